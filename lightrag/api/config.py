@@ -41,6 +41,13 @@ from lightrag.constants import (
     DEFAULT_OLLAMA_MODEL_TAG,
     DEFAULT_RERANK_BINDING,
     DEFAULT_ENTITY_TYPES,
+    DEFAULT_PARSE_WORKERS,
+    DEFAULT_PARSE_TIMEOUT,
+    DEFAULT_PARSE_MEMORY_LIMIT_MB,
+    DEFAULT_STREAM_INGEST_THRESHOLD_MB,
+    DEFAULT_DELETE_BATCH_SIZE,
+    DEFAULT_INPUT_DIR_WATCH_DEBOUNCE,
+    DEFAULT_INPUT_DIR_WATCH_POLL_INTERVAL,
 )
 
 # use the .env that is inside the current folder
@@ -254,7 +261,7 @@ def parse_args() -> argparse.Namespace:
         "--rerank-binding",
         type=str,
         default=get_env_value("RERANK_BINDING", DEFAULT_RERANK_BINDING),
-        choices=["null", "cohere", "jina", "aliyun"],
+        choices=["null", "cohere", "jina", "aliyun", "local"],
         help=f"Rerank binding type (default: from env or {DEFAULT_RERANK_BINDING})",
     )
 
@@ -326,6 +333,16 @@ def parse_args() -> argparse.Namespace:
     args.working_dir = os.path.abspath(args.working_dir)
     args.input_dir = os.path.abspath(args.input_dir)
 
+    # Input directory scanning and watching
+    args.input_dir_recursive = get_env_value("INPUT_DIR_RECURSIVE", False, bool)
+    args.input_dir_watch = get_env_value("INPUT_DIR_WATCH", False, bool)
+    args.input_dir_watch_debounce = get_env_value(
+        "INPUT_DIR_WATCH_DEBOUNCE", DEFAULT_INPUT_DIR_WATCH_DEBOUNCE, float
+    )
+    args.input_dir_watch_poll_interval = get_env_value(
+        "INPUT_DIR_WATCH_POLL_INTERVAL", DEFAULT_INPUT_DIR_WATCH_POLL_INTERVAL, float
+    )
+
     # Inject storage configuration from environment variables
     args.kv_storage = get_env_value(
         "LIGHTRAG_KV_STORAGE", DefaultRAGStorageConfig.KV_STORAGE
@@ -394,6 +411,20 @@ def parse_args() -> argparse.Namespace:
     # PDF decryption password
     args.pdf_decrypt_password = get_env_value("PDF_DECRYPT_PASSWORD", None)
 
+    # Document parsing process pool
+    args.parse_workers = get_env_value("PARSE_WORKERS", DEFAULT_PARSE_WORKERS, int)
+    args.parse_timeout = get_env_value("PARSE_TIMEOUT", DEFAULT_PARSE_TIMEOUT, float)
+    args.parse_memory_limit_mb = get_env_value(
+        "PARSE_MEMORY_LIMIT_MB", DEFAULT_PARSE_MEMORY_LIMIT_MB, int
+    )
+    args.stream_ingest_threshold_mb = get_env_value(
+        "STREAM_INGEST_THRESHOLD_MB", DEFAULT_STREAM_INGEST_THRESHOLD_MB, float
+    )
+    # 0 deletes all documents in one batch, negative values are treated as 0
+    args.delete_batch_size = max(
+        0, get_env_value("DELETE_BATCH_SIZE", DEFAULT_DELETE_BATCH_SIZE, int)
+    )
+
     # Add environment variables that were previously read directly
     args.cors_origins = get_env_value("CORS_ORIGINS", "*")
     args.summary_language = get_env_value("SUMMARY_LANGUAGE", DEFAULT_SUMMARY_LANGUAGE)
@@ -0,0 +1,127 @@
+"""
+Background watcher that indexes files dropped into the input directory.
+
+Uses watchdog (inotify, FSEvents, ReadDirectoryChangesW) when it is installed and
+falls back to polling otherwise. Polling is cheap because a scan only stats
+files whose manifest entry is unchanged (see DocumentManager).
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from lightrag.utils import logger
+
+
+def _is_ignored(path: str, root: str) -> bool:
+    """Events for hidden files (the manifest) and dunder dirs (__enqueued__) never trigger a scan"""
+    relative = os.path.relpath(path, root)
+    return any(
+        part.startswith(".") or part.startswith("__") for part in Path(relative).parts
+    )
+
+
+class InputDirWatcher:
+    """Calls ``on_change`` when files in ``path`` are created, modified or moved in
+
+    Events are debounced: the callback runs once the directory has been quiet for
+    ``debounce`` seconds, so a file that is still being copied is not parsed
+    half-written and a burst of files is handled by one scan.
+
+    Args:
+        path: Directory to watch (recursively)
+        on_change: Coroutine function that scans and indexes the directory
+        debounce: Quiet period in seconds before ``on_change`` runs
+        poll_interval: Seconds between scans when watchdog is not installed
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        on_change: Callable[[], Awaitable[None]],
+        debounce: float = 2.0,
+        poll_interval: float = 30.0,
+    ):
+        self.path = str(path)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._changed: asyncio.Event | None = None
+        self._observer = None
+        self._task: asyncio.Task | None = None
+
+    def _start_observer(self, loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler  # type: ignore
+            from watchdog.observers import Observer  # type: ignore
+        except ImportError:
+            return False
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type not in ("created", "modified", "moved"):
+                    return
+                if event.is_directory and event.event_type == "modified":
+                    return
+                path = getattr(event, "dest_path", "") or event.src_path
+                if not _is_ignored(path, watcher.path):
+                    loop.call_soon_threadsafe(watcher._changed.set)
+
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), self.path, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+        return True
+
+    async def start(self):
+        """Start watching; the first scan picks up files added while stopped"""
+        loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        if self._start_observer(loop):
+            logger.info(f"Watching input directory {self.path} for new files")
+        else:
+            logger.info(
+                f"watchdog not installed, polling input directory {self.path} every {self.poll_interval}s"
+            )
+        self._changed.set()
+        self._task = asyncio.create_task(self._run())
+
+    async def _wait_for_change(self):
+        if self._observer is not None:
+            await self._changed.wait()
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        while True:
+            await self._wait_for_change()
+            # Debounce: wait until no event arrived for a full quiet period
+            while True:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=self.debounce)
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self.on_change()
+            except Exception as e:
+                logger.error(f"Error indexing changes of {self.path}: {e}")
+
+    async def stop(self):
+        """Stop watching"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
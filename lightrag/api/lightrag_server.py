@@ -38,6 +38,7 @@ from lightrag import LightRAG, __version__ as core_version
 from lightrag.api import __api_version__
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.utils import EmbeddingFunc
+from lightrag.llm.endpoint_router import build_endpoint_router, endpoint_router_stats
 from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
@@ -48,13 +49,16 @@ from lightrag.constants import (
 from lightrag.api.routers.document_routes import (
     DocumentManager,
     create_document_routes,
+    run_scanning_process,
+    shutdown_parsing_pool,
 )
+from lightrag.api.input_watcher import InputDirWatcher
 from lightrag.api.routers.query_routes import create_query_routes
 from lightrag.api.routers.graph_routes import create_graph_routes
 from lightrag.api.routers.thread_routes import create_thread_routes
 from lightrag.api.routers.ollama_api import OllamaAPI
 
-from lightrag.utils import logger, set_verbose_debug
+from lightrag.utils import generate_track_id, logger, set_verbose_debug
 from lightrag.kg.shared_storage import (
     get_namespace_data,
     get_default_workspace,
@@ -345,7 +349,26 @@ def create_app(args):
     api_key = os.getenv("LIGHTRAG_API_KEY") or args.key
 
     # Initialize document manager with workspace support for data isolation
-    doc_manager = DocumentManager(args.input_dir, workspace=args.workspace)
+    doc_manager = DocumentManager(
+        args.input_dir, workspace=args.workspace, recursive=args.input_dir_recursive
+    )
+
+    # Index files dropped into the input directory in the background
+    input_watcher = None
+    if args.input_dir_watch:
+        if "LIGHTRAG_GUNICORN_MODE" in os.environ:
+            logger.warning(
+                "INPUT_DIR_WATCH is only supported in single-process (uvicorn) mode"
+            )
+        else:
+            input_watcher = InputDirWatcher(
+                doc_manager.input_dir,
+                lambda: run_scanning_process(
+                    rag, doc_manager, generate_track_id("watch"), process_queue=False
+                ),
+                debounce=args.input_dir_watch_debounce,
+                poll_interval=args.input_dir_watch_poll_interval,
+            )
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
@@ -361,11 +384,18 @@ def create_app(args):
             # Data migration regardless of storage implementation
             await rag.check_and_migrate_data()
 
+            if input_watcher:
+                await input_watcher.start()
+
             ASCIIColors.green("\nServer is ready to accept connections! 🚀\n")
 
             yield
 
         finally:
+            if input_watcher:
+                await input_watcher.stop()
+            shutdown_parsing_pool()
+
             # Clean up database connections
             await rag.finalize_storages()
 
@@ -510,12 +540,15 @@ def create_app(args):
             if config_cache.openai_llm_options:
                 kwargs.update(config_cache.openai_llm_options)
 
+            # Set by the endpoint router when several endpoints are configured
+            base_url = kwargs.pop("base_url", args.llm_binding_host)
+
             return await openai_complete_if_cache(
                 args.llm_model,
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
-                base_url=args.llm_binding_host,
+                base_url=base_url,
                 api_key=args.llm_binding_api_key,
                 **kwargs,
             )
@@ -547,12 +580,14 @@ def create_app(args):
             if config_cache.openai_llm_options:
                 kwargs.update(config_cache.openai_llm_options)
 
+            base_url = kwargs.pop("base_url", args.llm_binding_host)
+
             return await azure_openai_complete_if_cache(
                 args.llm_model,
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
-                base_url=args.llm_binding_host,
+                base_url=base_url,
                 api_key=os.getenv("AZURE_OPENAI_API_KEY", args.llm_binding_api_key),
                 api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview"),
                 **kwargs,
@@ -585,13 +620,15 @@ def create_app(args):
             ):
                 kwargs["generation_config"] = dict(config_cache.gemini_llm_options)
 
+            base_url = kwargs.pop("base_url", args.llm_binding_host)
+
             return await gemini_complete_if_cache(
                 args.llm_model,
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
                 api_key=args.llm_binding_api_key,
-                base_url=args.llm_binding_host,
+                base_url=base_url,
                 keyword_extraction=keyword_extraction,
                 **kwargs,
             )
@@ -627,6 +664,36 @@ def create_app(args):
         except ImportError as e:
             raise Exception(f"Failed to import {binding} LLM binding: {e}")
 
+    def route_llm_endpoints(llm_func, binding: str):
+        """Spread LLM calls over the endpoints when LLM_BINDING_HOST lists several"""
+        if binding == "aws_bedrock":
+            return llm_func
+        llm_router = build_endpoint_router(args.llm_binding_host)
+        if llm_router is None:
+            return llm_func
+        logger.info(f"LLM calls routed across {len(llm_router.endpoints)} endpoints")
+        return llm_router.wrap(llm_func, "host" if binding == "ollama" else "base_url")
+
+    def create_extraction_batch_backend(binding: str):
+        """Create the Batch API backend for offline extraction when EXTRACTION_BATCH_MODE is on"""
+        if not get_env_value("EXTRACTION_BATCH_MODE", False, bool):
+            return None
+        if binding != "openai":
+            logger.warning(
+                f"EXTRACTION_BATCH_MODE is not supported by the {binding} binding, "
+                "using real-time extraction"
+            )
+            return None
+        from lightrag.batch_extraction import OpenAIBatchBackend
+
+        logger.info("Entity extraction runs through the OpenAI Batch API")
+        return OpenAIBatchBackend(
+            args.llm_model,
+            api_key=args.llm_binding_api_key,
+            base_url=args.llm_binding_host,
+            body_kwargs=config_cache.openai_llm_options,
+        )
+
     def create_llm_model_kwargs(binding: str, args, llm_timeout: int) -> dict:
         """
         Create LLM model kwargs based on binding type.
@@ -729,7 +796,11 @@ def create_app(args):
 
         # Step 3: Create optimized embedding function (calls underlying function directly)
         # Note: When model is None, each binding will use its own default model
-        async def optimized_embedding_function(texts, embedding_dim=None):
+        async def optimized_embedding_function(
+            texts, embedding_dim=None, base_url=None
+        ):
+            # base_url is set by the endpoint router when several endpoints are configured
+            endpoint = base_url or host
             try:
                 if binding == "lollms":
                     from lightrag.llm.lollms import lollms_embed
@@ -742,7 +813,7 @@ def create_app(args):
                     )
                     # lollms embed_model is not used (server uses configured vectorizer)
                     # Only pass base_url and api_key
-                    return await actual_func(texts, base_url=host, api_key=api_key)
+                    return await actual_func(texts, base_url=endpoint, api_key=api_key)
                 elif binding == "ollama":
                     from lightrag.llm.ollama import ollama_embed
 
@@ -764,7 +835,7 @@ def create_app(args):
                     # Pass embed_model only if provided, let function use its default (bge-m3:latest)
                     kwargs = {
                         "texts": texts,
-                        "host": host,
+                        "host": endpoint,
                         "api_key": api_key,
                         "options": ollama_options,
                     }
@@ -809,7 +880,7 @@ def create_app(args):
                     kwargs = {
                         "texts": texts,
                         "embedding_dim": embedding_dim,
-                        "base_url": host,
+                        "base_url": endpoint,
                         "api_key": api_key,
                     }
                     if model:
@@ -835,7 +906,7 @@ def create_app(args):
                     # Pass model only if provided, let function use its default (gemini-embedding-001)
                     kwargs = {
                         "texts": texts,
-                        "base_url": host,
+                        "base_url": endpoint,
                         "api_key": api_key,
                         "embedding_dim": embedding_dim,
                         "task_type": gemini_options.get(
@@ -856,7 +927,7 @@ def create_app(args):
                     # Pass model only if provided, let function use its default (text-embedding-3-small)
                     kwargs = {
                         "texts": texts,
-                        "base_url": host,
+                        "base_url": endpoint,
                         "api_key": api_key,
                         "embedding_dim": embedding_dim,
                     }
@@ -866,6 +937,15 @@ def create_app(args):
             except ImportError as e:
                 raise Exception(f"Failed to import {binding} embedding: {e}")
 
+        embedding_router = build_endpoint_router(host)
+        if embedding_router is not None:
+            logger.info(
+                f"Embedding calls routed across {len(embedding_router.endpoints)} endpoints"
+            )
+            optimized_embedding_function = embedding_router.wrap(
+                optimized_embedding_function, "base_url"
+            )
+
         # Step 4: Wrap in EmbeddingFunc and return
         embedding_func_instance = EmbeddingFunc(
             embedding_dim=final_embedding_dim,
@@ -977,13 +1057,19 @@ def create_app(args):
     # Configure rerank function based on args.rerank_bindingparameter
     rerank_model_func = None
     if args.rerank_binding != "null":
-        from lightrag.rerank import cohere_rerank, jina_rerank, ali_rerank
+        from lightrag.rerank import (
+            cohere_rerank,
+            jina_rerank,
+            ali_rerank,
+            local_rerank,
+        )
 
         # Map rerank binding to corresponding function
         rerank_functions = {
             "cohere": cohere_rerank,
             "jina": jina_rerank,
             "aliyun": ali_rerank,
+            "local": local_rerank,
         }
 
         # Select the appropriate rerank function based on binding
@@ -1053,7 +1139,9 @@ def create_app(args):
         rag = LightRAG(
             working_dir=args.working_dir,
             workspace=args.workspace,
-            llm_model_func=create_llm_model_func(args.llm_binding),
+            llm_model_func=route_llm_endpoints(
+                create_llm_model_func(args.llm_binding), args.llm_binding
+            ),
             llm_model_name=args.llm_model,
             llm_model_max_async=args.max_async,
             summary_max_tokens=args.summary_max_tokens,
@@ -1083,6 +1171,7 @@ def create_app(args):
                 "entity_types": args.entity_types,
             },
             ollama_server_infos=ollama_server_infos,
+            extraction_batch_backend=create_extraction_batch_backend(args.llm_binding),
         )
     except Exception as e:
         logger.error(f"Failed to initialize LightRAG: {e}")
@@ -1293,6 +1382,14 @@ def create_app(args):
                 "auth_mode": auth_mode,
                 "pipeline_busy": pipeline_status.get("busy", False),
                 "keyed_locks": keyed_lock_info,
+                "read_cache": rag.get_read_cache_stats(),
+                "semantic_cache": rag.get_semantic_cache_stats(),
+                "context_cache": rag.get_context_cache_stats(),
+                "concurrency": rag.get_concurrency_stats(),
+                "endpoints": {
+                    "llm": endpoint_router_stats(rag.llm_model_func),
+                    "embedding": endpoint_router_stats(rag.embedding_func),
+                },
                 "core_version": core_version,
                 "api_version": api_version_display,
                 "webui_title": webui_title,
@@ -0,0 +1,108 @@
+"""
+Process pool for parsing uploaded and scanned documents.
+
+pypdf, python-docx, openpyxl and docling are pure-Python parsers that hold the
+GIL, so running them through asyncio.to_thread() serializes them. ParsingPool
+runs them in worker processes with a per-file timeout and an optional memory
+cap per worker.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from lightrag.utils import logger
+
+
+def _limit_worker_memory(memory_limit_mb: int) -> None:
+    """Worker initializer: cap the address space so a runaway parse raises MemoryError"""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        logger.warning(f"Cannot limit parser worker memory: {e}")
+
+
+class ParsingPool:
+    """Runs synchronous parser functions in a pool of worker processes
+
+    At most ``max_workers`` parses are submitted at a time, the others wait
+    for a free worker, so the timeout only counts the time a parse runs. A
+    parse that exceeds ``timeout`` cannot be cancelled inside its worker, so
+    the workers of the pool are terminated and a fresh pool is started. Parses
+    that were running in the same pool fail with BrokenProcessPool and are
+    retried once on the new pool, as are parses whose worker died (e.g. killed
+    by the OOM killer).
+
+    Args:
+        max_workers: Number of worker processes
+        timeout: Seconds a single parse may run, 0 disables the timeout
+        memory_limit_mb: Address-space limit per worker in MB, 0 disables it
+            (Unix only, exceeding it raises MemoryError in the parser)
+    """
+
+    def __init__(self, max_workers: int, timeout: float = 0, memory_limit_mb: int = 0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: ProcessPoolExecutor | None = None
+        self._generation = 0
+        self._workers_free = asyncio.Semaphore(max_workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_limit_worker_memory,
+                initargs=(self.memory_limit_mb,),
+            )
+        return self._executor
+
+    def _reset(self, generation: int) -> None:
+        """Kill the workers of a pool generation; the next parse starts a fresh pool"""
+        if generation != self._generation or self._executor is None:
+            return
+        executor = self._executor
+        self._executor = None
+        self._generation += 1
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` in a worker process
+
+        ``func`` and its arguments must be picklable (module-level functions).
+
+        Raises:
+            TimeoutError: If the parse runs longer than the timeout
+            BrokenProcessPool: If the worker died twice while parsing
+        """
+        loop = asyncio.get_running_loop()
+        # Queued parses wait here instead of in the executor, where the
+        # timeout would already be running
+        async with self._workers_free:
+            for attempt in range(2):
+                generation = self._generation
+                future = loop.run_in_executor(self._get_executor(), func, *args)
+                try:
+                    return await asyncio.wait_for(future, timeout=self.timeout or None)
+                except asyncio.TimeoutError:
+                    self._reset(generation)
+                    raise TimeoutError(f"Parsing timed out after {self.timeout}s")
+                except BrokenProcessPool:
+                    self._reset(generation)
+                    if attempt:
+                        raise
+                    logger.warning(
+                        "Parser worker died, retrying on a fresh process pool"
+                    )
+
+    def shutdown(self) -> None:
+        """Terminate the worker processes"""
+        self._reset(self._generation)
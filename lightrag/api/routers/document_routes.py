@@ -3,6 +3,9 @@ This module contains all document-related routes for the LightRAG API.
 """
 
 import asyncio
+import hashlib
+import json
+import os
 from functools import lru_cache
 from lightrag.utils import logger, get_pinyin_sort_key
 import aiofiles
@@ -10,7 +13,7 @@ import shutil
 import traceback
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Literal
+from typing import Callable, Dict, Iterator, List, Optional, Any, Literal
 from io import BytesIO
 from fastapi import (
     APIRouter,
@@ -30,6 +33,7 @@ from lightrag.utils import (
     sanitize_text_for_encoding,
 )
 from lightrag.api.utils_api import get_combined_auth_dependency
+from lightrag.api.parsing_pool import ParsingPool
 from ..config import global_args
 
 
@@ -743,6 +747,8 @@ class PipelineStatusResponse(BaseModel):
         latest_message: Latest message from pipeline processing
         history_messages: List of history messages
         update_status: Status of update flags for all namespaces
+        concurrency: LLM/embedding queue concurrency, queue depth and throttle events
+        stages: Per-stage concurrency, queue depth and throughput of the document pipeline
     """
 
     autoscanned: bool = False
@@ -756,6 +762,8 @@ class PipelineStatusResponse(BaseModel):
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
     update_status: Optional[dict] = None
+    concurrency: Optional[dict] = None
+    stages: Optional[dict] = None
 
     @field_validator("job_start", mode="before")
     @classmethod
@@ -767,6 +775,10 @@ class PipelineStatusResponse(BaseModel):
         extra = "allow"  # Allow additional fields from the pipeline status
 
 
+# Manifest of indexed files kept in the input directory
+MANIFEST_FILENAME = ".lightrag_manifest.json"
+
+
 class DocumentManager:
     def __init__(
         self,
@@ -811,12 +823,13 @@ class DocumentManager:
             ".scss",  # Sassy CSS
             ".less",  # LESS CSS
         ),
+        recursive: bool = False,
     ):
         # Store the base input directory and workspace
         self.base_input_dir = Path(input_dir)
         self.workspace = workspace
         self.supported_extensions = supported_extensions
-        self.indexed_files = set()
+        self.recursive = recursive
 
         # Create workspace-specific input directory
         # If workspace is provided, create a subdirectory for data isolation
@@ -828,18 +841,123 @@ class DocumentManager:
         # Create input directory if it doesn't exist
         self.input_dir.mkdir(parents=True, exist_ok=True)
 
+        # Manifest of the files already handed to the pipeline: relative path ->
+        # size, mtime and content hash. Scanned files wait in _scanned until
+        # mark_as_indexed() moves them into the manifest.
+        self.manifest_path = self.input_dir / MANIFEST_FILENAME
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self._scanned: Dict[str, Dict[str, Any]] = {}
+        self._manifest_dirty = False
+        # Serializes scans, so a watcher scan and /documents/scan never parse the same file
+        self.scan_lock = asyncio.Lock()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f).get("files", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(
+                f"Ignoring unreadable input manifest {self.manifest_path}: {e}"
+            )
+            return {}
+
+    def save_manifest(self):
+        """Persist the manifest if it changed (atomic replace)"""
+        if not self._manifest_dirty:
+            return
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self.manifest}, f)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_dirty = False
+
+    def _walk(self, directory: str):
+        """Yield supported files with one os.scandir pass per directory
+
+        Hidden entries and dunder directories such as __enqueued__ are skipped.
+        """
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive and not entry.name.startswith("__"):
+                        yield from self._walk(entry.path)
+                elif entry.is_file() and self.is_supported_file(entry.name):
+                    yield entry
+
+    def _manifest_key(self, file_path) -> str:
+        return Path(os.path.relpath(file_path, self.input_dir)).as_posix()
+
+    @staticmethod
+    def _file_record(file_path, stat: os.stat_result) -> Dict[str, Any]:
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                file_hash.update(block)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash.hexdigest(),
+        }
+
     def scan_directory_for_new_files(self) -> List[Path]:
-        """Scan input directory for new files"""
+        """Scan input directory for new or changed files
+
+        A file whose size and mtime match its manifest entry is skipped without
+        being read; otherwise its content hash decides. Returned files are
+        remembered until mark_as_indexed() records them in the manifest.
+        """
         new_files = []
-        for ext in self.supported_extensions:
-            logger.debug(f"Scanning for {ext} files in {self.input_dir}")
-            for file_path in self.input_dir.glob(f"*{ext}"):
-                if file_path not in self.indexed_files:
-                    new_files.append(file_path)
+        for entry in self._walk(self.input_dir):
+            key = self._manifest_key(entry.path)
+            stat = entry.stat()
+            known = self.manifest.get(key)
+            if (
+                known
+                and known["size"] == stat.st_size
+                and known["mtime_ns"] == stat.st_mtime_ns
+            ):
+                continue
+            try:
+                record = self._file_record(entry.path, stat)
+            except OSError as e:
+                logger.warning(f"Cannot read {entry.path}: {e}")
+                continue
+            if known and known["hash"] == record["hash"]:
+                # Touched or copied again with the same content
+                self.manifest[key] = record
+                self._manifest_dirty = True
+                continue
+            self._scanned[key] = record
+            new_files.append(Path(entry.path))
         return new_files
 
     def mark_as_indexed(self, file_path: Path):
-        self.indexed_files.add(file_path)
+        """Record a scanned file in the manifest, unchanged copies are skipped from now on"""
+        key = self._manifest_key(file_path)
+        record = self._scanned.pop(key, None)
+        if record is None:
+            try:
+                record = self._file_record(file_path, file_path.stat())
+            except OSError:
+                return
+        self.manifest[key] = record
+        self._manifest_dirty = True
+
+    def forget(self, file_name: str):
+        """Drop manifest entries of a file name, so the file is indexed again when it reappears"""
+        for key in [k for k in self.manifest if Path(k).name == file_name]:
+            del self.manifest[key]
+            self._manifest_dirty = True
+
+    def reset_manifest(self):
+        """Forget all indexed files"""
+        self.manifest.clear()
+        self._scanned.clear()
+        self._manifest_dirty = True
 
     def is_supported_file(self, filename: str) -> bool:
         return any(filename.lower().endswith(ext) for ext in self.supported_extensions)
@@ -932,7 +1050,40 @@ def get_unique_filename_in_enqueued(target_dir: Path, original_name: str) -> str
 
 
 # Document processing helper functions (synchronous)
-# These functions run in thread pool via asyncio.to_thread() to avoid blocking the event loop
+# These functions run in the parsing process pool via _run_parser() to avoid blocking the event loop
+
+
+_parsing_pool: Optional[ParsingPool] = None
+
+
+def _get_parsing_pool() -> Optional[ParsingPool]:
+    """Get the shared parsing process pool, None when PARSE_WORKERS is 0"""
+    global _parsing_pool
+    if global_args.parse_workers <= 0:
+        return None
+    if _parsing_pool is None:
+        _parsing_pool = ParsingPool(
+            global_args.parse_workers,
+            timeout=global_args.parse_timeout,
+            memory_limit_mb=global_args.parse_memory_limit_mb,
+        )
+    return _parsing_pool
+
+
+def shutdown_parsing_pool() -> None:
+    """Terminate the parser worker processes"""
+    global _parsing_pool
+    if _parsing_pool is not None:
+        _parsing_pool.shutdown()
+        _parsing_pool = None
+
+
+async def _run_parser(func, *args):
+    """Run a synchronous parser in the parsing process pool, or in a thread when disabled"""
+    pool = _get_parsing_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+    return await pool.run(func, *args)
 
 
 def _convert_with_docling(file_path: Path) -> str:
@@ -1121,6 +1272,11 @@ def _extract_xlsx(file_bytes: bytes) -> str:
 
     xlsx_file = BytesIO(file_bytes)
     wb = load_workbook(xlsx_file)
+    return "\n".join(_iter_xlsx_lines(wb))
+
+
+def _iter_xlsx_lines(wb) -> Iterator[str]:
+    """Yield the lines of the _extract_xlsx text format for a workbook, sheet by sheet"""
 
     def escape_cell(cell_value: str | int | float | None) -> str:
         """Escape characters that would break tab-delimited layout.
@@ -1157,18 +1313,18 @@ def _extract_xlsx(file_bytes: bytes) -> str:
         """
         return str(title).replace("\n", " ").replace("\t", " ").replace("\r", " ")
 
-    content_parts: list[str] = []
     sheet_separator = "=" * 20
 
     for idx, sheet in enumerate(wb):
         if idx > 0:
-            content_parts.append("")  # Blank line between sheets for readability
+            yield ""  # Blank line between sheets for readability
 
         # Escape sheet title to handle edge cases with special characters
         safe_title = escape_sheet_title(sheet.title)
-        content_parts.append(f"{sheet_separator} Sheet: {safe_title} {sheet_separator}")
+        yield f"{sheet_separator} Sheet: {safe_title} {sheet_separator}"
 
         # Use sheet.max_column to get the maximum column width directly
+        # (read-only worksheets without stored dimensions report None)
         max_columns = sheet.max_column if sheet.max_column else 0
 
         # Extract rows with consistent width to preserve column alignment
@@ -1176,7 +1332,7 @@ def _extract_xlsx(file_bytes: bytes) -> str:
             row_parts = []
 
             # Build row up to max_columns width
-            for idx in range(max_columns):
+            for idx in range(max_columns or len(row)):
                 if idx < len(row):
                     row_parts.append(escape_cell(row[idx]))
                 else:
@@ -1185,14 +1341,168 @@ def _extract_xlsx(file_bytes: bytes) -> str:
             # Check if row is completely empty
             if all(part == "" for part in row_parts):
                 # Preserve empty rows as blank lines (maintains row structure)
-                content_parts.append("")
+                yield ""
             else:
                 # Join all columns to maintain consistent column count
-                content_parts.append("\t".join(row_parts))
+                yield "\t".join(row_parts)
 
     # Final separator for symmetry (makes parsing easier)
-    content_parts.append(sheet_separator)
-    return "\n".join(content_parts)
+    yield sheet_separator
+
+
+# Streaming extraction of very large files (see pipeline_stream_file)
+# Lines (text files, CSV rows, XLSX rows) per yielded segment
+STREAM_SEGMENT_LINES = 1000
+TEXT_FILE_EXTENSIONS = (
+    ".txt", ".md", ".html", ".htm", ".tex", ".json", ".xml", ".yaml", ".yml",
+    ".rtf", ".odt", ".epub", ".csv", ".log", ".conf", ".ini", ".properties",
+    ".sql", ".bat", ".sh", ".c", ".cpp", ".py", ".java", ".js", ".ts", ".swift",
+    ".go", ".rb", ".php", ".css", ".scss", ".less",
+)  # fmt: skip
+
+
+def _batched_lines(lines) -> Iterator[str]:
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= STREAM_SEGMENT_LINES:
+            yield "\n".join(batch)
+            batch = []
+    if batch:
+        yield "\n".join(batch)
+
+
+def _iter_text_segments(file_path: Path) -> Iterator[str]:
+    """Stream a UTF-8 text file in batches of lines (synchronous)"""
+    with open(file_path, encoding="utf-8") as f:
+        yield from _batched_lines(line.rstrip("\r\n") for line in f)
+
+
+def _iter_pdf_pages(file_path: Path, password: str = None) -> Iterator[str]:
+    """Stream the text of a PDF page by page with pypdf (synchronous)"""
+    from pypdf import PdfReader  # type: ignore
+
+    with open(file_path, "rb") as f:
+        reader = PdfReader(f)
+        if reader.is_encrypted:
+            if not password:
+                raise Exception("PDF is encrypted but no password provided")
+            if reader.decrypt(password) == 0:
+                raise Exception("Incorrect PDF password")
+        for page in reader.pages:
+            yield page.extract_text()
+
+
+def _iter_xlsx_segments(file_path: Path) -> Iterator[str]:
+    """Stream an XLSX workbook in batches of rows from a read-only workbook (synchronous)"""
+    from openpyxl import load_workbook  # type: ignore
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from _batched_lines(_iter_xlsx_lines(wb))
+    finally:
+        wb.close()
+
+
+def _stream_segments(file_path: Path, ext: str) -> Optional[Iterator[str]]:
+    """Streaming text extractor for a file type, None if the type cannot be streamed"""
+    if ext in TEXT_FILE_EXTENSIONS:
+        return _iter_text_segments(file_path)
+    if ext == ".pdf" and global_args.document_loading_engine != "DOCLING":
+        return _iter_pdf_pages(file_path, global_args.pdf_decrypt_password)
+    if ext == ".xlsx" and global_args.document_loading_engine != "DOCLING":
+        return _iter_xlsx_segments(file_path)
+    return None
+
+
+def _file_doc_id(file_path: Path) -> str:
+    """Document ID from the file bytes; equals compute_mdhash_id of UTF-8 text content"""
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            md5.update(block)
+    return "doc-" + md5.hexdigest()
+
+
+async def pipeline_stream_file(
+    rag: LightRAG,
+    file_path: Path,
+    segments: Iterator[str],
+    track_id: str,
+    file_size: int,
+) -> tuple[bool, str]:
+    """Insert a very large file through LightRAG.ainsert_stream
+
+    The file is extracted page by page or in batches of lines and never held
+    in memory as a whole; its chunks are stored and extracted window by window.
+
+    Args:
+        rag: LightRAG instance
+        file_path: Path to the saved file
+        segments: Streaming text extractor of the file (see _stream_segments)
+        track_id: Tracking ID
+        file_size: Size of the file in bytes
+    Returns:
+        tuple: (success: bool, track_id: str)
+    """
+    doc_id = None
+    try:
+        doc_id = await asyncio.to_thread(_file_doc_id, file_path)
+        if await rag.doc_status.get_by_id(doc_id):
+            logger.warning(
+                f"Skipping {file_path.name}: document {doc_id} already exists"
+            )
+            return False, track_id
+
+        logger.info(
+            f"Streaming large file {file_path.name} ({file_size / 1024 / 1024:.0f} MB)"
+        )
+        await rag.ainsert_stream(
+            segments,
+            file_path=file_path.name,
+            doc_id=doc_id,
+            track_id=track_id,
+        )
+    except Exception as e:
+        logger.error(f"Error streaming file {file_path.name}: {str(e)}")
+        # ainsert_stream records the failure in the document status once started
+        if doc_id is None or not await rag.doc_status.get_by_id(doc_id):
+            error_files = [
+                {
+                    "file_path": str(file_path.name),
+                    "error_description": "[File Extraction]Streaming error",
+                    "original_error": str(e),
+                    "file_size": file_size,
+                }
+            ]
+            await rag.apipeline_enqueue_error_documents(error_files, track_id)
+        return False, track_id
+
+    _move_to_enqueued(file_path)
+    return True, track_id
+
+
+def _move_to_enqueued(file_path: Path):
+    """Move an enqueued file into the __enqueued__ directory next to it"""
+    try:
+        enqueued_dir = file_path.parent / "__enqueued__"
+        enqueued_dir.mkdir(exist_ok=True)
+
+        # Generate unique filename to avoid conflicts
+        unique_filename = get_unique_filename_in_enqueued(enqueued_dir, file_path.name)
+        target_path = enqueued_dir / unique_filename
+
+        # Move the file
+        file_path.rename(target_path)
+        logger.debug(
+            f"Moved file to enqueued directory: {file_path.name} -> {unique_filename}"
+        )
+
+    except Exception as move_error:
+        logger.error(
+            f"Failed to move file {file_path.name} to __enqueued__ directory: {move_error}"
+        )
+        # Don't affect the main function's success status
 
 
 async def pipeline_enqueue_file(
@@ -1223,6 +1533,17 @@ async def pipeline_enqueue_file(
         except Exception:
             file_size = 0
 
+        # Very large files are streamed into the graph instead of being read whole
+        if (
+            global_args.stream_ingest_threshold_mb > 0
+            and file_size >= global_args.stream_ingest_threshold_mb * 1024 * 1024
+        ):
+            segments = _stream_segments(file_path, ext)
+            if segments is not None:
+                return await pipeline_stream_file(
+                    rag, file_path, segments, track_id, file_size
+                )
+
         file = None
         try:
             async with aiofiles.open(file_path, "rb") as f:
@@ -1370,7 +1691,7 @@ async def pipeline_enqueue_file(
                             global_args.document_loading_engine == "DOCLING"
                             and _is_docling_available()
                         ):
-                            content = await asyncio.to_thread(
+                            content = await _run_parser(
                                 _convert_with_docling, file_path
                             )
                         else:
@@ -1381,8 +1702,8 @@ async def pipeline_enqueue_file(
                                 logger.warning(
                                     f"DOCLING engine configured but not available for {file_path.name}. Falling back to pypdf."
                                 )
-                            # Use pypdf (non-blocking via to_thread)
-                            content = await asyncio.to_thread(
+                            # Use pypdf (in the parsing process pool)
+                            content = await _run_parser(
                                 _extract_pdf_pypdf,
                                 file,
                                 global_args.pdf_decrypt_password,
@@ -1411,7 +1732,7 @@ async def pipeline_enqueue_file(
                             global_args.document_loading_engine == "DOCLING"
                             and _is_docling_available()
                         ):
-                            content = await asyncio.to_thread(
+                            content = await _run_parser(
                                 _convert_with_docling, file_path
                             )
                         else:
@@ -1422,8 +1743,8 @@ async def pipeline_enqueue_file(
                                 logger.warning(
                                     f"DOCLING engine configured but not available for {file_path.name}. Falling back to python-docx."
                                 )
-                            # Use python-docx (non-blocking via to_thread)
-                            content = await asyncio.to_thread(_extract_docx, file)
+                            # Use python-docx (in the parsing process pool)
+                            content = await _run_parser(_extract_docx, file)
                     except Exception as e:
                         error_files = [
                             {
@@ -1448,7 +1769,7 @@ async def pipeline_enqueue_file(
                             global_args.document_loading_engine == "DOCLING"
                             and _is_docling_available()
                         ):
-                            content = await asyncio.to_thread(
+                            content = await _run_parser(
                                 _convert_with_docling, file_path
                             )
                         else:
@@ -1459,8 +1780,8 @@ async def pipeline_enqueue_file(
                                 logger.warning(
                                     f"DOCLING engine configured but not available for {file_path.name}. Falling back to python-pptx."
                                 )
-                            # Use python-pptx (non-blocking via to_thread)
-                            content = await asyncio.to_thread(_extract_pptx, file)
+                            # Use python-pptx (in the parsing process pool)
+                            content = await _run_parser(_extract_pptx, file)
                     except Exception as e:
                         error_files = [
                             {
@@ -1485,7 +1806,7 @@ async def pipeline_enqueue_file(
                             global_args.document_loading_engine == "DOCLING"
                             and _is_docling_available()
                         ):
-                            content = await asyncio.to_thread(
+                            content = await _run_parser(
                                 _convert_with_docling, file_path
                             )
                         else:
@@ -1496,8 +1817,8 @@ async def pipeline_enqueue_file(
                                 logger.warning(
                                     f"DOCLING engine configured but not available for {file_path.name}. Falling back to openpyxl."
                                 )
-                            # Use openpyxl (non-blocking via to_thread)
-                            content = await asyncio.to_thread(_extract_xlsx, file)
+                            # Use openpyxl (in the parsing process pool)
+                            content = await _run_parser(_extract_xlsx, file)
                     except Exception as e:
                         error_files = [
                             {
@@ -1573,27 +1894,7 @@ async def pipeline_enqueue_file(
                 )
 
                 # Move file to __enqueued__ directory after enqueuing
-                try:
-                    enqueued_dir = file_path.parent / "__enqueued__"
-                    enqueued_dir.mkdir(exist_ok=True)
-
-                    # Generate unique filename to avoid conflicts
-                    unique_filename = get_unique_filename_in_enqueued(
-                        enqueued_dir, file_path.name
-                    )
-                    target_path = enqueued_dir / unique_filename
-
-                    # Move the file
-                    file_path.rename(target_path)
-                    logger.debug(
-                        f"Moved file to enqueued directory: {file_path.name} -> {unique_filename}"
-                    )
-
-                except Exception as move_error:
-                    logger.error(
-                        f"Failed to move file {file_path.name} to __enqueued__ directory: {move_error}"
-                    )
-                    # Don't affect the main function's success status
+                _move_to_enqueued(file_path)
 
                 return True, track_id
 
@@ -1670,34 +1971,49 @@ async def pipeline_index_file(rag: LightRAG, file_path: Path, track_id: str = No
 
 
 async def pipeline_index_files(
-    rag: LightRAG, file_paths: List[Path], track_id: str = None
+    rag: LightRAG,
+    file_paths: List[Path],
+    track_id: str = None,
+    on_parsed: Optional[Callable[[Path], None]] = None,
 ):
-    """Index multiple files sequentially to avoid high CPU load
+    """Parse and enqueue multiple files, processing the queue as they arrive
+
+    Up to PARSE_WORKERS files are parsed at a time. Each parsed file is enqueued
+    right away and the processing pipeline is triggered, so LLM extraction of the
+    parsed files overlaps with parsing of the rest.
 
     Args:
         rag: LightRAG instance
         file_paths: Paths to the files to index
         track_id: Optional tracking ID to pass to all files
+        on_parsed: Optional callback for each file handed to the pipeline,
+            whether it was enqueued or recorded as an error document
     """
     if not file_paths:
         return
     try:
-        enqueued = False
-
         # Use get_pinyin_sort_key for Chinese pinyin sorting
-        sorted_file_paths = sorted(
-            file_paths, key=lambda p: get_pinyin_sort_key(str(p))
+        sorted_file_paths = iter(
+            sorted(file_paths, key=lambda p: get_pinyin_sort_key(str(p)))
         )
+        processing_runs = []
+
+        async def parse_files():
+            for file_path in sorted_file_paths:
+                success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
+                if on_parsed:
+                    on_parsed(file_path)
+                if success:
+                    # A busy pipeline picks the document up as a pending request
+                    processing_runs.append(
+                        asyncio.create_task(rag.apipeline_process_enqueue_documents())
+                    )
 
-        # Process files sequentially with track_id
-        for file_path in sorted_file_paths:
-            success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
-            if success:
-                enqueued = True
-
-        # Process the queue only if at least one file was successfully enqueued
-        if enqueued:
-            await rag.apipeline_process_enqueue_documents()
+        # Parsers share one iterator, bounding the files in flight to the worker count
+        await asyncio.gather(
+            *(parse_files() for _ in range(max(1, global_args.parse_workers)))
+        )
+        await asyncio.gather(*processing_runs)
     except Exception as e:
         logger.error(f"Error indexing files: {str(e)}")
         logger.error(traceback.format_exc())
@@ -1732,62 +2048,129 @@ async def pipeline_index_texts(
 
 
 async def run_scanning_process(
-    rag: LightRAG, doc_manager: DocumentManager, track_id: str = None
+    rag: LightRAG,
+    doc_manager: DocumentManager,
+    track_id: str = None,
+    process_queue: bool = True,
 ):
     """Background task to scan and index documents
 
+    Only new or changed files are parsed (see DocumentManager's manifest); every
+    file handed to the pipeline is recorded in the manifest, so a file that
+    failed to parse is not retried until it changes.
+
     Args:
         rag: LightRAG instance
         doc_manager: DocumentManager instance
         track_id: Optional tracking ID to pass to all scanned files
+        process_queue: Process already queued documents when no new file is found
     """
-    try:
-        new_files = doc_manager.scan_directory_for_new_files()
-        total_files = len(new_files)
-        logger.info(f"Found {total_files} files to index.")
-
-        if new_files:
-            # Check for files with PROCESSED status and filter them out
-            valid_files = []
-            processed_files = []
-
-            for file_path in new_files:
-                filename = file_path.name
-                existing_doc_data = await rag.doc_status.get_doc_by_file_path(filename)
-
-                if existing_doc_data and existing_doc_data.get("status") == "processed":
-                    # File is already PROCESSED, skip it with warning
-                    processed_files.append(filename)
-                    logger.warning(f"Skipping already processed file: {filename}")
-                else:
-                    # File is new or in non-PROCESSED status, add to processing list
-                    valid_files.append(file_path)
+    async with doc_manager.scan_lock:
+        try:
+            new_files = await asyncio.to_thread(
+                doc_manager.scan_directory_for_new_files
+            )
+            if not new_files and not process_queue:
+                return
+            total_files = len(new_files)
+            logger.info(f"Found {total_files} new or changed files to index.")
+
+            if new_files:
+                # Check for files with PROCESSED status and filter them out
+                valid_files = []
+                processed_files = []
+
+                for file_path in new_files:
+                    filename = file_path.name
+                    existing_doc_data = await rag.doc_status.get_doc_by_file_path(
+                        filename
+                    )
 
-            # Process valid files (new files + non-PROCESSED status files)
-            if valid_files:
-                await pipeline_index_files(rag, valid_files, track_id)
-                if processed_files:
-                    logger.info(
-                        f"Scanning process completed: {len(valid_files)} files Processed {len(processed_files)} skipped."
+                    if (
+                        existing_doc_data
+                        and existing_doc_data.get("status") == "processed"
+                    ):
+                        # File is already PROCESSED, skip it with warning
+                        processed_files.append(filename)
+                        doc_manager.mark_as_indexed(file_path)
+                        logger.warning(
+                            f"Skipping already processed file: {filename} (use /documents/replace to update it)"
+                        )
+                    else:
+                        # File is new or in non-PROCESSED status, add to processing list
+                        valid_files.append(file_path)
+
+                # Process valid files (new files + non-PROCESSED status files)
+                if valid_files:
+                    await pipeline_index_files(
+                        rag,
+                        valid_files,
+                        track_id,
+                        on_parsed=doc_manager.mark_as_indexed,
                     )
+                    if processed_files:
+                        logger.info(
+                            f"Scanning process completed: {len(valid_files)} files Processed {len(processed_files)} skipped."
+                        )
+                    else:
+                        logger.info(
+                            f"Scanning process completed: {len(valid_files)} files Processed."
+                        )
                 else:
                     logger.info(
-                        f"Scanning process completed: {len(valid_files)} files Processed."
+                        "No files to process after filtering already processed files."
                     )
             else:
+                # No new files to index, check if there are any documents in the queue
                 logger.info(
-                    "No files to process after filtering already processed files."
+                    "No upload file found, check if there are any documents in the queue..."
                 )
-        else:
-            # No new files to index, check if there are any documents in the queue
-            logger.info(
-                "No upload file found, check if there are any documents in the queue..."
-            )
-            await rag.apipeline_process_enqueue_documents()
+                await rag.apipeline_process_enqueue_documents()
 
-    except Exception as e:
-        logger.error(f"Error during scanning process: {str(e)}")
-        logger.error(traceback.format_exc())
+        except Exception as e:
+            logger.error(f"Error during scanning process: {str(e)}")
+            logger.error(traceback.format_exc())
+        finally:
+            try:
+                doc_manager.save_manifest()
+            except OSError as e:
+                logger.error(f"Failed to save input manifest: {str(e)}")
+
+
+async def background_update_document(
+    rag: LightRAG,
+    doc_id: str,
+    content: str,
+    file_path: str | None = None,
+    track_id: str | None = None,
+):
+    """Background task to update a processed document incrementally
+
+    A refused or failed update is reported in the pipeline status instead of
+    being dropped with the task.
+    """
+    from lightrag.kg.shared_storage import (
+        get_namespace_data,
+        get_namespace_lock,
+    )
+
+    result = await rag.aupdate_document(
+        doc_id, content, file_path=file_path, track_id=track_id
+    )
+    if result.status == "success":
+        return
+
+    log_message = f"Update of document {doc_id} {result.status}: {result.message}"
+    logger.error(log_message)
+    pipeline_status = await get_namespace_data(
+        "pipeline_status", workspace=rag.workspace
+    )
+    pipeline_status_lock = get_namespace_lock(
+        "pipeline_status", workspace=rag.workspace
+    )
+    async with pipeline_status_lock:
+        pipeline_status["latest_message"] = log_message
+        pipeline_status["history_messages"].append(log_message)
 
 
 async def background_delete_documents(
@@ -1824,7 +2207,7 @@ async def background_delete_documents(
         pipeline_status.update(
             {
                 "busy": True,
-                # Job name can not be changed, it's verified in adelete_by_doc_id()
+                # Job name can not be changed, it's verified in adelete_by_doc_ids()
                 "job_name": f"Deleting {total_docs} Documents",
                 "job_start": datetime.now().isoformat(),
                 "docs": total_docs,
@@ -1841,37 +2224,49 @@ async def background_delete_documents(
             )
 
     try:
-        # Loop through each document ID and delete them one by one
-        for i, doc_id in enumerate(doc_ids, 1):
-            # Check for cancellation at the start of each document deletion
+        # Delete in batches: the chunks of a batch are removed together, so an
+        # entity shared by its documents is rebuilt once
+        batch_size = max(1, global_args.delete_batch_size or total_docs)
+        for batch_start in range(0, total_docs, batch_size):
+            batch = doc_ids[batch_start : batch_start + batch_size]
+            # Check for cancellation before each batch
             async with pipeline_status_lock:
                 if pipeline_status.get("cancellation_requested", False):
-                    cancel_msg = f"Deletion cancelled by user at document {i}/{total_docs}. {len(successful_deletions)} deleted, {total_docs - i + 1} remaining."
+                    cancel_msg = f"Deletion cancelled by user at document {batch_start + 1}/{total_docs}. {len(successful_deletions)} deleted, {total_docs - batch_start} remaining."
                     logger.info(cancel_msg)
                     pipeline_status["latest_message"] = cancel_msg
                     pipeline_status["history_messages"].append(cancel_msg)
                     # Add remaining documents to failed list with cancellation reason
-                    failed_deletions.extend(
-                        doc_ids[i - 1 :]
-                    )  # i-1 because enumerate starts at 1
+                    failed_deletions.extend(doc_ids[batch_start:])
                     break  # Exit the loop, remaining documents unchanged
 
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
+                start_msg = f"Deleting documents {batch_start + 1}-{batch_start + len(batch)}/{total_docs}"
                 logger.info(start_msg)
-                pipeline_status["cur_batch"] = i
+                pipeline_status["cur_batch"] = batch_start + len(batch)
                 pipeline_status["latest_message"] = start_msg
                 pipeline_status["history_messages"].append(start_msg)
 
-            file_path = "#"
             try:
-                result = await rag.adelete_by_doc_id(
-                    doc_id, delete_llm_cache=delete_llm_cache
-                )
-                file_path = (
-                    getattr(result, "file_path", "-") if "result" in locals() else "-"
+                results = await rag.adelete_by_doc_ids(
+                    batch, delete_llm_cache=delete_llm_cache
                 )
+            except Exception as e:
+                failed_deletions.extend(batch)
+                error_msg = f"Error deleting documents {batch_start + 1}-{batch_start + len(batch)}/{total_docs} - {str(e)}"
+                logger.error(error_msg)
+                logger.error(traceback.format_exc())
+                async with pipeline_status_lock:
+                    pipeline_status["latest_message"] = error_msg
+                    pipeline_status["history_messages"].append(error_msg)
+                continue
+
+            for i, (doc_id, result) in enumerate(zip(batch, results), batch_start + 1):
+                file_path = result.file_path or "-"
                 if result.status == "success":
                     successful_deletions.append(doc_id)
+                    if result.file_path:
+                        # Index the file again if it is put back into the input dir
+                        doc_manager.forget(Path(result.file_path).name)
                     success_msg = (
                         f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
                     )
@@ -1999,15 +2394,6 @@ async def background_delete_documents(
                         pipeline_status["latest_message"] = error_msg
                         pipeline_status["history_messages"].append(error_msg)
 
-            except Exception as e:
-                failed_deletions.append(doc_id)
-                error_msg = f"Error deleting document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
-                logger.error(error_msg)
-                logger.error(traceback.format_exc())
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = error_msg
-                    pipeline_status["history_messages"].append(error_msg)
-
     except Exception as e:
         error_msg = f"Critical error during batch deletion: {str(e)}"
         logger.error(error_msg)
@@ -2015,6 +2401,11 @@ async def background_delete_documents(
         async with pipeline_status_lock:
             pipeline_status["history_messages"].append(error_msg)
     finally:
+        try:
+            doc_manager.save_manifest()
+        except OSError as e:
+            logger.error(f"Failed to save input manifest: {str(e)}")
+
         # Final summary and check for pending requests
         async with pipeline_status_lock:
             pipeline_status["busy"] = False
@@ -2241,8 +2632,10 @@ def create_document_routes(
         """
         Replace an existing document with a new version.
 
-        This endpoint deletes the old document and all its associated data,
-        then inserts the new document.
+        A processed document is updated incrementally in the background: only
+        chunks whose content changed are re-extracted, chunks that disappeared
+        are subtracted from the knowledge graph and the document keeps its ID.
+        Documents that are not processed yet are deleted and inserted again.
 
         Args:
             conflict_doc_id: ID of the document to replace
@@ -2250,23 +2643,64 @@ def create_document_routes(
 
         Returns:
             InsertResponse: A response object containing the status of the operation.
+
+        Raises:
+            HTTPException: If the document does not exist (404), the old version
+                could not be deleted (400), a processed document cannot be updated
+                while the pipeline is busy (409) or an error occurs (500).
         """
         try:
-            # Delete the old document
-            deletion_result = await rag.delete_documents([conflict_doc_id])
-            if not deletion_result:
+            status_doc = await rag.doc_status.get_by_id(conflict_doc_id)
+            if not status_doc:
                 raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to delete conflicting document {conflict_doc_id}"
+                    status_code=404,
+                    detail=f"Document {conflict_doc_id} not found",
                 )
 
-            # Insert the new document
-            sanitized_text = sanitize_text_for_encoding(request.text)
-            content_doc_id = compute_mdhash_id(sanitized_text, prefix="doc-")
-            
-            # Generate track_id for text insertion
             track_id = generate_track_id("replace")
 
+            if status_doc.get("status") == DocStatus.PROCESSED:
+                from lightrag.kg.shared_storage import (
+                    get_namespace_data,
+                    get_namespace_lock,
+                )
+
+                pipeline_status = await get_namespace_data(
+                    "pipeline_status", workspace=rag.workspace
+                )
+                pipeline_status_lock = get_namespace_lock(
+                    "pipeline_status", workspace=rag.workspace
+                )
+
+                # The update needs the pipeline to itself
+                async with pipeline_status_lock:
+                    if pipeline_status.get("busy", False):
+                        raise HTTPException(
+                            status_code=409,
+                            detail=f"Cannot update document {conflict_doc_id} while pipeline is busy",
+                        )
+
+                background_tasks.add_task(
+                    background_update_document,
+                    rag,
+                    conflict_doc_id,
+                    request.text,
+                    file_path=request.file_source,
+                    track_id=track_id,
+                )
+                return InsertResponse(
+                    status="success",
+                    message=f"Document {conflict_doc_id} is being updated incrementally. Only changed chunks are re-processed.",
+                    track_id=track_id,
+                )
+
+            deletion_result = await rag.adelete_by_doc_id(conflict_doc_id)
+            if deletion_result.status != "success":
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Failed to delete conflicting document {conflict_doc_id}: {deletion_result.message}",
+                )
+
             background_tasks.add_task(
                 pipeline_index_texts,
                 rag,
@@ -2280,6 +2714,8 @@ def create_document_routes(
                 message=f"Document replaced successfully. Old document (ID: {conflict_doc_id}) deleted and new content is being processed.",
                 track_id=track_id,
             )
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error /documents/replace: {str(e)}")
             logger.error(traceback.format_exc())
@@ -2519,6 +2955,12 @@ def create_document_routes(
                         logger.error(f"Error deleting file {file_path}: {str(e)}")
                         file_errors_count += 1
 
+            doc_manager.reset_manifest()
+            try:
+                doc_manager.save_manifest()
+            except OSError as e:
+                logger.error(f"Failed to reset input manifest: {str(e)}")
+
             # Log file deletion results
             if "history_messages" in pipeline_status:
                 if file_errors_count > 0:
@@ -564,7 +564,8 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
         - Subsequent lines: `{"response": "content chunk"}`
         - Error handling: `{"error": "error message"}`
 
-        > If stream parameter is False, or the query hit LLM cache, complete response delivered in a single streaming message.
+        > If stream parameter is False, complete response delivered in a single streaming message.
+        > Streamed responses are written to the LLM cache once complete; a cache hit is replayed as a stream.
 
         **Response Format Details**
         - **Content-Type**: `application/x-ndjson` (Newline-Delimited JSON)
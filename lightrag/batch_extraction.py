@@ -0,0 +1,486 @@
+"""
+Offline entity extraction through provider batch APIs.
+
+For large backfills the latency of the real-time LLM queue does not matter,
+while its cost and rate limits do. In batch mode the pipeline writes the
+extraction prompts of all pending chunks to a JSONL file in the OpenAI Batch
+format, submits it to a BatchBackend, polls until the job is done and stores
+every result in the LLM response cache under the exact key that
+``use_llm_func_with_cache`` computes for the same call. Gleaning prompts depend
+on the first answer, so they are sent as a second batch round.
+
+Afterwards ``extract_entities`` runs as usual: every LLM call is answered from
+the cache, and the results flow through ``_process_extraction_result`` and
+``merge_nodes_and_edges`` unchanged. Chunks without a batch result (failed
+requests or jobs) fall back to real-time extraction.
+
+Each submitted job is recorded in a small state file next to its request file.
+When the process crashes while a job is running, the next pipeline run
+harvests the job instead of submitting the prompts again, and results already
+in the cache are never requested twice.
+
+Backends:
+
+- ``OpenAIBatchBackend`` uses the OpenAI (or compatible) ``/v1/batches`` API.
+- ``LocalBatchBackend`` answers the batch file with a local LLM function. It
+  stands in for a provider in tests and development.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from lightrag.base import BaseKVStorage, TextChunkSchema
+from lightrag.constants import DEFAULT_BATCH_POLL_INTERVAL
+from lightrag.exceptions import PipelineCancelledException
+from lightrag.operate import build_extraction_prompt_context
+from lightrag.prompt import PROMPTS
+from lightrag.utils import (
+    CacheData,
+    compute_args_hash,
+    handle_cache,
+    logger,
+    pack_user_ass_to_openai_messages,
+    prepare_llm_cache_call,
+    remove_think_tags,
+    save_to_cache,
+)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+class BatchBackend(ABC):
+    """Submits JSONL request files in the OpenAI Batch format and returns their results"""
+
+    @abstractmethod
+    async def submit(self, requests_path: str) -> str:
+        """Submit a request file and return the batch id"""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> str:
+        """Return "pending", "completed" or "failed" """
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> dict[str, str]:
+        """Return the response content of each successful request by custom_id"""
+
+    def __deepcopy__(self, memo):
+        # Backends hold clients and functions: share them with asdict() copies
+        return self
+
+
+def parse_batch_output(lines) -> dict[str, str]:
+    """Collect response contents by custom_id from OpenAI Batch output lines"""
+    results = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            logger.warning(
+                f"Batch request {record.get('custom_id')} failed: "
+                f"{record.get('error') or response.get('body')}"
+            )
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            continue
+        if content:
+            results[record["custom_id"]] = content
+    return results
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API backend
+
+    Args:
+        model: Model name written into every request body
+        api_key, base_url, client_configs: OpenAI client configuration
+        completion_window: Completion window of the batch job
+        body_kwargs: Extra request body fields, e.g. temperature
+    """
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        completion_window: str = "24h",
+        client_configs: dict[str, Any] | None = None,
+        body_kwargs: dict[str, Any] | None = None,
+    ):
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+        self.completion_window = completion_window
+        self.client_configs = client_configs
+        self.body_kwargs = body_kwargs or {}
+
+    def _client(self):
+        from lightrag.llm.openai import get_openai_async_client
+
+        return get_openai_async_client(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            client_configs=self.client_configs,
+        )
+
+    def request_body(self, messages: list[dict[str, str]]) -> dict[str, Any]:
+        return {"model": self.model, "messages": messages, **self.body_kwargs}
+
+    async def submit(self, requests_path: str) -> str:
+        client = self._client()
+        with open(requests_path, "rb") as f:
+            input_file = await client.files.create(file=f, purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    async def status(self, batch_id: str) -> str:
+        batch = await self._client().batches.retrieve(batch_id)
+        # Expired jobs keep the results of the requests that completed in time
+        if batch.status in ("completed", "expired"):
+            return "completed"
+        if batch.status in ("failed", "cancelled"):
+            return "failed"
+        return "pending"
+
+    async def results(self, batch_id: str) -> dict[str, str]:
+        client = self._client()
+        batch = await client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            return {}
+        output = await client.files.content(batch.output_file_id)
+        return parse_batch_output(output.text.splitlines())
+
+
+class LocalBatchBackend(BatchBackend):
+    """Answers batch files with a local LLM function
+
+    The batch id is the path of the request file. The job runs when its status
+    is first polled and writes ``<requests>.output.jsonl`` in the OpenAI Batch
+    output format.
+    """
+
+    def __init__(self, llm_model_func: Callable, max_async: int = 4):
+        self.llm_model_func = llm_model_func
+        self.max_async = max_async
+
+    def request_body(self, messages: list[dict[str, str]]) -> dict[str, Any]:
+        return {"messages": messages}
+
+    async def submit(self, requests_path: str) -> str:
+        return requests_path
+
+    async def status(self, batch_id: str) -> str:
+        if not os.path.exists(batch_id):
+            return "failed"
+        if not os.path.exists(batch_id + ".output.jsonl"):
+            await self._run(batch_id)
+        return "completed"
+
+    async def results(self, batch_id: str) -> dict[str, str]:
+        with open(batch_id + ".output.jsonl", encoding="utf-8") as f:
+            return parse_batch_output(f)
+
+    async def _run(self, batch_id: str) -> None:
+        with open(batch_id, encoding="utf-8") as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        semaphore = asyncio.Semaphore(self.max_async)
+
+        async def answer(request: dict) -> dict:
+            messages = request["body"]["messages"]
+            system_prompt = None
+            if messages and messages[0]["role"] == "system":
+                system_prompt = messages[0]["content"]
+                messages = messages[1:]
+            async with semaphore:
+                try:
+                    content = await self.llm_model_func(
+                        messages[-1]["content"],
+                        system_prompt=system_prompt,
+                        history_messages=messages[:-1],
+                    )
+                except Exception as e:
+                    return {
+                        "custom_id": request["custom_id"],
+                        "response": None,
+                        "error": {"message": str(e)},
+                    }
+            return {
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": content}}]},
+                },
+                "error": None,
+            }
+
+        records = await asyncio.gather(*(answer(request) for request in requests))
+        tmp_path = batch_id + ".output.jsonl.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, batch_id + ".output.jsonl")
+
+
+@dataclass
+class _ExtractionRequest:
+    custom_id: str
+    chunk_id: str
+    cache_prompt: str
+    messages: list[dict[str, str]]
+
+
+def _build_request(
+    chunk_id: str,
+    user_prompt: str,
+    system_prompt: str,
+    history_messages: list[dict[str, str]] | None = None,
+) -> _ExtractionRequest:
+    """Build the batch request for an extraction call, keyed like its LLM cache entry"""
+    safe_user, safe_system, safe_history, cache_prompt = prepare_llm_cache_call(
+        user_prompt, system_prompt, history_messages
+    )
+    messages = [{"role": "system", "content": str(safe_system)}]
+    messages.extend(safe_history or [])
+    messages.append({"role": "user", "content": safe_user})
+    return _ExtractionRequest(
+        custom_id=compute_args_hash(cache_prompt),
+        chunk_id=chunk_id,
+        cache_prompt=cache_prompt,
+        messages=messages,
+    )
+
+
+async def _cached_result(
+    llm_response_cache: BaseKVStorage, request: _ExtractionRequest
+) -> str | None:
+    cached = await handle_cache(
+        llm_response_cache,
+        request.custom_id,
+        request.cache_prompt,
+        "default",
+        cache_type="extract",
+    )
+    return cached[0] if cached else None
+
+
+class _BatchRun:
+    """Submits extraction rounds and checkpoints their results in the LLM cache"""
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        llm_response_cache: BaseKVStorage,
+        state_dir: str,
+        poll_interval: float,
+        pipeline_status: dict | None,
+        pipeline_status_lock,
+    ):
+        self.backend = backend
+        self.llm_response_cache = llm_response_cache
+        self.state_dir = state_dir
+        self.poll_interval = poll_interval
+        self.pipeline_status = pipeline_status
+        self.pipeline_status_lock = pipeline_status_lock
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "resumed_jobs": 0}
+
+    async def _log(self, message: str) -> None:
+        logger.info(message)
+        if self.pipeline_status is not None and self.pipeline_status_lock is not None:
+            async with self.pipeline_status_lock:
+                self.pipeline_status["latest_message"] = message
+                self.pipeline_status["history_messages"].append(message)
+
+    async def _check_cancelled(self) -> None:
+        if self.pipeline_status is None or self.pipeline_status_lock is None:
+            return
+        async with self.pipeline_status_lock:
+            if self.pipeline_status.get("cancellation_requested", False):
+                # The job keeps running at the provider and is harvested next time
+                raise PipelineCancelledException(
+                    "User cancelled during batch extraction"
+                )
+
+    def _job_paths(self, job_name: str) -> tuple[str, str]:
+        base = os.path.join(self.state_dir, job_name)
+        return base + ".jsonl", base + ".state.json"
+
+    async def resume(self) -> None:
+        """Harvest jobs submitted by an earlier run that did not finish"""
+        if not os.path.isdir(self.state_dir):
+            return
+        for name in sorted(os.listdir(self.state_dir)):
+            if not name.endswith(".state.json"):
+                continue
+            with open(os.path.join(self.state_dir, name), encoding="utf-8") as f:
+                state = json.load(f)
+            self.stats["resumed_jobs"] += 1
+            await self._log(
+                f"Resuming extraction batch {state['batch_id']} "
+                f"({len(state['requests'])} requests)"
+            )
+            await self._harvest(name[: -len(".state.json")], state)
+
+    async def submit_round(self, requests: list[_ExtractionRequest], label: str):
+        """Submit the requests without a cached result and store their results"""
+        pending = {}
+        for request in requests:
+            if request.custom_id in pending:
+                continue
+            if await _cached_result(self.llm_response_cache, request) is None:
+                pending[request.custom_id] = request
+        if not pending:
+            return
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        job_name = f"extract-{label}-{time.time_ns()}"
+        requests_path, state_path = self._job_paths(job_name)
+        with open(requests_path, "w", encoding="utf-8") as f:
+            for request in pending.values():
+                line = {
+                    "custom_id": request.custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": self.backend.request_body(request.messages),
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+        batch_id = await self.backend.submit(requests_path)
+        state = {
+            "batch_id": batch_id,
+            "requests": {
+                custom_id: [request.chunk_id, request.cache_prompt]
+                for custom_id, request in pending.items()
+            },
+        }
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, state_path)
+
+        self.stats["submitted"] += len(pending)
+        await self._log(
+            f"Submitted extraction batch {batch_id}: {len(pending)} {label} requests"
+        )
+        await self._harvest(job_name, state)
+
+    async def _harvest(self, job_name: str, state: dict) -> None:
+        batch_id = state["batch_id"]
+        while (status := await self.backend.status(batch_id)) == "pending":
+            await self._check_cancelled()
+            await asyncio.sleep(self.poll_interval)
+
+        results = {}
+        if status == "completed":
+            results = await self.backend.results(batch_id)
+        else:
+            logger.warning(f"Extraction batch {batch_id} failed")
+
+        for custom_id, content in results.items():
+            if custom_id not in state["requests"]:
+                continue
+            chunk_id, cache_prompt = state["requests"][custom_id]
+            await save_to_cache(
+                self.llm_response_cache,
+                CacheData(
+                    args_hash=custom_id,
+                    content=remove_think_tags(content),
+                    prompt=cache_prompt,
+                    cache_type="extract",
+                    chunk_id=chunk_id,
+                ),
+            )
+        # Persist the checkpoint before the job files are removed
+        await self.llm_response_cache.index_done_callback()
+
+        completed = sum(1 for custom_id in results if custom_id in state["requests"])
+        self.stats["completed"] += completed
+        self.stats["failed"] += len(state["requests"]) - completed
+        await self._log(
+            f"Extraction batch {batch_id} done: {completed}/{len(state['requests'])} "
+            "results cached"
+        )
+        for path in self._job_paths(job_name):
+            for leftover in (path, path + ".output.jsonl"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+
+async def run_batch_extraction(
+    chunks: dict[str, TextChunkSchema],
+    global_config: dict[str, Any],
+    llm_response_cache: BaseKVStorage,
+    backend: BatchBackend,
+    state_dir: str,
+    pipeline_status: dict | None = None,
+    pipeline_status_lock=None,
+    poll_interval: float = DEFAULT_BATCH_POLL_INTERVAL,
+) -> dict[str, int]:
+    """Answer the extraction calls of ``chunks`` through batch jobs into the LLM cache
+
+    ``extract_entities`` on the same chunks afterwards reads every answer from
+    the cache. Requires ``enable_llm_cache_for_entity_extract``.
+
+    Returns:
+        Request counts: submitted, completed, failed and resumed_jobs
+    """
+    run = _BatchRun(
+        backend,
+        llm_response_cache,
+        state_dir,
+        poll_interval,
+        pipeline_status,
+        pipeline_status_lock,
+    )
+    await run.resume()
+
+    context_base, system_prompt = build_extraction_prompt_context(global_config)
+    user_prompts = {
+        chunk_id: PROMPTS["entity_extraction_user_prompt"].format(
+            **{**context_base, "input_text": chunk["content"]}
+        )
+        for chunk_id, chunk in chunks.items()
+    }
+    initial_requests = {
+        chunk_id: _build_request(chunk_id, user_prompt, system_prompt)
+        for chunk_id, user_prompt in user_prompts.items()
+    }
+    await run.submit_round(list(initial_requests.values()), "initial")
+
+    if global_config["entity_extract_max_gleaning"] > 0:
+        # Gleaning continues the conversation of the initial extraction
+        gleaning_requests = []
+        for chunk_id, request in initial_requests.items():
+            first_result = await _cached_result(llm_response_cache, request)
+            if first_result is None:
+                continue
+            continue_prompt = PROMPTS["entity_continue_extraction_user_prompt"].format(
+                **{**context_base, "input_text": chunks[chunk_id]["content"]}
+            )
+            gleaning_requests.append(
+                _build_request(
+                    chunk_id,
+                    continue_prompt,
+                    system_prompt,
+                    pack_user_ass_to_openai_messages(
+                        user_prompts[chunk_id], first_result
+                    ),
+                )
+            )
+        await run.submit_round(gleaning_requests, "gleaning")
+
+    return run.stats
@@ -54,10 +54,64 @@ DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
 # TODO: Deprated. All conversation_history messages is send to LLM.
 DEFAULT_HISTORY_TURNS = 0
 
+# Query-path read cache for text chunks and graph records (0 entries disables it)
+DEFAULT_READ_CACHE_MAX_ENTRIES = 0
+DEFAULT_READ_CACHE_TTL = 300  # seconds
+
+# Semantic query-answer cache: minimum cosine similarity for a paraphrased
+# query to reuse a cached answer, and entries kept per process
+DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES = 1000
+
+# Retrieval-context cache for built query contexts (0 entries disables it)
+DEFAULT_QUERY_CONTEXT_CACHE_MAX_ENTRIES = 0
+
+# Graph bulk-load mode: buffered graph mutations before an automatic flush,
+# and rows sent per bulk_write / UNWIND round-trip
+DEFAULT_GRAPH_BULK_BUFFER_SIZE = 5000
+DEFAULT_GRAPH_BULK_BATCH_SIZE = 1000
+
+# Group commit of the document pipeline: processed documents persisted per
+# storage flush (1 flushes after every document)
+DEFAULT_INSERT_FLUSH_DOCS = 1
+
+# Streaming ingestion of very large documents: chunks stored and extracted per
+# window (bounds memory independently of the document size)
+DEFAULT_STREAM_WINDOW_CHUNKS = 32
+
+# Documents of at least this many characters are chunked in a worker thread
+# instead of blocking the event loop
+DEFAULT_CHUNKING_OFFLOAD_THRESHOLD = 20000
+
+# Adaptive (AIMD) concurrency for the LLM and embedding queues: factor applied
+# to the concurrency limit on 429/overload errors, and the smoothed latency
+# (relative to the best observed) treated as congestion by the embedding queue
+DEFAULT_AIMD_MIN_CONCURRENCY = 1
+DEFAULT_AIMD_DECREASE_FACTOR = 0.5
+DEFAULT_AIMD_LATENCY_TOLERANCE = 3.0
+
+# Multi-endpoint routing of LLM/embedding calls: consecutive failures before an
+# endpoint's circuit opens, seconds before a trial call is let through, and the
+# highest queue priority routed to query endpoints (queries use priority 5)
+DEFAULT_ENDPOINT_FAILURE_THRESHOLD = 3
+DEFAULT_ENDPOINT_COOLDOWN = 30
+DEFAULT_QUERY_PRIORITY_THRESHOLD = 5
+
+# Offline batch extraction: seconds between status polls of a submitted batch job
+DEFAULT_BATCH_POLL_INTERVAL = 60
+
 # Rerank configuration defaults
 DEFAULT_MIN_RERANK_SCORE = 0.0
 DEFAULT_RERANK_BINDING = "null"
 
+# In-process cross-encoder rerank (RERANK_BINDING=local): model, query/document
+# pairs per inference batch, seconds a partial batch waits for concurrent
+# queries, and (query, chunk) scores kept in the LRU cache
+DEFAULT_LOCAL_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+DEFAULT_LOCAL_RERANK_BATCH_SIZE = 32
+DEFAULT_LOCAL_RERANK_MAX_WAIT = 0.005
+DEFAULT_LOCAL_RERANK_CACHE_SIZE = 10000
+
 # Default source ids limit in meta data for entity and relation
 DEFAULT_MAX_SOURCE_IDS_PER_ENTITY = 300
 DEFAULT_MAX_SOURCE_IDS_PER_RELATION = 300
@@ -87,6 +141,38 @@ DEFAULT_TEMPERATURE = 1.0
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
 
+# Pipeline stages: documents merging into the graph at once (merges of
+# different documents are serialized per entity by keyed locks), and documents
+# that may wait between two stages before the upstream stage is held back
+DEFAULT_MAX_PARALLEL_MERGE = 2
+DEFAULT_PIPELINE_STAGE_QUEUE_SIZE = 4
+
+# Resumable processing: chunks of a document extracted and merged per window.
+# After each window but the last the progress is persisted with the doc status,
+# so an interrupted document resumes at its first unmerged chunk (0 disables)
+DEFAULT_CHECKPOINT_CHUNKS = 50
+
+# Document parsing process pool of the API server: worker processes (0 parses
+# in threads), seconds a single file may take, and address-space limit per
+# worker in MB (0 is unlimited)
+DEFAULT_PARSE_WORKERS = 4
+DEFAULT_PARSE_TIMEOUT = 300
+DEFAULT_PARSE_MEMORY_LIMIT_MB = 0
+
+# Files of at least this many MB are streamed into the graph by the API server
+# instead of being extracted whole (0 disables streaming)
+DEFAULT_STREAM_INGEST_THRESHOLD_MB = 100
+
+# Input directory watcher of the API server: seconds the directory must stay
+# quiet before a scan, and seconds between scans when watchdog is not installed
+DEFAULT_INPUT_DIR_WATCH_DEBOUNCE = 2
+DEFAULT_INPUT_DIR_WATCH_POLL_INTERVAL = 30
+
+# Documents deleted together by the API server's batch deletion: entities and
+# relations shared by the documents of a batch are rebuilt once per batch, and
+# cancellation takes effect between batches (0 deletes all in one batch)
+DEFAULT_DELETE_BATCH_SIZE = 100
+
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
@@ -2,9 +2,11 @@ STORAGE_IMPLEMENTATIONS = {
     "KV_STORAGE": {
         "implementations": [
             "JsonKVStorage",
+            "JsonlKVStorage",
             "RedisKVStorage",
             "PGKVStorage",
             "MongoKVStorage",
+            "SqliteKVStorage",
         ],
         "required_methods": ["get_by_id", "upsert"],
     },
@@ -15,6 +17,7 @@ STORAGE_IMPLEMENTATIONS = {
             "PGGraphStorage",
             "MongoGraphStorage",
             "MemgraphStorage",
+            "SqliteGraphStorage",
         ],
         "required_methods": ["upsert_node", "upsert_edge"],
     },
@@ -26,6 +29,7 @@ STORAGE_IMPLEMENTATIONS = {
             "FaissVectorDBStorage",
             "QdrantVectorDBStorage",
             "MongoVectorDBStorage",
+            "SqliteVectorDBStorage",
             # "ChromaVectorDBStorage",
         ],
         "required_methods": ["query", "upsert"],
@@ -36,6 +40,7 @@ STORAGE_IMPLEMENTATIONS = {
             "RedisDocStatusStorage",
             "PGDocStatusStorage",
             "MongoDocStatusStorage",
+            "SqliteDocStatusStorage",
         ],
         "required_methods": ["get_docs_by_status"],
     },
@@ -45,6 +50,7 @@ STORAGE_IMPLEMENTATIONS = {
 STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
     # KV Storage Implementations
     "JsonKVStorage": [],
+    "JsonlKVStorage": [],
     "MongoKVStorage": [
         "MONGO_URI",
         "MONGO_DATABASE",
@@ -91,12 +97,18 @@ STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
         "MONGO_URI",
         "MONGO_DATABASE",
     ],
+    # SQLite Storage Implementations (embedded, no external service)
+    "SqliteKVStorage": [],
+    "SqliteDocStatusStorage": [],
+    "SqliteGraphStorage": [],
+    "SqliteVectorDBStorage": [],
 }
 
 # Storage implementation module mapping
 STORAGES = {
     "NetworkXStorage": ".kg.networkx_impl",
     "JsonKVStorage": ".kg.json_kv_impl",
+    "JsonlKVStorage": ".kg.jsonl_kv_impl",
     "NanoVectorDBStorage": ".kg.nano_vector_db_impl",
     "JsonDocStatusStorage": ".kg.json_doc_status_impl",
     "Neo4JStorage": ".kg.neo4j_impl",
@@ -116,6 +128,10 @@ STORAGES = {
     "FaissVectorDBStorage": ".kg.faiss_impl",
     "QdrantVectorDBStorage": ".kg.qdrant_impl",
     "MemgraphStorage": ".kg.memgraph_impl",
+    "SqliteKVStorage": ".kg.sqlite_impl",
+    "SqliteDocStatusStorage": ".kg.sqlite_impl",
+    "SqliteGraphStorage": ".kg.sqlite_impl",
+    "SqliteVectorDBStorage": ".kg.sqlite_impl",
 }
 
 
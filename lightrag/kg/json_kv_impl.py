@@ -18,7 +18,9 @@ from .shared_storage import (
     get_update_flag,
     set_all_update_flags,
     clear_all_update_flags,
+    bump_namespace_version,
     try_initialize_namespace,
+    get_namespace_read_cache,
 )
 
 
@@ -41,6 +43,8 @@ class JsonKVStorage(BaseKVStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Process-local read view, only used in multi-process mode
+        self._read_cache = None
 
     async def initialize(self):
         """Initialize storage data"""
@@ -50,6 +54,9 @@ class JsonKVStorage(BaseKVStorage):
         self.storage_updated = await get_update_flag(
             self.namespace, workspace=self.workspace
         )
+        self._read_cache = await get_namespace_read_cache(
+            self.namespace, workspace=self.workspace
+        )
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(
@@ -100,39 +107,60 @@ class JsonKVStorage(BaseKVStorage):
                     if cleaned_data is not None:
                         self._data.clear()
                         self._data.update(cleaned_data)
+                        await bump_namespace_version(
+                            self.namespace, workspace=self.workspace
+                        )
 
                 await clear_all_update_flags(self.namespace, workspace=self.workspace)
 
+    @staticmethod
+    def _to_record(id: str, data: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not data:
+            return None
+        # Create a copy to avoid modifying the original data
+        result = dict(data)
+        # Ensure time fields are present, provide default values for old data
+        result.setdefault("create_time", 0)
+        result.setdefault("update_time", 0)
+        # Ensure _id field contains the clean ID
+        result["_id"] = id
+        return result
+
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
-        async with self._storage_lock:
-            result = self._data.get(id)
-            if result:
-                # Create a copy to avoid modifying the original data
-                result = dict(result)
-                # Ensure time fields are present, provide default values for old data
-                result.setdefault("create_time", 0)
-                result.setdefault("update_time", 0)
-                # Ensure _id field contains the clean ID
-                result["_id"] = id
-            return result
+        if self._read_cache is None:
+            async with self._storage_lock:
+                return self._to_record(id, self._data.get(id))
+
+        # Serve from the process-local view while no worker changed the namespace
+        version = self._read_cache.sync()
+        hit, data = self._read_cache.get(id)
+        if not hit:
+            async with self._storage_lock:
+                data = self._data.get(id)
+            self._read_cache.put(id, data, version)
+        return self._to_record(id, data)
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        async with self._storage_lock:
-            results = []
-            for id in ids:
-                data = self._data.get(id, None)
-                if data:
-                    # Create a copy to avoid modifying the original data
-                    result = {k: v for k, v in data.items()}
-                    # Ensure time fields are present, provide default values for old data
-                    result.setdefault("create_time", 0)
-                    result.setdefault("update_time", 0)
-                    # Ensure _id field contains the clean ID
-                    result["_id"] = id
-                    results.append(result)
-                else:
-                    results.append(None)
-            return results
+        if self._read_cache is None:
+            async with self._storage_lock:
+                return [self._to_record(id, self._data.get(id, None)) for id in ids]
+
+        version = self._read_cache.sync()
+        found: dict[str, Any] = {}
+        missing = []
+        for id in ids:
+            hit, data = self._read_cache.get(id)
+            if hit:
+                found[id] = data
+            else:
+                missing.append(id)
+        if missing:
+            async with self._storage_lock:
+                for id in missing:
+                    found[id] = self._data.get(id, None)
+            for id in missing:
+                self._read_cache.put(id, found[id], version)
+        return [self._to_record(id, found[id]) for id in ids]
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
         async with self._storage_lock:
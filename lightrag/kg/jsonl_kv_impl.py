@@ -0,0 +1,428 @@
+import os
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, final
+
+from lightrag.base import (
+    BaseKVStorage,
+)
+from lightrag.utils import (
+    load_json,
+    logger,
+    write_json,
+    get_env_value,
+    SanitizingJSONEncoder,
+)
+from lightrag.exceptions import StorageNotInitializedError
+from .shared_storage import (
+    get_namespace_data,
+    get_namespace_lock,
+    get_data_init_lock,
+    get_update_flag,
+    set_all_update_flags,
+    clear_all_update_flags,
+    bump_namespace_version,
+    try_initialize_namespace,
+    get_namespace_read_cache,
+)
+
+# Compact when the journal grows larger than this ratio of the snapshot size
+DEFAULT_JSONL_KV_COMPACT_RATIO = 1.0
+# Never compact while the journal is smaller than this many bytes (default 16MB)
+DEFAULT_JSONL_KV_COMPACT_MIN_BYTES = 16 * 1024 * 1024
+
+
+def _encode_journal_record(record: dict[str, Any]) -> tuple[str, bool]:
+    """Serialize one journal record as a single JSON line.
+
+    Returns:
+        tuple[str, bool]: The encoded line and whether sanitization was applied
+    """
+    line = json.dumps(record, ensure_ascii=False)
+    try:
+        line.encode("utf-8")
+        return line, False
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return json.dumps(record, ensure_ascii=False, cls=SanitizingJSONEncoder), True
+
+
+def replay_journal(data: dict[str, Any], journal_file: str) -> int:
+    """Apply journal records on top of a snapshot dict in place.
+
+    A partially written trailing line (e.g. from a crash during append) is ignored.
+
+    Returns:
+        int: Number of records applied
+    """
+    if not os.path.exists(journal_file):
+        return 0
+
+    applied = 0
+    with open(journal_file, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(
+                    f"Skipping corrupted journal record at {journal_file}:{line_no}"
+                )
+                continue
+            if record.get("op") == "put":
+                data[record["k"]] = record["v"]
+            elif record.get("op") == "del":
+                data.pop(record["k"], None)
+            applied += 1
+    return applied
+
+
+@final
+@dataclass
+class JsonlKVStorage(BaseKVStorage):
+    """Journaled variant of JsonKVStorage.
+
+    The full dict lives in shared memory exactly like JsonKVStorage. Instead of
+    rewriting ``kv_store_<namespace>.json`` on every flush, only the keys changed
+    since the last flush are appended to ``kv_store_<namespace>.jsonl``. The
+    snapshot is rewritten (compacted) only when the journal outgrows it.
+
+    The snapshot file has the same name and format as the one written by
+    JsonKVStorage, so existing data is picked up without conversion, and
+    ``finalize`` compacts the journal so the snapshot stays readable by
+    JsonKVStorage as well.
+    """
+
+    def __post_init__(self):
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+        else:
+            # Default behavior when workspace is empty
+            workspace_dir = working_dir
+            self.workspace = ""
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        self._journal_file = os.path.join(
+            workspace_dir, f"kv_store_{self.namespace}.jsonl"
+        )
+
+        self._compact_ratio = get_env_value(
+            "JSONL_KV_COMPACT_RATIO", DEFAULT_JSONL_KV_COMPACT_RATIO, float
+        )
+        self._compact_min_bytes = get_env_value(
+            "JSONL_KV_COMPACT_MIN_BYTES", DEFAULT_JSONL_KV_COMPACT_MIN_BYTES, int
+        )
+
+        self._data = None
+        self._dirty_keys = None
+        self._storage_lock = None
+        self.storage_updated = None
+        # Process-local read view, only used in multi-process mode
+        self._read_cache = None
+
+    async def initialize(self):
+        """Initialize storage data"""
+        self._storage_lock = get_namespace_lock(
+            self.namespace, workspace=self.workspace
+        )
+        self.storage_updated = await get_update_flag(
+            self.namespace, workspace=self.workspace
+        )
+        self._read_cache = await get_namespace_read_cache(
+            self.namespace, workspace=self.workspace
+        )
+        async with get_data_init_lock():
+            # check need_init must before get_namespace_data
+            need_init = await try_initialize_namespace(
+                self.namespace, workspace=self.workspace
+            )
+            self._data = await get_namespace_data(
+                self.namespace, workspace=self.workspace
+            )
+            # Keys changed since last flush, shared by all workers of the namespace
+            self._dirty_keys = await get_namespace_data(
+                f"{self.namespace}_dirty_keys", workspace=self.workspace
+            )
+            if need_init:
+                loaded_data = load_json(self._file_name) or {}
+                replayed = replay_journal(loaded_data, self._journal_file)
+                async with self._storage_lock:
+                    # Migrate legacy cache structure if needed
+                    if self.namespace.endswith("_cache") and not replayed:
+                        from .json_kv_impl import JsonKVStorage
+
+                        loaded_data = (
+                            await JsonKVStorage._migrate_legacy_cache_structure(
+                                self, loaded_data
+                            )
+                        )
+
+                    self._data.update(loaded_data)
+                    logger.info(
+                        f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {len(loaded_data)} records ({replayed} journal records replayed)"
+                    )
+
+    def _should_compact(self) -> bool:
+        try:
+            journal_size = os.path.getsize(self._journal_file)
+        except OSError:
+            return False
+        if journal_size < self._compact_min_bytes:
+            return False
+        try:
+            snapshot_size = os.path.getsize(self._file_name)
+        except OSError:
+            snapshot_size = 0
+        return journal_size > snapshot_size * self._compact_ratio
+
+    def _append_dirty_records(self) -> tuple[int, bool]:
+        """Append the current value of every dirty key to the journal.
+
+        Must be called while holding the storage lock. Returns the number of
+        records appended and whether any record was replaced by its sanitized value.
+        """
+        dirty_keys = list(self._dirty_keys.keys())
+        if not dirty_keys:
+            return 0, False
+
+        lines = []
+        any_sanitized = False
+        for key in dirty_keys:
+            value = self._data.get(key)
+            if value is None:
+                line, _ = _encode_journal_record({"op": "del", "k": key})
+            else:
+                line, sanitized = _encode_journal_record(
+                    {"op": "put", "k": key, "v": dict(value)}
+                )
+                if sanitized:
+                    # Keep shared memory consistent with what was persisted
+                    self._data[key] = json.loads(line)["v"]
+                    any_sanitized = True
+            lines.append(line)
+
+        with open(self._journal_file, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._dirty_keys.clear()
+        return len(lines), any_sanitized
+
+    def _compact(self) -> bool:
+        """Rewrite the snapshot from shared memory and truncate the journal.
+
+        Must be called while holding the storage lock, after dirty keys are flushed,
+        so replaying a journal left behind by a crash mid-compaction is idempotent.
+        Returns True if shared memory was replaced by the sanitized snapshot.
+        """
+        data_dict = dict(self._data) if hasattr(self._data, "_getvalue") else self._data
+        tmp_file = f"{self._file_name}.tmp"
+        needs_reload = write_json(data_dict, tmp_file)
+        os.replace(tmp_file, self._file_name)
+        open(self._journal_file, "w").close()
+
+        if needs_reload:
+            logger.info(
+                f"[{self.workspace}] Reloading sanitized data into shared memory for {self.namespace}"
+            )
+            cleaned_data = load_json(self._file_name)
+            if cleaned_data is not None:
+                self._data.clear()
+                self._data.update(cleaned_data)
+            else:
+                needs_reload = False
+
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} KV compacted {len(data_dict)} records of {self.namespace}"
+        )
+        return needs_reload
+
+    async def index_done_callback(self) -> None:
+        async with self._storage_lock:
+            if self.storage_updated.value:
+                start = time.perf_counter()
+                appended, replaced = self._append_dirty_records()
+                if self._should_compact() and self._compact():
+                    replaced = True
+                if replaced:
+                    # Records replaced by their sanitized values: other workers
+                    # must drop their read views
+                    await bump_namespace_version(
+                        self.namespace, workspace=self.workspace
+                    )
+
+                logger.debug(
+                    f"[{self.workspace}] Process {os.getpid()} KV journaled {appended} records to {self.namespace} in {time.perf_counter() - start:.3f}s"
+                )
+                await clear_all_update_flags(self.namespace, workspace=self.workspace)
+
+    @staticmethod
+    def _to_record(id: str, data: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not data:
+            return None
+        # Create a copy to avoid modifying the original data
+        result = dict(data)
+        # Ensure time fields are present, provide default values for old data
+        result.setdefault("create_time", 0)
+        result.setdefault("update_time", 0)
+        # Ensure _id field contains the clean ID
+        result["_id"] = id
+        return result
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        if self._read_cache is None:
+            async with self._storage_lock:
+                return self._to_record(id, self._data.get(id))
+
+        # Serve from the process-local view while no worker changed the namespace
+        version = self._read_cache.sync()
+        hit, data = self._read_cache.get(id)
+        if not hit:
+            async with self._storage_lock:
+                data = self._data.get(id)
+            self._read_cache.put(id, data, version)
+        return self._to_record(id, data)
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        if self._read_cache is None:
+            async with self._storage_lock:
+                return [self._to_record(id, self._data.get(id, None)) for id in ids]
+
+        version = self._read_cache.sync()
+        found: dict[str, Any] = {}
+        missing = []
+        for id in ids:
+            hit, data = self._read_cache.get(id)
+            if hit:
+                found[id] = data
+            else:
+                missing.append(id)
+        if missing:
+            async with self._storage_lock:
+                for id in missing:
+                    found[id] = self._data.get(id, None)
+            for id in missing:
+                self._read_cache.put(id, found[id], version)
+        return [self._to_record(id, found[id]) for id in ids]
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        async with self._storage_lock:
+            return set(keys) - set(self._data.keys())
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes for in-memory storage:
+        1. Changes will be appended to the journal during the next index_done_callback
+        2. update flags to notify other processes that data persistence is needed
+        """
+        if not data:
+            return
+
+        current_time = int(time.time())  # Get current Unix timestamp
+
+        logger.debug(
+            f"[{self.workspace}] Inserting {len(data)} records to {self.namespace}"
+        )
+        if self._storage_lock is None:
+            raise StorageNotInitializedError("JsonlKVStorage")
+        async with self._storage_lock:
+            for k, v in data.items():
+                # For text_chunks namespace, ensure llm_cache_list field exists
+                if self.namespace.endswith("text_chunks"):
+                    if "llm_cache_list" not in v:
+                        v["llm_cache_list"] = []
+
+                # Add timestamps based on whether key exists
+                if k in self._data:  # Key exists, only update update_time
+                    v["update_time"] = current_time
+                else:  # New key, set both create_time and update_time
+                    v["create_time"] = current_time
+                    v["update_time"] = current_time
+
+                v["_id"] = k
+
+            self._data.update(data)
+            self._dirty_keys.update(dict.fromkeys(data, True))
+            await set_all_update_flags(self.namespace, workspace=self.workspace)
+
+    async def delete(self, ids: list[str]) -> None:
+        """Delete specific records from storage by their IDs
+
+        Importance notes for in-memory storage:
+        1. Deletions will be appended to the journal during the next index_done_callback
+        2. update flags to notify other processes that data persistence is needed
+
+        Args:
+            ids (list[str]): List of document IDs to be deleted from storage
+
+        Returns:
+            None
+        """
+        async with self._storage_lock:
+            deleted = [doc_id for doc_id in ids if self._data.pop(doc_id, None)]
+            if deleted:
+                self._dirty_keys.update(dict.fromkeys(deleted, True))
+                await set_all_update_flags(self.namespace, workspace=self.workspace)
+
+    async def is_empty(self) -> bool:
+        """Check if the storage is empty
+
+        Returns:
+            bool: True if storage contains no data, False otherwise
+        """
+        async with self._storage_lock:
+            return len(self._data) == 0
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all data from storage and clean up resources
+           This action will persistent the data to disk immediately.
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                self._data.clear()
+                self._dirty_keys.clear()
+                self._compact()
+                # Persisted already, but other workers must drop their read views
+                await bump_namespace_version(self.namespace, workspace=self.workspace)
+                await clear_all_update_flags(self.namespace, workspace=self.workspace)
+
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
+
+    async def compact(self) -> None:
+        """Flush pending changes and fold the journal into the snapshot file."""
+        async with self._storage_lock:
+            _, replaced = self._append_dirty_records()
+            if self._compact() or replaced:
+                await bump_namespace_version(self.namespace, workspace=self.workspace)
+            await clear_all_update_flags(self.namespace, workspace=self.workspace)
+
+    async def finalize(self):
+        """Finalize storage resources
+        Fold the journal into the snapshot so the data directory stays compatible
+        with JsonKVStorage
+        """
+        if self._storage_lock is None or self._data is None:
+            return
+        journal_pending = (
+            os.path.exists(self._journal_file)
+            and os.path.getsize(self._journal_file) > 0
+        )
+        if journal_pending or len(self._dirty_keys) > 0:
+            await self.compact()
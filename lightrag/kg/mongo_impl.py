@@ -18,7 +18,7 @@ from ..base import (
 )
 from ..utils import logger, compute_mdhash_id
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from ..constants import GRAPH_FIELD_SEP
+from ..constants import GRAPH_FIELD_SEP, DEFAULT_GRAPH_BULK_BATCH_SIZE
 from ..kg.shared_storage import get_data_init_lock
 
 import pipmaster as pm
@@ -1085,6 +1085,78 @@ class MongoGraphStorage(BaseGraphStorage):
             upsert=True,
         )
 
+    def _bulk_batch_size(self) -> int:
+        return max(
+            1,
+            self.global_config.get(
+                "graph_bulk_batch_size", DEFAULT_GRAPH_BULK_BATCH_SIZE
+            ),
+        )
+
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert node documents with unordered bulk_write calls, same updates as upsert_node.
+        """
+        operations = []
+        for node_id, node_data in nodes:
+            update_doc = {"$set": {**node_data}}
+            if node_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = node_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(UpdateOne({"_id": node_id}, update_doc, upsert=True))
+
+        batch_size = self._bulk_batch_size()
+        for i in range(0, len(operations), batch_size):
+            await self.collection.bulk_write(
+                operations[i : i + batch_size], ordered=False
+            )
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert edge documents with unordered bulk_write calls, same updates as upsert_edge.
+        """
+        # Ensure source nodes exist
+        await self.upsert_nodes_batch(
+            [(source_node_id, {}) for source_node_id in {edge[0] for edge in edges}]
+        )
+
+        operations = []
+        for source_node_id, target_node_id, edge_data in edges:
+            edge_data = {
+                **edge_data,
+                "source_node_id": source_node_id,
+                "target_node_id": target_node_id,
+            }
+            if edge_data.get("source_id", ""):
+                edge_data["source_ids"] = edge_data["source_id"].split(GRAPH_FIELD_SEP)
+            operations.append(
+                UpdateOne(
+                    {
+                        "$or": [
+                            {
+                                "source_node_id": source_node_id,
+                                "target_node_id": target_node_id,
+                            },
+                            {
+                                "source_node_id": target_node_id,
+                                "target_node_id": source_node_id,
+                            },
+                        ]
+                    },
+                    {"$set": edge_data},
+                    upsert=True,
+                )
+            )
+
+        batch_size = self._bulk_batch_size()
+        for i in range(0, len(operations), batch_size):
+            await self.edge_collection.bulk_write(
+                operations[i : i + batch_size], ordered=False
+            )
+
     #
     # -------------------------------------------------------------------------
     # DELETION
@@ -18,6 +18,7 @@ from .shared_storage import (
     get_namespace_lock,
     get_update_flag,
     set_all_update_flags,
+    get_namespace_version,
 )
 
 
@@ -30,6 +31,9 @@ class NanoVectorDBStorage(BaseVectorStorage):
         self._client = None
         self._storage_lock = None
         self.storage_updated = None
+        # Shared version counter and the version this process last checked
+        self._version = None
+        self._seen_version = None
 
         # Use global config value if specified, otherwise use default
         kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
@@ -73,9 +77,17 @@ class NanoVectorDBStorage(BaseVectorStorage):
         self._storage_lock = get_namespace_lock(
             self.namespace, workspace=self.workspace
         )
+        self._version = await get_namespace_version(
+            self.namespace, workspace=self.workspace
+        )
 
     async def _get_client(self):
         """Check if the storage should be reloaded"""
+        # Fast path: no worker changed the namespace since the last check
+        current_version = self._version.value if self._version is not None else None
+        if current_version is not None and current_version == self._seen_version:
+            return self._client
+
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
             # Check if data needs to be reloaded
@@ -91,6 +103,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 # Reset update flag
                 self.storage_updated.value = False
 
+            self._seen_version = current_version
             return self._client
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
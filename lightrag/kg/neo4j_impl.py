@@ -14,6 +14,7 @@ from tenacity import (
 
 import logging
 from ..utils import logger
+from ..constants import DEFAULT_GRAPH_BULK_BATCH_SIZE
 from ..base import BaseGraphStorage
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from ..kg.shared_storage import get_data_init_lock
@@ -1102,6 +1103,120 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(f"[{self.workspace}] Error during edge upsert: {str(e)}")
             raise
 
+    def _bulk_batches(self, rows: list) -> list[list]:
+        batch_size = max(
+            1,
+            self.global_config.get(
+                "graph_bulk_batch_size", DEFAULT_GRAPH_BULK_BATCH_SIZE
+            ),
+        )
+        return [rows[i : i + batch_size] for i in range(0, len(rows), batch_size)]
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert nodes with UNWIND batches in one write transaction.
+
+        Labels can not be parameterized, so nodes are grouped by entity_type
+        and each group is written with its own UNWIND query.
+        """
+        workspace_label = self._get_workspace_label()
+        rows_by_type: dict[str, list[dict]] = {}
+        for node_id, node_data in nodes:
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type.setdefault(node_data["entity_type"], []).append(
+                {"entity_id": node_id, "properties": node_data}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    for entity_type, rows in rows_by_type.items():
+                        query = f"""
+                        UNWIND $rows AS row
+                        MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                        SET n += row.properties
+                        SET n:`{entity_type}`
+                        """
+                        for batch in self._bulk_batches(rows):
+                            result = await tx.run(query, rows=batch)
+                            await result.consume()
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert edges with UNWIND batches in one write transaction.
+        Edges whose endpoints do not exist are skipped, as in upsert_edge.
+        """
+        workspace_label = self._get_workspace_label()
+        rows = [
+            {
+                "source": source_node_id,
+                "target": target_node_id,
+                "properties": edge_data,
+            }
+            for source_node_id, target_node_id, edge_data in edges
+        ]
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+        MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+        MERGE (source)-[r:DIRECTED]-(target)
+        SET r += row.properties
+        """
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    for batch in self._bulk_batches(rows):
+                        result = await tx.run(query, rows=batch)
+                        await result.consume()
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch edge upsert: {str(e)}")
+            raise
+
     async def get_knowledge_graph(
         self,
         node_label: str,
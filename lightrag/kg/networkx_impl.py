@@ -10,6 +10,7 @@ from .shared_storage import (
     get_namespace_lock,
     get_update_flag,
     set_all_update_flags,
+    get_namespace_version,
 )
 
 from dotenv import load_dotenv
@@ -52,6 +53,9 @@ class NetworkXStorage(BaseGraphStorage):
         )
         self._storage_lock = None
         self.storage_updated = None
+        # Shared version counter and the version this process last checked
+        self._version = None
+        self._seen_version = None
         self._graph = None
 
         # Load initial graph
@@ -76,9 +80,17 @@ class NetworkXStorage(BaseGraphStorage):
         self._storage_lock = get_namespace_lock(
             self.namespace, workspace=self.workspace
         )
+        self._version = await get_namespace_version(
+            self.namespace, workspace=self.workspace
+        )
 
     async def _get_graph(self):
         """Check if the storage should be reloaded"""
+        # Fast path: no worker changed the namespace since the last check
+        current_version = self._version.value if self._version is not None else None
+        if current_version is not None and current_version == self._seen_version:
+            return self._graph
+
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
             # Check if data needs to be reloaded
@@ -93,6 +105,7 @@ class NetworkXStorage(BaseGraphStorage):
                 # Reset update flag
                 self.storage_updated.value = False
 
+            self._seen_version = current_version
             return self._graph
 
     async def has_node(self, node_id: str) -> bool:
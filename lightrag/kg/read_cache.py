@@ -0,0 +1,421 @@
+"""
+In-process read-through cache for KV and graph storages.
+
+The query path fetches the same hot text chunks, entities and relations over
+and over. On networked backends (PostgreSQL, Neo4j, MongoDB, ...) every fetch
+is a round-trip, even though this data only changes during indexing or graph
+edits. CachedKVStorage and CachedGraphStorage wrap any BaseKVStorage /
+BaseGraphStorage, answer reads from bounded LRU tiers with a TTL, and
+invalidate the affected entries on every write that goes through them. Since
+the document pipeline and utils_graph edits/merges write through the same
+storage instances, those paths invalidate the cache without extra hooks.
+
+Writes made by other processes are not seen until the TTL expires, so keep the
+TTL short when several workers or services write to the same backend.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from lightrag.base import BaseGraphStorage, BaseKVStorage
+from lightrag.types import KnowledgeGraph
+
+_MISSING = object()
+
+
+class ReadCacheTier:
+    """Bounded LRU map with per-entry TTL and hit/miss counters.
+
+    ``generation`` changes on every invalidation. Read-through callers take it
+    before querying the backend and pass it to put(), so a value fetched while
+    a write was in flight is never stored.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        """Return the cached value or _MISSING"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return _MISSING
+
+    def put(self, key: Any, value: Any, generation: int) -> None:
+        if generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys) -> None:
+        self.generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _copy(value: Any) -> Any:
+    # Callers may enrich returned records in place, never hand out cached objects
+    return dict(value) if isinstance(value, dict) else value
+
+
+def _edge_key(src: str, tgt: str) -> tuple[str, str]:
+    # Graph edges are undirected
+    return (src, tgt) if src <= tgt else (tgt, src)
+
+
+def _delegate(wrapper: Any, name: str) -> Any:
+    storage = wrapper.__dict__.get("storage")
+    if storage is None:
+        raise AttributeError(name)
+    return getattr(storage, name)
+
+
+async def _read_through(
+    tier: ReadCacheTier,
+    keys: list,
+    fetch: Callable,
+) -> dict:
+    """Resolve keys from the tier, fetching misses with one backend call.
+
+    ``fetch`` receives the missing keys and returns {key: value}; keys absent
+    from its result are cached as None (negative entries).
+    """
+    found = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        value = tier.get(key)
+        if value is _MISSING:
+            missing.append(key)
+        else:
+            found[key] = value
+    if missing:
+        generation = tier.generation
+        fetched = await fetch(missing)
+        for key in missing:
+            value = fetched.get(key)
+            tier.put(key, _copy(value), generation)
+            found[key] = value
+    return found
+
+
+class CachedKVStorage(BaseKVStorage):
+    """Read-through LRU/TTL cache in front of a BaseKVStorage"""
+
+    def __init__(self, storage: BaseKVStorage, max_entries: int, ttl: float):
+        # Not a dataclass init: the wrapped storage owns the configuration
+        self.storage = storage
+        self.namespace = storage.namespace
+        self.workspace = storage.workspace
+        self.global_config = storage.global_config
+        self.embedding_func = storage.embedding_func
+        self.records = ReadCacheTier(max_entries, ttl)
+
+    def __getattr__(self, name: str) -> Any:
+        # Backend specific attributes and helpers
+        return _delegate(self, name)
+
+    def cache_stats(self) -> dict[str, Any]:
+        return {"records": self.records.stats()}
+
+    def clear_cache(self) -> None:
+        self.records.clear()
+
+    async def initialize(self):
+        await self.storage.initialize()
+
+    async def finalize(self):
+        self.records.clear()
+        await self.storage.finalize()
+
+    async def index_done_callback(self) -> None:
+        await self.storage.index_done_callback()
+
+    async def drop(self) -> dict[str, str]:
+        self.records.clear()
+        return await self.storage.drop()
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        value = self.records.get(id)
+        if value is not _MISSING:
+            return _copy(value)
+        generation = self.records.generation
+        value = await self.storage.get_by_id(id)
+        self.records.put(id, _copy(value), generation)
+        return value
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        async def fetch(missing: list[str]) -> dict:
+            return dict(zip(missing, await self.storage.get_by_ids(missing)))
+
+        found = await _read_through(self.records, ids, fetch)
+        return [_copy(found[id]) for id in ids]
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        return await self.storage.filter_keys(keys)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        self.records.invalidate(data.keys())
+        try:
+            await self.storage.upsert(data)
+        finally:
+            self.records.invalidate(data.keys())
+
+    async def delete(self, ids: list[str]) -> None:
+        self.records.invalidate(ids)
+        try:
+            await self.storage.delete(ids)
+        finally:
+            self.records.invalidate(ids)
+
+    async def is_empty(self) -> bool:
+        return await self.storage.is_empty()
+
+
+class CachedGraphStorage(BaseGraphStorage):
+    """Read-through LRU/TTL cache in front of a BaseGraphStorage.
+
+    Tiers: nodes, edges (undirected key), node degrees and node edge lists.
+    Node upserts only touch the node tier; edge writes invalidate both
+    endpoints; node removal clears the edge related tiers since the neighbours
+    of a removed node are not known without a lookup.
+    """
+
+    def __init__(self, storage: BaseGraphStorage, max_entries: int, ttl: float):
+        self.storage = storage
+        self.namespace = storage.namespace
+        self.workspace = storage.workspace
+        self.global_config = storage.global_config
+        self.embedding_func = storage.embedding_func
+        self.nodes = ReadCacheTier(max_entries, ttl)
+        self.edges = ReadCacheTier(max_entries, ttl)
+        self.degrees = ReadCacheTier(max_entries, ttl)
+        self.node_edges = ReadCacheTier(max_entries, ttl)
+
+    def __getattr__(self, name: str) -> Any:
+        return _delegate(self, name)
+
+    def _tiers(self) -> dict[str, ReadCacheTier]:
+        return {
+            "nodes": self.nodes,
+            "edges": self.edges,
+            "degrees": self.degrees,
+            "node_edges": self.node_edges,
+        }
+
+    def cache_stats(self) -> dict[str, Any]:
+        return {name: tier.stats() for name, tier in self._tiers().items()}
+
+    def clear_cache(self) -> None:
+        for tier in self._tiers().values():
+            tier.clear()
+
+    def _invalidate_edges(self, edges: list[tuple[str, str]]) -> None:
+        endpoints = {node for edge in edges for node in edge}
+        self.edges.invalidate([_edge_key(src, tgt) for src, tgt in edges])
+        self.degrees.invalidate(endpoints)
+        self.node_edges.invalidate(endpoints)
+        # Backends may create missing endpoints implicitly
+        self.nodes.invalidate(endpoints)
+
+    def _invalidate_nodes(self, node_ids: list[str]) -> None:
+        self.nodes.invalidate(node_ids)
+        self.edges.clear()
+        self.degrees.clear()
+        self.node_edges.clear()
+
+    async def initialize(self):
+        await self.storage.initialize()
+
+    async def finalize(self):
+        self.clear_cache()
+        await self.storage.finalize()
+
+    async def index_done_callback(self) -> None:
+        await self.storage.index_done_callback()
+
+    async def drop(self) -> dict[str, str]:
+        self.clear_cache()
+        return await self.storage.drop()
+
+    # Reads
+
+    async def has_node(self, node_id: str) -> bool:
+        value = self.nodes.get(node_id)
+        if value is not _MISSING:
+            return value is not None
+        return await self.storage.has_node(node_id)
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        value = self.edges.get(_edge_key(source_node_id, target_node_id))
+        if value is not _MISSING:
+            return value is not None
+        return await self.storage.has_edge(source_node_id, target_node_id)
+
+    async def get_node(self, node_id: str) -> dict[str, str] | None:
+        found = await self.get_nodes_batch([node_id])
+        return found.get(node_id)
+
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        found = await _read_through(self.nodes, node_ids, self.storage.get_nodes_batch)
+        return {
+            node_id: _copy(node) for node_id, node in found.items() if node is not None
+        }
+
+    async def get_edge(
+        self, source_node_id: str, target_node_id: str
+    ) -> dict[str, str] | None:
+        found = await self.get_edges_batch(
+            [{"src": source_node_id, "tgt": target_node_id}]
+        )
+        return found.get((source_node_id, target_node_id))
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        async def fetch(missing: list[tuple[str, str]]) -> dict:
+            fetched = await self.storage.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in missing]
+            )
+            return {_edge_key(*pair): edge for pair, edge in fetched.items()}
+
+        found = await _read_through(
+            self.edges, [_edge_key(p["src"], p["tgt"]) for p in pairs], fetch
+        )
+        result = {}
+        for pair in pairs:
+            edge = found[_edge_key(pair["src"], pair["tgt"])]
+            if edge is not None:
+                result[(pair["src"], pair["tgt"])] = _copy(edge)
+        return result
+
+    async def node_degree(self, node_id: str) -> int:
+        return (await self.node_degrees_batch([node_id]))[node_id]
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        found = await _read_through(
+            self.degrees, node_ids, self.storage.node_degrees_batch
+        )
+        return {node_id: found[node_id] or 0 for node_id in node_ids}
+
+    async def edge_degree(self, src_id: str, tgt_id: str) -> int:
+        degrees = await self.node_degrees_batch([src_id, tgt_id])
+        return degrees[src_id] + degrees[tgt_id]
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        # Edge degree is the sum of both endpoint degrees in every backend
+        degrees = await self.node_degrees_batch(
+            [node for pair in edge_pairs for node in pair]
+        )
+        return {(src, tgt): degrees[src] + degrees[tgt] for src, tgt in edge_pairs}
+
+    async def get_node_edges(self, source_node_id: str) -> list[tuple[str, str]] | None:
+        value = self.node_edges.get(source_node_id)
+        if value is not _MISSING:
+            return list(value) if value is not None else None
+        generation = self.node_edges.generation
+        edges = await self.storage.get_node_edges(source_node_id)
+        self.node_edges.put(
+            source_node_id, list(edges) if edges is not None else None, generation
+        )
+        return edges
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        found = await _read_through(
+            self.node_edges, node_ids, self.storage.get_nodes_edges_batch
+        )
+        return {node_id: list(found[node_id] or []) for node_id in node_ids}
+
+    # Whole-graph reads are not cached
+
+    async def get_all_labels(self) -> list[str]:
+        return await self.storage.get_all_labels()
+
+    async def get_knowledge_graph(
+        self, node_label: str, max_depth: int = 3, max_nodes: int = 1000
+    ) -> KnowledgeGraph:
+        return await self.storage.get_knowledge_graph(node_label, max_depth, max_nodes)
+
+    async def get_all_nodes(self) -> list[dict]:
+        return await self.storage.get_all_nodes()
+
+    async def get_all_edges(self) -> list[dict]:
+        return await self.storage.get_all_edges()
+
+    async def get_popular_labels(self, limit: int = 300) -> list[str]:
+        return await self.storage.get_popular_labels(limit)
+
+    async def search_labels(self, query: str, limit: int = 50) -> list[str]:
+        return await self.storage.search_labels(query, limit)
+
+    # Writes, invalidated before and after so concurrent reads cannot refill stale data
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        self.nodes.invalidate([node_id])
+        try:
+            await self.storage.upsert_node(node_id, node_data)
+        finally:
+            self.nodes.invalidate([node_id])
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        edges = [(source_node_id, target_node_id)]
+        self._invalidate_edges(edges)
+        try:
+            await self.storage.upsert_edge(source_node_id, target_node_id, edge_data)
+        finally:
+            self._invalidate_edges(edges)
+
+    async def delete_node(self, node_id: str) -> None:
+        self._invalidate_nodes([node_id])
+        try:
+            await self.storage.delete_node(node_id)
+        finally:
+            self._invalidate_nodes([node_id])
+
+    async def remove_nodes(self, nodes: list[str]):
+        self._invalidate_nodes(nodes)
+        try:
+            return await self.storage.remove_nodes(nodes)
+        finally:
+            self._invalidate_nodes(nodes)
+
+    async def remove_edges(self, edges: list[tuple[str, str]]):
+        self._invalidate_edges(edges)
+        try:
+            return await self.storage.remove_edges(edges)
+        finally:
+            self._invalidate_edges(edges)
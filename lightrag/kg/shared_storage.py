@@ -1,11 +1,13 @@
 import os
 import sys
 import asyncio
+import ctypes
 import multiprocessing as mp
 from multiprocessing.synchronize import Lock as ProcessLock
 from multiprocessing import Manager
 import time
 import logging
+from collections import OrderedDict
 from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
 
@@ -84,6 +86,14 @@ _shared_dicts: Optional[Dict[str, Any]] = None
 _init_flags: Optional[Dict[str, bool]] = None  # namespace -> initialized
 _update_flags: Optional[Dict[str, bool]] = None  # namespace -> updated
 
+# Per-namespace version counters living in shared memory (multi-process mode only).
+# Workers read them without an IPC round-trip to the Manager process, so read
+# paths can tell whether their process-local view is still current.
+# Number of namespace version slots allocated before workers are forked
+SHARED_VERSION_SLOTS = int(os.getenv("SHARED_VERSION_SLOTS", 1024))
+_version_counters = None  # mp.RawArray of uint64, one slot per namespace
+_version_slots: Optional[Dict[str, int]] = None  # namespace -> slot index
+
 # locks for mutex access
 _internal_lock: Optional[LockType] = None
 _data_init_lock: Optional[LockType] = None
@@ -1208,7 +1218,9 @@ def initialize_share_data(workers: int = 1):
         _async_locks, \
         _storage_keyed_lock, \
         _earliest_mp_cleanup_time, \
-        _last_mp_cleanup_time
+        _last_mp_cleanup_time, \
+        _version_counters, \
+        _version_slots
 
     # Check if already initialized
     if _initialized:
@@ -1231,6 +1243,9 @@ def initialize_share_data(workers: int = 1):
         _shared_dicts = _manager.dict()
         _init_flags = _manager.dict()
         _update_flags = _manager.dict()
+        # Allocated before fork so every worker maps the same shared memory
+        _version_counters = mp.RawArray(ctypes.c_uint64, SHARED_VERSION_SLOTS)
+        _version_slots = _manager.dict()
 
         _storage_keyed_lock = KeyedUnifiedLock()
 
@@ -1251,6 +1266,8 @@ def initialize_share_data(workers: int = 1):
         _shared_dicts = {}
         _init_flags = {}
         _update_flags = {}
+        _version_counters = None  # Local reads are cheap, no version plane needed
+        _version_slots = None
         _async_locks = None  # No need for async locks in single process mode
 
         _storage_keyed_lock = KeyedUnifiedLock()
@@ -1341,6 +1358,108 @@ async def get_update_flag(namespace: str, workspace: str | None = None):
         return new_update_flag
 
 
+class NamespaceVersion:
+    """Read-only handle on a namespace version counter in shared memory.
+
+    Reading ``value`` is a plain memory load, no Manager round-trip. The counter
+    is bumped by set_all_update_flags(), i.e. whenever any worker changes the
+    namespace data, so a process can keep a local read view while the version
+    it recorded is still current.
+    """
+
+    __slots__ = ("_counters", "_index")
+
+    def __init__(self, counters, index: int):
+        self._counters = counters
+        self._index = index
+
+    @property
+    def value(self) -> int:
+        return self._counters[self._index]
+
+
+class NamespaceReadCache:
+    """Process-local LRU read view of a namespace, invalidated by its shared version.
+
+    Used by in-memory storages in multi-process mode to serve repeated reads
+    without going through the Manager. Writes keep going through the
+    namespace lock and the shared dict; they bump the version, and the next
+    read in every worker drops its local view.
+    """
+
+    def __init__(self, version: NamespaceVersion, max_entries: int):
+        self._version = version
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._seen_version = version.value
+        self.hits = 0
+        self.misses = 0
+
+    def sync(self) -> int:
+        """Drop the local view if the namespace changed; return the current version"""
+        current = self._version.value
+        if current != self._seen_version:
+            self._entries.clear()
+            self._seen_version = current
+        return current
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: str, value: Any, version: int) -> None:
+        """Cache a value read under ``version``; ignored if a write happened since"""
+        if version != self._seen_version or self._version.value != version:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+async def get_namespace_read_cache(
+    namespace: str, workspace: str | None = None
+) -> Optional[NamespaceReadCache]:
+    """Create a process-local read cache for a namespace (multi-process mode only)"""
+    version = await get_namespace_version(namespace, workspace)
+    if version is None:
+        return None
+    return NamespaceReadCache(
+        version, int(os.getenv("SHARED_READ_CACHE_MAX_ENTRIES", 10000))
+    )
+
+
+async def get_namespace_version(
+    namespace: str, workspace: str | None = None
+) -> Optional[NamespaceVersion]:
+    """Get the shared version counter of a namespace.
+
+    Returns None in single-process mode (reads of local data are already cheap)
+    or when all version slots are taken; callers then use their locked read path.
+    """
+    if _version_counters is None or _version_slots is None:
+        return None
+
+    final_namespace = get_final_namespace(namespace, workspace)
+
+    async with get_internal_lock():
+        if final_namespace not in _version_slots:
+            slot = len(_version_slots)
+            if slot >= SHARED_VERSION_SLOTS:
+                direct_log(
+                    f"Process {os.getpid()} no shared version slot left for [{final_namespace}], "
+                    f"increase SHARED_VERSION_SLOTS (current {SHARED_VERSION_SLOTS})",
+                    level="WARNING",
+                )
+                return None
+            _version_slots[final_namespace] = slot
+        return NamespaceVersion(_version_counters, _version_slots[final_namespace])
+
+
 async def set_all_update_flags(namespace: str, workspace: str | None = None):
     """Set all update flag of namespace indicating all workers need to reload data from files"""
     global _update_flags
@@ -1355,6 +1474,22 @@ async def set_all_update_flags(namespace: str, workspace: str | None = None):
         # Update flags for both modes
         for i in range(len(_update_flags[final_namespace])):
             _update_flags[final_namespace][i].value = True
+        # Bump shared version so workers drop their process-local read views
+        if _version_counters is not None and final_namespace in _version_slots:
+            _version_counters[_version_slots[final_namespace]] += 1
+
+
+async def bump_namespace_version(namespace: str, workspace: str | None = None):
+    """Bump the shared version of a namespace whose data was replaced in place
+
+    For changes that are already persisted (drop, reload of sanitized data):
+    the update flags stay untouched, but workers drop their local read views.
+    """
+    final_namespace = get_final_namespace(namespace, workspace)
+
+    async with get_internal_lock():
+        if _version_counters is not None and final_namespace in _version_slots:
+            _version_counters[_version_slots[final_namespace]] += 1
 
 
 async def clear_all_update_flags(namespace: str, workspace: str | None = None):
@@ -1603,7 +1738,9 @@ def finalize_share_data():
         _initialized, \
         _update_flags, \
         _async_locks, \
-        _default_workspace
+        _default_workspace, \
+        _version_counters, \
+        _version_slots
 
     # Check if already initialized
     if not _initialized:
@@ -1667,6 +1804,8 @@ def finalize_share_data():
     _update_flags = None
     _async_locks = None
     _default_workspace = None
+    _version_counters = None
+    _version_slots = None
 
     direct_log(f"Process {os.getpid()} storage data finalization complete")
 
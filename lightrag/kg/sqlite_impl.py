@@ -0,0 +1,1449 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Callable, Union, final
+
+import numpy as np
+
+from lightrag.base import (
+    BaseKVStorage,
+    BaseVectorStorage,
+    BaseGraphStorage,
+    DocProcessingStatus,
+    DocStatus,
+    DocStatusStorage,
+)
+from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
+from lightrag.utils import (
+    logger,
+    compute_mdhash_id,
+    get_env_value,
+    SanitizingJSONEncoder,
+)
+from lightrag.exceptions import StorageNotInitializedError
+
+from dotenv import load_dotenv
+
+# use the .env that is inside the current folder
+# allows to use different .env file for each lightrag instance
+# the OS environment variables take precedence over the .env file
+load_dotenv(dotenv_path=".env", override=False)
+
+# Seconds a connection waits for a write lock held by another worker
+SQLITE_BUSY_TIMEOUT = get_env_value("SQLITE_BUSY_TIMEOUT", 30, int)
+# Keep IN (...) lists well below SQLITE_MAX_VARIABLE_NUMBER of old builds
+_SQL_BATCH_SIZE = 500
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to JSON text that sqlite3 can bind (drops unencodable surrogates)"""
+    text = json.dumps(obj, ensure_ascii=False)
+    try:
+        text.encode("utf-8")
+        return text
+    except UnicodeEncodeError:
+        return json.dumps(obj, ensure_ascii=False, cls=SanitizingJSONEncoder)
+
+
+def _batched(items: list, size: int = _SQL_BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _placeholders(n: int) -> str:
+    return ",".join("?" * n)
+
+
+class SqliteClient:
+    """A single SQLite connection in WAL mode shared by the coroutines of one process.
+
+    sqlite3 calls are blocking, so every operation runs in a worker thread and is
+    serialized by an asyncio lock. Each gunicorn worker opens its own connection
+    after fork; cross-process write safety comes from SQLite's own file locking,
+    with writes taking the lock up front via BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.db_file,
+                timeout=SQLITE_BUSY_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000}")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _run_sync(self, func: Callable, args: tuple, write: bool):
+        conn = self._connect()
+        if not write:
+            return func(conn, *args)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn, *args)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def run(self, func: Callable, *args, write: bool = False):
+        """Run ``func(conn, *args)`` in a worker thread, inside a write transaction if requested"""
+        async with self._lock:
+            return await asyncio.to_thread(self._run_sync, func, args, write)
+
+    async def fetchall(self, sql: str, params: tuple | list = ()) -> list[sqlite3.Row]:
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params: tuple | list = ()) -> sqlite3.Row | None:
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def executescript(self, script: str) -> None:
+        await self.run(lambda conn: conn.executescript(script))
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+
+def _workspace_dir(storage) -> str:
+    working_dir = storage.global_config["working_dir"]
+    if storage.workspace:
+        # Include workspace in the file path for data isolation
+        workspace_dir = os.path.join(working_dir, storage.workspace)
+    else:
+        # Default behavior when workspace is empty
+        workspace_dir = working_dir
+        storage.workspace = ""
+    os.makedirs(workspace_dir, exist_ok=True)
+    return workspace_dir
+
+
+@final
+@dataclass
+class SqliteKVStorage(BaseKVStorage):
+    def __post_init__(self):
+        workspace_dir = _workspace_dir(self)
+        self._db_file = os.path.join(workspace_dir, f"kv_store_{self.namespace}.sqlite")
+        self._client: SqliteClient | None = None
+
+    async def initialize(self):
+        """Open the database and create the table if needed"""
+        if self._client is None:
+            self._client = SqliteClient(self._db_file)
+            await self._client.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS kv (
+                    id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    create_time INTEGER NOT NULL DEFAULT 0,
+                    update_time INTEGER NOT NULL DEFAULT 0
+                );
+                """
+            )
+
+    async def finalize(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> dict[str, Any]:
+        record = json.loads(row["data"])
+        record["create_time"] = row["create_time"]
+        record["update_time"] = row["update_time"]
+        record["_id"] = row["id"]
+        return record
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        row = await self._client.fetchone(
+            "SELECT id, data, create_time, update_time FROM kv WHERE id = ?", (id,)
+        )
+        return self._row_to_record(row) if row else None
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        if not ids:
+            return []
+
+        def _fetch(conn: sqlite3.Connection):
+            rows = {}
+            for batch in _batched(list(dict.fromkeys(ids))):
+                for row in conn.execute(
+                    f"SELECT id, data, create_time, update_time FROM kv WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ):
+                    rows[row["id"]] = row
+            return rows
+
+        rows = await self._client.run(_fetch)
+        return [self._row_to_record(rows[id]) if id in rows else None for id in ids]
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        if not keys:
+            return set()
+
+        def _existing(conn: sqlite3.Connection):
+            found = set()
+            for batch in _batched(list(keys)):
+                found.update(
+                    row["id"]
+                    for row in conn.execute(
+                        f"SELECT id FROM kv WHERE id IN ({_placeholders(len(batch))})",
+                        batch,
+                    )
+                )
+            return found
+
+        return set(keys) - await self._client.run(_existing)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        if not data:
+            return
+        if self._client is None:
+            raise StorageNotInitializedError("SqliteKVStorage")
+
+        logger.debug(
+            f"[{self.workspace}] Inserting {len(data)} records to {self.namespace}"
+        )
+        current_time = int(time.time())
+        rows = []
+        for k, v in data.items():
+            # For text_chunks namespace, ensure llm_cache_list field exists
+            if self.namespace.endswith("text_chunks"):
+                if "llm_cache_list" not in v:
+                    v["llm_cache_list"] = []
+            payload = {
+                key: value
+                for key, value in v.items()
+                if key not in ("_id", "create_time", "update_time")
+            }
+            rows.append((k, _dumps(payload), current_time, current_time))
+
+        await self._client.run(
+            lambda conn: conn.executemany(
+                """INSERT INTO kv (id, data, create_time, update_time) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET data = excluded.data, update_time = excluded.update_time""",
+                rows,
+            ),
+            write=True,
+        )
+
+    async def delete(self, ids: list[str]) -> None:
+        if not ids:
+            return
+
+        def _delete(conn: sqlite3.Connection):
+            for batch in _batched(list(ids)):
+                conn.execute(
+                    f"DELETE FROM kv WHERE id IN ({_placeholders(len(batch))})", batch
+                )
+
+        await self._client.run(_delete, write=True)
+
+    async def is_empty(self) -> bool:
+        return await self._client.fetchone("SELECT 1 FROM kv LIMIT 1") is None
+
+    async def index_done_callback(self) -> None:
+        # Data is committed on every write, nothing to flush
+        pass
+
+    async def drop(self) -> dict[str, str]:
+        try:
+            await self._client.run(
+                lambda conn: conn.execute("DELETE FROM kv"), write=True
+            )
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
+
+
+@final
+@dataclass
+class SqliteDocStatusStorage(DocStatusStorage):
+    """SQLite implementation of document status storage with indexed status and pagination"""
+
+    def __post_init__(self):
+        workspace_dir = _workspace_dir(self)
+        self._db_file = os.path.join(workspace_dir, f"kv_store_{self.namespace}.sqlite")
+        self._client: SqliteClient | None = None
+
+    async def initialize(self):
+        """Open the database and create the table and indexes if needed"""
+        if self._client is None:
+            self._client = SqliteClient(self._db_file)
+            await self._client.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS doc_status (
+                    id TEXT PRIMARY KEY,
+                    status TEXT,
+                    file_path TEXT,
+                    track_id TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_doc_status_status ON doc_status(status);
+                CREATE INDEX IF NOT EXISTS idx_doc_status_file_path ON doc_status(file_path);
+                CREATE INDEX IF NOT EXISTS idx_doc_status_track_id ON doc_status(track_id);
+                CREATE INDEX IF NOT EXISTS idx_doc_status_updated_at ON doc_status(updated_at);
+                CREATE INDEX IF NOT EXISTS idx_doc_status_created_at ON doc_status(created_at);
+                """
+            )
+
+    async def finalize(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _to_doc_status(self, doc_id: str, raw: str) -> DocProcessingStatus | None:
+        try:
+            data = json.loads(raw)
+            # Remove deprecated content field if it exists
+            data.pop("content", None)
+            # If file_path is not in data, use document id as file path
+            if "file_path" not in data:
+                data["file_path"] = "no-file-path"
+            # Ensure new fields exist with default values
+            if "metadata" not in data:
+                data["metadata"] = {}
+            if "error_msg" not in data:
+                data["error_msg"] = None
+            return DocProcessingStatus(**data)
+        except (KeyError, TypeError) as e:
+            logger.error(
+                f"[{self.workspace}] Missing required field for document {doc_id}: {e}"
+            )
+            return None
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        """Return keys that are not in storage"""
+        if self._client is None:
+            raise StorageNotInitializedError("SqliteDocStatusStorage")
+        if not keys:
+            return set()
+
+        def _existing(conn: sqlite3.Connection):
+            found = set()
+            for batch in _batched(list(keys)):
+                found.update(
+                    row["id"]
+                    for row in conn.execute(
+                        f"SELECT id FROM doc_status WHERE id IN ({_placeholders(len(batch))})",
+                        batch,
+                    )
+                )
+            return found
+
+        return set(keys) - await self._client.run(_existing)
+
+    async def get_by_id(self, id: str) -> Union[dict[str, Any], None]:
+        row = await self._client.fetchone(
+            "SELECT data FROM doc_status WHERE id = ?", (id,)
+        )
+        return json.loads(row["data"]) if row else None
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        if self._client is None:
+            raise StorageNotInitializedError("SqliteDocStatusStorage")
+        if not ids:
+            return []
+
+        def _fetch(conn: sqlite3.Connection):
+            rows = {}
+            for batch in _batched(list(dict.fromkeys(ids))):
+                for row in conn.execute(
+                    f"SELECT id, data FROM doc_status WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ):
+                    rows[row["id"]] = json.loads(row["data"])
+            return rows
+
+        rows = await self._client.run(_fetch)
+        return [rows.get(id) for id in ids]
+
+    async def get_status_counts(self) -> dict[str, int]:
+        """Get counts of documents in each status"""
+        if self._client is None:
+            raise StorageNotInitializedError("SqliteDocStatusStorage")
+        counts = {status.value: 0 for status in DocStatus}
+        rows = await self._client.fetchall(
+            "SELECT status, COUNT(*) AS n FROM doc_status GROUP BY status"
+        )
+        for row in rows:
+            counts[row["status"]] = row["n"]
+        return counts
+
+    async def get_all_status_counts(self) -> dict[str, int]:
+        """Get counts of documents in each status for all documents
+
+        Returns:
+            Dictionary mapping status names to counts, including 'all' field
+        """
+        counts = await self.get_status_counts()
+        counts["all"] = sum(counts.values())
+        return counts
+
+    async def get_docs_by_status(
+        self, status: DocStatus
+    ) -> dict[str, DocProcessingStatus]:
+        """Get all documents with a specific status"""
+        rows = await self._client.fetchall(
+            "SELECT id, data FROM doc_status WHERE status = ?", (status.value,)
+        )
+        result = {}
+        for row in rows:
+            doc = self._to_doc_status(row["id"], row["data"])
+            if doc is not None:
+                result[row["id"]] = doc
+        return result
+
+    async def get_docs_by_track_id(
+        self, track_id: str
+    ) -> dict[str, DocProcessingStatus]:
+        """Get all documents with a specific track_id"""
+        rows = await self._client.fetchall(
+            "SELECT id, data FROM doc_status WHERE track_id = ?", (track_id,)
+        )
+        result = {}
+        for row in rows:
+            doc = self._to_doc_status(row["id"], row["data"])
+            if doc is not None:
+                result[row["id"]] = doc
+        return result
+
+    async def get_docs_paginated(
+        self,
+        status_filter: DocStatus | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_field: str = "updated_at",
+        sort_direction: str = "desc",
+    ) -> tuple[list[tuple[str, DocProcessingStatus]], int]:
+        """Get documents with pagination support
+
+        Args:
+            status_filter: Filter by document status, None for all statuses
+            page: Page number (1-based)
+            page_size: Number of documents per page (10-200)
+            sort_field: Field to sort by ('created_at', 'updated_at', 'id')
+            sort_direction: Sort direction ('asc' or 'desc')
+
+        Returns:
+            Tuple of (list of (doc_id, DocProcessingStatus) tuples, total_count)
+        """
+        # Validate parameters
+        if page < 1:
+            page = 1
+        if page_size < 10:
+            page_size = 10
+        elif page_size > 200:
+            page_size = 200
+
+        # Whitelist validation for sort_field to prevent SQL injection
+        if sort_field not in {"created_at", "updated_at", "id", "file_path"}:
+            sort_field = "updated_at"
+        if sort_direction.lower() not in ["asc", "desc"]:
+            sort_direction = "desc"
+
+        where_clause, params = "", []
+        if status_filter is not None:
+            where_clause = "WHERE status = ?"
+            params.append(status_filter.value)
+
+        def _page(conn: sqlite3.Connection):
+            total = conn.execute(
+                f"SELECT COUNT(*) AS n FROM doc_status {where_clause}", params
+            ).fetchone()["n"]
+            rows = conn.execute(
+                f"SELECT id, data FROM doc_status {where_clause} "
+                f"ORDER BY {sort_field} {sort_direction.upper()}, id LIMIT ? OFFSET ?",
+                [*params, page_size, (page - 1) * page_size],
+            ).fetchall()
+            return total, rows
+
+        total_count, rows = await self._client.run(_page)
+        documents = []
+        for row in rows:
+            doc = self._to_doc_status(row["id"], row["data"])
+            if doc is not None:
+                documents.append((row["id"], doc))
+        return documents, total_count
+
+    async def get_doc_by_file_path(self, file_path: str) -> Union[dict[str, Any], None]:
+        """Get document by file path
+
+        Args:
+            file_path: The file path to search for
+
+        Returns:
+            Union[dict[str, Any], None]: Document data if found, None otherwise
+            Returns the same format as get_by_ids method
+        """
+        if self._client is None:
+            raise StorageNotInitializedError("SqliteDocStatusStorage")
+        row = await self._client.fetchone(
+            "SELECT data FROM doc_status WHERE file_path = ? LIMIT 1", (file_path,)
+        )
+        return json.loads(row["data"]) if row else None
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        if not data:
+            return
+        if self._client is None:
+            raise StorageNotInitializedError("SqliteDocStatusStorage")
+
+        logger.debug(
+            f"[{self.workspace}] Inserting {len(data)} records to {self.namespace}"
+        )
+        rows = []
+        for doc_id, doc_data in data.items():
+            # Ensure chunks_list field exists for new documents
+            if "chunks_list" not in doc_data:
+                doc_data["chunks_list"] = []
+            status = doc_data.get("status")
+            rows.append(
+                (
+                    doc_id,
+                    status.value if isinstance(status, DocStatus) else status,
+                    doc_data.get("file_path"),
+                    doc_data.get("track_id"),
+                    doc_data.get("created_at"),
+                    doc_data.get("updated_at"),
+                    _dumps(doc_data),
+                )
+            )
+
+        await self._client.run(
+            lambda conn: conn.executemany(
+                "INSERT OR REPLACE INTO doc_status (id, status, file_path, track_id, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            ),
+            write=True,
+        )
+
+    async def delete(self, doc_ids: list[str]) -> None:
+        if not doc_ids:
+            return
+
+        def _delete(conn: sqlite3.Connection):
+            for batch in _batched(list(doc_ids)):
+                conn.execute(
+                    f"DELETE FROM doc_status WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                )
+
+        await self._client.run(_delete, write=True)
+
+    async def is_empty(self) -> bool:
+        if self._client is None:
+            raise StorageNotInitializedError("SqliteDocStatusStorage")
+        return await self._client.fetchone("SELECT 1 FROM doc_status LIMIT 1") is None
+
+    async def index_done_callback(self) -> None:
+        # Data is committed on every write, nothing to flush
+        pass
+
+    async def drop(self) -> dict[str, str]:
+        try:
+            await self._client.run(
+                lambda conn: conn.execute("DELETE FROM doc_status"), write=True
+            )
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
+
+
+@final
+@dataclass
+class SqliteVectorDBStorage(BaseVectorStorage):
+    """SQLite metadata + memory-mapped float32 matrix for vectors.
+
+    Row ``i`` of ``vdb_<namespace>.f32`` holds the normalized vector of the record
+    whose ``row_idx`` is ``i``. Rows of deleted records are recycled. Queries
+    scan the mmap'd matrix with numpy; the row -> id mapping is cached and only
+    reloaded when the ``version`` counter (bumped by every write, from any
+    worker) changes.
+    """
+
+    def __post_init__(self):
+        self._validate_embedding_func()
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        workspace_dir = _workspace_dir(self)
+        self._db_file = os.path.join(workspace_dir, f"vdb_{self.namespace}.sqlite")
+        self._matrix_file = os.path.join(workspace_dir, f"vdb_{self.namespace}.f32")
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+        self._client: SqliteClient | None = None
+
+        # Per-process read cache, refreshed on version change
+        self._cached_version = -1
+        self._row_ids: np.ndarray | None = None
+        self._id_by_row: np.ndarray | None = None
+        self._matrix: np.memmap | None = None
+
+    async def initialize(self):
+        """Open the database and create tables if needed"""
+        if self._client is None:
+            self._client = SqliteClient(self._db_file)
+            await self._client.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS vectors (
+                    id TEXT PRIMARY KEY,
+                    row_idx INTEGER NOT NULL UNIQUE,
+                    data TEXT NOT NULL,
+                    created_at INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS free_rows (row_idx INTEGER PRIMARY KEY);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+                INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+                INSERT OR IGNORE INTO meta (key, value) VALUES ('next_row', 0);
+                """
+            )
+            if not os.path.exists(self._matrix_file):
+                open(self._matrix_file, "wb").close()
+
+    async def finalize(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        self._matrix = None
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection) -> None:
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+    def _write_rows(self, rows: list[int], vectors: np.ndarray) -> None:
+        with open(self._matrix_file, "r+b") as f:
+            for row, vector in zip(rows, vectors):
+                f.seek(row * self._dim * 4)
+                f.write(vector.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _refresh_cache(self) -> None:
+        """Reload row mapping and remap the matrix if another write happened"""
+
+        def _load(conn: sqlite3.Connection):
+            version = conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()["value"]
+            if version == self._cached_version:
+                return version, None
+            rows = conn.execute("SELECT id, row_idx FROM vectors").fetchall()
+            return version, rows
+
+        version, rows = await self._client.run(_load)
+        if rows is None:
+            return
+
+        self._id_by_row = np.array([row["id"] for row in rows], dtype=object)
+        self._row_ids = np.fromiter(
+            (row["row_idx"] for row in rows), dtype=np.int64, count=len(rows)
+        )
+        n_rows = os.path.getsize(self._matrix_file) // (self._dim * 4)
+        self._matrix = (
+            np.memmap(
+                self._matrix_file, dtype=np.float32, mode="r", shape=(n_rows, self._dim)
+            )
+            if n_rows
+            else None
+        )
+        self._cached_version = version
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        logger.debug(
+            f"[{self.workspace}] SQLite: Inserting {len(data)} to {self.namespace}"
+        )
+        if not data:
+            return
+
+        current_time = int(time.time())
+        ids = list(data.keys())
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of the write transaction
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+        if len(embeddings) != len(ids):
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(ids)}"
+            )
+            return
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1, norms)
+        metas = [
+            _dumps({k: v for k, v in data[id].items() if k in self.meta_fields})
+            for id in ids
+        ]
+
+        def _upsert(conn: sqlite3.Connection):
+            rows = []
+            for id, meta in zip(ids, metas):
+                existing = conn.execute(
+                    "SELECT row_idx FROM vectors WHERE id = ?", (id,)
+                ).fetchone()
+                if existing is not None:
+                    row = existing["row_idx"]
+                    conn.execute(
+                        "UPDATE vectors SET data = ?, created_at = ? WHERE id = ?",
+                        (meta, current_time, id),
+                    )
+                else:
+                    free = conn.execute(
+                        "SELECT row_idx FROM free_rows LIMIT 1"
+                    ).fetchone()
+                    if free is not None:
+                        row = free["row_idx"]
+                        conn.execute("DELETE FROM free_rows WHERE row_idx = ?", (row,))
+                    else:
+                        row = conn.execute(
+                            "SELECT value FROM meta WHERE key = 'next_row'"
+                        ).fetchone()["value"]
+                        conn.execute(
+                            "UPDATE meta SET value = value + 1 WHERE key = 'next_row'"
+                        )
+                    conn.execute(
+                        "INSERT INTO vectors (id, row_idx, data, created_at) VALUES (?, ?, ?, ?)",
+                        (id, row, meta, current_time),
+                    )
+                rows.append(row)
+            # Matrix is written while the write lock is held, before commit
+            self._write_rows(rows, embeddings)
+            self._bump_version(conn)
+
+        await self._client.run(_upsert, write=True)
+
+    async def query(
+        self, query: str, top_k: int, query_embedding: list[float] = None
+    ) -> list[dict[str, Any]]:
+        # Use provided embedding or compute it
+        if query_embedding is not None:
+            embedding = query_embedding
+        else:
+            embedding = await self.embedding_func(
+                [query], _priority=5
+            )  # higher priority for query
+            embedding = embedding[0]
+
+        await self._refresh_cache()
+        if self._matrix is None or not len(self._row_ids):
+            return []
+
+        query_vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vec)
+        if norm:
+            query_vec = query_vec / norm
+        # Only rows that currently belong to a record are scored
+        in_matrix = self._row_ids < self._matrix.shape[0]
+        row_ids = self._row_ids[in_matrix]
+        scores = self._matrix[row_ids] @ query_vec
+        keep = np.nonzero(scores > self.cosine_better_than_threshold)[0]
+        if not len(keep):
+            return []
+        order = keep[np.argsort(-scores[keep])][:top_k]
+        hit_ids = self._id_by_row[in_matrix][order].tolist()
+        hit_scores = dict(zip(hit_ids, scores[order].tolist()))
+
+        records = await self.get_by_ids(hit_ids)
+        results = []
+        for hit_id, record in zip(hit_ids, records):
+            if record is None:
+                continue
+            record["distance"] = hit_scores[hit_id]
+            results.append(record)
+        return results
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        result = await self.get_by_ids([id])
+        return result[0] if result else None
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        if not ids:
+            return []
+
+        def _fetch(conn: sqlite3.Connection):
+            rows = {}
+            for batch in _batched(list(dict.fromkeys(ids))):
+                for row in conn.execute(
+                    f"SELECT id, data, created_at FROM vectors WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ):
+                    rows[row["id"]] = row
+            return rows
+
+        rows = await self._client.run(_fetch)
+        results = []
+        for id in ids:
+            row = rows.get(id)
+            if row is None:
+                results.append(None)
+                continue
+            results.append(
+                {
+                    **json.loads(row["data"]),
+                    "id": row["id"],
+                    "created_at": row["created_at"],
+                }
+            )
+        return results
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        if not ids:
+            return {}
+
+        def _fetch(conn: sqlite3.Connection):
+            found = {}
+            for batch in _batched(list(dict.fromkeys(ids))):
+                for row in conn.execute(
+                    f"SELECT id, row_idx FROM vectors WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ):
+                    found[row["id"]] = row["row_idx"]
+            return found
+
+        rows = await self._client.run(_fetch)
+        vectors = {}
+        with open(self._matrix_file, "rb") as f:
+            for id, row in rows.items():
+                f.seek(row * self._dim * 4)
+                buf = f.read(self._dim * 4)
+                if len(buf) == self._dim * 4:
+                    vectors[id] = np.frombuffer(buf, dtype=np.float32).tolist()
+        return vectors
+
+    def _delete_where(self, conn: sqlite3.Connection, where: str, params) -> int:
+        rows = conn.execute(
+            f"SELECT row_idx FROM vectors WHERE {where}", params
+        ).fetchall()
+        if not rows:
+            return 0
+        conn.executemany(
+            "INSERT OR IGNORE INTO free_rows (row_idx) VALUES (?)",
+            [(row["row_idx"],) for row in rows],
+        )
+        conn.execute(f"DELETE FROM vectors WHERE {where}", params)
+        self._bump_version(conn)
+        return len(rows)
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        if not ids:
+            return
+
+        def _delete(conn: sqlite3.Connection):
+            deleted = 0
+            for batch in _batched(list(ids)):
+                deleted += self._delete_where(
+                    conn, f"id IN ({_placeholders(len(batch))})", batch
+                )
+            return deleted
+
+        try:
+            deleted_count = await self._client.run(_delete, write=True)
+            logger.debug(
+                f"[{self.workspace}] Successfully deleted {deleted_count} vectors from {self.namespace}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error while deleting vectors from {self.namespace}: {e}"
+            )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        try:
+            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+            await self._client.run(
+                lambda conn: self._delete_where(conn, "id = ?", (entity_id,)),
+                write=True,
+            )
+            logger.debug(f"[{self.workspace}] Deleted entity {entity_name}")
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error deleting entity {entity_name}: {e}")
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        try:
+            deleted = await self._client.run(
+                lambda conn: self._delete_where(
+                    conn,
+                    "json_extract(data, '$.src_id') = ? OR json_extract(data, '$.tgt_id') = ?",
+                    (entity_name, entity_name),
+                ),
+                write=True,
+            )
+            logger.debug(
+                f"[{self.workspace}] Deleted {deleted} relations for {entity_name}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error deleting relations for {entity_name}: {e}"
+            )
+
+    async def index_done_callback(self) -> None:
+        # Data is committed on every write, nothing to flush
+        pass
+
+    async def drop(self) -> dict[str, str]:
+        def _drop(conn: sqlite3.Connection):
+            conn.execute("DELETE FROM vectors")
+            conn.execute("DELETE FROM free_rows")
+            conn.execute("UPDATE meta SET value = 0 WHERE key = 'next_row'")
+            open(self._matrix_file, "wb").close()
+            self._bump_version(conn)
+
+        try:
+            await self._client.run(_drop, write=True)
+            self._matrix = None
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
+
+
+@final
+@dataclass
+class SqliteGraphStorage(BaseGraphStorage):
+    """Undirected property graph stored as node and adjacency tables.
+
+    Every edge is stored once with ``src <= tgt`` and indexed on both endpoints,
+    so lookups in either direction hit an index.
+    """
+
+    def __post_init__(self):
+        workspace_dir = _workspace_dir(self)
+        self._db_file = os.path.join(workspace_dir, f"graph_{self.namespace}.sqlite")
+        self._client: SqliteClient | None = None
+
+    async def initialize(self):
+        """Open the database and create tables and indexes if needed"""
+        if self._client is None:
+            self._client = SqliteClient(self._db_file)
+            await self._client.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS nodes (
+                    id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS edges (
+                    src TEXT NOT NULL,
+                    tgt TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (src, tgt)
+                );
+                CREATE INDEX IF NOT EXISTS idx_edges_tgt ON edges(tgt);
+                """
+            )
+
+    async def finalize(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    @staticmethod
+    def _edge_key(source: str, target: str) -> tuple[str, str]:
+        return (source, target) if source <= target else (target, source)
+
+    @staticmethod
+    def _degrees(conn: sqlite3.Connection, node_ids: list[str]) -> dict[str, int]:
+        degrees = dict.fromkeys(node_ids, 0)
+        for batch in _batched(list(degrees)):
+            marks = _placeholders(len(batch))
+            for row in conn.execute(
+                f"""SELECT node, COUNT(*) AS n FROM (
+                        SELECT src AS node FROM edges WHERE src IN ({marks})
+                        UNION ALL
+                        SELECT tgt AS node FROM edges WHERE tgt IN ({marks}) AND src != tgt
+                    ) GROUP BY node""",
+                [*batch, *batch],
+            ):
+                degrees[row["node"]] = row["n"]
+        return degrees
+
+    @staticmethod
+    def _neighbors(
+        conn: sqlite3.Connection, node_ids: list[str]
+    ) -> dict[str, list[str]]:
+        neighbors: dict[str, list[str]] = {node_id: [] for node_id in node_ids}
+        for batch in _batched(list(neighbors)):
+            marks = _placeholders(len(batch))
+            for row in conn.execute(
+                f"""SELECT src, tgt FROM edges WHERE src IN ({marks})
+                    UNION
+                    SELECT src, tgt FROM edges WHERE tgt IN ({marks})""",
+                [*batch, *batch],
+            ):
+                if row["src"] in neighbors:
+                    neighbors[row["src"]].append(row["tgt"])
+                if row["tgt"] in neighbors and row["tgt"] != row["src"]:
+                    neighbors[row["tgt"]].append(row["src"])
+        return neighbors
+
+    async def has_node(self, node_id: str) -> bool:
+        row = await self._client.fetchone(
+            "SELECT 1 FROM nodes WHERE id = ?", (node_id,)
+        )
+        return row is not None
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        row = await self._client.fetchone(
+            "SELECT 1 FROM edges WHERE src = ? AND tgt = ?",
+            self._edge_key(source_node_id, target_node_id),
+        )
+        return row is not None
+
+    async def node_degree(self, node_id: str) -> int:
+        degrees = await self._client.run(self._degrees, [node_id])
+        return degrees[node_id]
+
+    async def edge_degree(self, src_id: str, tgt_id: str) -> int:
+        degrees = await self._client.run(self._degrees, [src_id, tgt_id])
+        return degrees[src_id] + degrees[tgt_id]
+
+    async def get_node(self, node_id: str) -> dict[str, str] | None:
+        row = await self._client.fetchone(
+            "SELECT data FROM nodes WHERE id = ?", (node_id,)
+        )
+        return json.loads(row["data"]) if row else None
+
+    async def get_edge(
+        self, source_node_id: str, target_node_id: str
+    ) -> dict[str, str] | None:
+        row = await self._client.fetchone(
+            "SELECT data FROM edges WHERE src = ? AND tgt = ?",
+            self._edge_key(source_node_id, target_node_id),
+        )
+        return json.loads(row["data"]) if row else None
+
+    async def get_node_edges(self, source_node_id: str) -> list[tuple[str, str]] | None:
+        def _fetch(conn: sqlite3.Connection):
+            if (
+                conn.execute(
+                    "SELECT 1 FROM nodes WHERE id = ?", (source_node_id,)
+                ).fetchone()
+                is None
+            ):
+                return None
+            return self._neighbors(conn, [source_node_id])[source_node_id]
+
+        neighbors = await self._client.run(_fetch)
+        if neighbors is None:
+            return None
+        return [(source_node_id, neighbor) for neighbor in neighbors]
+
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        def _fetch(conn: sqlite3.Connection):
+            result = {}
+            for batch in _batched(list(dict.fromkeys(node_ids))):
+                for row in conn.execute(
+                    f"SELECT id, data FROM nodes WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ):
+                    result[row["id"]] = json.loads(row["data"])
+            return result
+
+        return await self._client.run(_fetch)
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        return await self._client.run(self._degrees, node_ids)
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        node_ids = list({node for pair in edge_pairs for node in pair})
+        degrees = await self._client.run(self._degrees, node_ids)
+        return {(src, tgt): degrees[src] + degrees[tgt] for src, tgt in edge_pairs}
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        def _fetch(conn: sqlite3.Connection):
+            result = {}
+            for pair in pairs:
+                row = conn.execute(
+                    "SELECT data FROM edges WHERE src = ? AND tgt = ?",
+                    self._edge_key(pair["src"], pair["tgt"]),
+                ).fetchone()
+                if row is not None:
+                    result[(pair["src"], pair["tgt"])] = json.loads(row["data"])
+            return result
+
+        return await self._client.run(_fetch)
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        neighbors = await self._client.run(self._neighbors, node_ids)
+        return {
+            node_id: [(node_id, neighbor) for neighbor in neighbors[node_id]]
+            for node_id in node_ids
+        }
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        """Insert a node or merge properties into an existing one (committed immediately)"""
+        await self._client.run(
+            lambda conn: conn.execute(
+                """INSERT INTO nodes (id, data) VALUES (?, ?)
+                   ON CONFLICT(id) DO UPDATE SET data = json_patch(nodes.data, excluded.data)""",
+                (node_id, _dumps(node_data)),
+            ),
+            write=True,
+        )
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        """Insert an edge or merge properties into an existing one (committed immediately)
+
+        Missing endpoint nodes are created without properties, like networkx does.
+        """
+        src, tgt = self._edge_key(source_node_id, target_node_id)
+
+        def _upsert(conn: sqlite3.Connection):
+            conn.executemany(
+                "INSERT OR IGNORE INTO nodes (id, data) VALUES (?, '{}')",
+                [(src,), (tgt,)],
+            )
+            conn.execute(
+                """INSERT INTO edges (src, tgt, data) VALUES (?, ?, ?)
+                   ON CONFLICT(src, tgt) DO UPDATE SET data = json_patch(edges.data, excluded.data)""",
+                (src, tgt, _dumps(edge_data)),
+            )
+
+        await self._client.run(_upsert, write=True)
+
+    async def delete_node(self, node_id: str) -> None:
+        def _delete(conn: sqlite3.Connection):
+            deleted = conn.execute(
+                "DELETE FROM nodes WHERE id = ?", (node_id,)
+            ).rowcount
+            conn.execute(
+                "DELETE FROM edges WHERE src = ? OR tgt = ?", (node_id, node_id)
+            )
+            return deleted
+
+        if await self._client.run(_delete, write=True):
+            logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
+        else:
+            logger.warning(
+                f"[{self.workspace}] Node {node_id} not found in the graph for deletion"
+            )
+
+    async def remove_nodes(self, nodes: list[str]):
+        """Delete multiple nodes and their edges
+
+        Args:
+            nodes: List of node IDs to be deleted
+        """
+        if not nodes:
+            return
+
+        def _delete(conn: sqlite3.Connection):
+            for batch in _batched(list(nodes)):
+                marks = _placeholders(len(batch))
+                conn.execute(f"DELETE FROM nodes WHERE id IN ({marks})", batch)
+                conn.execute(
+                    f"DELETE FROM edges WHERE src IN ({marks}) OR tgt IN ({marks})",
+                    [*batch, *batch],
+                )
+
+        await self._client.run(_delete, write=True)
+
+    async def remove_edges(self, edges: list[tuple[str, str]]):
+        """Delete multiple edges
+
+        Args:
+            edges: List of edges to be deleted, each edge is a (source, target) tuple
+        """
+        if not edges:
+            return
+        keys = [self._edge_key(source, target) for source, target in edges]
+        await self._client.run(
+            lambda conn: conn.executemany(
+                "DELETE FROM edges WHERE src = ? AND tgt = ?", keys
+            ),
+            write=True,
+        )
+
+    async def get_all_labels(self) -> list[str]:
+        """
+        Get all node labels in the graph
+        Returns:
+            [label1, label2, ...]  # Alphabetically sorted label list
+        """
+        rows = await self._client.fetchall("SELECT id FROM nodes ORDER BY id")
+        return [row["id"] for row in rows]
+
+    async def get_popular_labels(self, limit: int = 300) -> list[str]:
+        """
+        Get popular labels by node degree (most connected entities)
+
+        Args:
+            limit: Maximum number of labels to return
+
+        Returns:
+            List of labels sorted by degree (highest first)
+        """
+        rows = await self._client.fetchall(
+            """SELECT n.id AS id, COUNT(e.node) AS degree FROM nodes n
+               LEFT JOIN (
+                   SELECT src AS node FROM edges
+                   UNION ALL
+                   SELECT tgt AS node FROM edges WHERE src != tgt
+               ) e ON e.node = n.id
+               GROUP BY n.id ORDER BY degree DESC, n.id LIMIT ?""",
+            (limit,),
+        )
+        popular_labels = [row["id"] for row in rows]
+        logger.debug(
+            f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
+        )
+        return popular_labels
+
+    async def search_labels(self, query: str, limit: int = 50) -> list[str]:
+        """
+        Search labels with fuzzy matching
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+
+        Returns:
+            List of matching labels sorted by relevance
+        """
+        query_lower = query.lower().strip()
+        if not query_lower:
+            return []
+
+        escaped = re.sub(r"([\\%_])", r"\\\1", query_lower)
+        rows = await self._client.fetchall(
+            "SELECT id FROM nodes WHERE lower(id) LIKE ? ESCAPE '\\'",
+            (f"%{escaped}%",),
+        )
+
+        # Same relevance scoring as NetworkXStorage
+        matches = []
+        for row in rows:
+            node_str = row["id"]
+            node_lower = node_str.lower()
+            if query_lower not in node_lower:
+                continue
+            if node_lower == query_lower:
+                score = 1000
+            elif node_lower.startswith(query_lower):
+                score = 500
+            else:
+                score = 100 - len(node_str)
+                if f" {query_lower}" in node_lower or f"_{query_lower}" in node_lower:
+                    score += 50
+            matches.append((node_str, score))
+
+        matches.sort(key=lambda x: (-x[1], x[0]))
+        search_results = [match[0] for match in matches[:limit]]
+        logger.debug(
+            f"[{self.workspace}] Search query '{query}' returned {len(search_results)} results (limit: {limit})"
+        )
+        return search_results
+
+    async def get_knowledge_graph(
+        self,
+        node_label: str,
+        max_depth: int = 3,
+        max_nodes: int = None,
+    ) -> KnowledgeGraph:
+        """
+        Retrieve a connected subgraph of nodes where the label includes the specified `node_label`.
+
+        Args:
+            node_label: Label of the starting node，* means all nodes
+            max_depth: Maximum depth of the subgraph, Defaults to 3
+            max_nodes: Maxiumu nodes to return by BFS, Defaults to 1000
+
+        Returns:
+            KnowledgeGraph object containing nodes and edges, with an is_truncated flag
+            indicating whether the graph was truncated due to max_nodes limit
+        """
+        if max_nodes is None:
+            max_nodes = self.global_config.get("max_graph_nodes", 1000)
+        else:
+            max_nodes = min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
+
+        result = KnowledgeGraph()
+
+        if node_label == "*":
+            total = (await self._client.fetchone("SELECT COUNT(*) AS n FROM nodes"))[
+                "n"
+            ]
+            if total > max_nodes:
+                result.is_truncated = True
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: {total} nodes found, limited to {max_nodes}"
+                )
+            selected = await self.get_popular_labels(max_nodes)
+        else:
+            if not await self.has_node(node_label):
+                logger.warning(
+                    f"[{self.workspace}] Node {node_label} not found in the graph"
+                )
+                return KnowledgeGraph()
+
+            # BFS one level at a time, highest degree first within a level
+            selected = []
+            visited = {node_label}
+            frontier = [node_label]
+            depth = 0
+            has_unexplored_neighbors = False
+            while frontier and len(selected) < max_nodes:
+                degrees = await self.node_degrees_batch(frontier)
+                frontier.sort(key=lambda n: degrees.get(n, 0), reverse=True)
+                room = max_nodes - len(selected)
+                if len(frontier) > room:
+                    selected.extend(frontier[:room])
+                    result.is_truncated = True
+                    break
+                selected.extend(frontier)
+
+                neighbors = await self._client.run(self._neighbors, frontier)
+                next_frontier = []
+                for node in frontier:
+                    for neighbor in neighbors[node]:
+                        if neighbor not in visited:
+                            if depth >= max_depth:
+                                has_unexplored_neighbors = True
+                                continue
+                            visited.add(neighbor)
+                            next_frontier.append(neighbor)
+                if depth >= max_depth:
+                    break
+                frontier = next_frontier
+                depth += 1
+
+            if result.is_truncated:
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
+                )
+            elif has_unexplored_neighbors:
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: found {len(selected)} nodes within max_depth {max_depth}"
+                )
+
+        node_set = set(selected)
+        nodes = await self.get_nodes_batch(selected)
+
+        def _edges_within(conn: sqlite3.Connection):
+            edges = []
+            for batch in _batched(selected):
+                for row in conn.execute(
+                    f"SELECT src, tgt, data FROM edges WHERE src IN ({_placeholders(len(batch))})",
+                    batch,
+                ):
+                    if row["tgt"] in node_set:
+                        edges.append(row)
+            return edges
+
+        for node_id in selected:
+            result.nodes.append(
+                KnowledgeGraphNode(
+                    id=node_id, labels=[node_id], properties=nodes.get(node_id, {})
+                )
+            )
+        for row in await self._client.run(_edges_within):
+            result.edges.append(
+                KnowledgeGraphEdge(
+                    id=f"{row['src']}-{row['tgt']}",
+                    type="DIRECTED",
+                    source=row["src"],
+                    target=row["tgt"],
+                    properties=json.loads(row["data"]),
+                )
+            )
+
+        logger.info(
+            f"[{self.workspace}] Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}"
+        )
+        return result
+
+    async def get_all_nodes(self) -> list[dict]:
+        """Get all nodes in the graph.
+
+        Returns:
+            A list of all nodes, where each node is a dictionary of its properties
+        """
+        rows = await self._client.fetchall("SELECT id, data FROM nodes")
+        return [{**json.loads(row["data"]), "id": row["id"]} for row in rows]
+
+    async def get_all_edges(self) -> list[dict]:
+        """Get all edges in the graph.
+
+        Returns:
+            A list of all edges, where each edge is a dictionary of its properties
+        """
+        rows = await self._client.fetchall("SELECT src, tgt, data FROM edges")
+        return [
+            {**json.loads(row["data"]), "source": row["src"], "target": row["tgt"]}
+            for row in rows
+        ]
+
+    async def index_done_callback(self) -> None:
+        # Data is committed on every write, nothing to flush
+        pass
+
+    async def drop(self) -> dict[str, str]:
+        def _drop(conn: sqlite3.Connection):
+            conn.execute("DELETE FROM edges")
+            conn.execute("DELETE FROM nodes")
+
+        try:
+            await self._client.run(_drop, write=True)
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop graph {self._db_file}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error dropping graph {self._db_file}: {e}"
+            )
+            return {"status": "error", "message": str(e)}
@@ -4,6 +4,8 @@ import traceback
 import asyncio
 import configparser
 import inspect
+import itertools
+import json
 import os
 import time
 import warnings
@@ -15,6 +17,7 @@ from typing import (
     AsyncIterator,
     Awaitable,
     Callable,
+    Iterable,
     Iterator,
     cast,
     final,
@@ -43,6 +46,9 @@ from lightrag.constants import (
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_MAX_PARALLEL_MERGE,
+    DEFAULT_PIPELINE_STAGE_QUEUE_SIZE,
+    DEFAULT_CHECKPOINT_CHUNKS,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
     DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
@@ -53,6 +59,17 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
+    DEFAULT_READ_CACHE_MAX_ENTRIES,
+    DEFAULT_READ_CACHE_TTL,
+    DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    DEFAULT_QUERY_CONTEXT_CACHE_MAX_ENTRIES,
+    DEFAULT_GRAPH_BULK_BUFFER_SIZE,
+    DEFAULT_GRAPH_BULK_BATCH_SIZE,
+    DEFAULT_BATCH_POLL_INTERVAL,
+    DEFAULT_INSERT_FLUSH_DOCS,
+    DEFAULT_STREAM_WINDOW_CHUNKS,
+    DEFAULT_CHUNKING_OFFLOAD_THRESHOLD,
 )
 from lightrag.utils import get_env_value, extract_all_dates
 
@@ -81,18 +98,21 @@ from lightrag.base import (
     StorageNameSpace,
     StoragesStatus,
     DeletionResult,
+    DocumentUpdateResult,
     OllamaServerInfos,
     QueryResult,
 )
 from lightrag.namespace import NameSpace
 from lightrag.operate import (
     chunking_by_token_size,
+    chunking_by_token_size_stream,
     extract_entities,
     merge_nodes_and_edges,
     kg_query,
     naive_query,
     rebuild_knowledge_from_chunks,
 )
+from lightrag.query_cache import bump_kg_version
 from lightrag.constants import GRAPH_FIELD_SEP
 from lightrag.utils import (
     Tokenizer,
@@ -102,6 +122,8 @@ from lightrag.utils import (
     compute_mdhash_id,
     lazy_external_import,
     priority_limit_async_func_call,
+    PipelineStage,
+    compute_token_count_fields,
     get_content_summary,
     sanitize_text_for_encoding,
     check_storage_env_vars,
@@ -292,15 +314,24 @@ class LightRAG:
 
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
-            "enabled": False,
-            "similarity_threshold": 0.95,
+            "enabled": get_env_value("SEMANTIC_CACHE_ENABLED", False, bool),
+            "similarity_threshold": get_env_value(
+                "SEMANTIC_CACHE_SIMILARITY_THRESHOLD",
+                DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+                float,
+            ),
             "use_llm_check": False,
+            "max_entries": get_env_value(
+                "SEMANTIC_CACHE_MAX_ENTRIES", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES, int
+            ),
         }
     )
-    """Configuration for embedding cache.
-    - enabled: If True, enables caching to avoid redundant computations.
-    - similarity_threshold: Minimum similarity score to use cached embeddings.
+    """Configuration for the semantic query-answer cache.
+    - enabled: If True, paraphrased queries reuse answers of similar cached queries.
+    - similarity_threshold: Minimum cosine similarity between query embeddings to use a cached answer.
     - use_llm_check: If True, validates cached embeddings using an LLM.
+    - max_entries: Cached answers kept per process (least recently used are evicted).
+    Cached answers are dropped when documents are inserted or deleted, or the graph is edited.
     """
 
     default_embedding_timeout: int = field(
@@ -345,6 +376,32 @@ class LightRAG:
         default=int(os.getenv("LLM_TIMEOUT", DEFAULT_LLM_TIMEOUT))
     )
 
+    adaptive_concurrency: bool = field(
+        default=get_env_value("ADAPTIVE_CONCURRENCY", False, bool)
+    )
+    """Adjust LLM and embedding concurrency with an AIMD controller: grow while calls succeed,
+    back off on 429/overload errors (and rising latency for embeddings). MAX_ASYNC / EMBEDDING_FUNC_MAX_ASYNC become the ceilings."""
+
+    llm_requests_per_minute: int = field(
+        default=get_env_value("LLM_REQUESTS_PER_MINUTE", 0, int)
+    )
+    """Requests per minute allowed to the LLM provider (token bucket). 0 means unlimited."""
+
+    llm_tokens_per_minute: int = field(
+        default=get_env_value("LLM_TOKENS_PER_MINUTE", 0, int)
+    )
+    """Estimated prompt tokens per minute allowed to the LLM provider (token bucket). 0 means unlimited."""
+
+    embedding_requests_per_minute: int = field(
+        default=get_env_value("EMBEDDING_REQUESTS_PER_MINUTE", 0, int)
+    )
+    """Requests per minute allowed to the embedding provider (token bucket). 0 means unlimited."""
+
+    embedding_tokens_per_minute: int = field(
+        default=get_env_value("EMBEDDING_TOKENS_PER_MINUTE", 0, int)
+    )
+    """Estimated input tokens per minute allowed to the embedding provider (token bucket). 0 means unlimited."""
+
     # Rerank Configuration
     # ---
 
@@ -368,6 +425,81 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    read_cache_max_entries: int = field(
+        default=get_env_value(
+            "READ_CACHE_MAX_ENTRIES", DEFAULT_READ_CACHE_MAX_ENTRIES, int
+        )
+    )
+    """Entries per tier of the in-process read cache over text chunks and graph records. 0 disables it."""
+
+    read_cache_ttl: float = field(
+        default=get_env_value("READ_CACHE_TTL", DEFAULT_READ_CACHE_TTL, float)
+    )
+    """Seconds a read cache entry stays valid; bounds staleness for writes made by other processes."""
+
+    query_context_cache_max_entries: int = field(
+        default=get_env_value(
+            "QUERY_CONTEXT_CACHE_MAX_ENTRIES",
+            DEFAULT_QUERY_CONTEXT_CACHE_MAX_ENTRIES,
+            int,
+        )
+    )
+    """Built query contexts kept per process, reused by requests with the same keywords and retrieval parameters. 0 disables it."""
+
+    graph_bulk_load: bool = field(default=get_env_value("GRAPH_BULK_LOAD", False, bool))
+    """Buffer graph upserts across documents and write them in batches (for initial imports).
+    Buffered graph data becomes durable when the buffer fills up or the processing run ends."""
+
+    graph_bulk_buffer_size: int = field(
+        default=get_env_value(
+            "GRAPH_BULK_BUFFER_SIZE", DEFAULT_GRAPH_BULK_BUFFER_SIZE, int
+        )
+    )
+    """Buffered node and edge upserts that trigger a flush in graph bulk-load mode."""
+
+    insert_flush_docs: int = field(
+        default=get_env_value("INSERT_FLUSH_DOCS", DEFAULT_INSERT_FLUSH_DOCS, int)
+    )
+    """Group commit: persist all storages once this many documents are processed (1 = after every document)."""
+
+    insert_flush_interval: float = field(
+        default=get_env_value("INSERT_FLUSH_INTERVAL", 0, float)
+    )
+    """Group commit: also persist once this many seconds passed since the last flush. 0 disables the time trigger.
+    The interval is not a timer: it is checked each time a document finishes processing.
+    Pending documents are persisted when the pipeline goes idle, or at the start of the next run if that flush failed. A document stays PROCESSING until its flush,
+    so after a crash it is reset to PENDING and processed again."""
+
+    chunking_offload_threshold: int = field(
+        default=get_env_value(
+            "CHUNKING_OFFLOAD_THRESHOLD", DEFAULT_CHUNKING_OFFLOAD_THRESHOLD, int
+        )
+    )
+    """Documents of at least this many characters are chunked in a worker thread instead of on the event loop
+    when chunking_func is synchronous. 0 always chunks on the event loop."""
+
+    stream_window_chunks: int = field(
+        default=get_env_value("STREAM_WINDOW_CHUNKS", DEFAULT_STREAM_WINDOW_CHUNKS, int)
+    )
+    """Streaming ingestion (ainsert_stream): chunks stored and extracted per window. Memory grows with the window,
+    not with the document."""
+
+    extraction_batch_backend: Any = field(default=None)
+    """BatchBackend (lightrag.batch_extraction) for offline entity extraction. When set, each processing run first answers
+    all extraction prompts through batch jobs, checkpointed in the LLM cache. Requires enable_llm_cache_for_entity_extract."""
+
+    batch_poll_interval: float = field(
+        default=get_env_value("BATCH_POLL_INTERVAL", DEFAULT_BATCH_POLL_INTERVAL, float)
+    )
+    """Seconds between status polls of a submitted extraction batch job."""
+
+    graph_bulk_batch_size: int = field(
+        default=get_env_value(
+            "GRAPH_BULK_BATCH_SIZE", DEFAULT_GRAPH_BULK_BATCH_SIZE, int
+        )
+    )
+    """Rows per bulk_write (MongoDB) or UNWIND (Neo4j) round-trip when writing graph batches."""
+
     # Extensions
     # ---
 
@@ -376,6 +508,24 @@ class LightRAG:
     )
     """Maximum number of parallel insert operations."""
 
+    max_parallel_merge: int = field(
+        default=get_env_value("MAX_PARALLEL_MERGE", DEFAULT_MAX_PARALLEL_MERGE, int)
+    )
+    """Maximum number of documents merged into the graph at once. Merging does not hold one of the max_parallel_insert extraction slots."""
+
+    pipeline_stage_queue_size: int = field(
+        default=get_env_value(
+            "PIPELINE_STAGE_QUEUE_SIZE", DEFAULT_PIPELINE_STAGE_QUEUE_SIZE, int
+        )
+    )
+    """Documents that may wait for the extract, merge or persist stage before the stage feeding it is held back (0 is unbounded)."""
+
+    checkpoint_chunks: int = field(
+        default=get_env_value("CHECKPOINT_CHUNKS", DEFAULT_CHECKPOINT_CHUNKS, int)
+    )
+    """Chunks of a document extracted and merged per window. Progress is checkpointed in the doc status between windows,
+    so an interrupted document resumes at its first unmerged chunk. 0 processes documents in one window without checkpoints."""
+
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
     )
@@ -546,6 +696,9 @@ class LightRAG:
                 self.embedding_func_max_async,
                 llm_timeout=self.default_embedding_timeout,
                 queue_name="Embedding func",
+                adaptive=self.adaptive_concurrency,
+                requests_per_minute=self.embedding_requests_per_minute,
+                tokens_per_minute=self.embedding_tokens_per_minute,
             )(self.embedding_func.func)
             # Use dataclasses.replace() to create a new instance, leaving the original unchanged
             self.embedding_func = replace(self.embedding_func, func=wrapped_func)
@@ -622,6 +775,61 @@ class LightRAG:
             embedding_func=self.embedding_func,
         )
 
+        # Group commit: PROCESSED status records waiting for the next storage flush
+        self._uncommitted_docs: dict[str, dict[str, Any]] = {}
+        self._commit_lock = asyncio.Lock()
+        self._last_commit_time = time.monotonic()
+        self._commit_stats = {
+            "flushes": 0,
+            "documents": 0,
+            "total_seconds": 0.0,
+            "last_documents": 0,
+            "last_seconds": 0.0,
+        }
+
+        self._graph_write_buffer = None
+        if self.graph_bulk_load:
+            from lightrag.kg.graph_write_buffer import BufferedGraphStorage
+
+            self._graph_write_buffer = BufferedGraphStorage(
+                self.chunk_entity_relation_graph, self.graph_bulk_buffer_size
+            )
+            self.chunk_entity_relation_graph = self._graph_write_buffer
+
+        if self.read_cache_max_entries > 0:
+            from lightrag.kg.read_cache import CachedGraphStorage, CachedKVStorage
+
+            # Hot query-path records; writes go through the wrappers and invalidate them
+            self.text_chunks = CachedKVStorage(
+                self.text_chunks, self.read_cache_max_entries, self.read_cache_ttl
+            )
+            self.chunk_entity_relation_graph = CachedGraphStorage(
+                self.chunk_entity_relation_graph,
+                self.read_cache_max_entries,
+                self.read_cache_ttl,
+            )
+
+        self._query_context_cache = None
+        if self.query_context_cache_max_entries > 0:
+            from lightrag.query_cache import QueryContextCache
+
+            self._query_context_cache = QueryContextCache(
+                self.query_context_cache_max_entries
+            )
+
+        self._semantic_query_cache = None
+        if self.embedding_cache_config.get("enabled"):
+            from lightrag.query_cache import SemanticQueryCache
+
+            self._semantic_query_cache = SemanticQueryCache(
+                self.embedding_cache_config.get(
+                    "similarity_threshold", DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD
+                ),
+                self.embedding_cache_config.get(
+                    "max_entries", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES
+                ),
+            )
+
         self.entities_vdb: BaseVectorStorage = self.vector_db_storage_cls(  # type: ignore
             namespace=NameSpace.VECTOR_STORE_ENTITIES,
             workspace=self.workspace,
@@ -638,7 +846,13 @@ class LightRAG:
             namespace=NameSpace.VECTOR_STORE_CHUNKS,
             workspace=self.workspace,
             embedding_func=self.embedding_func,
-            meta_fields={"full_doc_id", "content", "file_path"},
+            meta_fields={
+                "full_doc_id",
+                "content",
+                "file_path",
+                "token_count",
+                "token_count_stamp",
+            },
         )
 
         # Initialize document status storage
@@ -653,10 +867,16 @@ class LightRAG:
         hashing_kv = self.llm_response_cache
 
         # Get timeout from LLM model kwargs for dynamic timeout calculation
+        # LLM latency follows prompt and output length, not provider load, so
+        # the adaptive limit only backs off on 429/overload errors
         self.llm_model_func = priority_limit_async_func_call(
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            adaptive=self.adaptive_concurrency,
+            latency_tolerance=0,
+            requests_per_minute=self.llm_requests_per_minute,
+            tokens_per_minute=self.llm_tokens_per_minute,
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -704,6 +924,12 @@ class LightRAG:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
 
+            # Keep-alive HTTP clients of the LLM/embedding bindings are shared by
+            # the instances on this loop, and closed when the last one finalizes
+            from lightrag.llm.client_pool import acquire_pooled_clients
+
+            acquire_pooled_clients()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
@@ -753,6 +979,15 @@ class LightRAG:
             else:
                 logger.debug("All storages finalized successfully")
 
+            # Close the keep-alive HTTP clients shared by the LLM/embedding bindings
+            # unless other instances on this loop still use them
+            try:
+                from lightrag.llm.client_pool import release_pooled_clients
+
+                await release_pooled_clients()
+            except Exception as e:
+                logger.error(f"Failed to close pooled HTTP clients: {e}")
+
             self._storages_status = StoragesStatus.FINALIZED
 
     async def check_and_migrate_data(self):
@@ -1056,6 +1291,40 @@ class LightRAG:
                     f"Relation chunk_tracking migration completed: {total_migrated} records persisted"
                 )
 
+    def get_read_cache_stats(self) -> dict[str, Any] | None:
+        """Hit/miss statistics of the query-path read cache, None when disabled"""
+        stats = {}
+        for name, storage in (
+            ("text_chunks", self.text_chunks),
+            ("chunk_entity_relation_graph", self.chunk_entity_relation_graph),
+        ):
+            if hasattr(type(storage), "cache_stats"):
+                stats[name] = storage.cache_stats()
+        return stats or None
+
+    def get_concurrency_stats(self) -> dict[str, Any]:
+        """Live concurrency, queue depth and throttle events of the LLM and embedding queues"""
+        stats = {}
+        for name, func in (
+            ("llm", self.llm_model_func),
+            ("embedding", getattr(self.embedding_func, "func", None)),
+        ):
+            if hasattr(func, "stats"):
+                stats[name] = func.stats()
+        return stats
+
+    def get_semantic_cache_stats(self) -> dict[str, Any] | None:
+        """Hit/miss statistics of the semantic query-answer cache, None when disabled"""
+        if self._semantic_query_cache is None:
+            return None
+        return self._semantic_query_cache.stats()
+
+    def get_context_cache_stats(self) -> dict[str, Any] | None:
+        """Hit/miss statistics of the retrieval-context cache, None when disabled"""
+        if self._query_context_cache is None:
+            return None
+        return self._query_context_cache.stats()
+
     async def get_graph_labels(self):
         text = await self.chunk_entity_relation_graph.get_all_labels()
         return text
@@ -1231,6 +1500,7 @@ class LightRAG:
                     "tokens": tokens,
                     "chunk_order_index": index,
                     "file_path": file_path,
+                    **self._chunk_token_fields(chunk_text),
                 }
 
             doc_ids = set(inserting_chunks.keys())
@@ -1252,6 +1522,8 @@ class LightRAG:
 
         finally:
             if update_storage:
+                if self._graph_write_buffer is not None:
+                    await self._graph_write_buffer.flush()
                 await self._insert_done()
 
     async def apipeline_enqueue_documents(
@@ -1581,9 +1853,12 @@ class LightRAG:
                         "updated_at": datetime.now(timezone.utc).isoformat(),
                         "file_path": getattr(status_doc, "file_path", "unknown_source"),
                         "track_id": getattr(status_doc, "track_id", ""),
-                        # Clear any error messages and processing metadata
+                        # Clear any error messages and processing metadata, but keep
+                        # the chunk checkpoint so processing resumes where it stopped
                         "error_msg": "",
-                        "metadata": {},
+                        "metadata": self._checkpoint_metadata(
+                            self._load_checkpoint(status_doc)
+                        ),
                     }
 
                     # Update the status in to_process_docs as well
@@ -1602,6 +1877,23 @@ class LightRAG:
 
         return to_process_docs
 
+    @staticmethod
+    def _load_checkpoint(status_doc: DocProcessingStatus) -> dict[str, list[str]]:
+        """Chunk ids an interrupted run of the document had extracted and merged"""
+        checkpoint = (getattr(status_doc, "metadata", None) or {}).get("checkpoint")
+        checkpoint = checkpoint or {}
+        return {
+            "extracted": list(checkpoint.get("extracted", [])),
+            "merged": list(checkpoint.get("merged", [])),
+        }
+
+    @staticmethod
+    def _checkpoint_metadata(checkpoint: dict[str, list[str]]) -> dict[str, Any]:
+        """Doc status metadata carrying the checkpoint, if any chunk made progress"""
+        if checkpoint["extracted"] or checkpoint["merged"]:
+            return {"checkpoint": checkpoint}
+        return {}
+
     async def apipeline_process_enqueue_documents(
         self,
         split_by_character: str | None = None,
@@ -1627,6 +1919,11 @@ class LightRAG:
             "pipeline_status", workspace=self.workspace
         )
 
+        # Documents of a failed final commit of the previous run are processed,
+        # only their commit is missing
+        if self._uncommitted_docs:
+            await self._group_commit(pipeline_status, pipeline_status_lock)
+
         # Check if another process is already processing the queue
         async with pipeline_status_lock:
             # Ensure only one worker is processing documents
@@ -1641,6 +1938,9 @@ class LightRAG:
                 to_process_docs.update(processing_docs)
                 to_process_docs.update(failed_docs)
                 to_process_docs.update(pending_docs)
+                # Documents still queued for the group commit are processed already
+                for doc_id in self._uncommitted_docs:
+                    to_process_docs.pop(doc_id, None)
 
                 if not to_process_docs:
                     logger.info("No documents to process")
@@ -1737,8 +2037,9 @@ class LightRAG:
 
                 # Create a counter to track the number of processed files
                 processed_count = 0
-                # Create a semaphore to limit the number of concurrent file processing
-                semaphore = asyncio.Semaphore(self.max_parallel_insert)
+                # Each stage has its own concurrency limit and a bounded queue, so a
+                # document merging its graph does not hold an extraction slot
+                stages = self._create_pipeline_stages(pipeline_status)
 
                 async def process_document(
                     doc_id: str,
@@ -1747,9 +2048,9 @@ class LightRAG:
                     split_by_character_only: bool,
                     pipeline_status: dict,
                     pipeline_status_lock: asyncio.Lock,
-                    semaphore: asyncio.Semaphore,
                 ) -> None:
-                    """Process single document"""
+                    """Process single document through the chunk, extract, merge and persist stages"""
+                    nonlocal processed_count
                     # Initialize variables at the start to prevent UnboundLocalError in error handling
                     file_path = "unknown_source"
                     current_file_number = 0
@@ -1757,13 +2058,30 @@ class LightRAG:
                     processing_start_time = int(time.time())
                     first_stage_tasks = []
                     entity_relation_task = None
+                    checkpoint = self._load_checkpoint(status_doc)
+                    chunks: dict[str, Any] = {}
+
+                    def processing_record(
+                        progress: dict[str, list[str]],
+                    ) -> dict[str, Any]:
+                        return {
+                            "status": DocStatus.PROCESSING,
+                            "chunks_count": len(chunks),
+                            "chunks_list": list(chunks.keys()),  # Save chunks list
+                            "content_summary": status_doc.content_summary,
+                            "content_length": status_doc.content_length,
+                            "created_at": status_doc.created_at,
+                            "updated_at": datetime.now(timezone.utc).isoformat(),
+                            "file_path": file_path,
+                            "track_id": status_doc.track_id,  # Preserve existing track_id
+                            "metadata": {
+                                "processing_start_time": processing_start_time,
+                                **self._checkpoint_metadata(progress),
+                            },
+                        }
 
-                    async with semaphore:
-                        nonlocal processed_count
-                        # Initialize to prevent UnboundLocalError in error handling
-                        first_stage_tasks = []
-                        entity_relation_task = None
-                        try:
+                    try:
+                        async with stages["chunk"].slot():
                             # Check for cancellation before starting document processing
                             async with pipeline_status_lock:
                                 if pipeline_status.get("cancellation_requested", False):
@@ -1799,57 +2117,42 @@ class LightRAG:
                                         pipeline_status["history_messages"][-5000:]
                                     )
 
-                            # Get document content from full_docs
-                            content_data = await self.full_docs.get_by_id(doc_id)
-                            if not content_data:
-                                raise Exception(
-                                    f"Document content not found in full_docs for doc_id: {doc_id}"
-                                )
-                            content = content_data["content"]
-
-                            # Call chunking function, supporting both sync and async implementations
-                            chunking_result = self.chunking_func(
-                                self.tokenizer,
-                                content,
+                            chunks = await self._chunk_document(
+                                doc_id,
+                                file_path,
                                 split_by_character,
                                 split_by_character_only,
-                                self.chunk_overlap_token_size,
-                                self.chunk_token_size,
                             )
 
-                            # If result is awaitable, await to get actual result
-                            if inspect.isawaitable(chunking_result):
-                                chunking_result = await chunking_result
-
-                            # Validate return type
-                            if not isinstance(chunking_result, (list, tuple)):
-                                raise TypeError(
-                                    f"chunking_func must return a list or tuple of dicts, "
-                                    f"got {type(chunking_result)}"
-                                )
-
-                            # Build chunks dictionary
-                            chunks: dict[str, Any] = {}
-                            # Use current date as fallback for documents without extractable dates
-                            current_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-
-                            for dp in chunking_result:
-                                # Extract dates from filename and chunk content with fallback
-                                date_info = extract_all_dates(file_path, dp["content"], fallback_date=current_date)
-
-                                chunk_id = compute_mdhash_id(dp["content"], prefix="chunk-")
-                                chunks[chunk_id] = {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                    "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
-                                    "relevant_dates": date_info["relevant_dates"],  # Add extracted dates
-                                    "primary_date": date_info["primary_date"],  # Add primary date
-                                }
-
                             if not chunks:
                                 logger.warning("No document chunks to process")
 
+                            # Chunks merged by an interrupted run are stored and in the
+                            # graph already, only the remaining ones are processed
+                            merged_chunk_ids = set(checkpoint["merged"]) & chunks.keys()
+                            checkpoint = {
+                                "extracted": [
+                                    c for c in checkpoint["extracted"] if c in chunks
+                                ],
+                                "merged": [c for c in chunks if c in merged_chunk_ids],
+                            }
+                            pending_chunks = {
+                                chunk_id: chunk_data
+                                for chunk_id, chunk_data in chunks.items()
+                                if chunk_id not in merged_chunk_ids
+                            }
+                            if merged_chunk_ids:
+                                log_message = (
+                                    f"Resuming d-id: {doc_id} at chunk {len(merged_chunk_ids) + 1}/{len(chunks)} "
+                                    f"({len(checkpoint['extracted']) - len(merged_chunk_ids)} more extracted earlier)"
+                                )
+                                logger.info(log_message)
+                                async with pipeline_status_lock:
+                                    pipeline_status["latest_message"] = log_message
+                                    pipeline_status["history_messages"].append(
+                                        log_message
+                                    )
+
                             # Record processing start time
                             processing_start_time = int(time.time())
 
@@ -1862,33 +2165,14 @@ class LightRAG:
                             # Stage 1: Process text chunks and docs (parallel execution)
                             doc_status_task = asyncio.create_task(
                                 self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(
-                                                chunks.keys()
-                                            ),  # Save chunks list
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time
-                                            },
-                                        }
-                                    }
+                                    {doc_id: processing_record(checkpoint)}
                                 )
                             )
                             chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
+                                self.chunks_vdb.upsert(pending_chunks)
                             )
                             text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
+                                self.text_chunks.upsert(pending_chunks)
                             )
 
                             # First stage tasks (parallel execution)
@@ -1902,20 +2186,223 @@ class LightRAG:
                             # Execute first stage tasks
                             await asyncio.gather(*first_stage_tasks)
 
+                            # Keep the chunk slot until the extract queue has room
+                            await stages["extract"].reserve()
+
+                        async with stages["extract"].slot(reserved=True):
                             # Stage 2: Process entity relation graph (after text_chunks are saved)
-                            entity_relation_task = asyncio.create_task(
-                                self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
+                            windows = self._checkpoint_windows(pending_chunks)
+                            window_results = []
+                            for window_number, window in enumerate(windows, 1):
+                                entity_relation_task = asyncio.create_task(
+                                    self._process_extract_entities(
+                                        window, pipeline_status, pipeline_status_lock
+                                    )
+                                )
+                                window_results.append(
+                                    (list(window), await entity_relation_task)
+                                )
+                                if window_number < len(windows):
+                                    # The LLM cache holds the results, a resumed run
+                                    # reads them instead of calling the LLM again
+                                    progress = {
+                                        **checkpoint,
+                                        "extracted": list(
+                                            dict.fromkeys(
+                                                checkpoint["extracted"] + list(window)
+                                            )
+                                        ),
+                                    }
+                                    await self._save_checkpoint(
+                                        doc_id,
+                                        processing_record(progress),
+                                        [self.llm_response_cache, self.text_chunks],
+                                    )
+                                    checkpoint = progress
+                            await stages["merge"].reserve()
+                        file_extraction_stage_ok = True
+
+                    except Exception as e:
+                        # Check if this is a user cancellation
+                        if isinstance(e, PipelineCancelledException):
+                            # User cancellation - log brief message only, no traceback
+                            error_msg = f"User cancelled {current_file_number}/{total_files}: {file_path}"
+                            logger.warning(error_msg)
+                            async with pipeline_status_lock:
+                                pipeline_status["latest_message"] = error_msg
+                                pipeline_status["history_messages"].append(error_msg)
+                        else:
+                            # Other exceptions - log with traceback
+                            logger.error(traceback.format_exc())
+                            error_msg = f"Failed to extract document {current_file_number}/{total_files}: {file_path}"
+                            logger.error(error_msg)
+                            async with pipeline_status_lock:
+                                pipeline_status["latest_message"] = error_msg
+                                pipeline_status["history_messages"].append(
+                                    traceback.format_exc()
+                                )
+                                pipeline_status["history_messages"].append(error_msg)
+
+                        # Cancel tasks that are not yet completed
+                        all_tasks = first_stage_tasks + (
+                            [entity_relation_task] if entity_relation_task else []
+                        )
+                        for task in all_tasks:
+                            if task and not task.done():
+                                task.cancel()
+
+                        # Persistent llm cache with error handling
+                        if self.llm_response_cache:
+                            try:
+                                await self.llm_response_cache.index_done_callback()
+                            except Exception as persist_error:
+                                logger.error(
+                                    f"Failed to persist LLM cache: {persist_error}"
+                                )
+
+                        # Record processing end time for failed case
+                        processing_end_time = int(time.time())
+
+                        # Update document status to failed
+                        await self.doc_status.upsert(
+                            {
+                                doc_id: {
+                                    "status": DocStatus.FAILED,
+                                    "error_msg": str(e),
+                                    "content_summary": status_doc.content_summary,
+                                    "content_length": status_doc.content_length,
+                                    "created_at": status_doc.created_at,
+                                    "updated_at": datetime.now(
+                                        timezone.utc
+                                    ).isoformat(),
+                                    "file_path": file_path,
+                                    "track_id": status_doc.track_id,  # Preserve existing track_id
+                                    "metadata": {
+                                        "processing_start_time": processing_start_time,
+                                        "processing_end_time": processing_end_time,
+                                        **self._checkpoint_metadata(checkpoint),
+                                    },
+                                }
+                            }
+                        )
+
+                    # Merges of different documents run concurrently, serialized per
+                    # entity and relationship by keyed locks
+                    if file_extraction_stage_ok:
+                        try:
+                            async with stages["merge"].slot(reserved=True):
+                                # Check for cancellation before merge
+                                async with pipeline_status_lock:
+                                    if pipeline_status.get(
+                                        "cancellation_requested", False
+                                    ):
+                                        raise PipelineCancelledException(
+                                            "User cancelled"
+                                        )
+
+                                for window_number, (window, chunk_results) in enumerate(
+                                    window_results, 1
+                                ):
+                                    # Entities of the chunks merged before this window
+                                    # stay recorded for the document
+                                    if checkpoint["merged"]:
+                                        old_entities = (
+                                            await self.full_entities.get_by_id(doc_id)
+                                            or {}
+                                        )
+                                        old_relations = (
+                                            await self.full_relations.get_by_id(doc_id)
+                                            or {}
+                                        )
+
+                                    # Use chunk_results from entity_relation_task
+                                    await merge_nodes_and_edges(
+                                        chunk_results=chunk_results,  # result collected from entity_relation_task
+                                        knowledge_graph_inst=self.chunk_entity_relation_graph,
+                                        entity_vdb=self.entities_vdb,
+                                        relationships_vdb=self.relationships_vdb,
+                                        global_config=asdict(self),
+                                        full_entities_storage=self.full_entities,
+                                        full_relations_storage=self.full_relations,
+                                        doc_id=doc_id,
+                                        pipeline_status=pipeline_status,
+                                        pipeline_status_lock=pipeline_status_lock,
+                                        llm_response_cache=self.llm_response_cache,
+                                        entity_chunks_storage=self.entity_chunks,
+                                        relation_chunks_storage=self.relation_chunks,
+                                        current_file_number=current_file_number,
+                                        total_files=total_files,
+                                        file_path=file_path,
+                                    )
+                                    if checkpoint["merged"]:
+                                        await self._merge_document_graph_index(
+                                            doc_id, old_entities, old_relations
+                                        )
+
+                                    if window_number < len(window_results):
+                                        progress = {
+                                            **checkpoint,
+                                            "merged": checkpoint["merged"] + window,
+                                        }
+                                        await self._save_checkpoint(
+                                            doc_id, processing_record(progress)
+                                        )
+                                        checkpoint = progress
+
+                                        # Cancellation takes effect at a checkpoint
+                                        async with pipeline_status_lock:
+                                            if pipeline_status.get(
+                                                "cancellation_requested", False
+                                            ):
+                                                raise PipelineCancelledException(
+                                                    "User cancelled"
+                                                )
+                                await stages["persist"].reserve()
+
+                            async with stages["persist"].slot(reserved=True):
+                                # Record processing end time
+                                processing_end_time = int(time.time())
+
+                                # The PROCESSED status is written by the group commit that
+                                # persists the document's data
+                                await self._commit_processed_document(
+                                    {
+                                        doc_id: {
+                                            "status": DocStatus.PROCESSED,
+                                            "chunks_count": len(chunks),
+                                            "chunks_list": list(chunks.keys()),
+                                            "content_summary": status_doc.content_summary,
+                                            "content_length": status_doc.content_length,
+                                            "created_at": status_doc.created_at,
+                                            "updated_at": datetime.now(
+                                                timezone.utc
+                                            ).isoformat(),
+                                            "file_path": file_path,
+                                            "track_id": status_doc.track_id,  # Preserve existing track_id
+                                            "metadata": {
+                                                "processing_start_time": processing_start_time,
+                                                "processing_end_time": processing_end_time,
+                                            },
+                                        }
+                                    },
+                                    pipeline_status,
+                                    pipeline_status_lock,
+                                )
+
+                            async with pipeline_status_lock:
+                                log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
+                                logger.info(log_message)
+                                pipeline_status["latest_message"] = log_message
+                                pipeline_status["history_messages"].append(log_message)
+                                pipeline_status["concurrency"] = (
+                                    self.get_concurrency_stats()
                                 )
-                            )
-                            chunk_results = await entity_relation_task
-                            file_extraction_stage_ok = True
 
                         except Exception as e:
                             # Check if this is a user cancellation
                             if isinstance(e, PipelineCancelledException):
                                 # User cancellation - log brief message only, no traceback
-                                error_msg = f"User cancelled {current_file_number}/{total_files}: {file_path}"
+                                error_msg = f"User cancelled during merge {current_file_number}/{total_files}: {file_path}"
                                 logger.warning(error_msg)
                                 async with pipeline_status_lock:
                                     pipeline_status["latest_message"] = error_msg
@@ -1925,7 +2412,7 @@ class LightRAG:
                             else:
                                 # Other exceptions - log with traceback
                                 logger.error(traceback.format_exc())
-                                error_msg = f"Failed to extract document {current_file_number}/{total_files}: {file_path}"
+                                error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
                                 logger.error(error_msg)
                                 async with pipeline_status_lock:
                                     pipeline_status["latest_message"] = error_msg
@@ -1936,14 +2423,6 @@ class LightRAG:
                                         error_msg
                                     )
 
-                            # Cancel tasks that are not yet completed
-                            all_tasks = first_stage_tasks + (
-                                [entity_relation_task] if entity_relation_task else []
-                            )
-                            for task in all_tasks:
-                                if task and not task.done():
-                                    task.cancel()
-
                             # Persistent llm cache with error handling
                             if self.llm_response_cache:
                                 try:
@@ -1965,173 +2444,64 @@ class LightRAG:
                                         "content_summary": status_doc.content_summary,
                                         "content_length": status_doc.content_length,
                                         "created_at": status_doc.created_at,
-                                        "updated_at": datetime.now(
-                                            timezone.utc
-                                        ).isoformat(),
+                                        "updated_at": datetime.now().isoformat(),
                                         "file_path": file_path,
                                         "track_id": status_doc.track_id,  # Preserve existing track_id
                                         "metadata": {
                                             "processing_start_time": processing_start_time,
                                             "processing_end_time": processing_end_time,
+                                            **self._checkpoint_metadata(checkpoint),
                                         },
                                     }
                                 }
                             )
 
-                        # Concurrency is controlled by keyed lock for individual entities and relationships
-                        if file_extraction_stage_ok:
-                            try:
-                                # Check for cancellation before merge
-                                async with pipeline_status_lock:
-                                    if pipeline_status.get(
-                                        "cancellation_requested", False
-                                    ):
-                                        raise PipelineCancelledException(
-                                            "User cancelled"
-                                        )
-
-                                # Use chunk_results from entity_relation_task
-                                await merge_nodes_and_edges(
-                                    chunk_results=chunk_results,  # result collected from entity_relation_task
-                                    knowledge_graph_inst=self.chunk_entity_relation_graph,
-                                    entity_vdb=self.entities_vdb,
-                                    relationships_vdb=self.relationships_vdb,
-                                    global_config=asdict(self),
-                                    full_entities_storage=self.full_entities,
-                                    full_relations_storage=self.full_relations,
-                                    doc_id=doc_id,
-                                    pipeline_status=pipeline_status,
-                                    pipeline_status_lock=pipeline_status_lock,
-                                    llm_response_cache=self.llm_response_cache,
-                                    entity_chunks_storage=self.entity_chunks,
-                                    relation_chunks_storage=self.relation_chunks,
-                                    current_file_number=current_file_number,
-                                    total_files=total_files,
-                                    file_path=file_path,
-                                )
+                if self.extraction_batch_backend is not None:
+                    try:
+                        await self._run_batch_extraction(
+                            to_process_docs,
+                            split_by_character,
+                            split_by_character_only,
+                            pipeline_status,
+                            pipeline_status_lock,
+                        )
+                    except PipelineCancelledException:
+                        # Running batch jobs are harvested by the next run
+                        log_message = "User cancelled during batch extraction"
+                        logger.warning(log_message)
+                        async with pipeline_status_lock:
+                            pipeline_status["latest_message"] = log_message
+                            pipeline_status["history_messages"].append(log_message)
+                        return
 
-                                # Record processing end time
-                                processing_end_time = int(time.time())
+                # Create processing tasks for all documents
+                doc_tasks = []
+                for doc_id, status_doc in to_process_docs.items():
+                    doc_tasks.append(
+                        process_document(
+                            doc_id,
+                            status_doc,
+                            split_by_character,
+                            split_by_character_only,
+                            pipeline_status,
+                            pipeline_status_lock,
+                        )
+                    )
 
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSED,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(chunks.keys()),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
-                                    }
-                                )
+                # Wait for all document processing to complete
+                try:
+                    await asyncio.gather(*doc_tasks)
+                except PipelineCancelledException:
+                    # Cancel all remaining tasks
+                    for task in doc_tasks:
+                        if not task.done():
+                            task.cancel()
 
-                                # Call _insert_done after processing each file
-                                await self._insert_done()
+                    # Wait for all tasks to complete cancellation
+                    await asyncio.wait(doc_tasks, return_when=asyncio.ALL_COMPLETED)
 
-                                async with pipeline_status_lock:
-                                    log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
-                                    logger.info(log_message)
-                                    pipeline_status["latest_message"] = log_message
-                                    pipeline_status["history_messages"].append(
-                                        log_message
-                                    )
-
-                            except Exception as e:
-                                # Check if this is a user cancellation
-                                if isinstance(e, PipelineCancelledException):
-                                    # User cancellation - log brief message only, no traceback
-                                    error_msg = f"User cancelled during merge {current_file_number}/{total_files}: {file_path}"
-                                    logger.warning(error_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = error_msg
-                                        pipeline_status["history_messages"].append(
-                                            error_msg
-                                        )
-                                else:
-                                    # Other exceptions - log with traceback
-                                    logger.error(traceback.format_exc())
-                                    error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
-                                    logger.error(error_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = error_msg
-                                        pipeline_status["history_messages"].append(
-                                            traceback.format_exc()
-                                        )
-                                        pipeline_status["history_messages"].append(
-                                            error_msg
-                                        )
-
-                                # Persistent llm cache with error handling
-                                if self.llm_response_cache:
-                                    try:
-                                        await self.llm_response_cache.index_done_callback()
-                                    except Exception as persist_error:
-                                        logger.error(
-                                            f"Failed to persist LLM cache: {persist_error}"
-                                        )
-
-                                # Record processing end time for failed case
-                                processing_end_time = int(time.time())
-
-                                # Update document status to failed
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.FAILED,
-                                            "error_msg": str(e),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now().isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
-                                    }
-                                )
-
-                # Create processing tasks for all documents
-                doc_tasks = []
-                for doc_id, status_doc in to_process_docs.items():
-                    doc_tasks.append(
-                        process_document(
-                            doc_id,
-                            status_doc,
-                            split_by_character,
-                            split_by_character_only,
-                            pipeline_status,
-                            pipeline_status_lock,
-                            semaphore,
-                        )
-                    )
-
-                # Wait for all document processing to complete
-                try:
-                    await asyncio.gather(*doc_tasks)
-                except PipelineCancelledException:
-                    # Cancel all remaining tasks
-                    for task in doc_tasks:
-                        if not task.done():
-                            task.cancel()
-
-                    # Wait for all tasks to complete cancellation
-                    await asyncio.wait(doc_tasks, return_when=asyncio.ALL_COMPLETED)
-
-                    # Exit directly (document statuses already updated in process_document)
-                    return
+                    # Exit directly (document statuses already updated in process_document)
+                    return
 
                 # Check if there's a pending request to process more documents (with lock)
                 has_pending_request = False
@@ -2149,6 +2519,10 @@ class LightRAG:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
+                # Documents waiting for the group commit are still PROCESSING in
+                # doc_status: commit them before looking for more work
+                await self._group_commit(pipeline_status, pipeline_status_lock)
+
                 # Check for pending documents again
                 processing_docs, failed_docs, pending_docs = await asyncio.gather(
                     self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
@@ -2160,8 +2534,20 @@ class LightRAG:
                 to_process_docs.update(processing_docs)
                 to_process_docs.update(failed_docs)
                 to_process_docs.update(pending_docs)
+                # A failed commit keeps its documents queued for the next flush,
+                # they are processed already
+                for doc_id in self._uncommitted_docs:
+                    to_process_docs.pop(doc_id, None)
 
         finally:
+            if self._graph_write_buffer is not None:
+                await self._flush_graph_write_buffer(
+                    pipeline_status, pipeline_status_lock
+                )
+
+            # Pipeline idle: persist the documents of the last partial group
+            await self._group_commit(pipeline_status, pipeline_status_lock)
+
             log_message = "Enqueued document processing pipeline stopped"
             logger.info(log_message)
             # Always reset busy status and cancellation flag when done or if an exception occurs (with lock)
@@ -2173,6 +2559,242 @@ class LightRAG:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
+    def _create_pipeline_stages(
+        self, pipeline_status: dict
+    ) -> dict[str, PipelineStage]:
+        """Stages of apipeline_process_enqueue_documents, publishing their stats to the pipeline status
+
+        Parsing happens before documents are enqueued (see the API server's
+        parsing pool), so the pipeline starts at chunking. Persisting runs one
+        document at a time since group commits are serialized anyway.
+        """
+        stages: dict[str, PipelineStage] = {}
+
+        def publish() -> None:
+            pipeline_status["stages"] = {
+                name: stage.stats() for name, stage in stages.items()
+            }
+
+        queue_size = self.pipeline_stage_queue_size
+        for name, concurrency, stage_queue_size in (
+            ("chunk", self.max_parallel_insert, 0),
+            ("extract", self.max_parallel_insert, queue_size),
+            ("merge", self.max_parallel_merge, queue_size),
+            ("persist", 1, queue_size),
+        ):
+            stages[name] = PipelineStage(
+                name, concurrency, stage_queue_size, on_change=publish
+            )
+        publish()
+        return stages
+
+    async def _chunk_document(
+        self,
+        doc_id: str,
+        file_path: str,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+        content: str | None = None,
+    ) -> dict[str, Any]:
+        """Split a document into chunks keyed by chunk id
+
+        The content is read from full_docs unless it is given.
+        """
+        if content is None:
+            # Get document content from full_docs
+            content_data = await self.full_docs.get_by_id(doc_id)
+            if not content_data:
+                raise Exception(
+                    f"Document content not found in full_docs for doc_id: {doc_id}"
+                )
+            if content_data.get("streamed"):
+                raise Exception(
+                    f"Streamed document {doc_id} was interrupted and cannot be resumed, insert it again"
+                )
+            content = content_data["content"]
+
+        # Synchronous chunking of a large document (a full encode plus a decode
+        # per window) runs in a worker thread so the event loop keeps serving
+        # queries meanwhile; tiktoken releases the GIL while encoding
+        offload = not inspect.iscoroutinefunction(self.chunking_func) and (
+            0 < self.chunking_offload_threshold <= len(content)
+        )
+        chunking_args = (
+            self.tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            self.chunk_overlap_token_size,
+            self.chunk_token_size,
+        )
+
+        # Call chunking function, supporting both sync and async implementations
+        if offload:
+            chunking_result = await asyncio.to_thread(
+                self.chunking_func, *chunking_args
+            )
+        else:
+            chunking_result = self.chunking_func(*chunking_args)
+
+        # If result is awaitable, await to get actual result
+        if inspect.isawaitable(chunking_result):
+            chunking_result = await chunking_result
+
+        # Validate return type
+        if not isinstance(chunking_result, (list, tuple)):
+            raise TypeError(
+                f"chunking_func must return a list or tuple of dicts, "
+                f"got {type(chunking_result)}"
+            )
+
+        if offload:
+            return await asyncio.to_thread(
+                self._build_chunks, doc_id, file_path, chunking_result
+            )
+        return self._build_chunks(doc_id, file_path, chunking_result)
+
+    def _build_chunks(
+        self, doc_id: str, file_path: str, chunking_result: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Key chunking results by chunk id and add document metadata and dates"""
+        # Build chunks dictionary
+        chunks: dict[str, Any] = {}
+        # Use current date as fallback for documents without extractable dates
+        current_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+        for dp in chunking_result:
+            # Extract dates from filename and chunk content with fallback
+            date_info = extract_all_dates(file_path, dp["content"], fallback_date=current_date)
+
+            chunk_id = compute_mdhash_id(dp["content"], prefix="chunk-")
+            chunks[chunk_id] = {
+                **dp,
+                "full_doc_id": doc_id,
+                "file_path": file_path,  # Add file path to each chunk
+                "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
+                "relevant_dates": date_info["relevant_dates"],  # Add extracted dates
+                "primary_date": date_info["primary_date"],  # Add primary date
+                **self._chunk_token_fields(dp["content"]),
+            }
+
+        return chunks
+
+    def _checkpoint_windows(self, chunks: dict[str, Any]) -> list[dict[str, Any]]:
+        """Split a document's chunks into the windows processed between checkpoints"""
+        if self.checkpoint_chunks <= 0 or len(chunks) <= self.checkpoint_chunks:
+            return [chunks]
+        items = list(chunks.items())
+        return [
+            dict(items[start : start + self.checkpoint_chunks])
+            for start in range(0, len(items), self.checkpoint_chunks)
+        ]
+
+    async def _save_checkpoint(
+        self,
+        doc_id: str,
+        status_record: dict[str, Any],
+        storages: list[StorageNameSpace | None] | None = None,
+    ) -> None:
+        """Persist storages (all by default), then record the document's chunk progress
+
+        As in the group commit, the doc status is written last: a checkpoint
+        never names chunks whose results are not durable yet. Persisting all
+        storages includes the graph write buffer of bulk-load mode, flushed by
+        _insert_done while the commit lock is held.
+        """
+        async with self._commit_lock:
+            if storages is None:
+                await self._insert_done()
+            else:
+                await asyncio.gather(
+                    *(
+                        storage.index_done_callback()
+                        for storage in storages
+                        if storage is not None
+                    )
+                )
+            await self.doc_status.upsert({doc_id: status_record})
+            await self.doc_status.index_done_callback()
+
+    def _chunk_token_fields(self, content: str) -> dict[str, Any]:
+        """Stored token count of a chunk's content as serialized in the query context"""
+        return compute_token_count_fields(
+            self.tokenizer, json.dumps(content, ensure_ascii=False), content
+        )
+
+    async def _run_batch_extraction(
+        self,
+        docs: dict[str, DocProcessingStatus],
+        split_by_character: str | None,
+        split_by_character_only: bool,
+        pipeline_status: dict,
+        pipeline_status_lock: asyncio.Lock,
+    ) -> None:
+        """Answer the extraction prompts of all documents through batch jobs
+
+        The results land in the LLM cache, so the per-document extraction that
+        follows reads them instead of calling the LLM.
+        """
+        from lightrag.batch_extraction import run_batch_extraction
+
+        if not self.enable_llm_cache_for_entity_extract:
+            logger.warning(
+                "Batch extraction needs enable_llm_cache_for_entity_extract, "
+                "using real-time extraction"
+            )
+            return
+
+        chunks: dict[str, Any] = {}
+        for doc_id, status_doc in docs.items():
+            try:
+                chunks.update(
+                    await self._chunk_document(
+                        doc_id,
+                        getattr(status_doc, "file_path", "unknown_source"),
+                        split_by_character,
+                        split_by_character_only,
+                    )
+                )
+            except Exception as e:
+                # Reported by the document's own processing
+                logger.warning(f"Batch extraction skips {doc_id}: {e}")
+
+        if not chunks:
+            return
+
+        try:
+            stats = await run_batch_extraction(
+                chunks,
+                global_config=asdict(self),
+                llm_response_cache=self.llm_response_cache,
+                backend=self.extraction_batch_backend,
+                state_dir=os.path.join(
+                    self.working_dir, self.workspace, "extraction_batches"
+                ),
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=pipeline_status_lock,
+                poll_interval=self.batch_poll_interval,
+            )
+        except PipelineCancelledException:
+            raise
+        except Exception as e:
+            # Chunks without a cached result are extracted in real time
+            log_message = f"Batch extraction failed, using real-time extraction: {e}"
+            logger.error(log_message)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+            return
+
+        log_message = (
+            f"Batch extraction of {len(chunks)} chunks: {stats['completed']} results "
+            f"received, {stats['failed']} left for real-time extraction"
+        )
+        logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+
     async def _process_extract_entities(
         self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
     ) -> list:
@@ -2197,6 +2819,12 @@ class LightRAG:
     async def _insert_done(
         self, pipeline_status=None, pipeline_status_lock=None
     ) -> None:
+        # Bulk-load mode: the graph storage only persists what the write buffer
+        # has flushed, so buffered nodes and edges are written first. A failed
+        # flush raises, and no caller records the data as persisted.
+        if self._graph_write_buffer is not None:
+            await self._graph_write_buffer.flush()
+
         tasks = [
             cast(StorageNameSpace, storage_inst).index_done_callback()
             for storage_inst in [  # type: ignore
@@ -2217,6 +2845,9 @@ class LightRAG:
         ]
         await asyncio.gather(*tasks)
 
+        # Inserts and deletions change the graph: cached query answers are stale
+        await bump_kg_version(self.workspace)
+
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
 
@@ -2224,6 +2855,100 @@ class LightRAG:
             async with pipeline_status_lock:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
+                if self._graph_write_buffer is not None:
+                    pipeline_status["graph_bulk_load"] = (
+                        self._graph_write_buffer.bulk_stats()
+                    )
+
+    async def _commit_processed_document(
+        self,
+        status_record: dict[str, dict[str, Any]],
+        pipeline_status: dict,
+        pipeline_status_lock: asyncio.Lock,
+    ) -> None:
+        """Queue a processed document for the group commit and flush when a trigger fires"""
+        self._uncommitted_docs.update(status_record)
+        if len(self._uncommitted_docs) >= self.insert_flush_docs or (
+            self.insert_flush_interval > 0
+            and time.monotonic() - self._last_commit_time >= self.insert_flush_interval
+        ):
+            await self._group_commit(pipeline_status, pipeline_status_lock)
+
+    async def _group_commit(
+        self, pipeline_status=None, pipeline_status_lock=None
+    ) -> None:
+        """Persist all storages, then mark the queued documents PROCESSED
+
+        The doc status is written last: a document is only PROCESSED once its
+        chunks, graph and vectors are durable. In bulk-load mode this includes
+        the graph write buffer, which _insert_done flushes first while the
+        commit lock is held. If the flush fails, the documents stay queued and
+        the next flush retries them.
+        """
+        async with self._commit_lock:
+            if not self._uncommitted_docs:
+                return
+            records, self._uncommitted_docs = self._uncommitted_docs, {}
+            start = time.perf_counter()
+            try:
+                await self._insert_done(pipeline_status, pipeline_status_lock)
+                await self.doc_status.upsert(records)
+                await self.doc_status.index_done_callback()
+            except Exception as e:
+                self._uncommitted_docs = {**records, **self._uncommitted_docs}
+                log_message = (
+                    f"Group commit of {len(records)} documents failed, will retry: {e}"
+                )
+                logger.error(log_message)
+                if pipeline_status is not None and pipeline_status_lock is not None:
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
+                return
+
+            elapsed = time.perf_counter() - start
+            self._last_commit_time = time.monotonic()
+            stats = self._commit_stats
+            stats["flushes"] += 1
+            stats["documents"] += len(records)
+            stats["total_seconds"] = round(stats["total_seconds"] + elapsed, 3)
+            stats["last_documents"] = len(records)
+            stats["last_seconds"] = round(elapsed, 3)
+
+            log_message = (
+                f"Group commit: {len(records)} documents persisted in {elapsed:.2f}s"
+            )
+            logger.info(log_message)
+            if pipeline_status is not None and pipeline_status_lock is not None:
+                async with pipeline_status_lock:
+                    pipeline_status["group_commit"] = dict(stats)
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
+
+    async def _flush_graph_write_buffer(
+        self, pipeline_status=None, pipeline_status_lock=None
+    ) -> None:
+        """Write buffered graph upserts of bulk-load mode and report throughput"""
+        try:
+            await self._graph_write_buffer.flush()
+            await self.chunk_entity_relation_graph.index_done_callback()
+            stats = self._graph_write_buffer.bulk_stats()
+            log_message = (
+                f"Graph bulk load: {stats['flushed_nodes']} nodes, "
+                f"{stats['flushed_edges']} edges written at "
+                f"{stats['records_per_second']} records/s"
+            )
+            logger.info(log_message)
+        except Exception as e:
+            stats = self._graph_write_buffer.bulk_stats()
+            log_message = f"Graph bulk flush failed, {self._graph_write_buffer.pending} records still buffered: {e}"
+            logger.error(log_message)
+
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["graph_bulk_load"] = stats
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
 
     def insert_custom_kg(
         self, custom_kg: dict[str, Any], full_doc_id: str = None
@@ -2404,6 +3129,8 @@ class LightRAG:
             raise
         finally:
             if update_storage:
+                if self._graph_write_buffer is not None:
+                    await self._graph_write_buffer.flush()
                 await self._insert_done()
 
     def query(
@@ -2594,6 +3321,7 @@ class LightRAG:
             fields at the top level.
         """
         global_config = asdict(self)
+        global_config["query_context_cache"] = self._query_context_cache
 
         # Create a copy of param to avoid modifying the original
         data_param = QueryParam(
@@ -2614,6 +3342,8 @@ class LightRAG:
             model_func=param.model_func,
             user_prompt=param.user_prompt,
             enable_rerank=param.enable_rerank,
+            start_date=param.start_date,
+            end_date=param.end_date,
         )
 
         query_result = None
@@ -2712,6 +3442,8 @@ class LightRAG:
         logger.debug(f"[aquery_llm] Query param: {param}")
 
         global_config = asdict(self)
+        global_config["semantic_query_cache"] = self._semantic_query_cache
+        global_config["query_context_cache"] = self._query_context_cache
 
         try:
             query_result = None
@@ -2862,6 +3594,11 @@ class LightRAG:
             # Clear all cache
             await rag.aclear_cache()
         """
+        if self._semantic_query_cache is not None:
+            self._semantic_query_cache.clear()
+        if self._query_context_cache is not None:
+            self._query_context_cache.clear()
+
         if not self.llm_response_cache:
             logger.warning("No cache storage configured")
             return
@@ -3158,24 +3895,7 @@ class LightRAG:
                     )
                 else:
                     try:
-                        chunk_data_list = await self.text_chunks.get_by_ids(
-                            list(chunk_ids)
-                        )
-                        seen_cache_ids: set[str] = set()
-                        for chunk_data in chunk_data_list:
-                            if not chunk_data or not isinstance(chunk_data, dict):
-                                continue
-                            cache_ids = chunk_data.get("llm_cache_list", [])
-                            if not isinstance(cache_ids, list):
-                                continue
-                            for cache_id in cache_ids:
-                                if (
-                                    isinstance(cache_id, str)
-                                    and cache_id
-                                    and cache_id not in seen_cache_ids
-                                ):
-                                    doc_llm_cache_ids.append(cache_id)
-                                    seen_cache_ids.add(cache_id)
+                        doc_llm_cache_ids = await self._collect_llm_cache_ids(chunk_ids)
                         if doc_llm_cache_ids:
                             logger.info(
                                 "Collected %d LLM cache entries for document %s",
@@ -3196,238 +3916,1253 @@ class LightRAG:
                             f"Failed to collect LLM cache ids for document {doc_id}: {cache_collect_error}"
                         ) from cache_collect_error
 
-            # 4. Analyze entities and relationships that will be affected
-            entities_to_delete = set()
-            entities_to_rebuild = {}  # entity_name -> remaining chunk id list
-            relationships_to_delete = set()
-            relationships_to_rebuild = {}  # (src, tgt) -> remaining chunk id list
-            entity_chunk_updates: dict[str, list[str]] = {}
-            relation_chunk_updates: dict[tuple[str, str], list[str]] = {}
+            # 4-8. Subtract the chunks from the graph and rebuild what remains
+            await self._remove_chunks_from_knowledge(
+                [doc_id], chunk_ids, pipeline_status, pipeline_status_lock
+            )
 
+            # 9. Delete from full_entities and full_relations storage
             try:
-                # Get affected entities and relations from full_entities and full_relations storage
-                doc_entities_data = await self.full_entities.get_by_id(doc_id)
-                doc_relations_data = await self.full_relations.get_by_id(doc_id)
-
-                affected_nodes = []
-                affected_edges = []
-
-                # Get entity data from graph storage using entity names from full_entities
-                if doc_entities_data and "entity_names" in doc_entities_data:
-                    entity_names = doc_entities_data["entity_names"]
-                    # get_nodes_batch returns dict[str, dict], need to convert to list[dict]
-                    nodes_dict = await self.chunk_entity_relation_graph.get_nodes_batch(
-                        entity_names
-                    )
-                    for entity_name in entity_names:
-                        node_data = nodes_dict.get(entity_name)
-                        if node_data:
-                            # Ensure compatibility with existing logic that expects "id" field
-                            if "id" not in node_data:
-                                node_data["id"] = entity_name
-                            affected_nodes.append(node_data)
-
-                # Get relation data from graph storage using relation pairs from full_relations
-                if doc_relations_data and "relation_pairs" in doc_relations_data:
-                    relation_pairs = doc_relations_data["relation_pairs"]
-                    edge_pairs_dicts = [
-                        {"src": pair[0], "tgt": pair[1]} for pair in relation_pairs
-                    ]
-                    # get_edges_batch returns dict[tuple[str, str], dict], need to convert to list[dict]
-                    edges_dict = await self.chunk_entity_relation_graph.get_edges_batch(
-                        edge_pairs_dicts
-                    )
-
-                    for pair in relation_pairs:
-                        src, tgt = pair[0], pair[1]
-                        edge_key = (src, tgt)
-                        edge_data = edges_dict.get(edge_key)
-                        if edge_data:
-                            # Ensure compatibility with existing logic that expects "source" and "target" fields
-                            if "source" not in edge_data:
-                                edge_data["source"] = src
-                            if "target" not in edge_data:
-                                edge_data["target"] = tgt
-                            affected_edges.append(edge_data)
-
+                await self.full_entities.delete([doc_id])
+                await self.full_relations.delete([doc_id])
             except Exception as e:
-                logger.error(f"Failed to analyze affected graph elements: {e}")
-                raise Exception(f"Failed to analyze graph dependencies: {e}") from e
+                logger.error(f"Failed to delete from full_entities/full_relations: {e}")
+                raise Exception(
+                    f"Failed to delete from full_entities/full_relations: {e}"
+                ) from e
 
+            # 10. Delete original document and status
             try:
-                # Process entities
-                for node_data in affected_nodes:
-                    node_label = node_data.get("entity_id")
-                    if not node_label:
-                        continue
-
-                    existing_sources: list[str] = []
-                    if self.entity_chunks:
-                        stored_chunks = await self.entity_chunks.get_by_id(node_label)
-                        if stored_chunks and isinstance(stored_chunks, dict):
-                            existing_sources = [
-                                chunk_id
-                                for chunk_id in stored_chunks.get("chunk_ids", [])
-                                if chunk_id
-                            ]
+                await self.full_docs.delete([doc_id])
+                await self.doc_status.delete([doc_id])
+            except Exception as e:
+                logger.error(f"Failed to delete document and status: {e}")
+                raise Exception(f"Failed to delete document and status: {e}") from e
 
-                    if not existing_sources and node_data.get("source_id"):
-                        existing_sources = [
-                            chunk_id
-                            for chunk_id in node_data["source_id"].split(
-                                GRAPH_FIELD_SEP
-                            )
-                            if chunk_id
-                        ]
+            if delete_llm_cache and doc_llm_cache_ids and self.llm_response_cache:
+                try:
+                    await self.llm_response_cache.delete(doc_llm_cache_ids)
+                    cache_log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for document {doc_id}"
+                    logger.info(cache_log_message)
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = cache_log_message
+                        pipeline_status["history_messages"].append(cache_log_message)
+                    log_message = cache_log_message
+                except Exception as cache_delete_error:
+                    log_message = f"Failed to delete LLM cache for document {doc_id}: {cache_delete_error}"
+                    logger.error(log_message)
+                    logger.error(traceback.format_exc())
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
 
-                    if not existing_sources:
-                        # No chunk references means this entity should be deleted
-                        entities_to_delete.add(node_label)
-                        entity_chunk_updates[node_label] = []
-                        continue
+            return DeletionResult(
+                status="success",
+                doc_id=doc_id,
+                message=log_message,
+                status_code=200,
+                file_path=file_path,
+            )
 
-                    remaining_sources = subtract_source_ids(existing_sources, chunk_ids)
+        except Exception as e:
+            original_exception = e
+            error_message = f"Error while deleting document {doc_id}: {e}"
+            logger.error(error_message)
+            logger.error(traceback.format_exc())
+            return DeletionResult(
+                status="fail",
+                doc_id=doc_id,
+                message=error_message,
+                status_code=500,
+                file_path=file_path,
+            )
 
-                    if not remaining_sources:
-                        entities_to_delete.add(node_label)
-                        entity_chunk_updates[node_label] = []
-                    elif remaining_sources != existing_sources:
-                        entities_to_rebuild[node_label] = remaining_sources
-                        entity_chunk_updates[node_label] = remaining_sources
-                    else:
-                        logger.info(f"Untouch entity: {node_label}")
+        finally:
+            # ALWAYS ensure persistence if any deletion operations were started
+            if deletion_operations_started:
+                try:
+                    await self._insert_done()
+                except Exception as persistence_error:
+                    persistence_error_msg = f"Failed to persist data after deletion attempt for {doc_id}: {persistence_error}"
+                    logger.error(persistence_error_msg)
+                    logger.error(traceback.format_exc())
 
-                async with pipeline_status_lock:
-                    log_message = f"Found {len(entities_to_rebuild)} affected entities"
+                    # If there was no original exception, this persistence error becomes the main error
+                    if original_exception is None:
+                        return DeletionResult(
+                            status="fail",
+                            doc_id=doc_id,
+                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
+                            status_code=500,
+                            file_path=file_path,
+                        )
+                    # If there was an original exception, log the persistence error but don't override the original error
+                    # The original error result was already returned in the except block
+            else:
+                logger.debug(
+                    f"No deletion operations were started for document {doc_id}, skipping persistence"
+                )
+
+            # Release pipeline only if WE acquired it
+            if we_acquired_pipeline:
+                async with pipeline_status_lock:
+                    pipeline_status["busy"] = False
+                    pipeline_status["cancellation_requested"] = False
+                    completion_msg = (
+                        f"Deletion process completed for document: {doc_id}"
+                    )
+                    pipeline_status["latest_message"] = completion_msg
+                    pipeline_status["history_messages"].append(completion_msg)
+                    logger.info(completion_msg)
+
+    async def _collect_llm_cache_ids(self, chunk_ids: set[str]) -> list[str]:
+        """LLM cache ids recorded in the llm_cache_list of the given chunks"""
+        chunk_data_list = await self.text_chunks.get_by_ids(list(chunk_ids))
+        cache_ids: dict[str, None] = {}
+        for chunk_data in chunk_data_list:
+            if not chunk_data or not isinstance(chunk_data, dict):
+                continue
+            chunk_cache_ids = chunk_data.get("llm_cache_list", [])
+            if not isinstance(chunk_cache_ids, list):
+                continue
+            for cache_id in chunk_cache_ids:
+                if isinstance(cache_id, str) and cache_id:
+                    cache_ids[cache_id] = None
+        return list(cache_ids)
+
+    async def adelete_by_doc_ids(
+        self, doc_ids: list[str], delete_llm_cache: bool = False
+    ) -> list[DeletionResult]:
+        """Delete several documents, rebuilding each affected entity and relation once
+
+        Deleting the documents one by one with adelete_by_doc_id rebuilds an
+        entity shared by all of them once per document. Here the chunks of all
+        documents are subtracted together, so the remaining sources of every
+        entity and relation are computed once, each is rebuilt (re-summarized)
+        at most once, and the storages are persisted once.
+
+        Acquires the pipeline like adelete_by_doc_id, and may run inside a
+        "Deleting N Documents" job (see background_delete_documents).
+
+        Args:
+            doc_ids: IDs of the documents to delete
+            delete_llm_cache: Whether to delete the cached LLM extraction results
+                of the documents
+
+        Returns:
+            list[DeletionResult]: One result per document, in the order of ``doc_ids``.
+                Unknown documents get a "not_found" result. If removing the
+                chunks fails, every found document gets a "fail" result.
+        """
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return []
+
+        pipeline_status = await get_namespace_data(
+            "pipeline_status", workspace=self.workspace
+        )
+        pipeline_status_lock = get_namespace_lock(
+            "pipeline_status", workspace=self.workspace
+        )
+
+        we_acquired_pipeline = False
+        async with pipeline_status_lock:
+            if not pipeline_status.get("busy", False):
+                we_acquired_pipeline = True
+                log_message = f"Starting batch deletion of {len(doc_ids)} documents"
+                pipeline_status.update(
+                    {
+                        "busy": True,
+                        "job_name": "Batch document deletion",
+                        "job_start": datetime.now(timezone.utc).isoformat(),
+                        "docs": len(doc_ids),
+                        "batchs": 1,
+                        "cur_batch": 0,
+                        "request_pending": False,
+                        "cancellation_requested": False,
+                        "latest_message": log_message,
+                    }
+                )
+                pipeline_status["history_messages"][:] = [log_message]
+            else:
+                job_name = pipeline_status.get("job_name", "").lower()
+                if not job_name.startswith("deleting") or "document" not in job_name:
+                    message = f"Deletion not allowed: current job '{pipeline_status.get('job_name')}' is not a document deletion job"
+                    return [
+                        DeletionResult(
+                            status="not_allowed",
+                            doc_id=doc_id,
+                            message=message,
+                            status_code=403,
+                            file_path=None,
+                        )
+                        for doc_id in doc_ids
+                    ]
+
+        results: dict[str, DeletionResult] = {}
+        found: dict[str, dict[str, Any]] = {}
+        deletion_operations_started = False
+        try:
+            status_list = await self.doc_status.get_by_ids(doc_ids)
+            for doc_id, status_data in zip(doc_ids, status_list):
+                if status_data:
+                    found[doc_id] = status_data
+                else:
+                    logger.warning(f"Document {doc_id} not found")
+                    results[doc_id] = DeletionResult(
+                        status="not_found",
+                        doc_id=doc_id,
+                        message=f"Document {doc_id} not found.",
+                        status_code=404,
+                        file_path="",
+                    )
+            if not found:
+                return [results[doc_id] for doc_id in doc_ids]
+
+            chunk_ids: set[str] = set()
+            for status_data in found.values():
+                chunk_ids.update(status_data.get("chunks_list", []))
+
+            llm_cache_ids: list[str] = []
+            if delete_llm_cache and chunk_ids and self.llm_response_cache:
+                llm_cache_ids = await self._collect_llm_cache_ids(chunk_ids)
+
+            async with pipeline_status_lock:
+                log_message = (
+                    f"Deleting {len(found)} documents with {len(chunk_ids)} chunks"
+                )
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+            deletion_operations_started = True
+            found_ids = list(found)
+            if chunk_ids:
+                await self._remove_chunks_from_knowledge(
+                    found_ids, chunk_ids, pipeline_status, pipeline_status_lock
+                )
+            await self.full_entities.delete(found_ids)
+            await self.full_relations.delete(found_ids)
+            await self.full_docs.delete(found_ids)
+            await self.doc_status.delete(found_ids)
+
+            if llm_cache_ids:
+                try:
+                    await self.llm_response_cache.delete(llm_cache_ids)
+                    logger.info(f"Deleted {len(llm_cache_ids)} LLM cache entries")
+                except Exception as cache_delete_error:
+                    logger.error(f"Failed to delete LLM cache: {cache_delete_error}")
+
+            for doc_id, status_data in found.items():
+                results[doc_id] = DeletionResult(
+                    status="success",
+                    doc_id=doc_id,
+                    message=f"Document {doc_id} deleted with {len(found)} documents in one batch",
+                    status_code=200,
+                    file_path=status_data.get("file_path"),
+                )
+
+        except Exception as e:
+            error_message = f"Error while deleting {len(found)} documents: {e}"
+            logger.error(error_message)
+            logger.error(traceback.format_exc())
+            for doc_id, status_data in found.items():
+                results[doc_id] = DeletionResult(
+                    status="fail",
+                    doc_id=doc_id,
+                    message=error_message,
+                    status_code=500,
+                    file_path=status_data.get("file_path"),
+                )
+
+        finally:
+            if deletion_operations_started:
+                try:
+                    await self._insert_done()
+                except Exception as persistence_error:
+                    logger.error(
+                        f"Failed to persist data after batch deletion: {persistence_error}"
+                    )
+                    logger.error(traceback.format_exc())
+                    for doc_id, status_data in found.items():
+                        results[doc_id] = DeletionResult(
+                            status="fail",
+                            doc_id=doc_id,
+                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
+                            status_code=500,
+                            file_path=status_data.get("file_path"),
+                        )
+
+            if we_acquired_pipeline:
+                async with pipeline_status_lock:
+                    pipeline_status["busy"] = False
+                    pipeline_status["cancellation_requested"] = False
+                    completion_msg = (
+                        f"Batch deletion completed for {len(doc_ids)} documents"
+                    )
+                    pipeline_status["latest_message"] = completion_msg
+                    pipeline_status["history_messages"].append(completion_msg)
+                    logger.info(completion_msg)
+
+        return [results[doc_id] for doc_id in doc_ids]
+
+    async def ainsert_stream(
+        self,
+        segments: Iterable[str],
+        file_path: str = "unknown_source",
+        doc_id: str | None = None,
+        track_id: str | None = None,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+    ) -> str:
+        """Insert one very large document from a stream of text segments
+
+        Segments (pages, line or row batches) are read, sanitized and chunked
+        by a token window in a worker thread, ``stream_window_chunks`` chunks
+        at a time. Each window is stored in text_chunks and chunks_vdb and its
+        entities are extracted and merged while the next window is read, so the
+        full content is never held in memory. Streamed documents always use the
+        token-window chunker (chunking_by_token_size_stream), and full_docs
+        keeps no content for them.
+
+        The stream runs as its own pipeline job and waits while the pipeline is
+        busy. A stream interrupted by a crash cannot be resumed from full_docs;
+        its document fails on the next pipeline run and must be inserted again.
+
+        Args:
+            segments: Consecutive text segments of the document, may be a generator
+            file_path: File path of the document, used for citation
+            doc_id: Document ID, defaults to an ID derived from file path and track ID
+            track_id: Tracking ID, generated if not provided
+            split_by_character, split_by_character_only: Chunking options
+
+        Returns:
+            str: The tracking ID
+
+        Raises:
+            ValueError: If a document with this ID already exists
+        """
+        if track_id is None:
+            track_id = generate_track_id("insert")
+        if doc_id is None:
+            doc_id = compute_mdhash_id(f"{file_path}:{track_id}", prefix="doc-")
+        if await self.doc_status.get_by_id(doc_id):
+            raise ValueError(f"Document {doc_id} already exists")
+
+        pipeline_status = await get_namespace_data(
+            "pipeline_status", workspace=self.workspace
+        )
+        pipeline_status_lock = get_namespace_lock(
+            "pipeline_status", workspace=self.workspace
+        )
+        while True:
+            async with pipeline_status_lock:
+                if not pipeline_status.get("busy", False):
+                    log_message = f"Streaming document {doc_id}: {file_path}"
+                    pipeline_status.update(
+                        {
+                            "busy": True,
+                            "job_name": "Streaming document",
+                            "job_start": datetime.now(timezone.utc).isoformat(),
+                            "docs": 1,
+                            "batchs": 1,
+                            "cur_batch": 1,
+                            "request_pending": False,
+                            "cancellation_requested": False,
+                            "latest_message": log_message,
+                        }
+                    )
+                    pipeline_status["history_messages"][:] = [log_message]
+                    break
+            await asyncio.sleep(1)
+        logger.info(log_message)
+
+        processing_start_time = int(time.time())
+        status_record = {
+            "content_summary": "",
+            "content_length": 0,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "file_path": file_path,
+            "track_id": track_id,
+        }
+        chunk_ids: list[str] = []
+        seen_chunk_ids: set[str] = set()
+        next_window = None
+
+        def sanitized_segments():
+            for segment in segments:
+                segment = sanitize_text_for_encoding(segment)
+                if not segment:
+                    continue
+                if not status_record["content_summary"]:
+                    status_record["content_summary"] = get_content_summary(segment)
+                if status_record["content_length"]:
+                    status_record["content_length"] += 1
+                status_record["content_length"] += len(segment)
+                yield segment
+
+        chunk_stream = chunking_by_token_size_stream(
+            self.tokenizer,
+            sanitized_segments(),
+            split_by_character,
+            split_by_character_only,
+            self.chunk_overlap_token_size,
+            self.chunk_token_size,
+        )
+
+        def read_window() -> list[dict[str, Any]]:
+            return list(itertools.islice(chunk_stream, self.stream_window_chunks))
+
+        try:
+            await self.full_docs.upsert(
+                {doc_id: {"content": "", "file_path": file_path, "streamed": True}}
+            )
+
+            current_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            # Reading and chunking the next window overlaps with extraction of the current one
+            next_window = asyncio.create_task(asyncio.to_thread(read_window))
+            window_number = 0
+            while window := await next_window:
+                next_window = asyncio.create_task(asyncio.to_thread(read_window))
+                window_number += 1
+
+                chunks: dict[str, Any] = {}
+                for dp in window:
+                    chunk_id = compute_mdhash_id(dp["content"], prefix="chunk-")
+                    if chunk_id in seen_chunk_ids:
+                        continue
+                    seen_chunk_ids.add(chunk_id)
+                    date_info = extract_all_dates(
+                        file_path, dp["content"], fallback_date=current_date
+                    )
+                    chunks[chunk_id] = {
+                        **dp,
+                        "full_doc_id": doc_id,
+                        "file_path": file_path,
+                        "llm_cache_list": [],
+                        "relevant_dates": date_info["relevant_dates"],
+                        "primary_date": date_info["primary_date"],
+                        **self._chunk_token_fields(dp["content"]),
+                    }
+                chunk_ids.extend(chunks)
+
+                async with pipeline_status_lock:
+                    if pipeline_status.get("cancellation_requested", False):
+                        raise PipelineCancelledException("User cancelled")
+                    log_message = f"Streaming window {window_number}: {len(chunks)} chunks ({len(chunk_ids)} so far)"
                     logger.info(log_message)
                     pipeline_status["latest_message"] = log_message
                     pipeline_status["history_messages"].append(log_message)
 
-                # Process relationships
-                for edge_data in affected_edges:
-                    # source target is not in normalize order in graph db property
-                    src = edge_data.get("source")
-                    tgt = edge_data.get("target")
+                # chunks_list grows with every window, so deletion finds all stored chunks
+                await asyncio.gather(
+                    self.chunks_vdb.upsert(chunks),
+                    self.text_chunks.upsert(chunks),
+                    self.doc_status.upsert(
+                        {
+                            doc_id: {
+                                **status_record,
+                                "status": DocStatus.PROCESSING,
+                                "chunks_count": len(chunk_ids),
+                                "chunks_list": list(chunk_ids),
+                                "updated_at": datetime.now(timezone.utc).isoformat(),
+                                "metadata": {
+                                    "processing_start_time": processing_start_time
+                                },
+                            }
+                        }
+                    ),
+                )
+
+                old_entities = await self.full_entities.get_by_id(doc_id) or {}
+                old_relations = await self.full_relations.get_by_id(doc_id) or {}
+                chunk_results = await self._process_extract_entities(
+                    chunks, pipeline_status, pipeline_status_lock
+                )
+                await merge_nodes_and_edges(
+                    chunk_results=chunk_results,
+                    knowledge_graph_inst=self.chunk_entity_relation_graph,
+                    entity_vdb=self.entities_vdb,
+                    relationships_vdb=self.relationships_vdb,
+                    global_config=asdict(self),
+                    full_entities_storage=self.full_entities,
+                    full_relations_storage=self.full_relations,
+                    doc_id=doc_id,
+                    pipeline_status=pipeline_status,
+                    pipeline_status_lock=pipeline_status_lock,
+                    llm_response_cache=self.llm_response_cache,
+                    entity_chunks_storage=self.entity_chunks,
+                    relation_chunks_storage=self.relation_chunks,
+                    current_file_number=1,
+                    total_files=1,
+                    file_path=file_path,
+                )
+                await self._merge_document_graph_index(
+                    doc_id, old_entities, old_relations
+                )
+
+            await self.doc_status.upsert(
+                {
+                    doc_id: {
+                        **status_record,
+                        "status": DocStatus.PROCESSED,
+                        "chunks_count": len(chunk_ids),
+                        "chunks_list": chunk_ids,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "metadata": {
+                            "processing_start_time": processing_start_time,
+                            "processing_end_time": int(time.time()),
+                        },
+                    }
+                }
+            )
+            await self._insert_done(pipeline_status, pipeline_status_lock)
+
+            async with pipeline_status_lock:
+                log_message = f"Completed streaming {file_path}: {len(chunk_ids)} chunks in {window_number} windows"
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+            return track_id
+
+        except Exception as e:
+            logger.error(f"Failed to stream document {doc_id} ({file_path}): {e}")
+            if not isinstance(e, PipelineCancelledException):
+                logger.error(traceback.format_exc())
+            try:
+                await self.doc_status.upsert(
+                    {
+                        doc_id: {
+                            **status_record,
+                            "status": DocStatus.FAILED,
+                            "error_msg": str(e),
+                            "chunks_count": len(chunk_ids),
+                            "chunks_list": chunk_ids,
+                            "updated_at": datetime.now(timezone.utc).isoformat(),
+                            "metadata": {
+                                "processing_start_time": processing_start_time,
+                                "processing_end_time": int(time.time()),
+                            },
+                        }
+                    }
+                )
+                await self._insert_done()
+            except Exception as persist_error:
+                logger.error(
+                    f"Failed to persist data after streaming {doc_id}: {persist_error}"
+                )
+            raise
+
+        finally:
+            if next_window is not None and not next_window.done():
+                next_window.cancel()
+            async with pipeline_status_lock:
+                pipeline_status["busy"] = False
+                pipeline_status["cancellation_requested"] = False
+                has_pending_request = pipeline_status.get("request_pending", False)
+            if has_pending_request:
+                await self.apipeline_process_enqueue_documents()
+
+    async def aupdate_document(
+        self,
+        doc_id: str,
+        content: str,
+        file_path: str | None = None,
+        track_id: str | None = None,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+    ) -> DocumentUpdateResult:
+        """Replace the content of a processed document, re-extracting only changed chunks.
+
+        The new version is chunked and its chunk IDs (content hashes) are diffed
+        against the document's current ``chunks_list``:
+
+        - added chunks are stored, extracted and merged into the graph
+        - removed chunks are deleted and subtracted from the sources of the
+          document's entities and relations, which are rebuilt from their
+          remaining chunks (or deleted when none remain)
+        - unchanged chunks keep their vectors and cached extraction results
+
+        The document keeps its ID. Removed chunks are subtracted before the new
+        content replaces the old one in full_docs, and the document status
+        always describes the version full_docs holds. An update that fails or
+        is interrupted leaves the document FAILED or PROCESSING, and the next
+        pipeline run processes that version again in full: the old one restores
+        the removed chunks, the new one completes the added chunks.
+
+        Args:
+            doc_id: ID of the processed document to update
+            content: New document content
+            file_path: New file path, defaults to the current one
+            track_id: Tracking ID stored in the document status
+            split_by_character, split_by_character_only: Chunking options
+
+        Returns:
+            DocumentUpdateResult: status is "success", "unchanged", "not_found",
+            "not_allowed" (pipeline busy or document not PROCESSED) or "fail",
+            with the number of added, removed and kept chunks.
+        """
+        pipeline_status = await get_namespace_data(
+            "pipeline_status", workspace=self.workspace
+        )
+        pipeline_status_lock = get_namespace_lock(
+            "pipeline_status", workspace=self.workspace
+        )
+
+        async with pipeline_status_lock:
+            if pipeline_status.get("busy", False):
+                return DocumentUpdateResult(
+                    status="not_allowed",
+                    doc_id=doc_id,
+                    message=f"Update not allowed: pipeline is busy with '{pipeline_status.get('job_name')}'",
+                    status_code=403,
+                )
+            log_message = f"Starting incremental update of document {doc_id}"
+            pipeline_status.update(
+                {
+                    "busy": True,
+                    "job_name": "Updating document",
+                    "job_start": datetime.now(timezone.utc).isoformat(),
+                    "docs": 1,
+                    "batchs": 1,
+                    "cur_batch": 1,
+                    "request_pending": False,
+                    "cancellation_requested": False,
+                    "latest_message": log_message,
+                }
+            )
+            pipeline_status["history_messages"][:] = [log_message]
+        logger.info(log_message)
+
+        status_doc = None
+        status_record = None
+        content_replaced = False
+        processing_start_time = int(time.time())
+        try:
+            status_doc = await self.doc_status.get_by_id(doc_id)
+            if not status_doc:
+                return DocumentUpdateResult(
+                    status="not_found",
+                    doc_id=doc_id,
+                    message=f"Document {doc_id} not found.",
+                    status_code=404,
+                )
+            if status_doc.get("status") != DocStatus.PROCESSED:
+                return DocumentUpdateResult(
+                    status="not_allowed",
+                    doc_id=doc_id,
+                    message=f"Document {doc_id} is not processed (status: {status_doc.get('status')}), delete and insert it instead",
+                    status_code=409,
+                )
+
+            content = sanitize_text_for_encoding(content)
+            file_path = file_path or status_doc.get("file_path") or "unknown_source"
+            old_doc = await self.full_docs.get_by_id(doc_id)
+            if old_doc and old_doc.get("content") == content:
+                return DocumentUpdateResult(
+                    status="unchanged",
+                    doc_id=doc_id,
+                    message=f"Document {doc_id} content is unchanged",
+                    kept_chunks=len(status_doc.get("chunks_list", [])),
+                )
+
+            new_chunks = await self._chunk_document(
+                doc_id,
+                file_path,
+                split_by_character,
+                split_by_character_only,
+                content=content,
+            )
+            old_chunk_ids = set(status_doc.get("chunks_list", []))
+            removed_chunk_ids = old_chunk_ids - set(new_chunks)
+            added_chunks = {
+                chunk_id: chunk
+                for chunk_id, chunk in new_chunks.items()
+                if chunk_id not in old_chunk_ids
+            }
+            kept_chunk_ids = [
+                chunk_id for chunk_id in new_chunks if chunk_id in old_chunk_ids
+            ]
+
+            async with pipeline_status_lock:
+                log_message = (
+                    f"Updating {doc_id}: {len(added_chunks)} added, "
+                    f"{len(removed_chunk_ids)} removed, {len(kept_chunk_ids)} unchanged chunks"
+                )
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+            status_record = {
+                "chunks_count": len(new_chunks),
+                "chunks_list": list(new_chunks.keys()),
+                "content_summary": get_content_summary(content),
+                "content_length": len(content),
+                "created_at": status_doc.get("created_at"),
+                "file_path": file_path,
+                "track_id": track_id or status_doc.get("track_id"),
+            }
+            processing_metadata = {"processing_start_time": processing_start_time}
+            await self.doc_status.upsert(
+                {
+                    doc_id: {
+                        **status_doc,
+                        "status": DocStatus.PROCESSING,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "metadata": processing_metadata,
+                    }
+                }
+            )
+
+            # Entity and relation lists of the old version, kept for what survives
+            old_entities = await self.full_entities.get_by_id(doc_id) or {}
+            old_relations = await self.full_relations.get_by_id(doc_id) or {}
+
+            # Removed chunks are subtracted while full_docs still holds the old
+            # version: a run resuming the document after an interruption here
+            # re-chunks the old content and restores them
+            if removed_chunk_ids:
+                await self._remove_chunks_from_knowledge(
+                    [doc_id], removed_chunk_ids, pipeline_status, pipeline_status_lock
+                )
+
+            await self.full_docs.upsert(
+                {doc_id: {"content": content, "file_path": file_path}}
+            )
+            content_replaced = True
+            await self.doc_status.upsert(
+                {
+                    doc_id: {
+                        **status_record,
+                        "status": DocStatus.PROCESSING,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "metadata": processing_metadata,
+                    }
+                }
+            )
+
+            # Unchanged chunks keep their vectors and LLM cache list, only their
+            # position in the document may have moved
+            if kept_chunk_ids:
+                stored_chunks = await self.text_chunks.get_by_ids(kept_chunk_ids)
+                moved_chunks = {
+                    chunk_id: {
+                        **stored,
+                        "chunk_order_index": new_chunks[chunk_id]["chunk_order_index"],
+                    }
+                    for chunk_id, stored in zip(kept_chunk_ids, stored_chunks)
+                    if stored
+                    and stored.get("chunk_order_index")
+                    != new_chunks[chunk_id]["chunk_order_index"]
+                }
+                if moved_chunks:
+                    await self.text_chunks.upsert(moved_chunks)
+
+            if added_chunks:
+                await asyncio.gather(
+                    self.chunks_vdb.upsert(added_chunks),
+                    self.text_chunks.upsert(added_chunks),
+                )
+                chunk_results = await self._process_extract_entities(
+                    added_chunks, pipeline_status, pipeline_status_lock
+                )
+                await merge_nodes_and_edges(
+                    chunk_results=chunk_results,
+                    knowledge_graph_inst=self.chunk_entity_relation_graph,
+                    entity_vdb=self.entities_vdb,
+                    relationships_vdb=self.relationships_vdb,
+                    global_config=asdict(self),
+                    full_entities_storage=self.full_entities,
+                    full_relations_storage=self.full_relations,
+                    doc_id=doc_id,
+                    pipeline_status=pipeline_status,
+                    pipeline_status_lock=pipeline_status_lock,
+                    llm_response_cache=self.llm_response_cache,
+                    entity_chunks_storage=self.entity_chunks,
+                    relation_chunks_storage=self.relation_chunks,
+                    current_file_number=1,
+                    total_files=1,
+                    file_path=file_path,
+                )
+
+            await self._merge_document_graph_index(doc_id, old_entities, old_relations)
+
+            await self.doc_status.upsert(
+                {
+                    doc_id: {
+                        **status_record,
+                        "status": DocStatus.PROCESSED,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "metadata": {
+                            "processing_start_time": processing_start_time,
+                            "processing_end_time": int(time.time()),
+                        },
+                    }
+                }
+            )
+            await self._insert_done(pipeline_status, pipeline_status_lock)
+
+            return DocumentUpdateResult(
+                status="success",
+                doc_id=doc_id,
+                message=log_message,
+                added_chunks=len(added_chunks),
+                removed_chunks=len(removed_chunk_ids),
+                kept_chunks=len(kept_chunk_ids),
+            )
+
+        except Exception as e:
+            error_message = f"Error while updating document {doc_id}: {e}"
+            logger.error(error_message)
+            logger.error(traceback.format_exc())
+            if status_doc:
+                # The failed record describes the version held by full_docs, so
+                # a retry re-chunks the content its chunks_list was built from
+                failed_record = (
+                    {**status_doc, **status_record} if content_replaced else status_doc
+                )
+                try:
+                    await self.doc_status.upsert(
+                        {
+                            doc_id: {
+                                **failed_record,
+                                "status": DocStatus.FAILED,
+                                "error_msg": str(e),
+                                "updated_at": datetime.now(timezone.utc).isoformat(),
+                                "metadata": {
+                                    "processing_start_time": processing_start_time,
+                                    "processing_end_time": int(time.time()),
+                                },
+                            }
+                        }
+                    )
+                    await self._insert_done()
+                except Exception as persist_error:
+                    logger.error(
+                        f"Failed to persist data after update attempt for {doc_id}: {persist_error}"
+                    )
+            return DocumentUpdateResult(
+                status="fail",
+                doc_id=doc_id,
+                message=error_message,
+                status_code=500,
+            )
+
+        finally:
+            async with pipeline_status_lock:
+                pipeline_status["busy"] = False
+                pipeline_status["cancellation_requested"] = False
+                completion_msg = f"Update process completed for document: {doc_id}"
+                pipeline_status["latest_message"] = completion_msg
+                pipeline_status["history_messages"].append(completion_msg)
+                logger.info(completion_msg)
+
+    async def _merge_document_graph_index(
+        self, doc_id: str, old_entities: dict, old_relations: dict
+    ) -> None:
+        """Add the old version's entities and relations that still exist to the document's lists
+
+        merge_nodes_and_edges only records what the added chunks produced.
+        """
+        new_entities = await self.full_entities.get_by_id(doc_id) or {}
+        new_relations = await self.full_relations.get_by_id(doc_id) or {}
+
+        old_names = old_entities.get("entity_names", [])
+        existing_nodes = await self.chunk_entity_relation_graph.get_nodes_batch(
+            old_names
+        )
+        entity_names = set(new_entities.get("entity_names", []))
+        entity_names.update(name for name in old_names if name in existing_nodes)
+
+        old_pairs = old_relations.get("relation_pairs", [])
+        existing_edges = await self.chunk_entity_relation_graph.get_edges_batch(
+            [{"src": pair[0], "tgt": pair[1]} for pair in old_pairs]
+        )
+        relation_pairs = {
+            tuple(pair) for pair in new_relations.get("relation_pairs", [])
+        }
+        relation_pairs.update(
+            tuple(pair) for pair in old_pairs if tuple(pair) in existing_edges
+        )
+
+        if entity_names:
+            await self.full_entities.upsert(
+                {
+                    doc_id: {
+                        "entity_names": list(entity_names),
+                        "count": len(entity_names),
+                    }
+                }
+            )
+        else:
+            await self.full_entities.delete([doc_id])
+        if relation_pairs:
+            await self.full_relations.upsert(
+                {
+                    doc_id: {
+                        "relation_pairs": [list(pair) for pair in relation_pairs],
+                        "count": len(relation_pairs),
+                    }
+                }
+            )
+        else:
+            await self.full_relations.delete([doc_id])
+
+    async def _remove_chunks_from_knowledge(
+        self,
+        doc_ids: list[str],
+        chunk_ids: set[str],
+        pipeline_status: dict,
+        pipeline_status_lock: asyncio.Lock,
+    ) -> None:
+        """Delete chunks of documents and subtract them from their entities and relations
+
+        Entities and relations left without source chunks are deleted, the others
+        are rebuilt from their remaining chunks using the cached extraction results.
+        The chunks of all documents are subtracted at once, so an entity shared by
+        several of the documents is rebuilt a single time.
+        """
+        # 4. Analyze entities and relationships that will be affected
+        entities_to_delete = set()
+        entities_to_rebuild = {}  # entity_name -> remaining chunk id list
+        relationships_to_delete = set()
+        relationships_to_rebuild = {}  # (src, tgt) -> remaining chunk id list
+        entity_chunk_updates: dict[str, list[str]] = {}
+        relation_chunk_updates: dict[tuple[str, str], list[str]] = {}
 
-                    if not src or not tgt or "source_id" not in edge_data:
-                        continue
+        try:
+            # Get affected entities and relations from full_entities and full_relations storage
+            doc_entities_list = await self.full_entities.get_by_ids(doc_ids)
+            doc_relations_list = await self.full_relations.get_by_ids(doc_ids)
+            entity_names = list(
+                dict.fromkeys(
+                    name
+                    for data in doc_entities_list
+                    if data
+                    for name in data.get("entity_names", [])
+                )
+            )
+            relation_pairs = list(
+                dict.fromkeys(
+                    tuple(pair)
+                    for data in doc_relations_list
+                    if data
+                    for pair in data.get("relation_pairs", [])
+                )
+            )
 
-                    edge_tuple = tuple(sorted((src, tgt)))
-                    if (
-                        edge_tuple in relationships_to_delete
-                        or edge_tuple in relationships_to_rebuild
-                    ):
-                        continue
+            affected_nodes = []
+            affected_edges = []
 
-                    existing_sources: list[str] = []
-                    if self.relation_chunks:
-                        storage_key = make_relation_chunk_key(src, tgt)
-                        stored_chunks = await self.relation_chunks.get_by_id(
-                            storage_key
+            # Get entity data from graph storage using entity names from full_entities
+            if entity_names:
+                # get_nodes_batch returns dict[str, dict], need to convert to list[dict]
+                nodes_dict = await self.chunk_entity_relation_graph.get_nodes_batch(
+                    entity_names
+                )
+                for entity_name in entity_names:
+                    node_data = nodes_dict.get(entity_name)
+                    if node_data:
+                        # Ensure compatibility with existing logic that expects "id" field
+                        if "id" not in node_data:
+                            node_data["id"] = entity_name
+                        affected_nodes.append(node_data)
+
+            # Get relation data from graph storage using relation pairs from full_relations
+            if relation_pairs:
+                edge_pairs_dicts = [
+                    {"src": pair[0], "tgt": pair[1]} for pair in relation_pairs
+                ]
+                # get_edges_batch returns dict[tuple[str, str], dict], need to convert to list[dict]
+                edges_dict = await self.chunk_entity_relation_graph.get_edges_batch(
+                    edge_pairs_dicts
+                )
+
+                for pair in relation_pairs:
+                    src, tgt = pair[0], pair[1]
+                    edge_key = (src, tgt)
+                    edge_data = edges_dict.get(edge_key)
+                    if edge_data:
+                        # Ensure compatibility with existing logic that expects "source" and "target" fields
+                        if "source" not in edge_data:
+                            edge_data["source"] = src
+                        if "target" not in edge_data:
+                            edge_data["target"] = tgt
+                        affected_edges.append(edge_data)
+
+        except Exception as e:
+            logger.error(f"Failed to analyze affected graph elements: {e}")
+            raise Exception(f"Failed to analyze graph dependencies: {e}") from e
+
+        try:
+            # Fetch the chunk tracking records of all affected elements at once
+            stored_entity_chunks = {}
+            if self.entity_chunks and affected_nodes:
+                labels = [node.get("entity_id") or "" for node in affected_nodes]
+                stored_entity_chunks = dict(
+                    zip(labels, await self.entity_chunks.get_by_ids(labels))
+                )
+            stored_relation_chunks = {}
+            if self.relation_chunks and affected_edges:
+                keys = [
+                    make_relation_chunk_key(edge.get("source"), edge.get("target"))
+                    for edge in affected_edges
+                    if edge.get("source") and edge.get("target")
+                ]
+                stored_relation_chunks = dict(
+                    zip(keys, await self.relation_chunks.get_by_ids(keys))
+                )
+
+            # Process entities
+            for node_data in affected_nodes:
+                node_label = node_data.get("entity_id")
+                if not node_label:
+                    continue
+
+                existing_sources: list[str] = []
+                if self.entity_chunks:
+                    stored_chunks = stored_entity_chunks.get(node_label)
+                    if stored_chunks and isinstance(stored_chunks, dict):
+                        existing_sources = [
+                            chunk_id
+                            for chunk_id in stored_chunks.get("chunk_ids", [])
+                            if chunk_id
+                        ]
+
+                if not existing_sources and node_data.get("source_id"):
+                    existing_sources = [
+                        chunk_id
+                        for chunk_id in node_data["source_id"].split(
+                            GRAPH_FIELD_SEP
                         )
-                        if stored_chunks and isinstance(stored_chunks, dict):
-                            existing_sources = [
-                                chunk_id
-                                for chunk_id in stored_chunks.get("chunk_ids", [])
-                                if chunk_id
-                            ]
+                        if chunk_id
+                    ]
+
+                if not existing_sources:
+                    # No chunk references means this entity should be deleted
+                    entities_to_delete.add(node_label)
+                    entity_chunk_updates[node_label] = []
+                    continue
+
+                remaining_sources = subtract_source_ids(existing_sources, chunk_ids)
+
+                if not remaining_sources:
+                    entities_to_delete.add(node_label)
+                    entity_chunk_updates[node_label] = []
+                elif remaining_sources != existing_sources:
+                    entities_to_rebuild[node_label] = remaining_sources
+                    entity_chunk_updates[node_label] = remaining_sources
+                else:
+                    logger.info(f"Untouch entity: {node_label}")
+
+            async with pipeline_status_lock:
+                log_message = f"Found {len(entities_to_rebuild)} affected entities"
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+            # Process relationships
+            for edge_data in affected_edges:
+                # source target is not in normalize order in graph db property
+                src = edge_data.get("source")
+                tgt = edge_data.get("target")
 
-                    if not existing_sources:
+                if not src or not tgt or "source_id" not in edge_data:
+                    continue
+
+                edge_tuple = tuple(sorted((src, tgt)))
+                if (
+                    edge_tuple in relationships_to_delete
+                    or edge_tuple in relationships_to_rebuild
+                ):
+                    continue
+
+                existing_sources: list[str] = []
+                if self.relation_chunks:
+                    storage_key = make_relation_chunk_key(src, tgt)
+                    stored_chunks = stored_relation_chunks.get(storage_key)
+                    if stored_chunks and isinstance(stored_chunks, dict):
                         existing_sources = [
                             chunk_id
-                            for chunk_id in edge_data["source_id"].split(
-                                GRAPH_FIELD_SEP
-                            )
+                            for chunk_id in stored_chunks.get("chunk_ids", [])
                             if chunk_id
                         ]
 
-                    if not existing_sources:
-                        # No chunk references means this relationship should be deleted
-                        relationships_to_delete.add(edge_tuple)
-                        relation_chunk_updates[edge_tuple] = []
+                if not existing_sources:
+                    existing_sources = [
+                        chunk_id
+                        for chunk_id in edge_data["source_id"].split(
+                            GRAPH_FIELD_SEP
+                        )
+                        if chunk_id
+                    ]
+
+                if not existing_sources:
+                    # No chunk references means this relationship should be deleted
+                    relationships_to_delete.add(edge_tuple)
+                    relation_chunk_updates[edge_tuple] = []
+                    continue
+
+                remaining_sources = subtract_source_ids(existing_sources, chunk_ids)
+
+                if not remaining_sources:
+                    relationships_to_delete.add(edge_tuple)
+                    relation_chunk_updates[edge_tuple] = []
+                elif remaining_sources != existing_sources:
+                    relationships_to_rebuild[edge_tuple] = remaining_sources
+                    relation_chunk_updates[edge_tuple] = remaining_sources
+                else:
+                    logger.info(f"Untouch relation: {edge_tuple}")
+
+            async with pipeline_status_lock:
+                log_message = (
+                    f"Found {len(relationships_to_rebuild)} affected relations"
+                )
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+            current_time = int(time.time())
+
+            if entity_chunk_updates and self.entity_chunks:
+                entity_upsert_payload = {}
+                for entity_name, remaining in entity_chunk_updates.items():
+                    if not remaining:
+                        # Empty entities are deleted alongside graph nodes later
+                        continue
+                    entity_upsert_payload[entity_name] = {
+                        "chunk_ids": remaining,
+                        "count": len(remaining),
+                        "updated_at": current_time,
+                    }
+                if entity_upsert_payload:
+                    await self.entity_chunks.upsert(entity_upsert_payload)
+
+            if relation_chunk_updates and self.relation_chunks:
+                relation_upsert_payload = {}
+                for edge_tuple, remaining in relation_chunk_updates.items():
+                    if not remaining:
+                        # Empty relations are deleted alongside graph edges later
                         continue
+                    storage_key = make_relation_chunk_key(*edge_tuple)
+                    relation_upsert_payload[storage_key] = {
+                        "chunk_ids": remaining,
+                        "count": len(remaining),
+                        "updated_at": current_time,
+                    }
 
-                    remaining_sources = subtract_source_ids(existing_sources, chunk_ids)
+                if relation_upsert_payload:
+                    await self.relation_chunks.upsert(relation_upsert_payload)
 
-                    if not remaining_sources:
-                        relationships_to_delete.add(edge_tuple)
-                        relation_chunk_updates[edge_tuple] = []
-                    elif remaining_sources != existing_sources:
-                        relationships_to_rebuild[edge_tuple] = remaining_sources
-                        relation_chunk_updates[edge_tuple] = remaining_sources
-                    else:
-                        logger.info(f"Untouch relation: {edge_tuple}")
+        except Exception as e:
+            logger.error(f"Failed to process graph analysis results: {e}")
+            raise Exception(f"Failed to process graph dependencies: {e}") from e
+
+        # Data integrity is ensured by allowing only one process to hold pipeline at a time（no graph db lock is needed anymore)
+
+        # 5. Delete chunks from storage
+        if chunk_ids:
+            try:
+                await self.chunks_vdb.delete(chunk_ids)
+                await self.text_chunks.delete(chunk_ids)
 
                 async with pipeline_status_lock:
                     log_message = (
-                        f"Found {len(relationships_to_rebuild)} affected relations"
+                        f"Successfully deleted {len(chunk_ids)} chunks from storage"
                     )
                     logger.info(log_message)
                     pipeline_status["latest_message"] = log_message
                     pipeline_status["history_messages"].append(log_message)
 
-                current_time = int(time.time())
-
-                if entity_chunk_updates and self.entity_chunks:
-                    entity_upsert_payload = {}
-                    for entity_name, remaining in entity_chunk_updates.items():
-                        if not remaining:
-                            # Empty entities are deleted alongside graph nodes later
-                            continue
-                        entity_upsert_payload[entity_name] = {
-                            "chunk_ids": remaining,
-                            "count": len(remaining),
-                            "updated_at": current_time,
-                        }
-                    if entity_upsert_payload:
-                        await self.entity_chunks.upsert(entity_upsert_payload)
-
-                if relation_chunk_updates and self.relation_chunks:
-                    relation_upsert_payload = {}
-                    for edge_tuple, remaining in relation_chunk_updates.items():
-                        if not remaining:
-                            # Empty relations are deleted alongside graph edges later
-                            continue
-                        storage_key = make_relation_chunk_key(*edge_tuple)
-                        relation_upsert_payload[storage_key] = {
-                            "chunk_ids": remaining,
-                            "count": len(remaining),
-                            "updated_at": current_time,
-                        }
+            except Exception as e:
+                logger.error(f"Failed to delete chunks: {e}")
+                raise Exception(f"Failed to delete document chunks: {e}") from e
 
-                    if relation_upsert_payload:
-                        await self.relation_chunks.upsert(relation_upsert_payload)
+        # 6. Delete relationships that have no remaining sources
+        if relationships_to_delete:
+            try:
+                # Delete from relation vdb
+                rel_ids_to_delete = []
+                for src, tgt in relationships_to_delete:
+                    rel_ids_to_delete.extend(
+                        [
+                            compute_mdhash_id(src + tgt, prefix="rel-"),
+                            compute_mdhash_id(tgt + src, prefix="rel-"),
+                        ]
+                    )
+                await self.relationships_vdb.delete(rel_ids_to_delete)
 
-            except Exception as e:
-                logger.error(f"Failed to process graph analysis results: {e}")
-                raise Exception(f"Failed to process graph dependencies: {e}") from e
+                # Delete from graph
+                await self.chunk_entity_relation_graph.remove_edges(
+                    list(relationships_to_delete)
+                )
 
-            # Data integrity is ensured by allowing only one process to hold pipeline at a time（no graph db lock is needed anymore)
+                # Delete from relation_chunks storage
+                if self.relation_chunks:
+                    relation_storage_keys = [
+                        make_relation_chunk_key(src, tgt)
+                        for src, tgt in relationships_to_delete
+                    ]
+                    await self.relation_chunks.delete(relation_storage_keys)
 
-            # 5. Delete chunks from storage
-            if chunk_ids:
-                try:
-                    await self.chunks_vdb.delete(chunk_ids)
-                    await self.text_chunks.delete(chunk_ids)
+                async with pipeline_status_lock:
+                    log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
+                    logger.info(log_message)
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
 
-                    async with pipeline_status_lock:
-                        log_message = (
-                            f"Successfully deleted {len(chunk_ids)} chunks from storage"
-                        )
-                        logger.info(log_message)
-                        pipeline_status["latest_message"] = log_message
-                        pipeline_status["history_messages"].append(log_message)
+            except Exception as e:
+                logger.error(f"Failed to delete relationships: {e}")
+                raise Exception(f"Failed to delete relationships: {e}") from e
 
-                except Exception as e:
-                    logger.error(f"Failed to delete chunks: {e}")
-                    raise Exception(f"Failed to delete document chunks: {e}") from e
+        # 7. Delete entities that have no remaining sources
+        if entities_to_delete:
+            try:
+                # Batch get all edges for entities to avoid N+1 query problem
+                nodes_edges_dict = (
+                    await self.chunk_entity_relation_graph.get_nodes_edges_batch(
+                        list(entities_to_delete)
+                    )
+                )
 
-            # 6. Delete relationships that have no remaining sources
-            if relationships_to_delete:
-                try:
-                    # Delete from relation vdb
+                # Debug: Check and log all edges before deleting nodes
+                edges_to_delete = set()
+                edges_still_exist = 0
+
+                for entity, edges in nodes_edges_dict.items():
+                    if edges:
+                        for src, tgt in edges:
+                            # Normalize edge representation (sorted for consistency)
+                            edge_tuple = tuple(sorted((src, tgt)))
+                            edges_to_delete.add(edge_tuple)
+
+                            if (
+                                src in entities_to_delete
+                                and tgt in entities_to_delete
+                            ):
+                                logger.warning(
+                                    f"Edge still exists: {src} <-> {tgt}"
+                                )
+                            elif src in entities_to_delete:
+                                logger.warning(
+                                    f"Edge still exists: {src} --> {tgt}"
+                                )
+                            else:
+                                logger.warning(
+                                    f"Edge still exists: {src} <-- {tgt}"
+                                )
+                        edges_still_exist += 1
+
+                if edges_still_exist:
+                    logger.warning(
+                        f"⚠️ {edges_still_exist} entities still has edges before deletion"
+                    )
+
+                # Clean residual edges from VDB and storage before deleting nodes
+                if edges_to_delete:
+                    # Delete from relationships_vdb
                     rel_ids_to_delete = []
-                    for src, tgt in relationships_to_delete:
+                    for src, tgt in edges_to_delete:
                         rel_ids_to_delete.extend(
                             [
                                 compute_mdhash_id(src + tgt, prefix="rel-"),
@@ -3436,243 +5171,70 @@ class LightRAG:
                         )
                     await self.relationships_vdb.delete(rel_ids_to_delete)
 
-                    # Delete from graph
-                    await self.chunk_entity_relation_graph.remove_edges(
-                        list(relationships_to_delete)
-                    )
-
                     # Delete from relation_chunks storage
                     if self.relation_chunks:
                         relation_storage_keys = [
                             make_relation_chunk_key(src, tgt)
-                            for src, tgt in relationships_to_delete
+                            for src, tgt in edges_to_delete
                         ]
                         await self.relation_chunks.delete(relation_storage_keys)
 
-                    async with pipeline_status_lock:
-                        log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
-                        logger.info(log_message)
-                        pipeline_status["latest_message"] = log_message
-                        pipeline_status["history_messages"].append(log_message)
-
-                except Exception as e:
-                    logger.error(f"Failed to delete relationships: {e}")
-                    raise Exception(f"Failed to delete relationships: {e}") from e
-
-            # 7. Delete entities that have no remaining sources
-            if entities_to_delete:
-                try:
-                    # Batch get all edges for entities to avoid N+1 query problem
-                    nodes_edges_dict = (
-                        await self.chunk_entity_relation_graph.get_nodes_edges_batch(
-                            list(entities_to_delete)
-                        )
-                    )
-
-                    # Debug: Check and log all edges before deleting nodes
-                    edges_to_delete = set()
-                    edges_still_exist = 0
-
-                    for entity, edges in nodes_edges_dict.items():
-                        if edges:
-                            for src, tgt in edges:
-                                # Normalize edge representation (sorted for consistency)
-                                edge_tuple = tuple(sorted((src, tgt)))
-                                edges_to_delete.add(edge_tuple)
-
-                                if (
-                                    src in entities_to_delete
-                                    and tgt in entities_to_delete
-                                ):
-                                    logger.warning(
-                                        f"Edge still exists: {src} <-> {tgt}"
-                                    )
-                                elif src in entities_to_delete:
-                                    logger.warning(
-                                        f"Edge still exists: {src} --> {tgt}"
-                                    )
-                                else:
-                                    logger.warning(
-                                        f"Edge still exists: {src} <-- {tgt}"
-                                    )
-                            edges_still_exist += 1
-
-                    if edges_still_exist:
-                        logger.warning(
-                            f"⚠️ {edges_still_exist} entities still has edges before deletion"
-                        )
-
-                    # Clean residual edges from VDB and storage before deleting nodes
-                    if edges_to_delete:
-                        # Delete from relationships_vdb
-                        rel_ids_to_delete = []
-                        for src, tgt in edges_to_delete:
-                            rel_ids_to_delete.extend(
-                                [
-                                    compute_mdhash_id(src + tgt, prefix="rel-"),
-                                    compute_mdhash_id(tgt + src, prefix="rel-"),
-                                ]
-                            )
-                        await self.relationships_vdb.delete(rel_ids_to_delete)
-
-                        # Delete from relation_chunks storage
-                        if self.relation_chunks:
-                            relation_storage_keys = [
-                                make_relation_chunk_key(src, tgt)
-                                for src, tgt in edges_to_delete
-                            ]
-                            await self.relation_chunks.delete(relation_storage_keys)
-
-                        logger.info(
-                            f"Cleaned {len(edges_to_delete)} residual edges from VDB and chunk-tracking storage"
-                        )
-
-                    # Delete from graph (edges will be auto-deleted with nodes)
-                    await self.chunk_entity_relation_graph.remove_nodes(
-                        list(entities_to_delete)
+                    logger.info(
+                        f"Cleaned {len(edges_to_delete)} residual edges from VDB and chunk-tracking storage"
                     )
 
-                    # Delete from vector vdb
-                    entity_vdb_ids = [
-                        compute_mdhash_id(entity, prefix="ent-")
-                        for entity in entities_to_delete
-                    ]
-                    await self.entities_vdb.delete(entity_vdb_ids)
-
-                    # Delete from entity_chunks storage
-                    if self.entity_chunks:
-                        await self.entity_chunks.delete(list(entities_to_delete))
-
-                    async with pipeline_status_lock:
-                        log_message = (
-                            f"Successfully deleted {len(entities_to_delete)} entities"
-                        )
-                        logger.info(log_message)
-                        pipeline_status["latest_message"] = log_message
-                        pipeline_status["history_messages"].append(log_message)
+                # Delete from graph (edges will be auto-deleted with nodes)
+                await self.chunk_entity_relation_graph.remove_nodes(
+                    list(entities_to_delete)
+                )
 
-                except Exception as e:
-                    logger.error(f"Failed to delete entities: {e}")
-                    raise Exception(f"Failed to delete entities: {e}") from e
+                # Delete from vector vdb
+                entity_vdb_ids = [
+                    compute_mdhash_id(entity, prefix="ent-")
+                    for entity in entities_to_delete
+                ]
+                await self.entities_vdb.delete(entity_vdb_ids)
 
-            # Persist changes to graph database before entity and relationship rebuild
-            await self._insert_done()
+                # Delete from entity_chunks storage
+                if self.entity_chunks:
+                    await self.entity_chunks.delete(list(entities_to_delete))
 
-            # 8. Rebuild entities and relationships from remaining chunks
-            if entities_to_rebuild or relationships_to_rebuild:
-                try:
-                    await rebuild_knowledge_from_chunks(
-                        entities_to_rebuild=entities_to_rebuild,
-                        relationships_to_rebuild=relationships_to_rebuild,
-                        knowledge_graph_inst=self.chunk_entity_relation_graph,
-                        entities_vdb=self.entities_vdb,
-                        relationships_vdb=self.relationships_vdb,
-                        text_chunks_storage=self.text_chunks,
-                        llm_response_cache=self.llm_response_cache,
-                        global_config=asdict(self),
-                        pipeline_status=pipeline_status,
-                        pipeline_status_lock=pipeline_status_lock,
-                        entity_chunks_storage=self.entity_chunks,
-                        relation_chunks_storage=self.relation_chunks,
+                async with pipeline_status_lock:
+                    log_message = (
+                        f"Successfully deleted {len(entities_to_delete)} entities"
                     )
+                    logger.info(log_message)
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
 
-                except Exception as e:
-                    logger.error(f"Failed to rebuild knowledge from chunks: {e}")
-                    raise Exception(f"Failed to rebuild knowledge graph: {e}") from e
-
-            # 9. Delete from full_entities and full_relations storage
-            try:
-                await self.full_entities.delete([doc_id])
-                await self.full_relations.delete([doc_id])
-            except Exception as e:
-                logger.error(f"Failed to delete from full_entities/full_relations: {e}")
-                raise Exception(
-                    f"Failed to delete from full_entities/full_relations: {e}"
-                ) from e
-
-            # 10. Delete original document and status
-            try:
-                await self.full_docs.delete([doc_id])
-                await self.doc_status.delete([doc_id])
             except Exception as e:
-                logger.error(f"Failed to delete document and status: {e}")
-                raise Exception(f"Failed to delete document and status: {e}") from e
-
-            if delete_llm_cache and doc_llm_cache_ids and self.llm_response_cache:
-                try:
-                    await self.llm_response_cache.delete(doc_llm_cache_ids)
-                    cache_log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for document {doc_id}"
-                    logger.info(cache_log_message)
-                    async with pipeline_status_lock:
-                        pipeline_status["latest_message"] = cache_log_message
-                        pipeline_status["history_messages"].append(cache_log_message)
-                    log_message = cache_log_message
-                except Exception as cache_delete_error:
-                    log_message = f"Failed to delete LLM cache for document {doc_id}: {cache_delete_error}"
-                    logger.error(log_message)
-                    logger.error(traceback.format_exc())
-                    async with pipeline_status_lock:
-                        pipeline_status["latest_message"] = log_message
-                        pipeline_status["history_messages"].append(log_message)
-
-            return DeletionResult(
-                status="success",
-                doc_id=doc_id,
-                message=log_message,
-                status_code=200,
-                file_path=file_path,
-            )
-
-        except Exception as e:
-            original_exception = e
-            error_message = f"Error while deleting document {doc_id}: {e}"
-            logger.error(error_message)
-            logger.error(traceback.format_exc())
-            return DeletionResult(
-                status="fail",
-                doc_id=doc_id,
-                message=error_message,
-                status_code=500,
-                file_path=file_path,
-            )
+                logger.error(f"Failed to delete entities: {e}")
+                raise Exception(f"Failed to delete entities: {e}") from e
 
-        finally:
-            # ALWAYS ensure persistence if any deletion operations were started
-            if deletion_operations_started:
-                try:
-                    await self._insert_done()
-                except Exception as persistence_error:
-                    persistence_error_msg = f"Failed to persist data after deletion attempt for {doc_id}: {persistence_error}"
-                    logger.error(persistence_error_msg)
-                    logger.error(traceback.format_exc())
+        # Persist changes to graph database before entity and relationship rebuild
+        await self._insert_done()
 
-                    # If there was no original exception, this persistence error becomes the main error
-                    if original_exception is None:
-                        return DeletionResult(
-                            status="fail",
-                            doc_id=doc_id,
-                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
-                            status_code=500,
-                            file_path=file_path,
-                        )
-                    # If there was an original exception, log the persistence error but don't override the original error
-                    # The original error result was already returned in the except block
-            else:
-                logger.debug(
-                    f"No deletion operations were started for document {doc_id}, skipping persistence"
+        # 8. Rebuild entities and relationships from remaining chunks
+        if entities_to_rebuild or relationships_to_rebuild:
+            try:
+                await rebuild_knowledge_from_chunks(
+                    entities_to_rebuild=entities_to_rebuild,
+                    relationships_to_rebuild=relationships_to_rebuild,
+                    knowledge_graph_inst=self.chunk_entity_relation_graph,
+                    entities_vdb=self.entities_vdb,
+                    relationships_vdb=self.relationships_vdb,
+                    text_chunks_storage=self.text_chunks,
+                    llm_response_cache=self.llm_response_cache,
+                    global_config=asdict(self),
+                    pipeline_status=pipeline_status,
+                    pipeline_status_lock=pipeline_status_lock,
+                    entity_chunks_storage=self.entity_chunks,
+                    relation_chunks_storage=self.relation_chunks,
                 )
 
-            # Release pipeline only if WE acquired it
-            if we_acquired_pipeline:
-                async with pipeline_status_lock:
-                    pipeline_status["busy"] = False
-                    pipeline_status["cancellation_requested"] = False
-                    completion_msg = (
-                        f"Deletion process completed for document: {doc_id}"
-                    )
-                    pipeline_status["latest_message"] = completion_msg
-                    pipeline_status["history_messages"].append(completion_msg)
-                    logger.info(completion_msg)
+            except Exception as e:
+                logger.error(f"Failed to rebuild knowledge from chunks: {e}")
+                raise Exception(f"Failed to rebuild knowledge graph: {e}") from e
 
     async def adelete_by_entity(self, entity_name: str) -> DeletionResult:
         """Asynchronously delete an entity and all its relationships.
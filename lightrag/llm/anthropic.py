@@ -25,6 +25,7 @@ from anthropic import (
     APIConnectionError,
     RateLimitError,
     APITimeoutError,
+    DefaultAsyncHttpxClient,
 )
 from tenacity import (
     retry,
@@ -35,8 +36,10 @@ from tenacity import (
 from lightrag.utils import (
     safe_unicode_decode,
     logger,
+    CacheablePrompt,
 )
 from lightrag.api import __api_version__
+from lightrag.llm.client_pool import get_pooled_client, httpx_pool_options, secret_key
 
 
 # Custom exception for retry mechanism
@@ -46,6 +49,77 @@ class InvalidResponseError(Exception):
     pass
 
 
+def get_anthropic_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    timeout: float | None = None,
+) -> AsyncAnthropic:
+    """Get a pooled AsyncAnthropic client, shared by calls with the same configuration"""
+
+    def factory() -> AsyncAnthropic:
+        default_headers = {
+            "User-Agent": f"Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_8) LightRAG/{__api_version__}",
+            "Content-Type": "application/json",
+        }
+        client_kwargs = {
+            "default_headers": default_headers,
+            "api_key": api_key,
+            "timeout": timeout,
+            "http_client": DefaultAsyncHttpxClient(**httpx_pool_options()),
+        }
+        if base_url is not None:
+            client_kwargs["base_url"] = base_url
+        return AsyncAnthropic(**client_kwargs)
+
+    async def close(client: AsyncAnthropic) -> None:
+        await client.close()
+
+    return get_pooled_client(
+        "anthropic", (base_url, secret_key(api_key), timeout), factory, close
+    )
+
+
+def _system_blocks(system_prompt: str) -> str | list[dict[str, Any]]:
+    """System prompt for the Messages API, with the static prefix marked for prompt caching"""
+    if not isinstance(system_prompt, CacheablePrompt):
+        return system_prompt
+    if not system_prompt.cache_prefix_len:
+        return str(system_prompt)
+    blocks: list[dict[str, Any]] = [
+        {
+            "type": "text",
+            "text": system_prompt.static_prefix,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    if system_prompt.dynamic_suffix:
+        blocks.append({"type": "text", "text": system_prompt.dynamic_suffix})
+    return blocks
+
+
+def _collect_usage(event: Any, usage: dict[str, int]) -> None:
+    """Accumulate token usage from message_start/message_delta stream events"""
+    event_usage = getattr(event, "usage", None) or getattr(
+        getattr(event, "message", None), "usage", None
+    )
+    if event_usage is None:
+        return
+    input_tokens = getattr(event_usage, "input_tokens", None) or 0
+    cache_read = getattr(event_usage, "cache_read_input_tokens", None) or 0
+    cache_creation = getattr(event_usage, "cache_creation_input_tokens", None) or 0
+    output_tokens = getattr(event_usage, "output_tokens", None) or 0
+    if input_tokens or cache_read or cache_creation:
+        # input_tokens excludes the tokens read from or written to the prompt cache
+        usage["prompt_tokens"] = input_tokens + cache_read + cache_creation
+        usage["cached_tokens"] = cache_read
+        usage["cache_creation_tokens"] = cache_creation
+    if output_tokens:
+        usage["completion_tokens"] = output_tokens
+    usage["total_tokens"] = usage.get("prompt_tokens", 0) + usage.get(
+        "completion_tokens", 0
+    )
+
+
 # Core Anthropic completion function with retry
 @retry(
     stop=stop_after_attempt(3),
@@ -62,6 +136,7 @@ async def anthropic_complete_if_cache(
     enable_cot: bool = False,
     base_url: str | None = None,
     api_key: str | None = None,
+    token_tracker: Any | None = None,
     **kwargs: Any,
 ) -> Union[str, AsyncIterator[str]]:
     if history_messages is None:
@@ -73,11 +148,6 @@ async def anthropic_complete_if_cache(
     if not api_key:
         api_key = os.environ.get("ANTHROPIC_API_KEY")
 
-    default_headers = {
-        "User-Agent": f"Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_8) LightRAG/{__api_version__}",
-        "Content-Type": "application/json",
-    }
-
     # Set logger level to INFO when VERBOSE_DEBUG is off
     if not VERBOSE_DEBUG and logger.level == logging.DEBUG:
         logging.getLogger("anthropic").setLevel(logging.INFO)
@@ -86,22 +156,13 @@ async def anthropic_complete_if_cache(
     kwargs.pop("keyword_extraction", None)
     timeout = kwargs.pop("timeout", None)
 
-    anthropic_async_client = (
-        AsyncAnthropic(
-            default_headers=default_headers, api_key=api_key, timeout=timeout
-        )
-        if base_url is None
-        else AsyncAnthropic(
-            base_url=base_url,
-            default_headers=default_headers,
-            api_key=api_key,
-            timeout=timeout,
-        )
+    anthropic_async_client = get_anthropic_async_client(
+        api_key=api_key, base_url=base_url, timeout=timeout
     )
 
-    messages: list[dict[str, Any]] = []
     if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
+        kwargs["system"] = _system_blocks(system_prompt)
+    messages: list[dict[str, Any]] = []
     messages.extend(history_messages)
     messages.append({"role": "user", "content": prompt})
 
@@ -131,14 +192,13 @@ async def anthropic_complete_if_cache(
         raise
 
     async def stream_response():
+        usage: dict[str, int] = {}
         try:
             async for event in response:
-                content = (
-                    event.delta.text
-                    if hasattr(event, "delta") and event.delta.text
-                    else None
-                )
-                if content is None:
+                if event.type in ("message_start", "message_delta"):
+                    _collect_usage(event, usage)
+                content = getattr(getattr(event, "delta", None), "text", None)
+                if not content:
                     continue
                 if r"\u" in content:
                     content = safe_unicode_decode(content.encode("utf-8"))
@@ -146,6 +206,8 @@ async def anthropic_complete_if_cache(
         except Exception as e:
             logger.error(f"Error in stream response: {str(e)}")
             raise
+        if token_tracker and usage:
+            token_tracker.add_usage(usage)
 
     return stream_response()
 
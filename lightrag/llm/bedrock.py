@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import os
 import json
@@ -17,6 +18,7 @@ from tenacity import (
 )
 
 import sys
+from lightrag.llm.client_pool import get_pooled_client, pool_limits, secret_key
 from lightrag.utils import wrap_embedding_func_with_attrs
 
 if sys.version_info < (3, 9):
@@ -55,6 +57,67 @@ class BedrockTimeoutError(BedrockError):
     """Error for timeout issues"""
 
 
+class _BedrockClient:
+    """Bedrock runtime client of one session, opened on first use and kept open
+
+    aioboto3 clients are async context managers, so the client is entered
+    lazily under a lock; a failed attempt leaves it to be opened by the next call.
+    """
+
+    def __init__(self, session: "aioboto3.Session"):
+        self._session = session
+        self._client = None
+        self._lock = asyncio.Lock()
+
+    async def get(self):
+        async with self._lock:
+            if self._client is None:
+                from botocore.config import Config
+
+                self._client = await self._session.client(
+                    "bedrock-runtime",
+                    config=Config(
+                        max_pool_connections=pool_limits()["max_connections"]
+                    ),
+                ).__aenter__()
+            return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.__aexit__(None, None, None)
+
+
+async def _get_bedrock_client(
+    region: str | None,
+    access_key: str | None,
+    secret_access_key: str | None,
+    session_token: str | None,
+):
+    """Get a pooled bedrock-runtime client, shared by calls with the same region and credentials"""
+
+    def factory() -> _BedrockClient:
+        return _BedrockClient(
+            aioboto3.Session(
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_access_key,
+                aws_session_token=session_token,
+                region_name=region,
+            )
+        )
+
+    async def close(client: _BedrockClient) -> None:
+        await client.close()
+
+    key = (
+        region,
+        access_key,
+        secret_key(secret_access_key),
+        secret_key(session_token),
+    )
+    return await get_pooled_client("bedrock", key, factory, close).get()
+
+
 def _set_env_if_present(key: str, value):
     """Set environment variable only if a non-empty value is provided."""
     if value is not None and value != "":
@@ -223,22 +286,15 @@ async def bedrock_complete_if_cache(
 
     # For streaming responses, we need a different approach to keep the connection open
     if stream:
-        # Create a session that will be used throughout the streaming process
-        session = aioboto3.Session()
-        client = None
-
-        # Define the generator function that will manage the client lifecycle
+        # The pooled client stays open after the stream, only the stream is closed
         async def stream_generator():
-            nonlocal client
-
-            # Create the client outside the generator to ensure it stays open
-            client = await session.client(
-                "bedrock-runtime", region_name=region
-            ).__aenter__()
             event_stream = None
             iteration_started = False
 
             try:
+                client = await _get_bedrock_client(
+                    region, access_key, secret_key, session_token
+                )
                 # Make the API call
                 response = await client.converse_stream(**args, **kwargs)
                 event_stream = response.get("stream")
@@ -292,47 +348,37 @@ async def bedrock_complete_if_cache(
                             f"Failed to close Bedrock event stream in finally block: {close_error}"
                         )
 
-                # Clean up the client
-                if client:
-                    try:
-                        await client.__aexit__(None, None, None)
-                    except Exception as client_close_error:
-                        logging.warning(
-                            f"Failed to close Bedrock client: {client_close_error}"
-                        )
-
         # Return the generator that manages its own lifecycle
         return stream_generator()
 
-    # For non-streaming responses, use the standard async context manager pattern
-    session = aioboto3.Session()
-    async with session.client(
-        "bedrock-runtime", region_name=region
-    ) as bedrock_async_client:
-        try:
-            # Use converse for non-streaming responses
-            response = await bedrock_async_client.converse(**args, **kwargs)
+    # For non-streaming responses, call the pooled client directly
+    try:
+        bedrock_async_client = await _get_bedrock_client(
+            region, access_key, secret_key, session_token
+        )
+        # Use converse for non-streaming responses
+        response = await bedrock_async_client.converse(**args, **kwargs)
 
-            # Validate response structure
-            if (
-                not response
-                or "output" not in response
-                or "message" not in response["output"]
-                or "content" not in response["output"]["message"]
-                or not response["output"]["message"]["content"]
-            ):
-                raise BedrockError("Invalid response structure from Bedrock API")
+        # Validate response structure
+        if (
+            not response
+            or "output" not in response
+            or "message" not in response["output"]
+            or "content" not in response["output"]["message"]
+            or not response["output"]["message"]["content"]
+        ):
+            raise BedrockError("Invalid response structure from Bedrock API")
 
-            content = response["output"]["message"]["content"][0]["text"]
+        content = response["output"]["message"]["content"][0]["text"]
 
-            if not content or content.strip() == "":
-                raise BedrockError("Received empty content from Bedrock API")
+        if not content or content.strip() == "":
+            raise BedrockError("Received empty content from Bedrock API")
 
-            return content
+        return content
 
-        except Exception as e:
-            # Convert to appropriate exception type
-            _handle_bedrock_exception(e, "Bedrock converse")
+    except Exception as e:
+        # Convert to appropriate exception type
+        _handle_bedrock_exception(e, "Bedrock converse")
 
 
 # Generic Bedrock completion function
@@ -381,105 +427,102 @@ async def bedrock_embed(
     # Region handling: prefer env
     region = os.environ.get("AWS_REGION")
 
-    session = aioboto3.Session()
-    async with session.client(
-        "bedrock-runtime", region_name=region
-    ) as bedrock_async_client:
-        try:
-            if (model_provider := model.split(".")[0]) == "amazon":
-                embed_texts = []
-                for text in texts:
-                    try:
-                        if "v2" in model:
-                            body = json.dumps(
-                                {
-                                    "inputText": text,
-                                    # 'dimensions': embedding_dim,
-                                    "embeddingTypes": ["float"],
-                                }
-                            )
-                        elif "v1" in model:
-                            body = json.dumps({"inputText": text})
-                        else:
-                            raise BedrockError(f"Model {model} is not supported!")
-
-                        response = await bedrock_async_client.invoke_model(
-                            modelId=model,
-                            body=body,
-                            accept="application/json",
-                            contentType="application/json",
-                        )
-
-                        response_body = await response.get("body").json()
-
-                        # Validate response structure
-                        if not response_body or "embedding" not in response_body:
-                            raise BedrockError(
-                                f"Invalid embedding response structure for text: {text[:50]}..."
-                            )
-
-                        embedding = response_body["embedding"]
-                        if not embedding:
-                            raise BedrockError(
-                                f"Received empty embedding for text: {text[:50]}..."
-                            )
-
-                        embed_texts.append(embedding)
-
-                    except Exception as e:
-                        # Convert to appropriate exception type
-                        _handle_bedrock_exception(
-                            e, "Bedrock embedding (amazon, text chunk)"
-                        )
-
-            elif model_provider == "cohere":
+    try:
+        bedrock_async_client = await _get_bedrock_client(
+            region, access_key, secret_key, session_token
+        )
+        if (model_provider := model.split(".")[0]) == "amazon":
+            embed_texts = []
+            for text in texts:
                 try:
-                    body = json.dumps(
-                        {
-                            "texts": texts,
-                            "input_type": "search_document",
-                            "truncate": "NONE",
-                        }
-                    )
+                    if "v2" in model:
+                        body = json.dumps(
+                            {
+                                "inputText": text,
+                                # 'dimensions': embedding_dim,
+                                "embeddingTypes": ["float"],
+                            }
+                        )
+                    elif "v1" in model:
+                        body = json.dumps({"inputText": text})
+                    else:
+                        raise BedrockError(f"Model {model} is not supported!")
 
                     response = await bedrock_async_client.invoke_model(
-                        model=model,
+                        modelId=model,
                         body=body,
                         accept="application/json",
                         contentType="application/json",
                     )
 
-                    response_body = json.loads(response.get("body").read())
+                    response_body = await response.get("body").json()
 
                     # Validate response structure
-                    if not response_body or "embeddings" not in response_body:
+                    if not response_body or "embedding" not in response_body:
                         raise BedrockError(
-                            "Invalid embedding response structure from Cohere"
+                            f"Invalid embedding response structure for text: {text[:50]}..."
                         )
 
-                    embeddings = response_body["embeddings"]
-                    if not embeddings or len(embeddings) != len(texts):
+                    embedding = response_body["embedding"]
+                    if not embedding:
                         raise BedrockError(
-                            f"Invalid embeddings count: expected {len(texts)}, got {len(embeddings) if embeddings else 0}"
+                            f"Received empty embedding for text: {text[:50]}..."
                         )
 
-                    embed_texts = embeddings
+                    embed_texts.append(embedding)
 
                 except Exception as e:
                     # Convert to appropriate exception type
-                    _handle_bedrock_exception(e, "Bedrock embedding (cohere)")
+                    _handle_bedrock_exception(
+                        e, "Bedrock embedding (amazon, text chunk)"
+                    )
+
+        elif model_provider == "cohere":
+            try:
+                body = json.dumps(
+                    {
+                        "texts": texts,
+                        "input_type": "search_document",
+                        "truncate": "NONE",
+                    }
+                )
 
-            else:
-                raise BedrockError(
-                    f"Model provider '{model_provider}' is not supported!"
+                response = await bedrock_async_client.invoke_model(
+                    model=model,
+                    body=body,
+                    accept="application/json",
+                    contentType="application/json",
                 )
 
-            # Final validation
-            if not embed_texts:
-                raise BedrockError("No embeddings generated")
+                response_body = json.loads(response.get("body").read())
+
+                # Validate response structure
+                if not response_body or "embeddings" not in response_body:
+                    raise BedrockError(
+                        "Invalid embedding response structure from Cohere"
+                    )
+
+                embeddings = response_body["embeddings"]
+                if not embeddings or len(embeddings) != len(texts):
+                    raise BedrockError(
+                        f"Invalid embeddings count: expected {len(texts)}, got {len(embeddings) if embeddings else 0}"
+                    )
+
+                embed_texts = embeddings
+
+            except Exception as e:
+                # Convert to appropriate exception type
+                _handle_bedrock_exception(e, "Bedrock embedding (cohere)")
+
+        else:
+            raise BedrockError(f"Model provider '{model_provider}' is not supported!")
+
+        # Final validation
+        if not embed_texts:
+            raise BedrockError("No embeddings generated")
 
-            return np.array(embed_texts)
+        return np.array(embed_texts)
 
-        except Exception as e:
-            # Convert to appropriate exception type
-            _handle_bedrock_exception(e, "Bedrock embedding")
+    except Exception as e:
+        # Convert to appropriate exception type
+        _handle_bedrock_exception(e, "Bedrock embedding")
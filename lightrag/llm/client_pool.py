@@ -0,0 +1,169 @@
+"""
+Registry of long-lived HTTP clients shared by the LLM, embedding and rerank bindings.
+
+Creating a client per request throws away keep-alive connections, so every
+call pays for a new TCP connection and TLS handshake. Bindings get their
+client from this registry instead. Clients are keyed by binding, base URL and
+API key (plus any option that changes how the client is built) and by the
+running event loop, since aiohttp and httpx connections cannot move between
+loops.
+
+Pool limits are configured through environment variables:
+
+- HTTP_POOL_MAX_CONNECTIONS: connections per client (default 100)
+- HTTP_POOL_MAX_KEEPALIVE: idle connections kept open per client, for aiohttp
+  sessions the connections per host (default 20)
+- HTTP_POOL_KEEPALIVE_EXPIRY: seconds an idle connection is kept (default 30)
+- HTTP_POOL_HTTP2: use HTTP/2 for httpx based clients when the ``h2`` package
+  is installed (default true)
+
+The registry is shared by all LightRAG instances of the process. Each
+instance acquires the pool of its loop in initialize_storages() and releases
+it in finalize_storages(); the clients of a loop are closed when its last
+instance releases them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+from typing import Any, Awaitable, Callable, Hashable
+
+from lightrag.utils import get_env_value, logger
+
+# (loop id, kind, key) -> (loop, client, async close function or None)
+_clients: dict[tuple, tuple[asyncio.AbstractEventLoop, Any, Callable | None]] = {}
+# loop id -> (loop, number of LightRAG instances using the pooled clients)
+_users: dict[int, tuple[asyncio.AbstractEventLoop, int]] = {}
+
+
+def pool_limits() -> dict[str, Any]:
+    """Connection pool settings shared by all pooled clients"""
+    return {
+        "max_connections": get_env_value("HTTP_POOL_MAX_CONNECTIONS", 100, int),
+        "max_keepalive": get_env_value("HTTP_POOL_MAX_KEEPALIVE", 20, int),
+        "keepalive_expiry": get_env_value("HTTP_POOL_KEEPALIVE_EXPIRY", 30.0, float),
+        "http2": get_env_value("HTTP_POOL_HTTP2", True, bool)
+        and importlib.util.find_spec("h2") is not None,
+    }
+
+
+def secret_key(secret: str | None) -> str | None:
+    """Hash secrets used in registry keys so they are not kept in plain text"""
+    if not secret:
+        return None
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def _drop_closed_loops() -> None:
+    for key in [key for key, entry in _clients.items() if entry[0].is_closed()]:
+        # Connections of a closed loop can not be closed gracefully anymore
+        del _clients[key]
+    for loop_id in [
+        loop_id for loop_id, entry in _users.items() if entry[0].is_closed()
+    ]:
+        del _users[loop_id]
+
+
+def get_pooled_client(
+    kind: str,
+    key: Hashable,
+    factory: Callable[[], Any],
+    close: Callable[[Any], Awaitable[None]] | None = None,
+) -> Any:
+    """Return the client registered for (kind, key) on the running loop, creating it once.
+
+    Args:
+        kind: Binding name, e.g. "openai" or "aiohttp"
+        key: Everything that changes how the client is built (base URL, hashed API key, ...)
+        factory: Builds a new client
+        close: Async function closing a client, None if nothing needs closing
+    """
+    loop = asyncio.get_running_loop()
+    full_key = (id(loop), kind, key)
+    entry = _clients.get(full_key)
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+
+    _drop_closed_loops()
+    client = factory()
+    _clients[full_key] = (loop, client, close)
+    logger.debug(f"Created pooled {kind} client ({len(_clients)} pooled clients)")
+    return client
+
+
+def httpx_pool_options() -> dict[str, Any]:
+    """Keyword arguments applying the pool settings to an httpx.AsyncClient"""
+    import httpx
+
+    limits = pool_limits()
+    return {
+        "limits": httpx.Limits(
+            max_connections=limits["max_connections"],
+            max_keepalive_connections=limits["max_keepalive"],
+            keepalive_expiry=limits["keepalive_expiry"],
+        ),
+        "http2": limits["http2"],
+    }
+
+
+def get_aiohttp_session(base_url: str | None, api_key: str | None = None):
+    """Pooled aiohttp.ClientSession for a (base_url, api_key) pair.
+
+    Headers and timeouts are passed per request, the session only owns the
+    connection pool.
+    """
+    import aiohttp
+
+    def factory():
+        limits = pool_limits()
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=limits["max_connections"],
+                limit_per_host=limits["max_keepalive"],
+                keepalive_timeout=limits["keepalive_expiry"],
+            )
+        )
+
+    async def close(session):
+        await session.close()
+
+    return get_pooled_client("aiohttp", (base_url, secret_key(api_key)), factory, close)
+
+
+def acquire_pooled_clients() -> None:
+    """Register a user (a LightRAG instance) of the pooled clients of the running loop"""
+    loop = asyncio.get_running_loop()
+    _drop_closed_loops()
+    _, count = _users.get(id(loop), (loop, 0))
+    _users[id(loop)] = (loop, count + 1)
+
+
+async def release_pooled_clients() -> None:
+    """Release a user of the running loop's clients, closing them when it was the last one"""
+    loop = asyncio.get_running_loop()
+    _drop_closed_loops()
+    _, count = _users.pop(id(loop), (loop, 0))
+    if count > 1:
+        _users[id(loop)] = (loop, count - 1)
+        return
+    await close_pooled_clients()
+
+
+async def close_pooled_clients() -> None:
+    """Close every pooled client created on the running loop"""
+    loop = asyncio.get_running_loop()
+    _drop_closed_loops()
+    for key in [key for key, entry in _clients.items() if entry[0] is loop]:
+        _, client, close = _clients.pop(key)
+        if close is None:
+            continue
+        try:
+            await close(client)
+        except Exception as e:
+            logger.warning(f"Failed to close pooled {key[1]} client: {e}")
+
+
+def pooled_client_count() -> int:
+    return len(_clients)
@@ -0,0 +1,294 @@
+"""
+Load balancing of LLM and embedding calls across several inference endpoints.
+
+A binding function such as ``openai_complete_if_cache`` or ``ollama_embed``
+talks to the single server given by its ``base_url``/``host`` argument.
+EndpointRouter wraps the binding function and fills in that argument for every
+call, so one LightRAG instance can use several servers (e.g. a vLLM or Ollama
+instance per GPU box):
+
+- Calls go to the healthy endpoint with the fewest outstanding requests
+  relative to its weight.
+- Endpoints have a role: ``query`` endpoints serve interactive calls
+  (queue priority <= 5, which LightRAG uses for query-time keyword extraction
+  and answers), ``batch`` endpoints serve everything else (entity extraction,
+  summaries, embeddings during indexing), ``any`` endpoints serve both. When no
+  endpoint with a matching role is healthy, any healthy endpoint is used.
+- After ``failure_threshold`` consecutive failures an endpoint's circuit opens
+  and it receives no calls for ``cooldown`` seconds. Then a single trial call
+  is let through; success closes the circuit again.
+- Connection errors, timeouts, server errors and rate limits fail over to the
+  next endpoint. Other errors (e.g. invalid requests) are raised immediately.
+
+Endpoints are given as a comma separated list, each URL optionally followed by
+``|weight=<n>`` and ``|role=<query|batch|any>``::
+
+    http://gpu1:8000/v1|weight=2|role=batch,http://gpu2:8000/v1|role=query
+
+The LightRAG server builds a router when LLM_BINDING_HOST or
+EMBEDDING_BINDING_HOST contains more than one endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable
+
+from lightrag.constants import (
+    DEFAULT_ENDPOINT_COOLDOWN,
+    DEFAULT_ENDPOINT_FAILURE_THRESHOLD,
+    DEFAULT_QUERY_PRIORITY_THRESHOLD,
+)
+from lightrag.utils import (
+    current_call_priority,
+    get_env_value,
+    is_overload_error,
+    logger,
+)
+
+ENDPOINT_ROLES = ("any", "query", "batch")
+
+
+@dataclass
+class Endpoint:
+    """An inference server and its routing state"""
+
+    url: str
+    weight: float = 1.0
+    role: str = "any"
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+
+    def available(self, now: float, cooldown: float) -> bool:
+        """Whether the circuit lets a call through"""
+        if self.opened_at is None:
+            return True
+        # Half-open: allow one trial call once the cooldown has passed
+        return now - self.opened_at >= cooldown and not self.trial_in_flight
+
+    def load(self) -> float:
+        return (self.outstanding + 1) / self.weight
+
+
+def parse_endpoints(spec: str | list[str]) -> list[Endpoint]:
+    """Parse ``url|weight=2|role=batch,url2`` into endpoints"""
+    entries = spec.split(",") if isinstance(spec, str) else spec
+    endpoints = []
+    for entry in entries:
+        parts = [part.strip() for part in entry.split("|")]
+        if not parts[0]:
+            continue
+        endpoint = Endpoint(url=parts[0])
+        for option in parts[1:]:
+            name, _, value = option.partition("=")
+            name = name.strip().lower()
+            value = value.strip()
+            if name == "weight":
+                endpoint.weight = float(value)
+                if endpoint.weight <= 0:
+                    raise ValueError(f"Endpoint weight must be positive: {entry}")
+            elif name == "role":
+                if value not in ENDPOINT_ROLES:
+                    raise ValueError(
+                        f"Endpoint role must be one of {ENDPOINT_ROLES}: {entry}"
+                    )
+                endpoint.role = value
+            else:
+                raise ValueError(f"Unknown endpoint option '{name}': {entry}")
+        endpoints.append(endpoint)
+    return endpoints
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """Errors caused by the endpoint rather than the request"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if is_overload_error(error):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if isinstance(status, int):
+        return status >= 500 or status in (408, 429)
+    name = type(error).__name__.lower()
+    return any(
+        marker in name for marker in ("connect", "timeout", "unavailable", "network")
+    )
+
+
+class EndpointRouter:
+    """Spreads calls of a binding function over several endpoints"""
+
+    def __init__(
+        self,
+        endpoints: str | list[str] | list[Endpoint],
+        failure_threshold: int = DEFAULT_ENDPOINT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_ENDPOINT_COOLDOWN,
+        query_priority_threshold: int = DEFAULT_QUERY_PRIORITY_THRESHOLD,
+    ):
+        if isinstance(endpoints, str) or (
+            endpoints and not isinstance(endpoints[0], Endpoint)
+        ):
+            endpoints = parse_endpoints(endpoints)
+        if not endpoints:
+            raise ValueError("EndpointRouter needs at least one endpoint")
+        self.endpoints: list[Endpoint] = list(endpoints)
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.query_priority_threshold = query_priority_threshold
+
+    def _role_for_call(self) -> str:
+        priority = current_call_priority.get()
+        if priority is not None and priority <= self.query_priority_threshold:
+            return "query"
+        return "batch"
+
+    def select(self, exclude: set[int] | None = None) -> Endpoint | None:
+        """Pick the least loaded available endpoint for the current call"""
+        now = time.monotonic()
+        candidates = [
+            endpoint
+            for index, endpoint in enumerate(self.endpoints)
+            if not (exclude and index in exclude)
+            and endpoint.available(now, self.cooldown)
+        ]
+        if not candidates:
+            return None
+        role = self._role_for_call()
+        preferred = [e for e in candidates if e.role in (role, "any")]
+        return min(preferred or candidates, key=lambda e: (e.load(), e.requests))
+
+    def _start(self, endpoint: Endpoint) -> None:
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        if endpoint.opened_at is not None:
+            endpoint.trial_in_flight = True
+
+    def _finish(self, endpoint: Endpoint, error: BaseException | None) -> None:
+        endpoint.outstanding -= 1
+        endpoint.trial_in_flight = False
+        if error is None:
+            endpoint.consecutive_failures = 0
+            if endpoint.opened_at is not None:
+                logger.info(f"Endpoint {endpoint.url} recovered, circuit closed")
+            endpoint.opened_at = None
+            return
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+        if (
+            endpoint.opened_at is not None
+            or endpoint.consecutive_failures >= self.failure_threshold
+        ):
+            if endpoint.opened_at is None:
+                logger.warning(
+                    f"Endpoint {endpoint.url} failed {endpoint.consecutive_failures} "
+                    f"times in a row, circuit opened for {self.cooldown}s: {error}"
+                )
+            endpoint.opened_at = time.monotonic()
+
+    async def call(self, func: Callable, url_param: str, *args, **kwargs) -> Any:
+        """Call ``func`` with ``url_param`` set to the selected endpoint's URL
+
+        Fails over to the next endpoint on endpoint errors. Raises the last
+        error when every endpoint failed, or RuntimeError when all circuits
+        are open.
+        """
+        tried: set[int] = set()
+        last_error: BaseException | None = None
+        while len(tried) < len(self.endpoints):
+            endpoint = self.select(exclude=tried)
+            if endpoint is None:
+                break
+            tried.add(self.endpoints.index(endpoint))
+            self._start(endpoint)
+            try:
+                result = await func(*args, **{**kwargs, url_param: endpoint.url})
+            except asyncio.CancelledError:
+                # Not the endpoint's fault
+                endpoint.outstanding -= 1
+                endpoint.trial_in_flight = False
+                raise
+            except Exception as e:
+                if not is_failover_error(e):
+                    # The endpoint answered, the request itself was rejected
+                    self._finish(endpoint, None)
+                    raise
+                self._finish(endpoint, e)
+                last_error = e
+                logger.warning(f"Endpoint {endpoint.url} failed, failing over: {e}")
+                continue
+            self._finish(endpoint, None)
+            return result
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(
+            "No endpoint available: all circuits are open "
+            f"({', '.join(e.url for e in self.endpoints)})"
+        )
+
+    def wrap(self, func: Callable, url_param: str = "base_url") -> Callable:
+        """Return ``func`` with its ``url_param`` argument routed by this router"""
+
+        @wraps(func)
+        async def routed(*args, **kwargs):
+            return await self.call(func, url_param, *args, **kwargs)
+
+        routed.endpoint_router = self
+        return routed
+
+    def stats(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "url": endpoint.url,
+                "role": endpoint.role,
+                "weight": endpoint.weight,
+                "outstanding": endpoint.outstanding,
+                "requests": endpoint.requests,
+                "failures": endpoint.failures,
+                "circuit": (
+                    "closed"
+                    if endpoint.opened_at is None
+                    else (
+                        "half_open"
+                        if endpoint.available(now, self.cooldown)
+                        else "open"
+                    )
+                ),
+            }
+            for endpoint in self.endpoints
+        ]
+
+
+def build_endpoint_router(host: str | None) -> EndpointRouter | None:
+    """Create a router when ``host`` lists several endpoints or endpoint options
+
+    Circuit breaking is configured with ENDPOINT_FAILURE_THRESHOLD and
+    ENDPOINT_COOLDOWN. Returns None for a plain single URL.
+    """
+    if not host or ("," not in host and "|" not in host):
+        return None
+    return EndpointRouter(
+        host,
+        failure_threshold=get_env_value(
+            "ENDPOINT_FAILURE_THRESHOLD", DEFAULT_ENDPOINT_FAILURE_THRESHOLD, int
+        ),
+        cooldown=get_env_value("ENDPOINT_COOLDOWN", DEFAULT_ENDPOINT_COOLDOWN, float),
+    )
+
+
+def endpoint_router_stats(func: Any) -> list[dict[str, Any]] | None:
+    """Endpoint statistics of a (wrapped) model function, None if it is not routed"""
+    for _ in range(10):
+        router = getattr(func, "endpoint_router", None)
+        if router is not None:
+            return router.stats()
+        func = getattr(func, "__wrapped__", None) or getattr(func, "func", None)
+        if func is None:
+            return None
+    return None
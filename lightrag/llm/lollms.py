@@ -17,6 +17,7 @@ from tenacity import (
     retry_if_exception_type,
 )
 
+from lightrag.llm.client_pool import get_aiohttp_session
 from lightrag.exceptions import (
     APIConnectionError,
     RateLimitError,
@@ -88,22 +89,28 @@ async def lollms_model_if_cache(
     request_data["prompt"] = full_prompt
     timeout = aiohttp.ClientTimeout(total=kwargs.get("timeout", None))
 
-    async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-        if stream:
+    session = get_aiohttp_session(base_url, api_key)
+    if stream:
 
-            async def inner():
-                async with session.post(
-                    f"{base_url}/lollms_generate", json=request_data
-                ) as response:
-                    async for line in response.content:
-                        yield line.decode().strip()
-
-            return inner()
-        else:
+        async def inner():
             async with session.post(
-                f"{base_url}/lollms_generate", json=request_data
+                f"{base_url}/lollms_generate",
+                json=request_data,
+                headers=headers,
+                timeout=timeout,
             ) as response:
-                return await response.text()
+                async for line in response.content:
+                    yield line.decode().strip()
+
+        return inner()
+    else:
+        async with session.post(
+            f"{base_url}/lollms_generate",
+            json=request_data,
+            headers=headers,
+            timeout=timeout,
+        ) as response:
+            return await response.text()
 
 
 async def lollms_model_complete(
@@ -162,16 +169,17 @@ async def lollms_embed(
         if api_key
         else {"Content-Type": "application/json"}
     )
-    async with aiohttp.ClientSession(headers=headers) as session:
-        embeddings = []
-        for text in texts:
-            request_data = {"text": text}
-
-            async with session.post(
-                f"{base_url}/lollms_embed",
-                json=request_data,
-            ) as response:
-                result = await response.json()
-                embeddings.append(result["vector"])
-
-        return np.array(embeddings)
+    session = get_aiohttp_session(base_url, api_key)
+    embeddings = []
+    for text in texts:
+        request_data = {"text": text}
+
+        async with session.post(
+            f"{base_url}/lollms_embed",
+            json=request_data,
+            headers=headers,
+        ) as response:
+            result = await response.json()
+            embeddings.append(result["vector"])
+
+    return np.array(embeddings)
@@ -29,6 +29,7 @@ from lightrag.utils import (
     wrap_embedding_func_with_attrs,
     logger,
 )
+from lightrag.llm.client_pool import get_pooled_client, httpx_pool_options, secret_key
 
 
 _OLLAMA_CLOUD_HOST = "https://ollama.com"
@@ -51,6 +52,30 @@ def _coerce_host_for_cloud_model(host: Optional[str], model: object) -> Optional
     return host
 
 
+def _get_ollama_client(
+    host: Optional[str], api_key: Optional[str], timeout
+) -> ollama.AsyncClient:
+    """Get a pooled Ollama client, shared by calls with the same host, key and timeout"""
+
+    def factory() -> ollama.AsyncClient:
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": f"LightRAG/{__api_version__}",
+        }
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        return ollama.AsyncClient(
+            host=host, timeout=timeout, headers=headers, **httpx_pool_options()
+        )
+
+    async def close(client: ollama.AsyncClient) -> None:
+        await client._client.aclose()
+
+    return get_pooled_client(
+        "ollama", (host, secret_key(api_key), timeout), factory, close
+    )
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -81,73 +106,40 @@ async def _ollama_model_if_cache(
     # fallback to environment variable when not provided explicitly
     if not api_key:
         api_key = os.getenv("OLLAMA_API_KEY")
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": f"LightRAG/{__api_version__}",
-    }
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
 
     host = _coerce_host_for_cloud_model(host, model)
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = _get_ollama_client(host, api_key, timeout)
 
-    try:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.extend(history_messages)
-        messages.append({"role": "user", "content": prompt})
-
-        response = await ollama_client.chat(model=model, messages=messages, **kwargs)
-        if stream:
-            """cannot cache stream response and process reasoning"""
-
-            async def inner():
-                try:
-                    async for chunk in response:
-                        yield chunk["message"]["content"]
-                except Exception as e:
-                    logger.error(f"Error in stream response: {str(e)}")
-                    raise
-                finally:
-                    try:
-                        await ollama_client._client.aclose()
-                        logger.debug("Successfully closed Ollama client for streaming")
-                    except Exception as close_error:
-                        logger.warning(f"Failed to close Ollama client: {close_error}")
-
-            return inner()
-        else:
-            model_response = response["message"]["content"]
-
-            """
-            If the model also wraps its thoughts in a specific tag,
-            this information is not needed for the final
-            response and can simply be trimmed.
-            """
-
-            return model_response
-    except Exception as e:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception: {close_error}"
-            )
-        raise e
-    finally:
-        if not stream:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.extend(history_messages)
+    messages.append({"role": "user", "content": prompt})
+
+    response = await ollama_client.chat(model=model, messages=messages, **kwargs)
+    if stream:
+        """cannot cache stream response and process reasoning"""
+
+        async def inner():
             try:
-                await ollama_client._client.aclose()
-                logger.debug(
-                    "Successfully closed Ollama client for non-streaming response"
-                )
-            except Exception as close_error:
-                logger.warning(
-                    f"Failed to close Ollama client in finally block: {close_error}"
-                )
+                async for chunk in response:
+                    yield chunk["message"]["content"]
+            except Exception as e:
+                logger.error(f"Error in stream response: {str(e)}")
+                raise
+
+        return inner()
+    else:
+        model_response = response["message"]["content"]
+
+        """
+        If the model also wraps its thoughts in a specific tag,
+        this information is not needed for the final
+        response and can simply be trimmed.
+        """
+
+        return model_response
 
 
 async def ollama_model_complete(
@@ -206,19 +198,13 @@ async def ollama_embed(
     api_key = kwargs.pop("api_key", None)
     if not api_key:
         api_key = os.getenv("OLLAMA_API_KEY")
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": f"LightRAG/{__api_version__}",
-    }
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
 
     host = kwargs.pop("host", None)
     timeout = kwargs.pop("timeout", None)
 
     host = _coerce_host_for_cloud_model(host, embed_model)
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = _get_ollama_client(host, api_key, timeout)
     try:
         options = kwargs.pop("options", {})
         data = await ollama_client.embed(
@@ -227,17 +213,4 @@ async def ollama_embed(
         return np.array(data["embeddings"])
     except Exception as e:
         logger.error(f"Error in ollama_embed: {str(e)}")
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception in embed")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception in embed: {close_error}"
-            )
         raise e
-    finally:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after embed")
-        except Exception as close_error:
-            logger.warning(f"Failed to close Ollama client after embed: {close_error}")
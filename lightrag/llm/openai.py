@@ -15,6 +15,7 @@ from openai import (
     APIConnectionError,
     RateLimitError,
     APITimeoutError,
+    DefaultAsyncHttpxClient,
 )
 from tenacity import (
     retry,
@@ -26,9 +27,13 @@ from lightrag.utils import (
     wrap_embedding_func_with_attrs,
     safe_unicode_decode,
     logger,
+    CacheablePrompt,
+    compute_mdhash_id,
+    get_env_value,
 )
 
 from lightrag.types import GPTKeywordExtractionFormat
+from lightrag.llm.client_pool import get_pooled_client, httpx_pool_options, secret_key
 from lightrag.api import __api_version__
 
 import numpy as np
@@ -75,6 +80,17 @@ class InvalidResponseError(Exception):
     pass
 
 
+def _usage_token_counts(usage: Any) -> dict[str, int]:
+    """Token counts of a chat completion, including prompt tokens served from the prompt cache"""
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+        "completion_tokens": getattr(usage, "completion_tokens", 0),
+        "total_tokens": getattr(usage, "total_tokens", 0),
+        "cached_tokens": getattr(prompt_details, "cached_tokens", 0) or 0,
+    }
+
+
 # Module-level cache for tiktoken encodings
 _TIKTOKEN_ENCODING_CACHE: dict[str, Any] = {}
 
@@ -184,6 +200,53 @@ def create_openai_async_client(
         return AsyncOpenAI(**merged_configs)
 
 
+def get_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    use_azure: bool = False,
+    azure_deployment: str | None = None,
+    api_version: str | None = None,
+    timeout: int | None = None,
+    client_configs: dict[str, Any] | None = None,
+) -> AsyncOpenAI:
+    """Get a pooled AsyncOpenAI or AsyncAzureOpenAI client for the given configuration.
+
+    Takes the same arguments as create_openai_async_client(). The client is
+    created once per configuration and event loop, keeps its connections alive
+    across calls and must not be closed by the caller; clients are closed when
+    the last LightRAG instance on the loop finalizes its storages.
+    """
+    client_configs = client_configs or {}
+    key = (
+        use_azure,
+        base_url,
+        secret_key(api_key),
+        azure_deployment,
+        api_version,
+        timeout,
+        repr(sorted(client_configs.items())),
+    )
+
+    def factory() -> AsyncOpenAI:
+        configs = dict(client_configs)
+        if "http_client" not in configs:
+            configs["http_client"] = DefaultAsyncHttpxClient(**httpx_pool_options())
+        return create_openai_async_client(
+            api_key=api_key,
+            base_url=base_url,
+            use_azure=use_azure,
+            azure_deployment=azure_deployment,
+            api_version=api_version,
+            timeout=timeout,
+            client_configs=configs,
+        )
+
+    async def close(client: AsyncOpenAI) -> None:
+        await client.close()
+
+    return get_pooled_client("openai", key, factory, close)
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -285,8 +348,8 @@ async def openai_complete_if_cache(
     if keyword_extraction:
         kwargs["response_format"] = GPTKeywordExtractionFormat
 
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Get the pooled OpenAI client (supports both OpenAI and Azure)
+    openai_async_client = get_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -296,10 +359,24 @@ async def openai_complete_if_cache(
         client_configs=client_configs,
     )
 
+    # OpenAI caches long prompt prefixes automatically. A prompt_cache_key routes
+    # requests sharing the static system prompt prefix to the same cache
+    if (
+        isinstance(system_prompt, CacheablePrompt)
+        and system_prompt.cache_prefix_len
+        and get_env_value("OPENAI_PROMPT_CACHE_KEY", False, bool)
+    ):
+        extra_body = dict(kwargs.get("extra_body") or {})
+        extra_body.setdefault(
+            "prompt_cache_key",
+            compute_mdhash_id(system_prompt.static_prefix, prefix="lightrag-"),
+        )
+        kwargs["extra_body"] = extra_body
+
     # Prepare messages
     messages: list[dict[str, Any]] = []
     if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "system", "content": str(system_prompt)})
     messages.extend(history_messages)
     messages.append({"role": "user", "content": prompt})
 
@@ -336,21 +413,17 @@ async def openai_complete_if_cache(
             )
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -448,13 +521,7 @@ async def openai_complete_if_cache(
                 # After streaming is complete, track token usage
                 if token_tracker and final_chunk_usage:
                     # Use actual usage from the API
-                    token_counts = {
-                        "prompt_tokens": getattr(final_chunk_usage, "prompt_tokens", 0),
-                        "completion_tokens": getattr(
-                            final_chunk_usage, "completion_tokens", 0
-                        ),
-                        "total_tokens": getattr(final_chunk_usage, "total_tokens", 0),
-                    }
+                    token_counts = _usage_token_counts(final_chunk_usage)
                     token_tracker.add_usage(token_counts)
                     logger.debug(f"Streaming token usage (from API): {token_counts}")
                 elif token_tracker:
@@ -484,8 +551,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -517,104 +582,78 @@ async def openai_complete_if_cache(
                                 f"Unexpected error during stream response cleanup: {close_error}"
                             )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            message = response.choices[0].message
-
-            # Handle parsed responses (structured output via response_format)
-            # When using beta.chat.completions.parse(), the response is in message.parsed
-            if hasattr(message, "parsed") and message.parsed is not None:
-                # Serialize the parsed structured response to JSON
-                final_content = message.parsed.model_dump_json()
-                logger.debug("Using parsed structured response from API")
-            else:
-                # Handle regular content responses
-                content = getattr(message, "content", None)
-                reasoning_content = getattr(message, "reasoning_content", "")
-
-                # Handle COT logic for non-streaming responses (only if enabled)
-                final_content = ""
-
-                if enable_cot:
-                    # Check if we should include reasoning content
-                    should_include_reasoning = False
-                    if reasoning_content and reasoning_content.strip():
-                        if not content or content.strip() == "":
-                            # Case 1: Only reasoning content, should include COT
-                            should_include_reasoning = True
-                            final_content = (
-                                content or ""
-                            )  # Use empty string if content is None
-                        else:
-                            # Case 3: Both content and reasoning_content present, ignore reasoning
-                            should_include_reasoning = False
-                            final_content = content
-                    else:
-                        # No reasoning content, use regular content
-                        final_content = content or ""
-
-                    # Apply COT wrapping if needed
-                    if should_include_reasoning:
-                        if r"\u" in reasoning_content:
-                            reasoning_content = safe_unicode_decode(
-                                reasoning_content.encode("utf-8")
-                            )
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        message = response.choices[0].message
+
+        # Handle parsed responses (structured output via response_format)
+        # When using beta.chat.completions.parse(), the response is in message.parsed
+        if hasattr(message, "parsed") and message.parsed is not None:
+            # Serialize the parsed structured response to JSON
+            final_content = message.parsed.model_dump_json()
+            logger.debug("Using parsed structured response from API")
+        else:
+            # Handle regular content responses
+            content = getattr(message, "content", None)
+            reasoning_content = getattr(message, "reasoning_content", "")
+
+            # Handle COT logic for non-streaming responses (only if enabled)
+            final_content = ""
+
+            if enable_cot:
+                # Check if we should include reasoning content
+                should_include_reasoning = False
+                if reasoning_content and reasoning_content.strip():
+                    if not content or content.strip() == "":
+                        # Case 1: Only reasoning content, should include COT
+                        should_include_reasoning = True
                         final_content = (
-                            f"<think>{reasoning_content}</think>{final_content}"
-                        )
+                            content or ""
+                        )  # Use empty string if content is None
+                    else:
+                        # Case 3: Both content and reasoning_content present, ignore reasoning
+                        should_include_reasoning = False
+                        final_content = content
                 else:
-                    # COT disabled, only use regular content
+                    # No reasoning content, use regular content
                     final_content = content or ""
 
-                # Validate final content
-                if not final_content or final_content.strip() == "":
-                    logger.error("Received empty content from OpenAI API")
-                    await openai_async_client.close()  # Ensure client is closed
-                    raise InvalidResponseError("Received empty content from OpenAI API")
+                # Apply COT wrapping if needed
+                if should_include_reasoning:
+                    if r"\u" in reasoning_content:
+                        reasoning_content = safe_unicode_decode(
+                            reasoning_content.encode("utf-8")
+                        )
+                    final_content = f"<think>{reasoning_content}</think>{final_content}"
+            else:
+                # COT disabled, only use regular content
+                final_content = content or ""
+
+            # Validate final content
+            if not final_content or final_content.strip() == "":
+                logger.error("Received empty content from OpenAI API")
+                raise InvalidResponseError("Received empty content from OpenAI API")
 
-            # Apply Unicode decoding to final content if needed
-            if r"\u" in final_content:
-                final_content = safe_unicode_decode(final_content.encode("utf-8"))
+        # Apply Unicode decoding to final content if needed
+        if r"\u" in final_content:
+            final_content = safe_unicode_decode(final_content.encode("utf-8"))
 
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
+        if token_tracker and hasattr(response, "usage"):
+            token_tracker.add_usage(_usage_token_counts(response.usage))
 
-            logger.debug(f"Response content len: {len(final_content)}")
-            verbose_debug(f"Response: {response}")
+        logger.debug(f"Response content len: {len(final_content)}")
+        verbose_debug(f"Response: {response}")
 
-            return final_content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        return final_content
 
 
 async def openai_complete(
@@ -801,8 +840,8 @@ async def openai_embed(
 
         texts = truncated_texts
 
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Get the pooled OpenAI client (supports both OpenAI and Azure)
+    openai_async_client = get_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -811,40 +850,39 @@ async def openai_embed(
         client_configs=client_configs,
     )
 
-    async with openai_async_client:
-        # Determine the correct model identifier to use
-        # For Azure OpenAI, we must use the deployment name instead of the model name
-        api_model = azure_deployment if use_azure and azure_deployment else model
+    # Determine the correct model identifier to use
+    # For Azure OpenAI, we must use the deployment name instead of the model name
+    api_model = azure_deployment if use_azure and azure_deployment else model
 
-        # Prepare API call parameters
-        api_params = {
-            "model": api_model,
-            "input": texts,
-            "encoding_format": "base64",
-        }
+    # Prepare API call parameters
+    api_params = {
+        "model": api_model,
+        "input": texts,
+        "encoding_format": "base64",
+    }
 
-        # Add dimensions parameter only if embedding_dim is provided
-        if embedding_dim is not None:
-            api_params["dimensions"] = embedding_dim
+    # Add dimensions parameter only if embedding_dim is provided
+    if embedding_dim is not None:
+        api_params["dimensions"] = embedding_dim
 
-        # Make API call
-        response = await openai_async_client.embeddings.create(**api_params)
+    # Make API call
+    response = await openai_async_client.embeddings.create(**api_params)
 
-        if token_tracker and hasattr(response, "usage"):
-            token_counts = {
-                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                "total_tokens": getattr(response.usage, "total_tokens", 0),
-            }
-            token_tracker.add_usage(token_counts)
-
-        return np.array(
-            [
-                np.array(dp.embedding, dtype=np.float32)
-                if isinstance(dp.embedding, list)
-                else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
-                for dp in response.data
-            ]
-        )
+    if token_tracker and hasattr(response, "usage"):
+        token_counts = {
+            "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+            "total_tokens": getattr(response.usage, "total_tokens", 0),
+        }
+        token_tracker.add_usage(token_counts)
+
+    return np.array(
+        [
+            np.array(dp.embedding, dtype=np.float32)
+            if isinstance(dp.embedding, list)
+            else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
+            for dp in response.data
+        ]
+    )
 
 
 # Azure OpenAI wrapper functions for backward compatibility
@@ -5,7 +5,7 @@ from pathlib import Path
 import asyncio
 import json
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
+from typing import Any, AsyncIterator, Iterable, Iterator, overload, Literal
 from collections import Counter, defaultdict
 
 from lightrag.exceptions import (
@@ -14,6 +14,8 @@ from lightrag.exceptions import (
 )
 from lightrag.utils import (
     logger,
+    CacheablePrompt,
+    format_cacheable_prompt,
     compute_mdhash_id,
     Tokenizer,
     is_float_regex,
@@ -25,6 +27,8 @@ from lightrag.utils import (
     handle_cache,
     save_to_cache,
     CacheData,
+    tee_stream,
+    replay_stream,
     use_llm_func_with_cache,
     update_chunk_cache_list,
     remove_think_tags,
@@ -40,6 +44,9 @@ from lightrag.utils import (
     merge_source_ids,
     make_relation_chunk_key,
     chunk_matches_date_range,
+    compute_token_count_fields,
+    TOKEN_COUNT_FIELDS,
+    stored_token_count,
 )
 from lightrag.base import (
     BaseGraphStorage,
@@ -67,6 +74,12 @@ from lightrag.constants import (
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
 )
 from lightrag.kg.shared_storage import get_storage_keyed_lock
+from lightrag.query_cache import (
+    get_kg_version,
+    is_semantic_cacheable,
+    query_context_cache_key,
+    semantic_cache_scope,
+)
 import time
 from dotenv import load_dotenv
 
@@ -163,6 +176,91 @@ def chunking_by_token_size(
     return results
 
 
+def chunking_by_token_size_stream(
+    tokenizer: Tokenizer,
+    segments: Iterable[str],
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    chunk_overlap_token_size: int = 100,
+    chunk_token_size: int = 1200,
+) -> Iterator[dict[str, Any]]:
+    """Streaming variant of chunking_by_token_size over consecutive text segments
+
+    Segments (pages, line or row batches of one document) are joined with
+    newlines. Only the current token window, or the text since the last
+    split_by_character separator, is held in memory, and each chunk is yielded
+    as soon as it is complete.
+    """
+    stride = chunk_token_size - chunk_overlap_token_size
+    index = 0
+
+    def joined(position: int, segment: str) -> str:
+        return segment if position == 0 else "\n" + segment
+
+    if split_by_character:
+
+        def split_piece(piece: str) -> list[tuple[int, str]]:
+            _tokens = tokenizer.encode(piece)
+            if len(_tokens) <= chunk_token_size:
+                return [(len(_tokens), piece)]
+            if split_by_character_only:
+                logger.warning(
+                    "Chunk split_by_character exceeds token limit: len=%d limit=%d",
+                    len(_tokens),
+                    chunk_token_size,
+                )
+                raise ChunkTokenLimitExceededError(
+                    chunk_tokens=len(_tokens),
+                    chunk_token_limit=chunk_token_size,
+                    chunk_preview=piece[:120],
+                )
+            return [
+                (
+                    min(chunk_token_size, len(_tokens) - start),
+                    tokenizer.decode(_tokens[start : start + chunk_token_size]),
+                )
+                for start in range(0, len(_tokens), stride)
+            ]
+
+        buffer = ""
+        for position, segment in enumerate(segments):
+            buffer += joined(position, segment)
+            *complete, buffer = buffer.split(split_by_character)
+            for piece in complete:
+                for _len, chunk in split_piece(piece):
+                    yield {
+                        "tokens": _len,
+                        "content": chunk.strip(),
+                        "chunk_order_index": index,
+                    }
+                    index += 1
+        for _len, chunk in split_piece(buffer):
+            yield {"tokens": _len, "content": chunk.strip(), "chunk_order_index": index}
+            index += 1
+        return
+
+    window: list[int] = []
+    for position, segment in enumerate(segments):
+        window.extend(tokenizer.encode(joined(position, segment)))
+        while len(window) >= chunk_token_size:
+            yield {
+                "tokens": chunk_token_size,
+                "content": tokenizer.decode(window[:chunk_token_size]).strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+            window = window[stride:]
+    # Tail windows, the same ones chunking_by_token_size produces
+    while window:
+        yield {
+            "tokens": min(chunk_token_size, len(window)),
+            "content": tokenizer.decode(window[:chunk_token_size]).strip(),
+            "chunk_order_index": index,
+        }
+        index += 1
+        window = window[stride:]
+
+
 async def _handle_entity_relation_summary(
     description_type: str,
     entity_or_relation_name: str,
@@ -170,6 +268,8 @@ async def _handle_entity_relation_summary(
     seperator: str,
     global_config: dict,
     llm_response_cache: BaseKVStorage | None = None,
+    pipeline_status: dict | None = None,
+    pipeline_status_lock=None,
 ) -> tuple[str, bool]:
     """Handle entity relation description summary using map-reduce approach.
 
@@ -177,7 +277,7 @@ async def _handle_entity_relation_summary(
     1. If total tokens < summary_context_size and len(description_list) < force_llm_summary_on_merge, no need to summarize
     2. If total tokens < summary_max_tokens, summarize with LLM directly
     3. Otherwise, split descriptions into chunks that fit within token limits
-    4. Summarize each chunk, then recursively process the summaries
+    4. Summarize the chunks of a round concurrently, then recursively process the summaries
     5. Continue until we get a final summary within token limits or num of descriptions is less than force_llm_summary_on_merge
 
     Args:
@@ -185,6 +285,8 @@ async def _handle_entity_relation_summary(
         description_list: List of description strings to summarize
         global_config: Global configuration containing tokenizer and limits
         llm_response_cache: Optional cache for LLM responses
+        pipeline_status: Pipeline status dictionary, receives the round estimate
+        pipeline_status_lock: Lock for pipeline status
 
     Returns:
         Tuple of (final_summarized_description_string, llm_was_used_boolean)
@@ -204,12 +306,25 @@ async def _handle_entity_relation_summary(
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
 
     current_list = description_list[:]  # Copy the list to avoid modifying original
+    # Token counts are computed once per description and carried through the rounds
+    current_token_counts = [len(tokenizer.encode(desc)) for desc in current_list]
     llm_was_used = False  # Track whether LLM was used during the entire process
+    round_count = 0
+
+    async def _reduce_group(group: list[str]) -> tuple[str, int]:
+        summary = await _summarize_descriptions(
+            description_type,
+            entity_or_relation_name,
+            group,
+            global_config,
+            llm_response_cache,
+        )
+        return summary, len(tokenizer.encode(summary))
 
     # Iterative map-reduce process
     while True:
         # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        total_tokens = sum(current_token_counts)
 
         # If total length is within limits, perform final summarization
         if total_tokens <= summary_context_size or len(current_list) <= 2:
@@ -235,6 +350,18 @@ async def _handle_entity_relation_summary(
                 )
                 return final_summary, True  # LLM was used for final summarization
 
+        if round_count == 0:
+            status_message = (
+                f"Summarizing {entity_or_relation_name}: {len(current_list)} descriptions, "
+                f"up to {_max_summary_rounds(len(current_list))} map-reduce rounds"
+            )
+            logger.info(status_message)
+            if pipeline_status is not None and pipeline_status_lock is not None:
+                async with pipeline_status_lock:
+                    pipeline_status["latest_message"] = status_message
+                    pipeline_status["history_messages"].append(status_message)
+        round_count += 1
+
         # Need to split into chunks - Map phase
         # Ensure each chunk has minimum 2 descriptions to guarantee progress
         chunks = []
@@ -242,15 +369,13 @@ async def _handle_entity_relation_summary(
         current_tokens = 0
 
         # Currently least 3 descriptions in current_list
-        for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
-
+        for desc, desc_tokens in zip(current_list, current_token_counts):
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
                 # Ensure we have at least 2 descriptions in the chunk (when possible)
                 if len(current_chunk) == 1:
                     # Force add one more description to ensure minimum 2 per chunk
-                    current_chunk.append(desc)
+                    current_chunk.append((desc, desc_tokens))
                     chunks.append(current_chunk)
                     logger.warning(
                         f"Summarizing {entity_or_relation_name}: Oversize descpriton found"
@@ -259,10 +384,10 @@ async def _handle_entity_relation_summary(
                     current_tokens = 0
                 else:  # curren_chunk is ready for summary in reduce phase
                     chunks.append(current_chunk)
-                    current_chunk = [desc]  # leave it for next group
+                    current_chunk = [(desc, desc_tokens)]  # leave it for next group
                     current_tokens = desc_tokens
             else:
-                current_chunk.append(desc)
+                current_chunk.append((desc, desc_tokens))
                 current_tokens += desc_tokens
 
         # Add the last chunk if it exists
@@ -273,26 +398,45 @@ async def _handle_entity_relation_summary(
             f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups"
         )
 
-        # Reduce phase: summarize each group from chunks
-        new_summaries = []
-        for chunk in chunks:
-            if len(chunk) == 1:
-                # Optimization: single description chunks don't need LLM summarization
-                new_summaries.append(chunk[0])
-            else:
-                # Multiple descriptions need LLM summarization
-                summary = await _summarize_descriptions(
-                    description_type,
-                    entity_or_relation_name,
-                    chunk,
-                    global_config,
-                    llm_response_cache,
-                )
-                new_summaries.append(summary)
-                llm_was_used = True  # Mark that LLM was used in reduce phase
+        # Reduce phase: summarize the groups of this round concurrently, the LLM
+        # queue bounds how many summaries are in flight
+        # Optimization: single description chunks don't need LLM summarization
+        reduce_tasks = {
+            index: asyncio.create_task(_reduce_group([desc for desc, _ in chunk]))
+            for index, chunk in enumerate(chunks)
+            if len(chunk) > 1
+        }
+        try:
+            await asyncio.gather(*reduce_tasks.values())
+        except BaseException:
+            for task in reduce_tasks.values():
+                task.cancel()
+            await asyncio.gather(*reduce_tasks.values(), return_exceptions=True)
+            raise
+        if reduce_tasks:
+            llm_was_used = True  # Mark that LLM was used in reduce phase
 
         # Update current list with new summaries for next iteration
-        current_list = new_summaries
+        reduced = [
+            reduce_tasks[index].result() if index in reduce_tasks else chunk[0]
+            for index, chunk in enumerate(chunks)
+        ]
+        current_list = [summary for summary, _ in reduced]
+        current_token_counts = [tokens for _, tokens in reduced]
+
+
+def _max_summary_rounds(description_count: int) -> int:
+    """Upper bound of LLM rounds needed to summarize descriptions by map-reduce
+
+    Every reduce group holds at least two descriptions (only the last group of
+    a round can be a single one), so each round at least halves the list until
+    two descriptions are left for the final summary.
+    """
+    rounds = 1
+    while description_count > 2:
+        description_count = (description_count + 1) // 2
+        rounds += 1
+    return rounds
 
 
 async def _summarize_descriptions(
@@ -1086,6 +1230,37 @@ async def _rebuild_from_extraction_result(
     return entities, relationships
 
 
+def _entity_context_json(entity_name: str, entity_type: str, description: str) -> str:
+    """An entity as serialized in the query context and measured by _apply_token_truncation"""
+    return json.dumps(
+        {"entity": entity_name, "type": entity_type, "description": description},
+        ensure_ascii=False,
+    )
+
+
+def _relation_context_json(src: str, tgt: str, description: str) -> str:
+    """A relation as serialized in the query context and measured by _apply_token_truncation"""
+    return json.dumps(
+        {"entity1": src, "entity2": tgt, "description": description},
+        ensure_ascii=False,
+    )
+
+
+def _context_token_fields(
+    global_config: dict[str, Any], serialized: str, description: str
+) -> dict[str, Any]:
+    """Token count fields stored with a graph element, so queries need not encode it"""
+    tokenizer = global_config.get("tokenizer")
+    if tokenizer is None:
+        return {}
+    return compute_token_count_fields(tokenizer, serialized, description)
+
+
+def _stored_token_fields(record: dict[str, Any]) -> dict[str, Any]:
+    """Token count fields of a stored record, carried along for context truncation"""
+    return {field: record[field] for field in TOKEN_COUNT_FIELDS if field in record}
+
+
 async def _rebuild_single_entity(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
@@ -1125,6 +1300,11 @@ async def _rebuild_single_entity(
                 else current_entity.get("file_path", "unknown_source"),
                 "created_at": int(time.time()),
                 "truncate": truncation_info,
+                **_context_token_fields(
+                    global_config,
+                    _entity_context_json(entity_name, entity_type, final_description),
+                    final_description,
+                ),
             }
             await knowledge_graph_inst.upsert_node(entity_name, updated_entity_data)
 
@@ -1227,6 +1407,8 @@ async def _rebuild_single_entity(
                 GRAPH_FIELD_SEP,
                 global_config,
                 llm_response_cache=llm_response_cache,
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=pipeline_status_lock,
             )
         else:
             final_description = current_entity.get("description", "")
@@ -1300,6 +1482,8 @@ async def _rebuild_single_entity(
             GRAPH_FIELD_SEP,
             global_config,
             llm_response_cache=llm_response_cache,
+            pipeline_status=pipeline_status,
+            pipeline_status_lock=pipeline_status_lock,
         )
     else:
         final_description = current_entity.get("description", "")
@@ -1472,6 +1656,8 @@ async def _rebuild_single_relationship(
             GRAPH_FIELD_SEP,
             global_config,
             llm_response_cache=llm_response_cache,
+            pipeline_status=pipeline_status,
+            pipeline_status_lock=pipeline_status_lock,
         )
     else:
         # fallback to keep current(unchanged)
@@ -1500,6 +1686,13 @@ async def _rebuild_single_relationship(
         "primary_date": primary_date,
         "relevant_dates": all_relevant_dates,
     }
+    updated_relationship_data.update(
+        _context_token_fields(
+            global_config,
+            _relation_context_json(src, tgt, updated_relationship_data["description"]),
+            updated_relationship_data["description"],
+        )
+    )
 
     # Ensure both endpoint nodes exist before writing the edge back
     # (certain storage backends require pre-existing nodes).
@@ -1777,6 +1970,8 @@ async def _merge_nodes_then_upsert(
         GRAPH_FIELD_SEP,
         global_config,
         llm_response_cache,
+        pipeline_status=pipeline_status,
+        pipeline_status_lock=pipeline_status_lock,
     )
 
     # 9. Build file_path within MAX_FILE_PATHS
@@ -1899,6 +2094,11 @@ async def _merge_nodes_then_upsert(
         truncate=truncation_info,
         primary_date=primary_date,  # Add date metadata
         relevant_dates=relevant_dates,  # Add date metadata
+        **_context_token_fields(
+            global_config,
+            _entity_context_json(entity_name, entity_type, description),
+            description,
+        ),
     )
     await knowledge_graph_inst.upsert_node(
         entity_name,
@@ -2127,6 +2327,8 @@ async def _merge_edges_then_upsert(
         GRAPH_FIELD_SEP,
         global_config,
         llm_response_cache,
+        pipeline_status=pipeline_status,
+        pipeline_status_lock=pipeline_status_lock,
     )
 
     # 9. Build file_path within MAX_FILE_PATHS limit
@@ -2422,6 +2624,11 @@ async def _merge_edges_then_upsert(
             truncate=truncation_info,
             primary_date=edge_primary_date,
             relevant_dates=edge_relevant_dates,
+            **_context_token_fields(
+                global_config,
+                _relation_context_json(src_id, tgt_id, description),
+                description,
+            ),
         ),
     )
 
@@ -2848,26 +3055,15 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
 
-async def extract_entities(
-    chunks: dict[str, TextChunkSchema],
+def build_extraction_prompt_context(
     global_config: dict[str, str],
-    pipeline_status: dict = None,
-    pipeline_status_lock=None,
-    llm_response_cache: BaseKVStorage | None = None,
-    text_chunks_storage: BaseKVStorage | None = None,
-) -> list:
-    # Check for cancellation at the start of entity extraction
-    if pipeline_status is not None and pipeline_status_lock is not None:
-        async with pipeline_status_lock:
-            if pipeline_status.get("cancellation_requested", False):
-                raise PipelineCancelledException(
-                    "User cancelled during entity extraction"
-                )
-
-    use_llm_func: callable = global_config["llm_model_func"]
-    entity_extract_max_gleaning = global_config["entity_extract_max_gleaning"]
+) -> tuple[dict[str, str], CacheablePrompt]:
+    """Build the prompt fields shared by all chunks and the extraction system prompt
 
-    ordered_chunks = list(chunks.items())
+    Returns:
+        (context_base, system_prompt): ``context_base`` formats the per-chunk
+        user prompts together with ``input_text``.
+    """
     # add language and example number params to prompt
     language = global_config["addon_params"].get("language", DEFAULT_SUMMARY_LANGUAGE)
     entity_types = global_config["addon_params"].get(
@@ -2893,6 +3089,38 @@ async def extract_entities(
         language=language,
     )
 
+    # The system prompt holds no chunk data: it is the same for every chunk and
+    # marked as a static prefix for provider prompt caching
+    system_prompt = CacheablePrompt(
+        PROMPTS["entity_extraction_system_prompt"].format(**context_base)
+    )
+    return context_base, system_prompt
+
+
+async def extract_entities(
+    chunks: dict[str, TextChunkSchema],
+    global_config: dict[str, str],
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+    text_chunks_storage: BaseKVStorage | None = None,
+) -> list:
+    # Check for cancellation at the start of entity extraction
+    if pipeline_status is not None and pipeline_status_lock is not None:
+        async with pipeline_status_lock:
+            if pipeline_status.get("cancellation_requested", False):
+                raise PipelineCancelledException(
+                    "User cancelled during entity extraction"
+                )
+
+    use_llm_func: callable = global_config["llm_model_func"]
+    entity_extract_max_gleaning = global_config["entity_extract_max_gleaning"]
+
+    ordered_chunks = list(chunks.items())
+    context_base, entity_extraction_system_prompt = build_extraction_prompt_context(
+        global_config
+    )
+
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
 
@@ -2915,10 +3143,6 @@ async def extract_entities(
         cache_keys_collector = []
 
         # Get initial extraction
-        # Format system prompt without input_text for each chunk (enables OpenAI prompt caching across chunks)
-        entity_extraction_system_prompt = PROMPTS[
-            "entity_extraction_system_prompt"
-        ].format(**context_base)
         # Format user prompts with input_text for each chunk
         entity_extraction_user_prompt = PROMPTS["entity_extraction_user_prompt"].format(
             **{**context_base, "input_text": content}
@@ -3109,6 +3333,83 @@ async def extract_entities(
     return chunk_results
 
 
+async def _semantic_cache_lookup(
+    query: str,
+    query_param: QueryParam,
+    global_config: dict[str, str],
+    embedding_func,
+    system_prompt: str | None = None,
+) -> tuple[QueryResult | None, tuple | None]:
+    """Look the query up in the semantic query cache (if enabled).
+
+    Returns:
+        (cached result or None, state for _semantic_cache_save or None)
+    """
+    cache = global_config.get("semantic_query_cache")
+    if (
+        cache is None
+        or embedding_func is None
+        or not is_semantic_cacheable(query_param)
+    ):
+        return None, None
+
+    workspace = global_config.get("workspace", "")
+    try:
+        # Read the version first: answers computed while the graph changes are stale
+        kg_version = await get_kg_version(workspace)
+        embedding = (await embedding_func([query]))[0]
+    except Exception as e:
+        logger.warning(f"Semantic query cache skipped: {e}")
+        return None, None
+
+    scope = semantic_cache_scope(workspace, query_param, system_prompt)
+    cached = cache.lookup(scope, embedding, kg_version)
+    if cached is not None:
+        content, raw_data, _ = cached
+        if query_param.stream:
+            return QueryResult(
+                response_iterator=replay_stream(content),
+                raw_data=raw_data,
+                is_streaming=True,
+            ), None
+        return QueryResult(content=content, raw_data=raw_data), None
+    return None, (cache, scope, embedding, kg_version)
+
+
+def _semantic_cache_save(
+    state: tuple | None, query: str, response: Any, raw_data: dict | None
+) -> None:
+    if state is None or not isinstance(response, str) or not response:
+        return
+    cache, scope, embedding, kg_version = state
+    cache.save(scope, query, embedding, response, raw_data, kg_version)
+
+
+def _cache_streamed_response(
+    response: AsyncIterator[str],
+    query: str,
+    hashing_kv: BaseKVStorage | None,
+    cache_data: CacheData | None,
+    semantic_state: tuple | None,
+    raw_data: dict | None,
+) -> AsyncIterator[str]:
+    """Stream the response to the caller and cache it once it is complete"""
+    if cache_data is None and semantic_state is None:
+        return response
+
+    async def on_complete(content: str) -> None:
+        if not content:
+            return
+        if cache_data is not None:
+            cache_data.content = content
+            await save_to_cache(hashing_kv, cache_data)
+            # The query has already returned: persist like _query_done does
+            await hashing_kv.index_done_callback()
+        _semantic_cache_save(semantic_state, query, content, raw_data)
+
+    return tee_stream(response, on_complete)
+
+
 async def kg_query(
     query: str,
     knowledge_graph_inst: BaseGraphStorage,
@@ -3161,6 +3462,16 @@ async def kg_query(
         # Apply higher priority (5) to query relation LLM function
         use_model_func = partial(use_model_func, _priority=5)
 
+    semantic_result, semantic_state = await _semantic_cache_lookup(
+        query,
+        query_param,
+        global_config,
+        text_chunks_db.embedding_func,
+        system_prompt,
+    )
+    if semantic_result is not None:
+        return semantic_result
+
     hl_keywords, ll_keywords = await get_keywords_from_query(
         query, query_param, global_config, hashing_kv
     )
@@ -3183,18 +3494,32 @@ async def kg_query(
     ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
     hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
-    # Build query context (unified interface)
-    context_result = await _build_query_context(
-        query,
-        ll_keywords_str,
-        hl_keywords_str,
-        knowledge_graph_inst,
-        entities_vdb,
-        relationships_vdb,
-        text_chunks_db,
-        query_param,
-        chunks_vdb,
-    )
+    # Reuse retrieval results of an earlier request with the same keywords
+    context_cache = global_config.get("query_context_cache")
+    context_result = None
+    if context_cache is not None:
+        context_key = query_context_cache_key(
+            query, ll_keywords_str, hl_keywords_str, query_param, global_config
+        )
+        kg_version = await get_kg_version(global_config.get("workspace", ""))
+        context_result = context_cache.get(context_key, kg_version)
+
+    if context_result is None:
+        # Build query context (unified interface)
+        context_result = await _build_query_context(
+            query,
+            ll_keywords_str,
+            hl_keywords_str,
+            knowledge_graph_inst,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks_db,
+            query_param,
+            chunks_vdb,
+            query_embedding=semantic_state[2] if semantic_state else None,
+        )
+        if context_cache is not None and context_result is not None:
+            context_cache.put(context_key, context_result, kg_version)
 
     if context_result is None:
         logger.info("[kg_query] No query context could be built; returning no-result.")
@@ -3215,7 +3540,10 @@ async def kg_query(
 
     # Build system prompt
     sys_prompt_temp = system_prompt if system_prompt else PROMPTS["rag_response"]
-    sys_prompt = sys_prompt_temp.format(
+    # The instructions before the per-query fields are a static prefix for prompt caching
+    sys_prompt = format_cacheable_prompt(
+        sys_prompt_temp,
+        ("response_type", "user_prompt", "context_data"),
         response_type=response_type,
         user_prompt=user_prompt,
         context_data=context_result.context,
@@ -3269,6 +3597,7 @@ async def kg_query(
             stream=query_param.stream,
         )
 
+        cache_data = None
         if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
             queryparam_dict = {
                 "mode": query_param.mode,
@@ -3283,16 +3612,27 @@ async def kg_query(
                 "user_prompt": query_param.user_prompt or "",
                 "enable_rerank": query_param.enable_rerank,
             }
-            await save_to_cache(
+            cache_data = CacheData(
+                args_hash=args_hash,
+                content=response,
+                prompt=query,
+                mode=query_param.mode,
+                cache_type="query",
+                queryparam=queryparam_dict,
+            )
+
+        if isinstance(response, str):
+            if cache_data is not None:
+                await save_to_cache(hashing_kv, cache_data)
+        else:
+            # Forward chunks as they arrive, cache the full response at the end
+            response = _cache_streamed_response(
+                response,
+                query,
                 hashing_kv,
-                CacheData(
-                    args_hash=args_hash,
-                    content=response,
-                    prompt=query,
-                    mode=query_param.mode,
-                    cache_type="query",
-                    queryparam=queryparam_dict,
-                ),
+                cache_data,
+                semantic_state,
+                context_result.raw_data,
             )
 
     # Return unified result based on actual response type
@@ -3309,6 +3649,14 @@ async def kg_query(
                 .strip()
             )
 
+        _semantic_cache_save(semantic_state, query, response, context_result.raw_data)
+        if query_param.stream:
+            # Cache hit of a streaming request: replay it as a stream
+            return QueryResult(
+                response_iterator=replay_stream(response),
+                raw_data=context_result.raw_data,
+                is_streaming=True,
+            )
         return QueryResult(content=response, raw_data=context_result.raw_data)
     else:
         # Streaming response (AsyncIterator)
@@ -3516,6 +3864,7 @@ async def _get_vector_context(
                     "chunk_id": result.get("id"),  # Add chunk_id for deduplication
                     "relevant_dates": result.get("relevant_dates", []),  # Preserve date metadata
                     "primary_date": result.get("primary_date"),  # Preserve primary date
+                    **_stored_token_fields(result),
                 }
                 valid_chunks.append(chunk_with_metadata)
 
@@ -3539,6 +3888,7 @@ async def _perform_kg_search(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    query_embedding=None,
 ) -> dict[str, Any]:
     """
     Pure search logic that retrieves raw entities, relations, and vector chunks.
@@ -3562,8 +3912,11 @@ async def _perform_kg_search(
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
+    if (
+        query_embedding is None
+        and query
+        and (kg_chunk_pick_method == "VECTOR" or chunks_vdb)
+    ):
         actual_embedding_func = text_chunks_db.embedding_func
         if actual_embedding_func:
             try:
@@ -3806,6 +4159,10 @@ async def _apply_token_truncation(
             ),
             max_token_size=max_entity_tokens,
             tokenizer=tokenizer,
+            # Counts stored at merge time make the truncation a prefix sum
+            count=lambda x: stored_token_count(
+                entity_id_to_original[x["entity"]], tokenizer, x["description"]
+            ),
         )
 
     if relations_context:
@@ -3824,6 +4181,11 @@ async def _apply_token_truncation(
             ),
             max_token_size=max_relation_tokens,
             tokenizer=tokenizer,
+            count=lambda x: stored_token_count(
+                relation_id_to_original[(x["entity1"], x["entity2"])],
+                tokenizer,
+                x["description"],
+            ),
         )
 
     logger.info(
@@ -3933,6 +4295,7 @@ async def _merge_all_chunks(
                         "content": chunk["content"],
                         "file_path": chunk.get("file_path", "unknown_source"),
                         "chunk_id": chunk_id,
+                        **_stored_token_fields(chunk),
                     }
                 )
 
@@ -3947,6 +4310,7 @@ async def _merge_all_chunks(
                         "content": chunk["content"],
                         "file_path": chunk.get("file_path", "unknown_source"),
                         "chunk_id": chunk_id,
+                        **_stored_token_fields(chunk),
                     }
                 )
 
@@ -3961,6 +4325,7 @@ async def _merge_all_chunks(
                         "content": chunk["content"],
                         "file_path": chunk.get("file_path", "unknown_source"),
                         "chunk_id": chunk_id,
+                        **_stored_token_fields(chunk),
                     }
                 )
 
@@ -4028,14 +4393,45 @@ async def _build_context_str(
         json.dumps(relation, ensure_ascii=False) for relation in relations_context
     )
 
-    # Calculate preliminary kg context tokens
-    pre_kg_context = kg_context_template.format(
-        entities_str=entities_str,
-        relations_str=relations_str,
-        text_chunks_str="",
-        reference_list_str="",
-    )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
+    # Calculate preliminary kg context tokens, from the counts stored with the
+    # entities and relations when all are valid (one extra token per line break)
+    record_tokens = [
+        stored_token_count(
+            (entity_id_to_original or {}).get(entity["entity"], {}),
+            tokenizer,
+            entity["description"],
+        )
+        for entity in entities_context
+    ] + [
+        stored_token_count(
+            (relation_id_to_original or {}).get(
+                (relation["entity1"], relation["entity2"]), {}
+            ),
+            tokenizer,
+            relation["description"],
+        )
+        for relation in relations_context
+    ]
+    if None not in record_tokens:
+        pre_kg_context = kg_context_template.format(
+            entities_str="",
+            relations_str="",
+            text_chunks_str="",
+            reference_list_str="",
+        )
+        kg_context_tokens = (
+            len(tokenizer.encode(pre_kg_context))
+            + sum(record_tokens)
+            + len(record_tokens)
+        )
+    else:
+        pre_kg_context = kg_context_template.format(
+            entities_str=entities_str,
+            relations_str=relations_str,
+            text_chunks_str="",
+            reference_list_str="",
+        )
+        kg_context_tokens = len(tokenizer.encode(pre_kg_context))
 
     # Calculate preliminary system prompt tokens
     pre_sys_prompt = sys_prompt_template.format(
@@ -4164,6 +4560,7 @@ async def _build_query_context(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    query_embedding=None,
 ) -> QueryContextResult | None:
     """
     Main query context building function using the new 4-stage architecture:
@@ -4187,6 +4584,7 @@ async def _build_query_context(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        query_embedding,
     )
 
     if not search_result["final_entities"] and not search_result["final_relations"]:
@@ -4923,7 +5321,18 @@ async def naive_query(
         logger.error("Tokenizer not found in global configuration.")
         return QueryResult(content=PROMPTS["fail_response"])
 
-    chunks = await _get_vector_context(query, chunks_vdb, query_param, None)
+    semantic_result, semantic_state = await _semantic_cache_lookup(
+        query, query_param, global_config, chunks_vdb.embedding_func, system_prompt
+    )
+    if semantic_result is not None:
+        return semantic_result
+
+    chunks = await _get_vector_context(
+        query,
+        chunks_vdb,
+        query_param,
+        semantic_state[2] if semantic_state else None,
+    )
 
     if chunks is None or len(chunks) == 0:
         logger.info(
@@ -5036,7 +5445,9 @@ async def naive_query(
     if query_param.only_need_context and not query_param.only_need_prompt:
         return QueryResult(content=context_content, raw_data=raw_data)
 
-    sys_prompt = sys_prompt_template.format(
+    sys_prompt = format_cacheable_prompt(
+        sys_prompt_template,
+        ("response_type", "user_prompt", "content_data"),
         response_type=query_param.response_type,
         user_prompt=user_prompt,
         content_data=context_content,
@@ -5079,6 +5490,7 @@ async def naive_query(
             stream=query_param.stream,
         )
 
+        cache_data = None
         if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
             queryparam_dict = {
                 "mode": query_param.mode,
@@ -5091,16 +5503,22 @@ async def naive_query(
                 "user_prompt": query_param.user_prompt or "",
                 "enable_rerank": query_param.enable_rerank,
             }
-            await save_to_cache(
-                hashing_kv,
-                CacheData(
-                    args_hash=args_hash,
-                    content=response,
-                    prompt=query,
-                    mode=query_param.mode,
-                    cache_type="query",
-                    queryparam=queryparam_dict,
-                ),
+            cache_data = CacheData(
+                args_hash=args_hash,
+                content=response,
+                prompt=query,
+                mode=query_param.mode,
+                cache_type="query",
+                queryparam=queryparam_dict,
+            )
+
+        if isinstance(response, str):
+            if cache_data is not None:
+                await save_to_cache(hashing_kv, cache_data)
+        else:
+            # Forward chunks as they arrive, cache the full response at the end
+            response = _cache_streamed_response(
+                response, query, hashing_kv, cache_data, semantic_state, raw_data
             )
 
     # Return unified result based on actual response type
@@ -5118,6 +5536,14 @@ async def naive_query(
                 .strip()
             )
 
+        _semantic_cache_save(semantic_state, query, response, raw_data)
+        if query_param.stream:
+            # Cache hit of a streaming request: replay it as a stream
+            return QueryResult(
+                response_iterator=replay_stream(response),
+                raw_data=raw_data,
+                is_streaming=True,
+            )
         return QueryResult(content=response, raw_data=raw_data)
     else:
         # Streaming response (AsyncIterator)
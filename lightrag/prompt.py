@@ -221,6 +221,9 @@ PROMPTS["fail_response"] = (
     "Sorry, I'm not able to provide an answer to that question.[no-context]"
 )
 
+# Query prompts keep the static instructions first and the per-query fields
+# ({response_type}, {user_prompt}, context) last, so the instructions form a
+# stable prefix for provider prompt caching
 PROMPTS["rag_response"] = """---Role---
 
 You are an expert AI assistant specializing in synthesizing information from a provided knowledge base. Your primary function is to answer user queries accurately by ONLY using the information within the provided **Context**.
@@ -248,7 +251,6 @@ Consider the conversation history if provided to maintain conversational flow an
 3. Formatting & Language:
   - The response MUST be in the same language as the user query.
   - The response MUST utilize Markdown formatting for enhanced clarity and structure (e.g., headings, bold text, bullet points).
-  - The response should be presented in {response_type}.
 
 4. References Section Format:
   - The References section should be under heading: `### References`
@@ -267,7 +269,9 @@ Consider the conversation history if provided to maintain conversational flow an
 - [3] Document Title Three
 ```
 
-6. Additional Instructions: {user_prompt}
+6. Response Type and Additional Instructions:
+  - The response should be presented in {response_type}.
+  - Additional Instructions: {user_prompt}
 
 
 ---Context---
@@ -302,7 +306,6 @@ Consider the conversation history if provided to maintain conversational flow an
 3. Formatting & Language:
   - The response MUST be in the same language as the user query.
   - The response MUST utilize Markdown formatting for enhanced clarity and structure (e.g., headings, bold text, bullet points).
-  - The response should be presented in {response_type}.
 
 4. References Section Format:
   - The References section should be under heading: `### References`
@@ -321,7 +324,9 @@ Consider the conversation history if provided to maintain conversational flow an
 - [3] Document Title Three
 ```
 
-6. Additional Instructions: {user_prompt}
+6. Response Type and Additional Instructions:
+  - The response should be presented in {response_type}.
+  - Additional Instructions: {user_prompt}
 
 
 ---Context---
@@ -0,0 +1,293 @@
+"""
+Query-path caches invalidated by the knowledge-graph version.
+
+Semantic query-answer cache:
+
+The LLM response cache only answers queries whose text and parameters hash to
+the same key, so paraphrased questions always miss. SemanticQueryCache keeps
+the embeddings of answered queries and serves a cached answer when a new query
+is similar enough (cosine similarity >= similarity_threshold).
+
+Entries are scoped: only queries with the same workspace, mode, date range and
+answer-shaping parameters (response type, top_k, token budgets, user prompt,
+custom system prompt, ...) can match each other.
+
+Every entry is tagged with the knowledge-graph version it was answered under.
+The version is a counter in shared storage, bumped by the insert and delete
+pipelines and by entity/relation edits, so answers computed against an older
+graph are evicted on their next lookup in every worker.
+
+Retrieval-context cache:
+
+QueryContextCache keeps the QueryContextResult built by _build_query_context
+(vector searches, graph expansion, chunk picking, reranking and token
+truncation) keyed by keywords, mode, top_k, token budgets and date range.
+Requests whose answer is not cacheable (other user_prompt, response_type or
+conversation history) and /query/data go straight to generation. The chunk
+token budget of a cached context was computed for the system prompt of the
+request that built it.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from lightrag.base import QueryContextResult, QueryParam
+from lightrag.constants import DEFAULT_KG_CHUNK_PICK_METHOD
+from lightrag.kg.shared_storage import get_namespace_data, get_namespace_lock
+from lightrag.utils import compute_args_hash, logger
+
+KG_VERSION_NAMESPACE = "kg_version"
+
+
+async def get_kg_version(workspace: str) -> int:
+    """Current knowledge-graph version of a workspace"""
+    data = await get_namespace_data(KG_VERSION_NAMESPACE, workspace=workspace)
+    return data.get("version", 0)
+
+
+async def bump_kg_version(workspace: str) -> int:
+    """Mark the knowledge graph of a workspace as changed"""
+    data = await get_namespace_data(KG_VERSION_NAMESPACE, workspace=workspace)
+    # Workers bumping at the same time must not write the same version
+    async with get_namespace_lock(KG_VERSION_NAMESPACE, workspace=workspace):
+        version = data.get("version", 0) + 1
+        data["version"] = version
+    return version
+
+
+def semantic_cache_scope(
+    workspace: str, query_param: QueryParam, system_prompt: str | None = None
+) -> str:
+    """Hash of everything besides the query text that shapes the answer"""
+    return compute_args_hash(
+        workspace,
+        system_prompt or "",
+        query_param.mode,
+        query_param.start_date or "",
+        query_param.end_date or "",
+        query_param.response_type,
+        query_param.top_k,
+        query_param.chunk_top_k,
+        query_param.max_entity_tokens,
+        query_param.max_relation_tokens,
+        query_param.max_total_tokens,
+        query_param.user_prompt or "",
+        query_param.enable_rerank,
+        ", ".join(query_param.hl_keywords),
+        ", ".join(query_param.ll_keywords),
+    )
+
+
+def is_semantic_cacheable(query_param: QueryParam) -> bool:
+    """Only final answers without conversation history are cached"""
+    return not (
+        query_param.only_need_context
+        or query_param.only_need_prompt
+        or query_param.conversation_history
+        or query_param.model_func
+    )
+
+
+def query_context_cache_key(
+    query: str,
+    ll_keywords: str,
+    hl_keywords: str,
+    query_param: QueryParam,
+    global_config: dict[str, Any],
+) -> str:
+    """Hash of everything _build_query_context depends on"""
+    # Vector chunk search, VECTOR chunk picking and reranking use the query itself
+    uses_query = (
+        query_param.mode == "mix"
+        or global_config.get("kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD)
+        == "VECTOR"
+        or (query_param.enable_rerank and global_config.get("rerank_model_func"))
+    )
+    return compute_args_hash(
+        global_config.get("workspace", ""),
+        query_param.mode,
+        query if uses_query else "",
+        ll_keywords,
+        hl_keywords,
+        query_param.top_k,
+        query_param.chunk_top_k,
+        query_param.max_entity_tokens,
+        query_param.max_relation_tokens,
+        query_param.max_total_tokens,
+        query_param.enable_rerank,
+        query_param.start_date or "",
+        query_param.end_date or "",
+    )
+
+
+@dataclass
+class _Entry:
+    scope: str
+    query: str
+    embedding: np.ndarray
+    content: str
+    raw_data: dict[str, Any] | None
+    kg_version: int
+    create_time: float = field(default_factory=time.time)
+
+
+class SemanticQueryCache:
+    """In-process cache of query answers, matched by query embedding similarity"""
+
+    def __init__(self, similarity_threshold: float, max_entries: int):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _evict_stale(self, kg_version: int) -> None:
+        stale = [
+            entry_id
+            for entry_id, entry in self._entries.items()
+            if entry.kg_version != kg_version
+        ]
+        for entry_id in stale:
+            del self._entries[entry_id]
+        if stale:
+            self.evictions += len(stale)
+            logger.debug(f"Semantic query cache: evicted {len(stale)} stale entries")
+
+    def lookup(
+        self, scope: str, embedding, kg_version: int
+    ) -> tuple[str, dict[str, Any] | None, float] | None:
+        """Return (content, raw_data, similarity) of the best match, None on a miss"""
+        self._evict_stale(kg_version)
+        candidates = [
+            (entry_id, entry)
+            for entry_id, entry in self._entries.items()
+            if entry.scope == scope
+        ]
+        if candidates:
+            vector = self._normalize(embedding)
+            matrix = np.stack([entry.embedding for _, entry in candidates])
+            similarities = matrix @ vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity >= self.similarity_threshold:
+                entry_id, entry = candidates[best]
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                logger.info(
+                    f" == Semantic cache == hit (similarity {similarity:.3f}): "
+                    f"{entry.query[:80]}"
+                )
+                raw_data = dict(entry.raw_data) if entry.raw_data else None
+                return entry.content, raw_data, similarity
+
+        self.misses += 1
+        return None
+
+    def save(
+        self,
+        scope: str,
+        query: str,
+        embedding,
+        content: str,
+        raw_data: dict[str, Any] | None,
+        kg_version: int,
+    ) -> None:
+        if raw_data:
+            raw_data = {k: v for k, v in raw_data.items() if k != "llm_response"}
+        self._entries[self._next_id] = _Entry(
+            scope=scope,
+            query=query,
+            embedding=self._normalize(embedding),
+            content=content,
+            raw_data=raw_data,
+            kg_version=kg_version,
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "similarity_threshold": self.similarity_threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class QueryContextCache:
+    """In-process LRU cache of built query contexts for one knowledge-graph version"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, QueryContextResult] = OrderedDict()
+        self._kg_version: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def _sync(self, kg_version: int) -> None:
+        if kg_version != self._kg_version:
+            self._entries.clear()
+            self._kg_version = kg_version
+
+    def get(self, key: str, kg_version: int) -> QueryContextResult | None:
+        self._sync(kg_version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.info(" == Context cache == hit, reusing retrieval results")
+        # Callers add fields to raw_data (e.g. llm_response)
+        return QueryContextResult(
+            context=entry.context, raw_data=copy.deepcopy(entry.raw_data)
+        )
+
+    def put(self, key: str, result: QueryContextResult, kg_version: int) -> None:
+        """Cache a context built under ``kg_version``; ignored if the graph changed since"""
+        if self._kg_version is not None and kg_version < self._kg_version:
+            return
+        self._sync(kg_version)
+        self._entries[key] = QueryContextResult(
+            context=result.context, raw_data=copy.deepcopy(result.raw_data)
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import threading
+from collections import OrderedDict
 import aiohttp
-from typing import Any, List, Dict, Optional, Tuple
+import pipmaster as pm
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -10,6 +14,13 @@ from tenacity import (
     retry_if_exception_type,
 )
 from .utils import logger
+from .llm.client_pool import get_aiohttp_session
+from .constants import (
+    DEFAULT_LOCAL_RERANK_BATCH_SIZE,
+    DEFAULT_LOCAL_RERANK_CACHE_SIZE,
+    DEFAULT_LOCAL_RERANK_MAX_WAIT,
+    DEFAULT_LOCAL_RERANK_MODEL,
+)
 
 from dotenv import load_dotenv
 
@@ -19,6 +30,27 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+# Tokenizers for rerank chunking by model name, None when unavailable
+_rerank_tokenizers: Dict[str, Any] = {}
+
+
+def _get_rerank_tokenizer(tokenizer_model: str):
+    """Create the tokenizer for a model once and reuse it across rerank calls"""
+    if tokenizer_model not in _rerank_tokenizers:
+        try:
+            from .utils import TiktokenTokenizer
+
+            _rerank_tokenizers[tokenizer_model] = TiktokenTokenizer(
+                model_name=tokenizer_model
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to initialize tokenizer: {e}. Using character-based approximation."
+            )
+            _rerank_tokenizers[tokenizer_model] = None
+    return _rerank_tokenizers[tokenizer_model]
+
+
 def chunk_documents_for_rerank(
     documents: List[str],
     max_tokens: int = 480,
@@ -51,14 +83,8 @@ def chunk_documents_for_rerank(
             f"Clamping to {overlap_tokens} to prevent infinite loop."
         )
 
-    try:
-        from .utils import TiktokenTokenizer
-
-        tokenizer = TiktokenTokenizer(model_name=tokenizer_model)
-    except Exception as e:
-        logger.warning(
-            f"Failed to initialize tokenizer: {e}. Using character-based approximation."
-        )
+    tokenizer = _get_rerank_tokenizer(tokenizer_model)
+    if tokenizer is None:
         # Fallback: approximate 1 token ≈ 4 characters
         max_chars = max_tokens * 4
         overlap_chars = overlap_tokens * 4
@@ -287,82 +313,82 @@ async def generic_rerank_api(
         f"Rerank request: {len(documents)} documents, model: {model}, format: {response_format}"
     )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(base_url, headers=headers, json=payload) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                content_type = response.headers.get("content-type", "").lower()
-                is_html_error = (
-                    error_text.strip().startswith("<!DOCTYPE html>")
-                    or "text/html" in content_type
-                )
-                if is_html_error:
-                    if response.status == 502:
-                        clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
-                    elif response.status == 503:
-                        clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
-                    elif response.status == 504:
-                        clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
-                    else:
-                        clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
+    session = get_aiohttp_session(base_url, headers.get("Authorization"))
+    async with session.post(base_url, headers=headers, json=payload) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            content_type = response.headers.get("content-type", "").lower()
+            is_html_error = (
+                error_text.strip().startswith("<!DOCTYPE html>")
+                or "text/html" in content_type
+            )
+            if is_html_error:
+                if response.status == 502:
+                    clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
+                elif response.status == 503:
+                    clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
+                elif response.status == 504:
+                    clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
                 else:
-                    clean_error = error_text
-                logger.error(f"Rerank API error {response.status}: {clean_error}")
-                raise aiohttp.ClientResponseError(
-                    request_info=response.request_info,
-                    history=response.history,
-                    status=response.status,
-                    message=f"Rerank API error: {clean_error}",
-                )
-
-            response_json = await response.json()
-
-            if response_format == "aliyun":
-                # Aliyun format: {"output": {"results": [...]}}
-                results = response_json.get("output", {}).get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'output.results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
-            elif response_format == "standard":
-                # Standard format: {"results": [...]}
-                results = response_json.get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
+                    clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
             else:
-                raise ValueError(f"Unsupported response format: {response_format}")
-
-            if not results:
-                logger.warning("Rerank API returned empty results")
-                return []
-
-            # Standardize return format
-            standardized_results = [
-                {"index": result["index"], "relevance_score": result["relevance_score"]}
-                for result in results
-            ]
-
-            # Aggregate chunk scores back to original documents if chunking was enabled
-            if enable_chunking and doc_indices:
-                standardized_results = aggregate_chunk_scores(
-                    standardized_results,
-                    doc_indices,
-                    len(original_documents),
-                    aggregation="max",
+                clean_error = error_text
+            logger.error(f"Rerank API error {response.status}: {clean_error}")
+            raise aiohttp.ClientResponseError(
+                request_info=response.request_info,
+                history=response.history,
+                status=response.status,
+                message=f"Rerank API error: {clean_error}",
+            )
+
+        response_json = await response.json()
+
+        if response_format == "aliyun":
+            # Aliyun format: {"output": {"results": [...]}}
+            results = response_json.get("output", {}).get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'output.results' to be list, got {type(results)}: {results}"
                 )
-                # Apply original top_n limit at document level (post-aggregation)
-                # This preserves document-level semantics: top_n limits documents, not chunks
-                if (
-                    original_top_n is not None
-                    and len(standardized_results) > original_top_n
-                ):
-                    standardized_results = standardized_results[:original_top_n]
+                results = []
+        elif response_format == "standard":
+            # Standard format: {"results": [...]}
+            results = response_json.get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'results' to be list, got {type(results)}: {results}"
+                )
+                results = []
+        else:
+            raise ValueError(f"Unsupported response format: {response_format}")
 
-            return standardized_results
+        if not results:
+            logger.warning("Rerank API returned empty results")
+            return []
+
+        # Standardize return format
+        standardized_results = [
+            {"index": result["index"], "relevance_score": result["relevance_score"]}
+            for result in results
+        ]
+
+        # Aggregate chunk scores back to original documents if chunking was enabled
+        if enable_chunking and doc_indices:
+            standardized_results = aggregate_chunk_scores(
+                standardized_results,
+                doc_indices,
+                len(original_documents),
+                aggregation="max",
+            )
+            # Apply original top_n limit at document level (post-aggregation)
+            # This preserves document-level semantics: top_n limits documents, not chunks
+            if (
+                original_top_n is not None
+                and len(standardized_results) > original_top_n
+            ):
+                standardized_results = standardized_results[:original_top_n]
+
+        return standardized_results
 
 
 async def cohere_rerank(
@@ -513,6 +539,226 @@ async def ali_rerank(
     )
 
 
+class LocalReranker:
+    """
+    In-process cross-encoder reranking without a network hop.
+
+    Scores query/document pairs with a sentence-transformers CrossEncoder,
+    optionally through its ONNX or OpenVINO backend for CPU inference. Pairs
+    from concurrent queries are collected into shared inference batches: a
+    batch runs when ``batch_size`` pairs are waiting or ``max_wait`` seconds
+    after the first pair arrived. Scores are kept in an LRU cache keyed by the
+    query hash and the chunk id of the document (``compute_mdhash_id`` of its
+    content, as used for text chunks), so repeated queries over the same
+    chunks skip inference.
+
+    An instance is a drop-in ``rerank_model_func``.
+
+    Args:
+        model: Cross-encoder model name or path
+        backend: "torch", "onnx" or "openvino"
+        device: Inference device, e.g. "cpu" or "cuda" (default: auto)
+        batch_size: Maximum pairs per inference batch
+        max_wait: Seconds a partial batch waits for more pairs
+        cache_size: Scores kept in the LRU cache, 0 disables it
+        max_length: Maximum tokens per pair, longer pairs are truncated
+        predict: Scoring function ``list[(query, document)] -> list[float]``
+            used instead of loading a model
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_LOCAL_RERANK_MODEL,
+        backend: str = "torch",
+        device: Optional[str] = None,
+        batch_size: int = DEFAULT_LOCAL_RERANK_BATCH_SIZE,
+        max_wait: float = DEFAULT_LOCAL_RERANK_MAX_WAIT,
+        cache_size: int = DEFAULT_LOCAL_RERANK_CACHE_SIZE,
+        max_length: int = 512,
+        predict: Optional[Callable[[List[Tuple[str, str]]], List[float]]] = None,
+    ):
+        self.model = model
+        self.backend = backend
+        self.device = device
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+        self.max_length = max_length
+        self._predict = predict
+        self._model_lock = threading.Lock()
+        self._scores: OrderedDict[Tuple[str, str], float] = OrderedDict()
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set[asyncio.Task] = set()
+        self.stats = {"pairs": 0, "cache_hits": 0, "batches": 0}
+
+    def __deepcopy__(self, memo):
+        # Shared by asdict() copies of the LightRAG config: keep one model and cache
+        return self
+
+    def _load_model(self) -> None:
+        if not pm.is_installed("sentence-transformers"):
+            pm.install("sentence-transformers")
+        from sentence_transformers import CrossEncoder
+
+        kwargs = {"max_length": self.max_length}
+        if self.device:
+            kwargs["device"] = self.device
+        if self.backend != "torch":
+            kwargs["backend"] = self.backend
+        cross_encoder = CrossEncoder(self.model, **kwargs)
+        logger.info(f"Loaded local rerank model {self.model} ({self.backend})")
+
+        def predict(pairs):
+            return cross_encoder.predict(
+                pairs, batch_size=self.batch_size, show_progress_bar=False
+            )
+
+        self._predict = predict
+
+    def _score_batch(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        # Runs in a worker thread; batches are scored one at a time
+        with self._model_lock:
+            if self._predict is None:
+                self._load_model()
+            return [float(score) for score in self._predict(pairs)]
+
+    async def _run_batch(self, batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+        self.stats["batches"] += 1
+        try:
+            scores = await asyncio.to_thread(
+                self._score_batch, [(query, doc) for query, doc, _ in batch]
+            )
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (*_, future), score in zip(batch, scores):
+            if not future.done():
+                future.set_result(score)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            self._pending = self._pending[self.batch_size :]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    def _remember(self, key: Tuple[str, str], score: float) -> None:
+        if self.cache_size <= 0:
+            return
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.cache_size:
+            self._scores.popitem(last=False)
+
+    async def score(self, query: str, documents: List[str]) -> List[float]:
+        """Relevance score of each document for the query"""
+        from .utils import compute_args_hash, compute_mdhash_id
+
+        query_hash = compute_args_hash(query)
+        scores: List[Optional[float]] = [None] * len(documents)
+        waiting = []
+        loop = asyncio.get_running_loop()
+        for index, document in enumerate(documents):
+            key = (query_hash, compute_mdhash_id(document, prefix="chunk-"))
+            cached = self._scores.get(key)
+            if cached is not None:
+                self._scores.move_to_end(key)
+                scores[index] = cached
+                continue
+            future = loop.create_future()
+            self._pending.append((query, document, future))
+            waiting.append((index, key, future))
+
+        self.stats["pairs"] += len(documents)
+        self.stats["cache_hits"] += len(documents) - len(waiting)
+        if waiting:
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+            results = await asyncio.gather(*(future for *_, future in waiting))
+            for (index, key, _), score in zip(waiting, results):
+                scores[index] = score
+                self._remember(key, score)
+        return scores
+
+    async def __call__(
+        self,
+        query: str,
+        documents: List[str],
+        top_n: Optional[int] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rerank documents for the query.
+
+        Returns:
+            List of dictionary of ["index": int, "relevance_score": float]
+        """
+        if not documents:
+            return []
+        scores = await self.score(query, documents)
+        results = [
+            {"index": index, "relevance_score": score}
+            for index, score in enumerate(scores)
+        ]
+        results.sort(key=lambda x: x["relevance_score"], reverse=True)
+        return results[:top_n] if top_n else results
+
+
+# Local rerankers by configuration, shared by all calls of local_rerank
+_local_rerankers: Dict[Tuple[Any, ...], LocalReranker] = {}
+
+
+async def local_rerank(
+    query: str,
+    documents: List[str],
+    top_n: Optional[int] = None,
+    model: str = DEFAULT_LOCAL_RERANK_MODEL,
+    backend: Optional[str] = None,
+    device: Optional[str] = None,
+    extra_body: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> List[Dict[str, Any]]:
+    """
+    Rerank documents with an in-process cross-encoder (see LocalReranker).
+
+    Backend, device, batch size and cache size default to LOCAL_RERANK_BACKEND,
+    LOCAL_RERANK_DEVICE, LOCAL_RERANK_BATCH_SIZE and LOCAL_RERANK_CACHE_SIZE.
+    Remote-only arguments (api_key, base_url, extra_body) are ignored.
+
+    Returns:
+        List of dictionary of ["index": int, "relevance_score": float]
+    """
+    from .utils import get_env_value
+
+    config = (
+        model or DEFAULT_LOCAL_RERANK_MODEL,
+        backend or get_env_value("LOCAL_RERANK_BACKEND", "torch"),
+        device or get_env_value("LOCAL_RERANK_DEVICE", None),
+    )
+    reranker = _local_rerankers.get(config)
+    if reranker is None:
+        reranker = LocalReranker(
+            *config,
+            batch_size=get_env_value(
+                "LOCAL_RERANK_BATCH_SIZE", DEFAULT_LOCAL_RERANK_BATCH_SIZE, int
+            ),
+            cache_size=get_env_value(
+                "LOCAL_RERANK_CACHE_SIZE", DEFAULT_LOCAL_RERANK_CACHE_SIZE, int
+            ),
+        )
+        _local_rerankers[config] = reranker
+    return await reranker(query, documents, top_n=top_n)
+
+
 """Please run this test as a module:
 python -m lightrag.rerank
 """
@@ -14,12 +14,16 @@ import os
 import re
 import time
 import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
 from hashlib import md5
 from typing import (
     Any,
+    AsyncIterator,
+    Awaitable,
     Protocol,
     Callable,
     TYPE_CHECKING,
@@ -41,6 +45,9 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
+    DEFAULT_AIMD_MIN_CONCURRENCY,
+    DEFAULT_AIMD_DECREASE_FACTOR,
+    DEFAULT_AIMD_LATENCY_TOLERANCE,
 )
 
 # Precompile regex pattern for JSON sanitization (module-level, compiled once)
@@ -272,6 +279,12 @@ def set_verbose_debug(enabled: bool):
 
 statistic_data = {"llm_call": 0, "llm_cache": 0, "embed_call": 0}
 
+# Priority of the queued LLM/embedding call being executed, set by the workers
+# of priority_limit_async_func_call (None outside of a queued call)
+current_call_priority: ContextVar[int | None] = ContextVar(
+    "current_call_priority", default=None
+)
+
 
 class LightragPathFilter(logging.Filter):
     """Filter for lightrag logger to filter out frequent path access logs"""
@@ -613,6 +626,282 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+def is_overload_error(error: BaseException) -> bool:
+    """True for provider rate-limit (429) and overload (503/529) errors"""
+    if isinstance(error, (WorkerTimeoutError, HealthCheckTimeoutError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status in (429, 503, 529):
+        return True
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    return (
+        "ratelimit" in name
+        or "overloaded" in name
+        or "rate limit" in message
+        or "too many requests" in message
+        or "overloaded" in message
+    )
+
+
+def estimate_request_tokens(args: tuple, kwargs: dict) -> int:
+    """Rough token count of a request (4 characters per token) for TPM limits"""
+
+    def count_chars(value: Any) -> int:
+        if isinstance(value, str):
+            return len(value)
+        if isinstance(value, (list, tuple)):
+            return sum(count_chars(item) for item in value)
+        if isinstance(value, dict):
+            return count_chars(value.get("content", ""))
+        return 0
+
+    chars = count_chars(list(args))
+    for key in ("system_prompt", "history_messages", "texts"):
+        chars += count_chars(kwargs.get(key))
+    return max(1, chars // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``per_minute`` units per minute"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waits = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        # Requests larger than the bucket are let through once it is full
+        amount = min(float(amount), self.capacity)
+        async with self._lock:  # waiters are served in arrival order
+            self._refill()
+            if self.tokens < amount:
+                self.waits += 1
+                while self.tokens < amount:
+                    await asyncio.sleep((amount - self.tokens) / self.rate)
+                    self._refill()
+            self.tokens -= amount
+
+
+class AIMDConcurrencyController:
+    """Additive-increase / multiplicative-decrease limit on concurrent calls.
+
+    The limit grows by one after a full window of successful calls (``limit``
+    calls) and is cut by ``decrease_factor`` when a call fails with a
+    rate-limit/overload error or the smoothed latency exceeds
+    ``latency_tolerance`` times the best latency seen. Calls started before
+    the last decrease do not trigger another one, so a burst of 429s from
+    in-flight requests halves the limit once.
+
+    Raw latency is only a congestion signal when calls have a similar size.
+    ``latency_tolerance`` 0 disables it, so only overload errors decrease the
+    limit; use this when call durations vary with the request, as for LLMs.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        decrease_factor: float = DEFAULT_AIMD_DECREASE_FACTOR,
+        latency_tolerance: float = DEFAULT_AIMD_LATENCY_TOLERANCE,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = max(self.min_limit, self.max_limit // 2)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.active = 0
+        self.latency_ewma: float | None = None
+        self.best_latency: float | None = None
+        self.increases = 0
+        self.decreases = 0
+        self.overload_errors = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until fewer than ``limit`` slots are taken"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(
+        self, start: float | None = None, error: BaseException | None = None
+    ) -> None:
+        """Free a slot and feed back the outcome of the call started at ``start``.
+
+        ``start`` is None when the slot was not used for a call.
+        """
+        async with self._condition:
+            self.active -= 1
+            if start is not None:
+                if error is None:
+                    self._observe(start, time.monotonic() - start)
+                elif is_overload_error(error):
+                    self.overload_errors += 1
+                    self._decrease(start, "overload error")
+            self._condition.notify_all()
+
+    def _observe(self, start: float, latency: float) -> None:
+        self.latency_ewma = (
+            latency
+            if self.latency_ewma is None
+            else 0.8 * self.latency_ewma + 0.2 * latency
+        )
+        # Baseline: best smoothed latency, drifting up slowly so that a lasting
+        # change of workload (e.g. longer prompts) is not taken for congestion
+        if self.best_latency is None:
+            self.best_latency = self.latency_ewma
+        else:
+            self.best_latency = min(self.latency_ewma, self.best_latency * 1.01)
+        if (
+            self.latency_tolerance > 0
+            and self.latency_ewma > self.best_latency * self.latency_tolerance
+        ):
+            self._decrease(start, f"latency {self.latency_ewma:.2f}s")
+            return
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self.increases += 1
+            self._successes = 0
+
+    def _decrease(self, start: float, reason: str) -> None:
+        if start < self._last_decrease:
+            return
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        self._last_decrease = time.monotonic()
+        self._successes = 0
+        # Forget the latency history so the next window is judged on its own
+        self.latency_ewma = None
+        if new_limit < self.limit:
+            logger.info(
+                f"Adaptive concurrency: limit {self.limit} -> {new_limit} ({reason})"
+            )
+            self.limit = new_limit
+            self.decreases += 1
+
+
+class PipelineStage:
+    """Concurrency-limited stage of the document pipeline.
+
+    A document waiting for a slot is queued on the stage. The previous stage
+    calls ``reserve`` while still holding its own slot, so a full queue holds
+    back the upstream stage instead of piling up extraction results. The
+    queue place belongs to the reserving task and is given back if the task
+    ends (e.g. is cancelled) before entering ``slot``. ``queue_size`` 0
+    leaves the queue unbounded. ``on_change`` is called whenever the counters
+    change, e.g. to publish ``stats`` to the pipeline status.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        queue_size: int = 0,
+        on_change: Callable[[], None] | None = None,
+    ):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(0, queue_size)
+        self.on_change = on_change
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started = time.monotonic()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._queue = asyncio.Semaphore(self.queue_size) if self.queue_size else None
+        # Queue places held by tasks between reserve() and slot()
+        self._reservations: dict[asyncio.Task, int] = {}
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+    async def reserve(self) -> None:
+        """Take a place in the queue for the current task, waiting while it is full"""
+        if self._queue is not None:
+            await self._queue.acquire()
+        task = asyncio.current_task()
+        if task not in self._reservations:
+            task.add_done_callback(self._release_reservations)
+        self._reservations[task] = self._reservations.get(task, 0) + 1
+        self.queued += 1
+        self._changed()
+
+    def _leave_queue(self, task: asyncio.Task) -> None:
+        count = self._reservations.pop(task) - 1
+        if count:
+            self._reservations[task] = count
+        else:
+            task.remove_done_callback(self._release_reservations)
+        self.queued -= 1
+        if self._queue is not None:
+            self._queue.release()
+
+    def _release_reservations(self, task: asyncio.Task) -> None:
+        """Give back the queue places of a task that ended before using them"""
+        while task in self._reservations:
+            self._leave_queue(task)
+        self._changed()
+
+    @asynccontextmanager
+    async def slot(self, reserved: bool = False) -> AsyncIterator[None]:
+        """Run the body in the stage once a slot is free.
+
+        ``reserved`` is True when the calling task already holds a queue place
+        from ``reserve``.
+        """
+        if not reserved:
+            await self.reserve()
+        elif asyncio.current_task() not in self._reservations:
+            raise RuntimeError(f"No place reserved in the {self.name} stage queue")
+        try:
+            await self._slots.acquire()
+        finally:
+            self._leave_queue(asyncio.current_task())
+        self.running += 1
+        self._changed()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+        finally:
+            self.running -= 1
+            self.busy_seconds += time.monotonic() - start
+            self._slots.release()
+            self._changed()
+
+    def stats(self) -> dict[str, Any]:
+        """Slots, queue depth, completed documents per minute and utilization"""
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "queue_depth": self.queued,
+            "queue_size": self.queue_size,
+            "completed": self.completed,
+            "failed": self.failed,
+            "docs_per_minute": round(self.completed * 60 / elapsed, 2),
+            "utilization": round(self.busy_seconds / (elapsed * self.concurrency), 3),
+        }
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -621,6 +910,11 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    adaptive: bool = False,
+    min_size: int = DEFAULT_AIMD_MIN_CONCURRENCY,
+    latency_tolerance: float = DEFAULT_AIMD_LATENCY_TOLERANCE,
+    requests_per_minute: int = 0,
+    tokens_per_minute: int = 0,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -630,6 +924,7 @@ def priority_limit_async_func_call(
     - Task state tracking to prevent race conditions
     - Enhanced health check system with stuck task detection
     - Proper resource cleanup and error recovery
+    - Optional adaptive (AIMD) concurrency and requests/tokens per minute limits
 
     Args:
         max_size: Maximum number of concurrent calls
@@ -639,9 +934,16 @@ def priority_limit_async_func_call(
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        adaptive: Adjust concurrency between min_size and max_size from latency and 429/overload errors
+        min_size: Lowest concurrency the adaptive controller may go down to
+        latency_tolerance: Smoothed latency, relative to the best seen, that the adaptive
+            controller treats as congestion (0 backs off on overload errors only)
+        requests_per_minute: Token-bucket limit on calls per minute (0 disables it)
+        tokens_per_minute: Token-bucket limit on estimated request tokens per minute (0 disables it)
 
     Returns:
-        Decorator function
+        Decorator function. The decorated function has ``shutdown()`` and
+        ``stats()`` (live concurrency, queue depth and throttle events) attributes.
     """
 
     def final_decro(func):
@@ -675,11 +977,31 @@ def priority_limit_async_func_call(
         active_futures = weakref.WeakSet()
         reinit_count = 0
 
+        # Flow control: max_size workers exist, the controller decides how many run
+        controller = (
+            AIMDConcurrencyController(
+                max_size, min_size, latency_tolerance=latency_tolerance
+            )
+            if adaptive
+            else None
+        )
+        rpm_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        tpm_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        metrics = {"running": 0, "overload_errors": 0}
+
         async def worker():
             """Enhanced worker that processes tasks with proper timeout and state management"""
             try:
                 while not shutdown_event.is_set():
+                    slot_taken = False
                     try:
+                        if controller is not None:
+                            # Take a slot before dequeuing so waiting workers never hold tasks
+                            await controller.acquire()
+                            slot_taken = True
+
                         # Get task from queue with timeout for shutdown checking
                         try:
                             (
@@ -714,7 +1036,20 @@ def priority_limit_async_func_call(
                             queue.task_done()
                             continue
 
+                        call_start = None
+                        call_error = None
                         try:
+                            # Provider rate limits
+                            if rpm_bucket is not None:
+                                await rpm_bucket.acquire(1)
+                            if tpm_bucket is not None:
+                                await tpm_bucket.acquire(
+                                    estimate_request_tokens(args, kwargs)
+                                )
+
+                            metrics["running"] += 1
+                            call_start = time.monotonic()
+                            current_call_priority.set(priority)
                             # Execute function with timeout protection
                             if max_execution_timeout is not None:
                                 result = await asyncio.wait_for(
@@ -732,14 +1067,14 @@ def priority_limit_async_func_call(
                             logger.warning(
                                 f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
                             )
+                            call_error = WorkerTimeoutError(
+                                max_execution_timeout, "execution"
+                            )
                             if not task_state.future.done():
-                                task_state.future.set_exception(
-                                    WorkerTimeoutError(
-                                        max_execution_timeout, "execution"
-                                    )
-                                )
+                                task_state.future.set_exception(call_error)
                         except asyncio.CancelledError:
                             # Task was cancelled during execution
+                            call_start = None
                             if not task_state.future.done():
                                 task_state.future.cancel()
                             logger.debug(
@@ -747,12 +1082,20 @@ def priority_limit_async_func_call(
                             )
                         except Exception as e:
                             # Function execution error
+                            call_error = e
                             logger.error(
                                 f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
                             )
                             if not task_state.future.done():
                                 task_state.future.set_exception(e)
                         finally:
+                            if call_start is not None:
+                                metrics["running"] -= 1
+                            if call_error is not None and is_overload_error(call_error):
+                                metrics["overload_errors"] += 1
+                            if slot_taken:
+                                slot_taken = False
+                                await controller.release(call_start, call_error)
                             # Clean up task state
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
@@ -764,6 +1107,9 @@ def priority_limit_async_func_call(
                             f"{queue_name}: Critical error in worker: {str(e)}"
                         )
                         await asyncio.sleep(0.1)
+                    finally:
+                        if slot_taken:
+                            await controller.release()
             finally:
                 logger.debug(f"{queue_name}: Worker exiting")
 
@@ -1050,8 +1396,31 @@ def priority_limit_async_func_call(
                 async with task_states_lock:
                     task_states.pop(task_id, None)
 
-        # Add shutdown method to decorated function
+        def stats() -> dict[str, Any]:
+            """Live concurrency, queue depth and throttle events of the queue"""
+            data = {
+                "adaptive": controller is not None,
+                "max_concurrency": max_size,
+                "concurrency_limit": controller.limit if controller else max_size,
+                "running": metrics["running"],
+                "queue_depth": queue.qsize(),
+                "overload_errors": metrics["overload_errors"],
+                "rpm_throttled": rpm_bucket.waits if rpm_bucket else 0,
+                "tpm_throttled": tpm_bucket.waits if tpm_bucket else 0,
+            }
+            if controller is not None:
+                data["limit_increases"] = controller.increases
+                data["limit_decreases"] = controller.decreases
+                data["latency_ewma"] = (
+                    round(controller.latency_ewma, 3)
+                    if controller.latency_ewma is not None
+                    else None
+                )
+            return data
+
+        # Add shutdown and stats methods to decorated function
         wait_func.shutdown = shutdown
+        wait_func.stats = stats
 
         return wait_func
 
@@ -1261,16 +1630,24 @@ class Tokenizer:
     A wrapper around a tokenizer to provide a consistent interface for encoding and decoding.
     """
 
-    def __init__(self, model_name: str, tokenizer: TokenizerInterface):
+    def __init__(
+        self,
+        model_name: str,
+        tokenizer: TokenizerInterface,
+        version: str | None = None,
+    ):
         """
         Initializes the Tokenizer with a tokenizer model name and a tokenizer instance.
 
         Args:
             model_name: The associated model name for the tokenizer.
             tokenizer: An instance of a class implementing the TokenizerInterface.
+            version: Identifies the vocabulary in the stamps of stored token counts.
+                Defaults to the model name.
         """
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        self.version: str = version or model_name
 
     def encode(self, content: str) -> List[int]:
         """
@@ -1322,7 +1699,11 @@ class TiktokenTokenizer(Tokenizer):
 
         try:
             tokenizer = tiktoken.encoding_for_model(model_name)
-            super().__init__(model_name=model_name, tokenizer=tokenizer)
+            super().__init__(
+                model_name=model_name,
+                tokenizer=tokenizer,
+                version=f"tiktoken-{tiktoken.__version__}/{tokenizer.name}",
+            )
         except KeyError:
             raise ValueError(f"Invalid model_name: {model_name}.")
 
@@ -1352,18 +1733,59 @@ def truncate_list_by_token_size(
     key: Callable[[Any], str],
     max_token_size: int,
     tokenizer: Tokenizer,
+    count: Callable[[Any], int | None] | None = None,
 ) -> list[int]:
-    """Truncate a list of data by token size"""
+    """Truncate a list of data by token size
+
+    ``count`` returns the precomputed token count of an item, or None to
+    encode ``key(item)`` instead.
+    """
     if max_token_size <= 0:
         return []
     tokens = 0
     for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+        item_tokens = count(data) if count is not None else None
+        if item_tokens is None:
+            item_tokens = len(tokenizer.encode(key(data)))
+        tokens += item_tokens
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
 
 
+# Precomputed token count of a record's context serialization, stored with the
+# record at ingest or merge time
+TOKEN_COUNT_FIELDS = ("token_count", "token_count_stamp")
+
+
+def token_count_stamp(tokenizer: Tokenizer, text: str) -> str:
+    """Stamp of a stored token count: tokenizer version and length of the counted text
+
+    The length catches records whose text was edited without recounting.
+    """
+    return f"{tokenizer.version}:{len(text)}"
+
+
+def compute_token_count_fields(
+    tokenizer: Tokenizer, serialized: str, text: str
+) -> dict[str, Any]:
+    """Token count fields to store with a record serialized as ``serialized``"""
+    return {
+        "token_count": len(tokenizer.encode(serialized)),
+        "token_count_stamp": token_count_stamp(tokenizer, text),
+    }
+
+
+def stored_token_count(record: dict, tokenizer: Tokenizer, text: str) -> int | None:
+    """Stored token count of a record, None if missing or stamped for another tokenizer or text"""
+    count = record.get("token_count")
+    if count is None or record.get("token_count_stamp") != token_count_stamp(
+        tokenizer, text
+    ):
+        return None
+    return int(count)
+
+
 def cosine_similarity(v1, v2):
     """Calculate cosine similarity between two vectors"""
     dot_product = np.dot(v1, v2)
@@ -1466,6 +1888,34 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
     await hashing_kv.upsert({flattened_key: cache_entry})
 
 
+async def tee_stream(
+    stream: AsyncIterator[str],
+    on_complete: Callable[[str], Awaitable[None]],
+) -> AsyncIterator[str]:
+    """Forward a streaming response chunk by chunk while accumulating it.
+
+    ``on_complete`` receives the full response once the stream is exhausted.
+    It is not called when the stream fails or the consumer stops early
+    (e.g. the client disconnected), so partial responses are never cached.
+    """
+    chunks = []
+    async for chunk in stream:
+        if chunk:
+            chunks.append(chunk)
+        yield chunk
+
+    try:
+        await on_complete("".join(chunks))
+    except Exception as e:
+        logger.warning(f"Failed to cache streamed response: {e}")
+
+
+async def replay_stream(content: str) -> AsyncIterator[str]:
+    """Replay a cached response as a stream, line by line"""
+    for line in content.splitlines(keepends=True):
+        yield line
+
+
 def safe_unicode_decode(content):
     # Regular expression to find all Unicode escape sequences of the form \uXXXX
     unicode_escape_pattern = re.compile(r"\\u([0-9a-fA-F]{4})")
@@ -1933,6 +2383,109 @@ def remove_think_tags(text: str) -> str:
     ).strip()
 
 
+class CacheablePrompt(str):
+    """Prompt whose leading ``cache_prefix_len`` characters do not change between calls
+
+    Providers with prompt caching (Anthropic ``cache_control``, OpenAI automatic
+    prefix caching, vLLM prefix caching) only reuse work for an identical
+    prompt prefix. The prompt builders return this str subclass so bindings that
+    support cache hints can mark the static part; all other bindings use it as
+    a plain string.
+    """
+
+    cache_prefix_len: int
+
+    def __new__(cls, text: str, cache_prefix_len: int | None = None):
+        prompt = super().__new__(cls, text)
+        prompt.cache_prefix_len = (
+            len(text)
+            if cache_prefix_len is None
+            else max(0, min(cache_prefix_len, len(text)))
+        )
+        return prompt
+
+    @property
+    def static_prefix(self) -> str:
+        return str(self)[: self.cache_prefix_len]
+
+    @property
+    def dynamic_suffix(self) -> str:
+        return str(self)[self.cache_prefix_len :]
+
+
+def format_cacheable_prompt(
+    template: str, dynamic_fields: Collection[str], **values: Any
+) -> str:
+    """Format a prompt template, marking the text before the first dynamic field as static
+
+    Returns a CacheablePrompt when the template starts with a static section,
+    otherwise the plain formatted string.
+    """
+    prompt = template.format(**values)
+    positions = [
+        template.find("{" + field + "}")
+        for field in dynamic_fields
+        if field in values
+    ]
+    positions = [pos for pos in positions if pos > 0]
+    if not positions:
+        return prompt
+    try:
+        static_prefix = template[: min(positions)].format(**values)
+    except (ValueError, KeyError, IndexError):
+        # The cut went through an escaped brace or a malformed custom template
+        return prompt
+    if not static_prefix or not prompt.startswith(static_prefix):
+        return prompt
+    return CacheablePrompt(prompt, len(static_prefix))
+
+
+def _sanitize_prompt(prompt: str) -> str:
+    """sanitize_text_for_encoding that keeps the static prefix of a CacheablePrompt"""
+    safe_prompt = sanitize_text_for_encoding(prompt)
+    if isinstance(prompt, CacheablePrompt) and safe_prompt:
+        safe_prefix = sanitize_text_for_encoding(prompt.static_prefix)
+        if safe_prefix and safe_prompt.startswith(safe_prefix):
+            return CacheablePrompt(safe_prompt, len(safe_prefix))
+    return safe_prompt
+
+
+def prepare_llm_cache_call(
+    user_prompt: str,
+    system_prompt: str | None = None,
+    history_messages: list[dict[str, str]] | None = None,
+) -> tuple[str, str | None, list[dict[str, str]] | None, str]:
+    """Sanitize the parts of an LLM call and build the prompt its cache key is hashed from
+
+    Returns:
+        (safe_user_prompt, safe_system_prompt, safe_history_messages, cache_prompt)
+    """
+    safe_user_prompt = sanitize_text_for_encoding(user_prompt)
+    safe_system_prompt = _sanitize_prompt(system_prompt) if system_prompt else None
+
+    # Sanitize history messages if provided
+    safe_history_messages = None
+    history = None
+    if history_messages:
+        safe_history_messages = []
+        for msg in history_messages:
+            safe_msg = msg.copy()
+            if "content" in safe_msg:
+                safe_msg["content"] = sanitize_text_for_encoding(safe_msg["content"])
+            safe_history_messages.append(safe_msg)
+        history = json.dumps(safe_history_messages, ensure_ascii=False)
+
+    prompt_parts = [
+        part for part in (safe_user_prompt, safe_system_prompt, history) if part
+    ]
+    return (
+        safe_user_prompt,
+        safe_system_prompt,
+        safe_history_messages,
+        "\n".join(prompt_parts),
+    )
+
+
 async def use_llm_func_with_cache(
     user_prompt: str,
     use_llm_func: callable,
@@ -1968,34 +2521,11 @@ async def use_llm_func_with_cache(
             - For cache misses: (content, current_timestamp)
     """
     # Sanitize input text to prevent UTF-8 encoding errors for all LLM providers
-    safe_user_prompt = sanitize_text_for_encoding(user_prompt)
-    safe_system_prompt = (
-        sanitize_text_for_encoding(system_prompt) if system_prompt else None
+    safe_user_prompt, safe_system_prompt, safe_history_messages, _prompt = (
+        prepare_llm_cache_call(user_prompt, system_prompt, history_messages)
     )
 
-    # Sanitize history messages if provided
-    safe_history_messages = None
-    if history_messages:
-        safe_history_messages = []
-        for i, msg in enumerate(history_messages):
-            safe_msg = msg.copy()
-            if "content" in safe_msg:
-                safe_msg["content"] = sanitize_text_for_encoding(safe_msg["content"])
-            safe_history_messages.append(safe_msg)
-        history = json.dumps(safe_history_messages, ensure_ascii=False)
-    else:
-        history = None
-
     if llm_response_cache:
-        prompt_parts = []
-        if safe_user_prompt:
-            prompt_parts.append(safe_user_prompt)
-        if safe_system_prompt:
-            prompt_parts.append(safe_system_prompt)
-        if history:
-            prompt_parts.append(history)
-        _prompt = "\n".join(prompt_parts)
-
         arg_hash = compute_args_hash(_prompt)
         # Generate cache key for this LLM call
         cache_key = generate_cache_key("default", cache_type, arg_hash)
@@ -2575,16 +3105,22 @@ class TokenTracker:
         self.prompt_tokens = 0
         self.completion_tokens = 0
         self.total_tokens = 0
+        self.cached_tokens = 0
+        self.cache_creation_tokens = 0
         self.call_count = 0
 
     def add_usage(self, token_counts):
         """Add token usage from one LLM call.
 
         Args:
-            token_counts: A dictionary containing prompt_tokens, completion_tokens, total_tokens
+            token_counts: A dictionary containing prompt_tokens, completion_tokens, total_tokens,
+                and optionally cached_tokens (prompt tokens read from the provider's prompt
+                cache) and cache_creation_tokens (prompt tokens written to it)
         """
         self.prompt_tokens += token_counts.get("prompt_tokens", 0)
         self.completion_tokens += token_counts.get("completion_tokens", 0)
+        self.cached_tokens += token_counts.get("cached_tokens") or 0
+        self.cache_creation_tokens += token_counts.get("cache_creation_tokens") or 0
 
         # If total_tokens is provided, use it directly; otherwise calculate the sum
         if "total_tokens" in token_counts:
@@ -2602,6 +3138,8 @@ class TokenTracker:
             "prompt_tokens": self.prompt_tokens,
             "completion_tokens": self.completion_tokens,
             "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens,
             "call_count": self.call_count,
         }
 
@@ -2611,7 +3149,8 @@ class TokenTracker:
             f"LLM call count: {usage['call_count']}, "
             f"Prompt tokens: {usage['prompt_tokens']}, "
             f"Completion tokens: {usage['completion_tokens']}, "
-            f"Total tokens: {usage['total_tokens']}"
+            f"Total tokens: {usage['total_tokens']}, "
+            f"Cached prompt tokens: {usage['cached_tokens']}"
         )
 
 
@@ -2784,13 +3323,29 @@ async def process_chunks_unified(
 
         original_count = len(unique_chunks)
 
+        def serialized(chunk: dict) -> str:
+            return json.dumps(
+                {k: v for k, v in chunk.items() if k not in TOKEN_COUNT_FIELDS},
+                ensure_ascii=False,
+            )
+
+        def stored_tokens(chunk: dict) -> int | None:
+            # The stored count covers the content, only the short fields around it are encoded
+            content_tokens = stored_token_count(
+                chunk, tokenizer, chunk.get("content", "")
+            )
+            if content_tokens is None:
+                return None
+            return content_tokens + len(
+                tokenizer.encode(serialized({**chunk, "content": ""}))
+            )
+
         unique_chunks = truncate_list_by_token_size(
             unique_chunks,
-            key=lambda x: "\n".join(
-                json.dumps(item, ensure_ascii=False) for item in [x]
-            ),
+            key=serialized,
             max_token_size=chunk_token_limit,
             tokenizer=tokenizer,
+            count=stored_tokens,
         )
 
         logger.debug(
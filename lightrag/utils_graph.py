@@ -9,6 +9,7 @@ from .kg.shared_storage import get_storage_keyed_lock
 from .constants import GRAPH_FIELD_SEP
 from .utils import compute_mdhash_id, logger
 from .base import StorageNameSpace
+from .query_cache import bump_kg_version
 
 
 async def _persist_graph_updates(
@@ -53,6 +54,12 @@ async def _persist_graph_updates(
             ]
         )
 
+    # Graph edits make cached query answers stale
+    if chunk_entity_relation_graph is not None:
+        await bump_kg_version(
+            chunk_entity_relation_graph.global_config.get("workspace", "")
+        )
+
 
 async def adelete_by_entity(
     chunk_entity_relation_graph,
@@ -4,8 +4,15 @@ Pytest configuration for LightRAG tests.
 This file provides command-line options and fixtures for test configuration.
 """
 
+import re
+
+import numpy as np
 import pytest
 
+from lightrag import LightRAG
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
 
 def pytest_configure(config):
     """Register custom markers for LightRAG tests."""
@@ -141,3 +148,98 @@ def run_integration_tests(request):
 
     # Fall back to environment variable
     return os.getenv("LIGHTRAG_RUN_INTEGRATION", "false").lower() == "true"
+
+
+class _CharTokenizer:
+    """One token per character, recording every encoded text"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, content: str) -> list[int]:
+        self.encoded.append(content)
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(token) for token in tokens)
+
+
+class _ExtractionLLM:
+    """Extracts every town (a capitalized word ending in "ville") as an entity
+
+    Extraction prompts carry a system prompt; other calls (summaries) do not.
+    The towns found by each extraction call are recorded in ``extracted``.
+    """
+
+    def __init__(self):
+        self.extracted = []
+
+    async def __call__(
+        self, prompt, system_prompt=None, history_messages=None, **kwargs
+    ):
+        if not system_prompt:
+            return "A summary."
+        towns = sorted(set(re.findall(r"\b[A-Z][a-z]*ville\b", prompt)))
+        self.extracted.append(towns)
+        lines = [f"entity<|#|>{t}<|#|>location<|#|>{t} is a town." for t in towns]
+        return "\n".join(lines + ["<|COMPLETE|>"])
+
+
+async def _ones_embedding(texts: list[str]) -> np.ndarray:
+    return np.ones((len(texts), 8))
+
+
+@pytest.fixture
+def shared_data():
+    """Single-process shared storage, torn down after the test"""
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.fixture
+def char_tokenizer() -> Tokenizer:
+    """Offline tokenizer; the encoded texts are in ``char_tokenizer.tokenizer.encoded``"""
+    return Tokenizer("char", _CharTokenizer())
+
+
+@pytest.fixture
+def embedding_func() -> EmbeddingFunc:
+    """8-dimensional embedding function returning the same vector for every text"""
+    return EmbeddingFunc(embedding_dim=8, max_token_size=8192, func=_ones_embedding)
+
+
+@pytest.fixture
+def extraction_llm() -> _ExtractionLLM:
+    return _ExtractionLLM()
+
+
+@pytest.fixture
+async def make_rag(
+    tmp_path, shared_data, char_tokenizer, embedding_func, extraction_llm
+):
+    """Factory of initialized offline LightRAG instances, finalized after the test
+
+    Keyword arguments override the defaults: the working directory is
+    ``tmp_path``, the LLM is ``extraction_llm`` and gleaning is disabled.
+    """
+    instances = []
+
+    async def factory(**kwargs) -> LightRAG:
+        rag = LightRAG(
+            **{
+                "working_dir": str(tmp_path),
+                "llm_model_func": extraction_llm,
+                "embedding_func": embedding_func,
+                "tokenizer": char_tokenizer,
+                "entity_extract_max_gleaning": 0,
+                **kwargs,
+            }
+        )
+        await rag.initialize_storages()
+        instances.append(rag)
+        return rag
+
+    yield factory
+    for rag in instances:
+        await rag.finalize_storages()
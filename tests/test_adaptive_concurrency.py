@@ -0,0 +1,137 @@
+"""
+Tests for adaptive concurrency and rate limits of priority_limit_async_func_call
+
+This test verifies:
+1. The AIMD controller halves the limit once per burst of overload errors and grows it back
+2. Rate-limit and overload errors are recognised
+3. Token buckets delay calls beyond the configured rate
+4. The decorated function never runs more calls than the current limit and reports stats
+5. The LLM queue does not take calls of mixed duration for congestion
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from lightrag import LightRAG
+from lightrag.utils import (
+    AIMDConcurrencyController,
+    TokenBucket,
+    is_overload_error,
+    priority_limit_async_func_call,
+)
+
+
+class _ProviderError(Exception):
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        super().__init__(f"HTTP {status_code}")
+
+
+@pytest.mark.offline
+async def test_aimd_decreases_once_per_burst_and_grows_back():
+    controller = AIMDConcurrencyController(max_limit=8, min_limit=1)
+    assert controller.limit == 4
+
+    # Four in-flight calls all fail with 429: one decrease
+    for _ in range(4):
+        await controller.acquire()
+    start = time.monotonic() - 0.01
+    for _ in range(4):
+        await controller.release(start, _ProviderError(429))
+    assert controller.limit == 2
+    assert controller.decreases == 1
+
+    # A full window of fast successful calls adds one slot
+    for _ in range(2):
+        await controller.acquire()
+        await controller.release(time.monotonic())
+    assert controller.limit == 3
+    assert controller.active == 0
+
+
+@pytest.mark.offline
+def test_overload_errors_are_recognised():
+    assert is_overload_error(_ProviderError(429))
+    assert is_overload_error(_ProviderError(529))
+    assert is_overload_error(Exception("Rate limit reached for requests"))
+    assert is_overload_error(type("RateLimitError", (Exception,), {})())
+    assert not is_overload_error(_ProviderError(400))
+    assert not is_overload_error(ValueError("bad input"))
+
+
+@pytest.mark.offline
+async def test_token_bucket_throttles():
+    bucket = TokenBucket(per_minute=600)  # 10 per second
+    await bucket.acquire(600)
+    started = time.monotonic()
+    await bucket.acquire(2)
+    assert time.monotonic() - started >= 0.15
+    assert bucket.waits == 1
+
+
+@pytest.mark.offline
+async def test_adaptive_queue_respects_limit_and_reports_stats():
+    running = 0
+    over_limit = 0
+    calls = 0
+
+    async def provider(i):
+        nonlocal running, over_limit, calls
+        running += 1
+        if running > func.stats()["concurrency_limit"]:
+            over_limit += 1
+        calls += 1
+        try:
+            await asyncio.sleep(0.01)
+            if calls <= 4:
+                raise _ProviderError(429)
+            return i
+        finally:
+            running -= 1
+
+    func = priority_limit_async_func_call(
+        8, queue_name="test", adaptive=True, requests_per_minute=100000
+    )(provider)
+
+    results = await asyncio.gather(
+        *[func(i) for i in range(20)], return_exceptions=True
+    )
+    stats = func.stats()
+    await func.shutdown()
+
+    assert over_limit == 0
+    assert sum(isinstance(r, _ProviderError) for r in results) == 4
+    assert stats["adaptive"] is True
+    assert stats["overload_errors"] == 4
+    assert stats["limit_decreases"] >= 1
+    assert stats["running"] == 0
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.offline
+async def test_llm_queue_ignores_mixed_call_durations(
+    tmp_path, char_tokenizer, embedding_func
+):
+    async def llm_func(prompt, **kwargs):
+        # Short summaries and long extractions from a healthy provider
+        await asyncio.sleep(0.05 if prompt == "long" else 0.005)
+        return prompt
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=llm_func,
+        embedding_func=embedding_func,
+        tokenizer=char_tokenizer,
+        llm_model_max_async=16,
+        adaptive_concurrency=True,
+    )
+    prompts = ["short", "short", "short", "long"] * 40
+
+    await asyncio.gather(*[rag.llm_model_func(prompt) for prompt in prompts])
+    stats = rag.llm_model_func.stats()
+    await rag.llm_model_func.shutdown()
+
+    assert stats["limit_decreases"] == 0
+    assert stats["concurrency_limit"] >= 8
@@ -0,0 +1,54 @@
+"""
+Tests for coalesced batch deletion (LightRAG.adelete_by_doc_ids)
+
+This test verifies:
+1. An entity shared by the deleted documents is rebuilt once, not once per document
+2. Entities of the deleted documents only are removed, shared ones keep their other sources
+3. Unknown documents get a not_found result without failing the batch
+"""
+
+import pytest
+
+import lightrag.lightrag as lightrag_module
+
+
+@pytest.mark.offline
+async def test_shared_entities_are_rebuilt_once(make_rag, monkeypatch):
+    rebuilds = []
+    rebuild_knowledge_from_chunks = lightrag_module.rebuild_knowledge_from_chunks
+
+    async def recording_rebuild(**kwargs):
+        rebuilds.append(set(kwargs["entities_to_rebuild"]))
+        return await rebuild_knowledge_from_chunks(**kwargs)
+
+    monkeypatch.setattr(
+        lightrag_module, "rebuild_knowledge_from_chunks", recording_rebuild
+    )
+
+    rag = await make_rag()
+    towns = ["Northville", "Southville", "Eastville", "Westville"]
+    await rag.ainsert(
+        [f"{town} trades with Hubville." for town in towns],
+        ids=[f"doc-{i}" for i in range(len(towns))],
+    )
+
+    results = await rag.adelete_by_doc_ids(["doc-0", "doc-1", "doc-missing", "doc-2"])
+
+    assert [r.status for r in results] == [
+        "success",
+        "success",
+        "not_found",
+        "success",
+    ]
+    assert rebuilds == [{"Hubville"}]
+
+    graph = rag.chunk_entity_relation_graph
+    for town in towns[:3]:
+        assert not await graph.has_node(town)
+    assert await graph.has_node("Westville")
+    hub_chunks = await rag.entity_chunks.get_by_id("Hubville")
+    remaining = await rag.doc_status.get_by_id("doc-3")
+    assert hub_chunks["chunk_ids"] == remaining["chunks_list"]
+    for doc_id in ("doc-0", "doc-1", "doc-2"):
+        assert await rag.doc_status.get_by_id(doc_id) is None
+        assert await rag.full_entities.get_by_id(doc_id) is None
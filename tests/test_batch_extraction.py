@@ -0,0 +1,164 @@
+"""
+Tests for offline batch extraction (lightrag.batch_extraction)
+
+This test verifies:
+1. Initial and gleaning prompts are answered in two batch rounds into the LLM cache
+2. extract_entities afterwards reads every answer from the cache
+3. A job left over by a crashed run is harvested instead of resubmitted
+4. Failed batch requests are left for real-time extraction
+"""
+
+import os
+
+import pytest
+
+from lightrag.batch_extraction import LocalBatchBackend, run_batch_extraction
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.operate import extract_entities
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+def _chunk(content: str) -> dict:
+    return {
+        "tokens": len(content),
+        "content": content,
+        "full_doc_id": "doc-1",
+        "chunk_order_index": 0,
+        "file_path": "notes.md",
+    }
+
+
+CHUNKS = {
+    "chunk-a": _chunk("Alice works at Acme."),
+    "chunk-b": _chunk("Bob founded Globex."),
+}
+
+
+async def _batch_llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+    """Answers extraction prompts; gleaning answers add a second entity"""
+    if history_messages:
+        name = "Bob" if "Globex" in history_messages[0]["content"] else "Alice"
+        return (
+            f"entity<|#|>{name} Gleaned<|#|>person<|#|>Found by gleaning.\n<|COMPLETE|>"
+        )
+    name = "Bob" if "Globex" in prompt else "Alice"
+    return f"entity<|#|>{name}<|#|>person<|#|>{name} is a person.\n<|COMPLETE|>"
+
+
+async def _no_realtime_llm(prompt, **kwargs):
+    raise AssertionError("extraction must be answered from the batch results")
+
+
+async def _setup(tmp_path, llm_model_func=_no_realtime_llm, max_gleaning=1):
+    global_config = {
+        "working_dir": str(tmp_path),
+        "workspace": "",
+        "llm_model_func": llm_model_func,
+        "entity_extract_max_gleaning": max_gleaning,
+        "enable_llm_cache_for_entity_extract": True,
+        "addon_params": {},
+    }
+    cache = JsonKVStorage(
+        namespace="llm_response_cache",
+        workspace="",
+        global_config=global_config,
+        embedding_func=None,
+    )
+    await cache.initialize()
+    return global_config, cache
+
+
+class _CountingBackend(LocalBatchBackend):
+    def __init__(self, llm_model_func):
+        super().__init__(llm_model_func)
+        self.submitted = []
+
+    async def submit(self, requests_path):
+        with open(requests_path, encoding="utf-8") as f:
+            self.submitted.append(len(f.readlines()))
+        return await super().submit(requests_path)
+
+
+@pytest.mark.offline
+async def test_batch_results_feed_extraction(tmp_path):
+    global_config, cache = await _setup(tmp_path)
+    backend = _CountingBackend(_batch_llm)
+    state_dir = str(tmp_path / "batches")
+
+    stats = await run_batch_extraction(
+        CHUNKS, global_config, cache, backend, state_dir, poll_interval=0
+    )
+    assert backend.submitted == [2, 2]
+    assert stats["completed"] == 4 and stats["failed"] == 0
+    assert os.listdir(state_dir) == []
+
+    results = await extract_entities(CHUNKS, global_config, llm_response_cache=cache)
+    names = {name for nodes, _ in results for name in nodes}
+    assert names == {"Alice", "Alice Gleaned", "Bob", "Bob Gleaned"}
+
+    # Everything is cached: a second run submits nothing
+    await run_batch_extraction(
+        CHUNKS, global_config, cache, backend, state_dir, poll_interval=0
+    )
+    assert backend.submitted == [2, 2]
+
+
+@pytest.mark.offline
+async def test_crashed_job_is_harvested(tmp_path):
+    global_config, cache = await _setup(tmp_path, max_gleaning=0)
+    state_dir = str(tmp_path / "batches")
+
+    class _CrashingBackend(LocalBatchBackend):
+        async def status(self, batch_id):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        await run_batch_extraction(
+            CHUNKS,
+            global_config,
+            cache,
+            _CrashingBackend(_batch_llm),
+            state_dir,
+            poll_interval=0,
+        )
+    assert any(name.endswith(".state.json") for name in os.listdir(state_dir))
+
+    backend = _CountingBackend(_batch_llm)
+    stats = await run_batch_extraction(
+        CHUNKS, global_config, cache, backend, state_dir, poll_interval=0
+    )
+    assert stats["resumed_jobs"] == 1 and stats["completed"] == 2
+    assert backend.submitted == []
+
+    results = await extract_entities(CHUNKS, global_config, llm_response_cache=cache)
+    assert {name for nodes, _ in results for name in nodes} == {"Alice", "Bob"}
+
+
+@pytest.mark.offline
+async def test_failed_requests_fall_back_to_realtime(tmp_path):
+    realtime_calls = []
+
+    async def realtime_llm(prompt, **kwargs):
+        realtime_calls.append(prompt)
+        return await _batch_llm(prompt, **kwargs)
+
+    async def flaky_batch_llm(prompt, **kwargs):
+        if "Globex" in prompt:
+            raise RuntimeError("model overloaded")
+        return await _batch_llm(prompt, **kwargs)
+
+    global_config, cache = await _setup(tmp_path, realtime_llm, max_gleaning=0)
+    stats = await run_batch_extraction(
+        CHUNKS,
+        global_config,
+        cache,
+        LocalBatchBackend(flaky_batch_llm),
+        str(tmp_path / "batches"),
+        poll_interval=0,
+    )
+    assert stats["completed"] == 1 and stats["failed"] == 1
+
+    results = await extract_entities(CHUNKS, global_config, llm_response_cache=cache)
+    assert {name for nodes, _ in results for name in nodes} == {"Alice", "Bob"}
+    assert len(realtime_calls) == 1 and "Globex" in realtime_calls[0]
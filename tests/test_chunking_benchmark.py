@@ -0,0 +1,120 @@
+"""
+Benchmark for document chunking (chunking_by_token_size)
+
+This test verifies:
+1. Chunking throughput (chars/s and chunks/s, printed with -s; larger with --stress-test)
+2. Documents from the offload threshold up are chunked in a worker thread
+3. Offloaded chunking keeps the event loop responsive (with --stress-test)
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from lightrag import LightRAG
+from lightrag.operate import chunking_by_token_size, chunking_by_token_size_stream
+
+PARAGRAPH = (
+    "The quick brown fox jumps over the lazy dog near the river bank. "
+    "Meanwhile the committee reviewed the quarterly figures in detail.\n"
+)
+
+
+def _document(chars: int) -> str:
+    return PARAGRAPH * (chars // len(PARAGRAPH) + 1)
+
+
+@pytest.mark.offline
+def test_chunking_throughput(char_tokenizer, stress_test_mode):
+    content = _document(20_000_000 if stress_test_mode else 1_000_000)
+
+    start = time.perf_counter()
+    chunks = chunking_by_token_size(char_tokenizer, content, None, False, 100, 1200)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    streamed = sum(
+        1
+        for _ in chunking_by_token_size_stream(
+            char_tokenizer, content.splitlines(), None, False, 100, 1200
+        )
+    )
+    stream_elapsed = time.perf_counter() - start
+
+    print(
+        f"\nchunking_by_token_size: {len(content) / elapsed / 1e6:.1f}M chars/s, "
+        f"{len(chunks) / elapsed:.0f} chunks/s"
+        f"\nchunking_by_token_size_stream: {len(content) / stream_elapsed / 1e6:.1f}M chars/s"
+    )
+    assert len(chunks) == len(content) // 1100 + 1
+    assert abs(streamed - len(chunks)) <= 1
+
+
+@pytest.mark.offline
+async def test_large_documents_are_chunked_in_worker_thread(make_rag):
+    rag = await make_rag(chunking_offload_threshold=20_000)
+    chunking_func = rag.chunking_func
+    threads = []
+
+    def recording_chunking(*args):
+        threads.append(threading.get_ident())
+        return chunking_func(*args)
+
+    rag.chunking_func = recording_chunking
+    await rag.full_docs.upsert(
+        {
+            "doc-small": {"content": _document(19_000), "file_path": "small.txt"},
+            "doc-large": {"content": _document(20_000), "file_path": "large.txt"},
+        }
+    )
+
+    await rag._chunk_document("doc-small", "small.txt", None, False)
+    await rag._chunk_document("doc-large", "large.txt", None, False)
+
+    assert threads[0] == threading.get_ident()
+    assert threads[1] != threading.get_ident()
+
+
+async def _max_loop_lag(rag: LightRAG, doc_id: str) -> float:
+    """Longest gap between event loop ticks while the document is chunked"""
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            lag = max(lag, now - last)
+            last = now
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await rag._chunk_document(doc_id, "large.txt", None, False)
+    done = True
+    await tick_task
+    return lag
+
+
+@pytest.mark.offline
+async def test_offloaded_chunking_keeps_loop_responsive(make_rag, stress_test_mode):
+    if not stress_test_mode:
+        pytest.skip("timing benchmark, use --stress-test to run")
+    rag = await make_rag()
+    await rag.full_docs.upsert(
+        {"doc-large": {"content": _document(2_000_000), "file_path": "large.txt"}}
+    )
+
+    rag.chunking_offload_threshold = 0
+    inline_lag = await _max_loop_lag(rag, "doc-large")
+    rag.chunking_offload_threshold = 20_000
+    offloaded_lag = await _max_loop_lag(rag, "doc-large")
+
+    print(
+        f"\nevent loop lag: {inline_lag * 1000:.0f} ms inline, "
+        f"{offloaded_lag * 1000:.0f} ms offloaded"
+    )
+    assert offloaded_lag < inline_lag / 2
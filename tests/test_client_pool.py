@@ -0,0 +1,182 @@
+"""
+Tests for the pooled HTTP clients used by LLM bindings (lightrag.llm.client_pool)
+
+This test verifies:
+1. Calls with the same binding, base URL and API key reuse one client
+2. A different API key or event loop gets its own client
+3. close_pooled_clients closes the clients of the running loop
+4. aiohttp sessions are shared between requests and bound per host
+5. Bedrock calls reuse one session and client until the pool is closed
+6. Finalizing one LightRAG instance keeps the clients other instances still use
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from lightrag.llm import client_pool
+from lightrag.llm.client_pool import (
+    acquire_pooled_clients,
+    close_pooled_clients,
+    get_aiohttp_session,
+    get_pooled_client,
+    pool_limits,
+    pooled_client_count,
+    release_pooled_clients,
+    secret_key,
+)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+async def _close(client: _FakeClient) -> None:
+    await client.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    client_pool._clients.clear()
+    client_pool._users.clear()
+    yield
+    client_pool._clients.clear()
+    client_pool._users.clear()
+
+
+@pytest.mark.offline
+async def test_same_key_reuses_client():
+    first = get_pooled_client("fake", ("http://a", secret_key("k1")), _FakeClient)
+    second = get_pooled_client("fake", ("http://a", secret_key("k1")), _FakeClient)
+    other = get_pooled_client("fake", ("http://a", secret_key("k2")), _FakeClient)
+
+    assert first is second
+    assert other is not first
+    assert pooled_client_count() == 2
+    assert secret_key("k1") != "k1"
+    assert secret_key(None) is None
+
+
+@pytest.mark.offline
+async def test_close_pooled_clients():
+    client = get_pooled_client("fake", "key", _FakeClient, _close)
+    get_pooled_client("fake", "no-close", _FakeClient)
+
+    await close_pooled_clients()
+    assert client.closed
+    assert pooled_client_count() == 0
+    assert get_pooled_client("fake", "key", _FakeClient, _close) is not client
+
+
+@pytest.mark.offline
+def test_clients_are_bound_to_their_event_loop():
+    async def create():
+        return get_pooled_client("fake", "key", _FakeClient)
+
+    first = asyncio.run(create())
+    second = asyncio.run(create())
+    assert first is not second
+    # The client of the first, closed loop was dropped
+    assert pooled_client_count() == 1
+
+
+@pytest.mark.offline
+async def test_aiohttp_session_is_shared():
+    session = get_aiohttp_session("http://localhost:9600", "key")
+    assert get_aiohttp_session("http://localhost:9600", "key") is session
+    assert get_aiohttp_session("http://localhost:9600") is not session
+    assert session.connector.limit_per_host == pool_limits()["max_keepalive"]
+
+    await close_pooled_clients()
+    assert session.closed
+
+
+class _FakeBedrockClient:
+    def __init__(self):
+        self.calls = 0
+        self.closed = False
+
+    async def converse(self, **kwargs):
+        self.calls += 1
+        return {"output": {"message": {"content": [{"text": "answer"}]}}}
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+
+class _FakeBedrockSession:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.clients = []
+
+    def client(self, service_name, **kwargs):
+        session = self
+
+        class _Context:
+            async def __aenter__(self):
+                client = _FakeBedrockClient()
+                session.clients.append(client)
+                return client
+
+        return _Context()
+
+
+@pytest.mark.offline
+async def test_bedrock_calls_share_pooled_client(monkeypatch):
+    pytest.importorskip("aioboto3")
+    from lightrag.llm import bedrock
+
+    sessions = []
+
+    def create_session(**kwargs):
+        sessions.append(_FakeBedrockSession(**kwargs))
+        return sessions[-1]
+
+    monkeypatch.setattr(bedrock.aioboto3, "Session", create_session)
+
+    for _ in range(3):
+        answer = await bedrock.bedrock_complete_if_cache(
+            "model", "question", aws_region="us-east-1"
+        )
+        assert answer == "answer"
+
+    [session] = sessions
+    [client] = session.clients
+    assert client.calls == 3
+    assert session.kwargs["region_name"] == os.environ.get("AWS_REGION", "us-east-1")
+
+    await close_pooled_clients()
+    assert client.closed
+
+
+@pytest.mark.offline
+async def test_clients_are_closed_by_their_last_user():
+    acquire_pooled_clients()
+    acquire_pooled_clients()
+    client = get_pooled_client("fake", "key", _FakeClient, _close)
+
+    await release_pooled_clients()
+    assert not client.closed
+    assert get_pooled_client("fake", "key", _FakeClient, _close) is client
+
+    await release_pooled_clients()
+    assert client.closed
+    assert pooled_client_count() == 0
+
+
+@pytest.mark.offline
+async def test_finalizing_one_instance_keeps_shared_clients(make_rag, tmp_path):
+    instances = [
+        await make_rag(working_dir=str(tmp_path / name)) for name in ("first", "second")
+    ]
+    client = get_pooled_client("fake", "key", _FakeClient, _close)
+
+    await instances[0].finalize_storages()
+    assert not client.closed
+    await instances[1].finalize_storages()
+    assert client.closed
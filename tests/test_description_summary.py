@@ -0,0 +1,116 @@
+"""
+Tests for map-reduce summarization of entity/relation descriptions
+
+This test verifies:
+1. The groups of one reduce round are summarized concurrently
+2. Each description is tokenized once across all rounds
+3. The estimated upper bound of rounds is reported in pipeline status
+4. A failing group cancels the rest of its round
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from lightrag.operate import _handle_entity_relation_summary, _max_summary_rounds
+from lightrag.utils import Tokenizer
+
+
+class _CountingTokenizer:
+    def __init__(self):
+        self.encoded = Counter()
+
+    def encode(self, content: str) -> list[int]:
+        self.encoded[content] += 1
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(token) for token in tokens)
+
+
+def _config(llm_model_func, tokenizer):
+    return {
+        "tokenizer": Tokenizer("counting", tokenizer),
+        "summary_context_size": 250,
+        "summary_max_tokens": 100,
+        "force_llm_summary_on_merge": 4,
+        "summary_length_recommended": 50,
+        "addon_params": {},
+        "llm_model_func": llm_model_func,
+    }
+
+
+def _descriptions(count: int) -> list[str]:
+    return [f"description {i:03d} " + "x" * 80 for i in range(count)]
+
+
+@pytest.mark.offline
+async def test_reduce_round_runs_concurrently_and_tokenizes_once():
+    running = 0
+    peak = 0
+    calls = 0
+
+    async def llm_model_func(prompt, **kwargs):
+        nonlocal running, peak, calls
+        running += 1
+        calls += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"summary {calls}"
+
+    tokenizer = _CountingTokenizer()
+    descriptions = _descriptions(16)
+    pipeline_status = {"latest_message": "", "history_messages": []}
+
+    summary, llm_was_used = await _handle_entity_relation_summary(
+        "Entity",
+        "Hub",
+        descriptions,
+        "<SEP>",
+        _config(llm_model_func, tokenizer),
+        pipeline_status=pipeline_status,
+        pipeline_status_lock=asyncio.Lock(),
+    )
+
+    assert llm_was_used
+    assert summary.startswith("summary")
+    # 16 descriptions map into 8 groups of two summarized together
+    assert peak == 8
+    assert all(tokenizer.encoded[desc] == 1 for desc in descriptions)
+    assert pipeline_status["history_messages"] == [
+        "Summarizing Hub: 16 descriptions, up to 4 map-reduce rounds"
+    ]
+
+
+@pytest.mark.offline
+def test_max_summary_rounds():
+    assert _max_summary_rounds(2) == 1
+    assert _max_summary_rounds(3) == 2
+    assert _max_summary_rounds(16) == 4
+    assert _max_summary_rounds(17) == 5
+
+
+@pytest.mark.offline
+async def test_failed_group_cancels_round():
+    finished = 0
+
+    async def llm_model_func(prompt, **kwargs):
+        nonlocal finished
+        if "description 000" in prompt:
+            raise RuntimeError("LLM unavailable")
+        await asyncio.sleep(0.05)
+        finished += 1
+        return "summary"
+
+    with pytest.raises(RuntimeError):
+        await _handle_entity_relation_summary(
+            "Entity",
+            "Hub",
+            _descriptions(8),
+            "<SEP>",
+            _config(llm_model_func, _CountingTokenizer()),
+        )
+    await asyncio.sleep(0.1)
+    assert finished == 0
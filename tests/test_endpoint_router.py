@@ -0,0 +1,129 @@
+"""
+Tests for multi-endpoint routing of LLM/embedding calls (lightrag.llm.endpoint_router)
+
+This test verifies:
+1. Endpoint lists are parsed with weights and roles
+2. Calls are spread by outstanding requests relative to weight
+3. Query-priority calls go to query endpoints, other calls to batch endpoints
+4. Failing endpoints fail over, open their circuit and recover after the cooldown
+5. Request errors are raised without failover
+"""
+
+import asyncio
+from functools import partial
+
+import pytest
+
+from lightrag.llm.endpoint_router import (
+    EndpointRouter,
+    endpoint_router_stats,
+    parse_endpoints,
+)
+from lightrag.utils import priority_limit_async_func_call
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        super().__init__(f"HTTP {status_code}")
+
+
+@pytest.mark.offline
+def test_parse_endpoints():
+    endpoints = parse_endpoints("http://a/v1|weight=2|role=batch, http://b/v1")
+    assert [(e.url, e.weight, e.role) for e in endpoints] == [
+        ("http://a/v1", 2.0, "batch"),
+        ("http://b/v1", 1.0, "any"),
+    ]
+    with pytest.raises(ValueError):
+        parse_endpoints("http://a|role=fast")
+    with pytest.raises(ValueError):
+        parse_endpoints("http://a|weight=0")
+
+
+@pytest.mark.offline
+async def test_least_outstanding_by_weight():
+    router = EndpointRouter("http://a|weight=2,http://b")
+    release = asyncio.Event()
+    used = []
+
+    async def complete(prompt, base_url=None):
+        used.append(base_url)
+        await release.wait()
+        return base_url
+
+    routed = router.wrap(complete)
+    tasks = [asyncio.create_task(routed("p")) for _ in range(6)]
+    await asyncio.sleep(0)
+    assert used.count("http://a") == 4
+    assert used.count("http://b") == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert all(stat["outstanding"] == 0 for stat in router.stats())
+
+
+@pytest.mark.offline
+async def test_priority_selects_endpoint_role():
+    router = EndpointRouter("http://batch|role=batch,http://query|role=query")
+
+    async def complete(prompt, host=None):
+        return host
+
+    # The priority queue workers publish the call priority to the router
+    func = priority_limit_async_func_call(2, queue_name="route")(
+        partial(router.wrap(complete, "host"), host="http://ignored")
+    )
+    assert await func("p", _priority=5) == "http://query"
+    assert await func("p", _priority=8) == "http://batch"
+    assert await func("p") == "http://batch"
+    assert endpoint_router_stats(func)[0]["requests"] == 2
+    await func.shutdown()
+
+
+@pytest.mark.offline
+async def test_failover_circuit_breaker_and_recovery():
+    router = EndpointRouter("http://down,http://up", failure_threshold=2, cooldown=60)
+    down = True
+
+    async def complete(prompt, base_url=None):
+        if base_url == "http://down" and down:
+            raise ConnectionError("connection refused")
+        return base_url
+
+    routed = router.wrap(complete)
+    for _ in range(4):
+        assert await routed("p") == "http://up"
+
+    stats = {stat["url"]: stat for stat in router.stats()}
+    assert stats["http://down"]["circuit"] == "open"
+    assert stats["http://down"]["failures"] == 2
+
+    # Half-open after the cooldown: one successful trial call closes the circuit
+    down = False
+    router.endpoints[0].opened_at -= 60
+    router.endpoints[1].outstanding = 5
+    assert await routed("p") == "http://down"
+    router.endpoints[1].outstanding = 0
+    assert router.stats()[0]["circuit"] == "closed"
+
+
+@pytest.mark.offline
+async def test_request_errors_do_not_fail_over():
+    router = EndpointRouter("http://a,http://b")
+    calls = []
+
+    async def complete(prompt, base_url=None):
+        calls.append(base_url)
+        raise _HTTPError(400)
+
+    with pytest.raises(_HTTPError):
+        await router.wrap(complete)("p")
+    assert len(calls) == 1
+    assert all(stat["circuit"] == "closed" for stat in router.stats())
+
+    async def unavailable(prompt, base_url=None):
+        raise _HTTPError(503)
+
+    with pytest.raises(_HTTPError):
+        await router.wrap(unavailable)("p")
@@ -0,0 +1,113 @@
+"""
+Tests for the graph bulk-load write buffer (lightrag.kg.graph_write_buffer)
+
+This test verifies:
+1. Upserts are buffered and written with the batch upsert methods
+2. Point reads see buffered writes merged over stored properties
+3. Structural reads and deletions flush the buffer first
+4. A full buffer flushes automatically and throughput stats are tracked
+5. Persisting the LightRAG storages writes the buffered records first
+"""
+
+import pytest
+
+from lightrag.kg.graph_write_buffer import BufferedGraphStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+async def _buffered(tmp_path, buffer_size: int = 100):
+    inner = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    calls = []
+    original_nodes, original_edges = inner.upsert_nodes_batch, inner.upsert_edges_batch
+
+    async def upsert_nodes_batch(nodes):
+        calls.append(("nodes", len(nodes)))
+        await original_nodes(nodes)
+
+    async def upsert_edges_batch(edges):
+        calls.append(("edges", len(edges)))
+        await original_edges(edges)
+
+    inner.upsert_nodes_batch = upsert_nodes_batch
+    inner.upsert_edges_batch = upsert_edges_batch
+    storage = BufferedGraphStorage(inner, buffer_size=buffer_size)
+    await storage.initialize()
+    return storage, inner, calls
+
+
+@pytest.mark.offline
+async def test_upserts_are_buffered_until_flush(tmp_path):
+    storage, inner, calls = await _buffered(tmp_path)
+    await storage.upsert_node("A", {"entity_id": "A", "description": "a"})
+    await storage.upsert_node("B", {"entity_id": "B"})
+    await storage.upsert_edge("B", "A", {"weight": "1"})
+
+    assert not await inner.has_node("A")
+    assert await storage.has_node("A")
+    assert await storage.get_edge("A", "B") == {"weight": "1"}
+    assert calls == []
+
+    await storage.flush()
+    assert calls == [("nodes", 2), ("edges", 1)]
+    assert await inner.get_edge("A", "B") == {"weight": "1"}
+    assert storage.bulk_stats()["flushed_edges"] == 1
+    assert storage.pending == 0
+
+
+@pytest.mark.offline
+async def test_point_reads_overlay_stored_properties(tmp_path):
+    storage, _, _ = await _buffered(tmp_path)
+    await storage.upsert_node("A", {"entity_id": "A", "description": "old"})
+    await storage.flush()
+
+    await storage.upsert_node("A", {"description": "new"})
+    assert await storage.get_node("A") == {"entity_id": "A", "description": "new"}
+    assert (await storage.get_nodes_batch(["A", "X"])) == {
+        "A": {"entity_id": "A", "description": "new"}
+    }
+
+
+@pytest.mark.offline
+async def test_structural_reads_and_deletes_flush(tmp_path):
+    storage, _, calls = await _buffered(tmp_path)
+    await storage.upsert_node("A", {"entity_id": "A"})
+    await storage.upsert_node("B", {"entity_id": "B"})
+    await storage.upsert_edge("A", "B", {"weight": "1"})
+
+    assert await storage.node_degree("A") == 1
+    assert len(calls) == 2
+
+    await storage.upsert_node("C", {"entity_id": "C"})
+    await storage.remove_nodes(["A"])
+    assert await storage.get_all_labels() == ["B", "C"]
+
+
+@pytest.mark.offline
+async def test_full_buffer_flushes_automatically(tmp_path):
+    storage, _, calls = await _buffered(tmp_path, buffer_size=3)
+    await storage.upsert_nodes_batch([(n, {"entity_id": n}) for n in "AB"])
+    assert calls == []
+    await storage.upsert_node("C", {"entity_id": "C"})
+    assert calls == [("nodes", 3)]
+    assert storage.bulk_stats()["flush_count"] == 1
+
+
+@pytest.mark.offline
+async def test_insert_done_flushes_buffer(make_rag):
+    rag = await make_rag(graph_bulk_load=True, graph_bulk_buffer_size=1000)
+    buffer = rag._graph_write_buffer
+    await buffer.upsert_node("A", {"entity_id": "A"})
+    await buffer.upsert_node("B", {"entity_id": "B"})
+    await buffer.upsert_edge("A", "B", {"weight": "1"})
+    assert buffer.pending == 3
+
+    await rag._insert_done()
+    assert buffer.pending == 0
+    assert await buffer.storage.has_edge("A", "B")
@@ -0,0 +1,186 @@
+"""
+Tests for the group-commit flush policy of the document pipeline
+
+This test verifies:
+1. Storages are persisted once per group of documents, not after every document
+2. Documents become PROCESSED only after the flush that persists their data
+3. The last partial group is persisted when the pipeline goes idle
+4. A failed flush keeps its documents queued for the next flush
+5. Documents enqueued during processing do not reprocess the queued ones
+6. A failed final flush is committed by the next run without reprocessing
+7. In bulk-load mode the buffered graph is written before PROCESSED is
+"""
+
+import pytest
+
+import lightrag.lightrag as lightrag_module
+from lightrag import LightRAG
+from lightrag.base import DocStatus
+from lightrag.kg.shared_storage import get_namespace_data
+
+
+def _record_events(rag: LightRAG) -> list:
+    events = []
+    flush = rag.chunks_vdb.index_done_callback
+    upsert = rag.doc_status.upsert
+
+    async def recording_flush():
+        events.append("flush")
+        return await flush()
+
+    async def recording_upsert(data):
+        processed = [k for k, v in data.items() if v["status"] == DocStatus.PROCESSED]
+        if processed:
+            events.append(len(processed))
+        return await upsert(data)
+
+    rag.chunks_vdb.index_done_callback = recording_flush
+    rag.doc_status.upsert = recording_upsert
+    return events
+
+
+@pytest.mark.offline
+async def test_documents_are_committed_in_groups(make_rag):
+    rag = await make_rag(insert_flush_docs=3)
+    events = _record_events(rag)
+    await rag.ainsert([f"Note number {i} about topic {i}." for i in range(5)])
+
+    # One flush for the first three documents, one when the pipeline is idle
+    assert events == ["flush", 3, "flush", 2]
+    pipeline_status = await get_namespace_data("pipeline_status")
+    assert pipeline_status["group_commit"]["flushes"] == 2
+    assert pipeline_status["group_commit"]["documents"] == 5
+    assert pipeline_status["group_commit"]["last_documents"] == 2
+    processed = await rag.doc_status.get_docs_by_status(DocStatus.PROCESSED)
+    assert len(processed) == 5
+
+
+@pytest.mark.offline
+async def test_failed_flush_keeps_documents_queued(make_rag):
+    rag = await make_rag(insert_flush_docs=2)
+    insert_done = rag._insert_done
+    calls = 0
+
+    async def flaky_insert_done(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise OSError("disk full")
+        return await insert_done(*args, **kwargs)
+
+    rag._insert_done = flaky_insert_done
+    await rag.ainsert(["First note about apples.", "Second note about pears."])
+
+    # The idle flush retried the group of the failed flush
+    assert calls == 2
+    processed = await rag.doc_status.get_docs_by_status(DocStatus.PROCESSED)
+    assert len(processed) == 2
+    assert rag._uncommitted_docs == {}
+
+
+@pytest.mark.offline
+async def test_next_run_commits_failed_final_flush(make_rag, monkeypatch):
+    extracted = []
+    extract_entities = lightrag_module.extract_entities
+
+    async def recording_extract(chunks, **kwargs):
+        extracted.extend(chunk["full_doc_id"] for chunk in chunks.values())
+        return await extract_entities(chunks, **kwargs)
+
+    monkeypatch.setattr(lightrag_module, "extract_entities", recording_extract)
+
+    rag = await make_rag(insert_flush_docs=10)
+    insert_done = rag._insert_done
+    failing = True
+
+    async def flaky_insert_done(*args, **kwargs):
+        if failing:
+            raise OSError("disk full")
+        return await insert_done(*args, **kwargs)
+
+    rag._insert_done = flaky_insert_done
+    await rag.ainsert(["First note about apples."], ids=["doc-1"])
+    assert list(rag._uncommitted_docs) == ["doc-1"]
+    status = await rag.doc_status.get_by_id("doc-1")
+    assert status["status"] == DocStatus.PROCESSING
+
+    failing = False
+    extracted.clear()
+    await rag.ainsert(["Second note about pears."], ids=["doc-2"])
+
+    assert extracted == ["doc-2"]
+    processed = await rag.doc_status.get_docs_by_status(DocStatus.PROCESSED)
+    assert sorted(processed) == ["doc-1", "doc-2"]
+    assert rag._uncommitted_docs == {}
+
+
+@pytest.mark.offline
+async def test_queued_documents_are_not_reprocessed(
+    make_rag, extraction_llm, monkeypatch
+):
+    extracted = []
+    extract_entities = lightrag_module.extract_entities
+
+    async def recording_extract(chunks, **kwargs):
+        extracted.extend(chunk["full_doc_id"] for chunk in chunks.values())
+        return await extract_entities(chunks, **kwargs)
+
+    monkeypatch.setattr(lightrag_module, "extract_entities", recording_extract)
+
+    enqueued = False
+
+    async def llm_func(prompt, system_prompt=None, **kwargs):
+        nonlocal enqueued
+        if system_prompt and not enqueued:
+            enqueued = True
+            # The pipeline is busy: the document is enqueued and request_pending set
+            await rag.ainsert("Third note about plums.", ids="doc-3")
+        return await extraction_llm(prompt, system_prompt, **kwargs)
+
+    rag = await make_rag(insert_flush_docs=10, llm_model_func=llm_func)
+    await rag.ainsert(
+        ["First note about apples.", "Second note about pears."],
+        ids=["doc-1", "doc-2"],
+    )
+
+    assert sorted(extracted) == ["doc-1", "doc-2", "doc-3"]
+    processed = await rag.doc_status.get_docs_by_status(DocStatus.PROCESSED)
+    assert sorted(processed) == ["doc-1", "doc-2", "doc-3"]
+    pipeline_status = await get_namespace_data("pipeline_status")
+    assert not any(
+        message.startswith("Reset ") for message in pipeline_status["history_messages"]
+    )
+
+
+@pytest.mark.offline
+async def test_bulk_load_graph_is_written_before_processed(make_rag):
+    async def llm_func(prompt, system_prompt=None, **kwargs):
+        if not system_prompt:
+            return "A summary."
+        return (
+            "entity<|#|>Hubville<|#|>location<|#|>Hubville is a market town.\n"
+            "entity<|#|>Portville<|#|>location<|#|>Portville is a harbour.\n"
+            "relation<|#|>Hubville<|#|>Portville<|#|>trade<|#|>They trade.\n"
+            "<|COMPLETE|>"
+        )
+
+    rag = await make_rag(
+        llm_model_func=llm_func,
+        insert_flush_docs=1,
+        graph_bulk_load=True,
+        graph_bulk_buffer_size=1000,
+    )
+    graph = rag._graph_write_buffer.storage
+    edges_at_commit = []
+    upsert = rag.doc_status.upsert
+
+    async def recording_upsert(data):
+        if any(v["status"] == DocStatus.PROCESSED for v in data.values()):
+            edges_at_commit.append(await graph.has_edge("Hubville", "Portville"))
+        return await upsert(data)
+
+    rag.doc_status.upsert = recording_upsert
+    await rag.ainsert("Hubville trades with Portville.", ids="doc-1")
+
+    assert edges_at_commit == [True]
+    assert rag._graph_write_buffer.pending == 0
@@ -0,0 +1,186 @@
+"""
+Tests for chunk-level incremental re-ingestion (LightRAG.aupdate_document)
+
+This test verifies:
+1. Only chunks added by the new version are sent to the LLM for extraction
+2. Entities found only in removed chunks are deleted from the graph
+3. Entities of unchanged chunks are kept and the document keeps its ID
+4. Unchanged content and unknown documents are refused
+5. A failed update leaves a status matching full_docs, which the pipeline completes
+6. The replace route refuses a busy pipeline, and refused background updates are reported
+"""
+
+import sys
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import lightrag.lightrag as lightrag_module
+from lightrag.base import DocStatus
+from lightrag.kg.shared_storage import get_namespace_data
+
+# Importing the routes initializes the server config from the command line
+with patch.object(sys, "argv", ["lightrag-server"]):
+    from lightrag.api.routers.document_routes import (
+        DocumentManager,
+        background_update_document,
+        create_document_routes,
+    )
+
+
+VERSION_1 = "Notes about Aville.\n\nNotes about Bville.\n\nNotes about Cville."
+VERSION_2 = "Notes about Aville.\n\nNotes about Cville.\n\nNotes about Dville."
+
+
+@pytest.mark.offline
+async def test_update_reextracts_only_changed_chunks(make_rag, extraction_llm):
+    rag = await make_rag()
+    await rag.ainsert(
+        VERSION_1,
+        ids="doc-notes",
+        split_by_character="\n\n",
+        split_by_character_only=True,
+    )
+    graph = rag.chunk_entity_relation_graph
+    assert await graph.has_node("Bville")
+    extraction_llm.extracted.clear()
+
+    result = await rag.aupdate_document(
+        "doc-notes",
+        VERSION_2,
+        split_by_character="\n\n",
+        split_by_character_only=True,
+    )
+
+    assert result.status == "success", result.message
+    assert (result.added_chunks, result.removed_chunks, result.kept_chunks) == (
+        1,
+        1,
+        2,
+    )
+    assert extraction_llm.extracted == [["Dville"]]
+    assert not await graph.has_node("Bville")
+    for name in ("Aville", "Cville", "Dville"):
+        assert await graph.has_node(name)
+
+    status = await rag.doc_status.get_by_id("doc-notes")
+    assert status["status"] == DocStatus.PROCESSED
+    assert status["chunks_count"] == 3
+    entities = await rag.full_entities.get_by_id("doc-notes")
+    assert set(entities["entity_names"]) == {"Aville", "Cville", "Dville"}
+    full_doc = await rag.full_docs.get_by_id("doc-notes")
+    assert full_doc["content"] == VERSION_2
+
+
+@pytest.mark.offline
+async def test_update_refuses_unchanged_and_unknown_documents(make_rag, extraction_llm):
+    rag = await make_rag()
+    await rag.ainsert(VERSION_1, ids="doc-notes")
+    extraction_llm.extracted.clear()
+
+    result = await rag.aupdate_document("doc-notes", VERSION_1)
+    assert result.status == "unchanged"
+    assert extraction_llm.extracted == []
+
+    result = await rag.aupdate_document("doc-missing", VERSION_2)
+    assert result.status == "not_found" and result.status_code == 404
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("failing_step", ["removal", "merge"])
+async def test_failed_update_is_completed_by_pipeline(
+    make_rag, monkeypatch, failing_step
+):
+    rag = await make_rag()
+    await rag.ainsert(
+        VERSION_1,
+        ids="doc-notes",
+        split_by_character="\n\n",
+        split_by_character_only=True,
+    )
+    old_status = await rag.doc_status.get_by_id("doc-notes")
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("worker stopped")
+
+    if failing_step == "removal":
+        monkeypatch.setattr(rag, "_remove_chunks_from_knowledge", fail)
+    else:
+        monkeypatch.setattr(lightrag_module, "merge_nodes_and_edges", fail)
+
+    result = await rag.aupdate_document(
+        "doc-notes",
+        VERSION_2,
+        split_by_character="\n\n",
+        split_by_character_only=True,
+    )
+    assert result.status == "fail"
+
+    status = await rag.doc_status.get_by_id("doc-notes")
+    content = (await rag.full_docs.get_by_id("doc-notes"))["content"]
+    assert status["status"] == DocStatus.FAILED
+    if failing_step == "removal":
+        assert content == VERSION_1
+        assert status["chunks_list"] == old_status["chunks_list"]
+    else:
+        # Removed chunks were subtracted before the content was replaced
+        assert content == VERSION_2
+        assert status["chunks_count"] == 3
+        assert status["chunks_list"] != old_status["chunks_list"]
+        assert not await rag.chunk_entity_relation_graph.has_node("Bville")
+
+    monkeypatch.undo()
+    await rag.apipeline_process_enqueue_documents("\n\n", True)
+
+    status = await rag.doc_status.get_by_id("doc-notes")
+    assert status["status"] == DocStatus.PROCESSED
+    towns = (await rag.full_entities.get_by_id("doc-notes"))["entity_names"]
+    if failing_step == "removal":
+        assert set(towns) == {"Aville", "Bville", "Cville"}
+    else:
+        assert set(towns) == {"Aville", "Cville", "Dville"}
+        assert not await rag.chunk_entity_relation_graph.has_node("Bville")
+        stored = await rag.text_chunks.get_by_ids(old_status["chunks_list"])
+        assert all("Bville" not in chunk["content"] for chunk in stored if chunk)
+
+
+@pytest.mark.offline
+async def test_replace_route_refuses_busy_pipeline(make_rag, tmp_path):
+    rag = await make_rag()
+    app = FastAPI()
+    app.include_router(
+        create_document_routes(rag, DocumentManager(str(tmp_path / "inputs")))
+    )
+    await rag.ainsert(VERSION_1, ids="doc-notes")
+    pipeline_status = await get_namespace_data("pipeline_status")
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        pipeline_status["busy"] = True
+        response = await client.post(
+            "/documents/replace",
+            params={"conflict_doc_id": "doc-notes"},
+            json={"text": VERSION_2},
+        )
+        assert response.status_code == 409
+        assert (await rag.full_docs.get_by_id("doc-notes"))["content"] == VERSION_1
+
+        pipeline_status["busy"] = False
+        response = await client.post(
+            "/documents/replace",
+            params={"conflict_doc_id": "doc-notes"},
+            json={"text": VERSION_2},
+        )
+        assert response.status_code == 200
+        assert (await rag.full_docs.get_by_id("doc-notes"))["content"] == VERSION_2
+
+    # A pipeline that became busy after the route's check is reported
+    pipeline_status["busy"] = True
+    await background_update_document(rag, "doc-notes", VERSION_1)
+    assert pipeline_status["latest_message"].startswith(
+        "Update of document doc-notes not_allowed"
+    )
+    pipeline_status["busy"] = False
@@ -0,0 +1,118 @@
+"""
+Tests for incremental input directory scanning (DocumentManager manifest)
+
+This test verifies:
+1. Unchanged files are skipped from their size and mtime, without being read
+2. Touched files with the same content are skipped, edited files are rescanned
+3. The manifest survives a restart and forgotten files are indexed again
+4. Recursive scans skip hidden files and __enqueued__ directories
+5. The watcher debounces changes into one scan
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from lightrag.api.input_watcher import InputDirWatcher
+
+# Importing the routes initializes the server config from the command line
+with patch.object(sys, "argv", ["lightrag-server"]):
+    from lightrag.api.routers.document_routes import DocumentManager
+
+
+def _write(path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _index_all(manager: DocumentManager) -> list[str]:
+    new_files = manager.scan_directory_for_new_files()
+    for file_path in new_files:
+        manager.mark_as_indexed(file_path)
+    manager.save_manifest()
+    return sorted(file_path.name for file_path in new_files)
+
+
+@pytest.mark.offline
+def test_only_new_and_changed_files_are_scanned(tmp_path, monkeypatch):
+    _write(tmp_path / "a.md", "alpha")
+    _write(tmp_path / "b.txt", "beta")
+    _write(tmp_path / "image.png", "not supported")
+    manager = DocumentManager(str(tmp_path))
+    assert _index_all(manager) == ["a.md", "b.txt"]
+
+    hashed = []
+    file_record = DocumentManager._file_record
+
+    def counting_record(file_path, stat):
+        hashed.append(os.path.basename(file_path))
+        return file_record(file_path, stat)
+
+    monkeypatch.setattr(DocumentManager, "_file_record", staticmethod(counting_record))
+    assert manager.scan_directory_for_new_files() == []
+    assert hashed == []
+
+    # Touched with the same content: hashed once, then known again
+    stat = (tmp_path / "a.md").stat()
+    os.utime(tmp_path / "a.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert manager.scan_directory_for_new_files() == []
+    assert hashed == ["a.md"]
+    assert manager.scan_directory_for_new_files() == []
+    assert hashed == ["a.md"]
+
+    _write(tmp_path / "b.txt", "beta, second edition")
+    assert _index_all(manager) == ["b.txt"]
+
+
+@pytest.mark.offline
+def test_manifest_survives_restart_and_forget(tmp_path):
+    _write(tmp_path / "a.md", "alpha")
+    assert _index_all(DocumentManager(str(tmp_path))) == ["a.md"]
+
+    restarted = DocumentManager(str(tmp_path))
+    assert restarted.scan_directory_for_new_files() == []
+
+    restarted.forget("a.md")
+    assert _index_all(restarted) == ["a.md"]
+
+
+@pytest.mark.offline
+def test_recursive_scan_skips_enqueued_and_hidden(tmp_path):
+    _write(tmp_path / "top.md", "top")
+    _write(tmp_path / "sub" / "nested.md", "nested")
+    _write(tmp_path / "__enqueued__" / "done.md", "done")
+    _write(tmp_path / ".hidden" / "secret.md", "secret")
+
+    assert _index_all(DocumentManager(str(tmp_path))) == ["top.md"]
+    recursive = DocumentManager(str(tmp_path / "r"), recursive=True)
+    for path in ("top.md", "sub/nested.md", "__enqueued__/done.md", ".x.md"):
+        _write(tmp_path / "r" / path, path)
+    assert _index_all(recursive) == ["nested.md", "top.md"]
+    assert set(recursive.manifest) == {"top.md", "sub/nested.md"}
+
+
+@pytest.mark.offline
+async def test_watcher_debounces_changes(tmp_path):
+    scans = 0
+
+    async def on_change():
+        nonlocal scans
+        scans += 1
+
+    watcher = InputDirWatcher(tmp_path, on_change, debounce=0.05, poll_interval=60)
+    await watcher.start()
+    try:
+        # The initial scan picks up files added while the server was down
+        await asyncio.sleep(0.1)
+        assert scans == 1
+
+        for _ in range(3):
+            watcher._changed.set()
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        assert scans == 2
+    finally:
+        await watcher.stop()
@@ -0,0 +1,110 @@
+"""
+Tests for JsonlKVStorage (journaled JSON KV storage)
+
+This test verifies:
+1. Flushes append only changed records to the journal
+2. Snapshot + journal are replayed on restart, including deletions
+3. Existing kv_store_*.json files written by JsonKVStorage load unchanged
+4. Compaction folds the journal into the snapshot
+"""
+
+import json
+import os
+
+import pytest
+
+from lightrag.kg.shared_storage import initialize_share_data, finalize_share_data
+from lightrag.kg.jsonl_kv_impl import JsonlKVStorage
+from lightrag.utils import write_json
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+async def _open_storage(working_dir: str, namespace: str = "text_chunks"):
+    storage = JsonlKVStorage(
+        namespace=namespace,
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def _restart_shared_data():
+    finalize_share_data()
+    initialize_share_data()
+
+
+def _journal_lines(storage: JsonlKVStorage) -> list[dict]:
+    with open(storage._journal_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.offline
+async def test_flush_appends_only_changed_records(tmp_path):
+    storage = await _open_storage(str(tmp_path))
+    await storage.upsert({f"k{i}": {"content": f"v{i}"} for i in range(100)})
+    await storage.index_done_callback()
+    assert len(_journal_lines(storage)) == 100
+
+    await storage.upsert({"k1": {"content": "changed"}})
+    await storage.delete(["k2"])
+    await storage.index_done_callback()
+
+    records = _journal_lines(storage)
+    assert len(records) == 102
+    assert {(r["op"], r["k"]) for r in records[100:]} == {("put", "k1"), ("del", "k2")}
+    # Snapshot is not rewritten by a small flush
+    assert not os.path.exists(storage._file_name)
+
+
+@pytest.mark.offline
+async def test_restart_replays_journal(tmp_path):
+    storage = await _open_storage(str(tmp_path))
+    await storage.upsert({"a": {"content": "1"}, "b": {"content": "2"}})
+    await storage.index_done_callback()
+    await storage.upsert({"a": {"content": "3"}})
+    await storage.delete(["b"])
+    await storage.index_done_callback()
+
+    _restart_shared_data()
+    reopened = await _open_storage(str(tmp_path))
+    assert (await reopened.get_by_id("a"))["content"] == "3"
+    assert await reopened.get_by_id("b") is None
+
+
+@pytest.mark.offline
+async def test_loads_existing_json_kv_file(tmp_path):
+    legacy_file = tmp_path / "kv_store_text_chunks.json"
+    write_json({"old": {"content": "legacy", "_id": "old"}}, str(legacy_file))
+
+    storage = await _open_storage(str(tmp_path))
+    assert (await storage.get_by_id("old"))["content"] == "legacy"
+
+    await storage.upsert({"new": {"content": "fresh"}})
+    await storage.finalize()
+
+    # After finalize the snapshot alone is a complete JsonKVStorage file
+    with open(legacy_file, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert set(snapshot) == {"old", "new"}
+    assert os.path.getsize(storage._journal_file) == 0
+
+
+@pytest.mark.offline
+async def test_compaction_when_journal_outgrows_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("JSONL_KV_COMPACT_MIN_BYTES", "0")
+    storage = await _open_storage(str(tmp_path))
+
+    for i in range(3):
+        await storage.upsert({"k": {"content": f"value {i}"}})
+        await storage.index_done_callback()
+
+    # First flush compacts immediately (no snapshot yet), later flushes stay small
+    with open(storage._file_name, encoding="utf-8") as f:
+        assert set(json.load(f)) == {"k"}
+
+    _restart_shared_data()
+    reopened = await _open_storage(str(tmp_path))
+    assert (await reopened.get_by_id("k"))["content"] == "value 2"
@@ -0,0 +1,89 @@
+"""
+Tests for in-process cross-encoder reranking (lightrag.rerank.LocalReranker)
+
+This test verifies:
+1. Pairs of concurrent queries are scored in shared inference batches
+2. (query, chunk) scores are served from the LRU cache
+3. A reranker plugs into apply_rerank_if_enabled as rerank_model_func
+"""
+
+import asyncio
+import copy
+import re
+
+import pytest
+
+from lightrag.rerank import LocalReranker
+from lightrag.utils import apply_rerank_if_enabled
+
+
+def _words(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+class _FakeCrossEncoder:
+    """Scores a pair by the words the document shares with the query"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, pairs):
+        self.batches.append(len(pairs))
+        return [len(_words(query) & _words(doc)) for query, doc in pairs]
+
+
+DOCS = [
+    "Paris is the capital of France.",
+    "Tokyo is the capital of Japan.",
+    "The capital of France hosts the Louvre.",
+]
+
+
+@pytest.mark.offline
+async def test_concurrent_queries_share_batches():
+    model = _FakeCrossEncoder()
+    reranker = LocalReranker(predict=model, batch_size=8, max_wait=0.05)
+
+    results = await asyncio.gather(
+        reranker("France Louvre", DOCS, top_n=2),
+        reranker("Japan", DOCS),
+        reranker("Louvre museum", DOCS),
+    )
+
+    # 9 pairs: one full batch of 8 and the remaining pair after max_wait
+    assert sorted(model.batches) == [1, 8]
+    assert [r["index"] for r in results[0]] == [2, 0]
+    assert results[1][0] == {"index": 1, "relevance_score": 1.0}
+    assert len(results[1]) == 3
+
+
+@pytest.mark.offline
+async def test_scores_are_cached_per_query_and_chunk():
+    model = _FakeCrossEncoder()
+    reranker = LocalReranker(predict=model, max_wait=0, cache_size=4)
+
+    first = await reranker("capital of France", DOCS)
+    again = await reranker("capital of France", list(reversed(DOCS)))
+    assert model.batches == [3]
+    assert {r["relevance_score"] for r in first} == {
+        r["relevance_score"] for r in again
+    }
+    assert reranker.stats == {"pairs": 6, "cache_hits": 3, "batches": 1}
+
+    # A new query evicts the least recently used scores
+    await reranker("Japan", DOCS)
+    await reranker("capital of France", DOCS[2:])
+    assert model.batches == [3, 3, 1]
+
+
+@pytest.mark.offline
+async def test_plugs_into_apply_rerank():
+    reranker = LocalReranker(predict=_FakeCrossEncoder(), max_wait=0)
+    # LightRAG passes asdict() copies of its config: the model must be shared
+    assert copy.deepcopy(reranker) is reranker
+
+    docs = [{"id": f"chunk-{i}", "content": content} for i, content in enumerate(DOCS)]
+    reranked = await apply_rerank_if_enabled(
+        "capital of Japan", docs, {"rerank_model_func": reranker}, top_n=1
+    )
+    assert reranked == [{**docs[1], "rerank_score": 3.0}]
@@ -0,0 +1,85 @@
+"""
+Tests for the document parsing process pool (lightrag.api.parsing_pool)
+
+This test verifies:
+1. GIL-bound parsers run in parallel across worker processes
+2. A parse exceeding the timeout is killed and the pool recovers
+3. Time spent waiting for a free worker does not count towards the timeout
+4. The memory limit turns a runaway parse into MemoryError
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from lightrag.api.parsing_pool import ParsingPool
+
+
+def _busy_parse(seconds: float) -> int:
+    """Pure-Python work holding the GIL, like pypdf"""
+    deadline = time.monotonic() + seconds
+    count = 0
+    while time.monotonic() < deadline:
+        count += 1
+    return os.getpid()
+
+
+def _hanging_parse() -> None:
+    time.sleep(60)
+
+
+def _greedy_parse(megabytes: int) -> int:
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+@pytest.mark.offline
+@pytest.mark.skipif((os.cpu_count() or 1) < 3, reason="needs three CPU cores")
+async def test_parsers_run_in_parallel_processes():
+    pool = ParsingPool(max_workers=3, timeout=30)
+    try:
+        start = time.monotonic()
+        pids = await asyncio.gather(*(pool.run(_busy_parse, 0.5) for _ in range(3)))
+        elapsed = time.monotonic() - start
+
+        assert os.getpid() not in pids
+        assert len(set(pids)) == 3
+        assert elapsed < 1.4
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.offline
+async def test_timeout_kills_parse_and_pool_recovers():
+    pool = ParsingPool(max_workers=2, timeout=0.5)
+    try:
+        with pytest.raises(TimeoutError, match="timed out"):
+            await pool.run(_hanging_parse)
+        assert await pool.run(_busy_parse, 0)
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.offline
+async def test_queued_parses_do_not_time_out():
+    pool = ParsingPool(max_workers=1, timeout=1)
+    try:
+        # Each parse fits the timeout, the last one only starts after 1.2s
+        pids = await asyncio.gather(*(pool.run(_busy_parse, 0.4) for _ in range(4)))
+        assert len(set(pids)) == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.offline
+@pytest.mark.skipif(sys.platform != "linux", reason="RLIMIT_AS is enforced on Linux")
+async def test_memory_limit_raises_memory_error():
+    pool = ParsingPool(max_workers=1, timeout=30, memory_limit_mb=1024)
+    try:
+        with pytest.raises(MemoryError):
+            await pool.run(_greedy_parse, 2048)
+        assert await pool.run(_greedy_parse, 16) == 16 * 1024 * 1024
+    finally:
+        pool.shutdown()
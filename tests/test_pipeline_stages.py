@@ -0,0 +1,131 @@
+"""
+Tests for the staged document pipeline (chunk -> extract -> merge -> persist)
+
+This test verifies:
+1. A full stage queue holds back the stage feeding it
+2. A task cancelled between reserve and slot gives back its queue place
+3. Extraction of the next document overlaps the merge of the previous one
+4. Per-stage counters are published to the pipeline status
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import lightrag.lightrag as lightrag_module
+from lightrag.base import DocStatus
+from lightrag.kg.shared_storage import get_namespace_data
+from lightrag.utils import PipelineStage
+
+
+@pytest.mark.offline
+async def test_full_queue_holds_back_upstream_stage():
+    stage = PipelineStage("merge", concurrency=1, queue_size=1)
+    release = asyncio.Event()
+
+    async def occupy():
+        async with stage.slot():
+            await release.wait()
+
+    running = asyncio.create_task(occupy())
+    await asyncio.sleep(0)
+    await stage.reserve()
+    assert stage.stats()["queue_depth"] == 1
+
+    reserved = asyncio.Event()
+
+    async def queue_next():
+        await stage.reserve()
+        reserved.set()
+        async with stage.slot(reserved=True):
+            pass
+
+    blocked = asyncio.create_task(queue_next())
+    await asyncio.sleep(0.01)
+    assert not reserved.is_set()
+
+    release.set()
+    await running
+    async with stage.slot(reserved=True):
+        await reserved.wait()
+    await blocked
+
+    stats = stage.stats()
+    assert stats["completed"] == 3
+    assert stats["queue_depth"] == 0 and stats["running"] == 0
+
+
+@pytest.mark.offline
+async def test_cancelled_task_gives_back_its_reservation():
+    stage = PipelineStage("merge", concurrency=1, queue_size=1)
+    reserved = asyncio.Event()
+
+    async def extract():
+        await stage.reserve()
+        reserved.set()
+        # Cancelled after reserving, before entering the slot
+        await asyncio.sleep(60)
+
+    task = asyncio.create_task(extract())
+    await reserved.wait()
+    assert stage.stats()["queue_depth"] == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+
+    assert stage.stats()["queue_depth"] == 0
+
+    async def merge():
+        async with stage.slot():
+            pass
+
+    await asyncio.wait_for(merge(), 1)
+    assert stage.stats()["completed"] == 1
+
+
+@pytest.mark.offline
+async def test_extraction_overlaps_merge(make_rag, monkeypatch):
+    extractions = []
+    merges = {}
+
+    async def llm_func(prompt, system_prompt=None, history_messages=None, **kwargs):
+        if not system_prompt:
+            return "A short note."
+        extractions.append(time.monotonic())
+        return "entity<|#|>Note<|#|>concept<|#|>A short note.\n<|COMPLETE|>"
+
+    merge_nodes_and_edges = lightrag_module.merge_nodes_and_edges
+
+    async def slow_merge(**kwargs):
+        start = time.monotonic()
+        await asyncio.sleep(0.3)
+        await merge_nodes_and_edges(**kwargs)
+        merges[kwargs["doc_id"]] = (start, time.monotonic())
+
+    monkeypatch.setattr(lightrag_module, "merge_nodes_and_edges", slow_merge)
+
+    rag = await make_rag(
+        llm_model_func=llm_func, max_parallel_insert=1, max_parallel_merge=1
+    )
+    await rag.ainsert(
+        ["First note.", "Second note.", "Third note."],
+        ids=["doc-1", "doc-2", "doc-3"],
+    )
+
+    # With one insert slot, the later documents were extracted while the
+    # first one was still merging
+    first_merge_start, first_merge_end = min(merges.values())
+    assert any(first_merge_start < t < first_merge_end for t in extractions)
+
+    for doc_id in merges:
+        status = await rag.doc_status.get_by_id(doc_id)
+        assert status["status"] == DocStatus.PROCESSED
+
+    pipeline_status = await get_namespace_data("pipeline_status")
+    stages = pipeline_status["stages"]
+    assert list(stages) == ["chunk", "extract", "merge", "persist"]
+    assert all(stage["completed"] == 3 for stage in stages.values())
+    assert stages["merge"]["concurrency"] == 1
+    assert all(stage["queue_depth"] == 0 for stage in stages.values())
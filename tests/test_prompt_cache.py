@@ -0,0 +1,114 @@
+"""
+Tests for provider prompt-caching support (lightrag.utils.CacheablePrompt)
+
+This test verifies:
+1. Query prompts mark the instructions before the per-query fields as static prefix
+2. The static prefix survives prompt sanitization before the LLM call
+3. Cached prompt tokens reported by OpenAI are tracked by TokenTracker
+4. The Anthropic binding sends the static prefix with cache_control
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from lightrag.prompt import PROMPTS
+from lightrag.utils import (
+    CacheablePrompt,
+    TokenTracker,
+    format_cacheable_prompt,
+    use_llm_func_with_cache,
+)
+
+QUERY_FIELDS = ("response_type", "user_prompt", "context_data")
+
+
+def _rag_prompt(**values):
+    return format_cacheable_prompt(PROMPTS["rag_response"], QUERY_FIELDS, **values)
+
+
+@pytest.mark.offline
+def test_query_prompt_static_prefix_is_stable():
+    first = _rag_prompt(
+        response_type="Bullet Points", user_prompt="n/a", context_data="ctx one"
+    )
+    second = _rag_prompt(
+        response_type="Single Paragraph",
+        user_prompt="Answer in French",
+        context_data="ctx two",
+    )
+    assert isinstance(first, CacheablePrompt)
+    assert first.static_prefix == second.static_prefix
+    assert first.static_prefix.startswith("---Role---")
+    assert "{" not in first.static_prefix[-50:]
+    assert first.dynamic_suffix.endswith("ctx one\n")
+
+    # Templates starting with a dynamic field have no static prefix
+    plain = format_cacheable_prompt(
+        "{context_data} rest", QUERY_FIELDS, context_data="x"
+    )
+    assert plain == "x rest" and not isinstance(plain, CacheablePrompt)
+    # A cut through escaped braces falls back to a plain prompt
+    escaped = format_cacheable_prompt(
+        "json {{context_data}} {context_data}", QUERY_FIELDS, context_data="x"
+    )
+    assert escaped == "json {context_data} x"
+    assert not isinstance(escaped, CacheablePrompt)
+
+
+@pytest.mark.offline
+async def test_static_prefix_survives_sanitization():
+    received = {}
+
+    async def llm_func(prompt, system_prompt=None, **kwargs):
+        received["system_prompt"] = system_prompt
+        return "ok"
+
+    system_prompt = CacheablePrompt("  static instructions\n\ndynamic part  ", 22)
+    await use_llm_func_with_cache("input", llm_func, system_prompt=system_prompt)
+
+    sent = received["system_prompt"]
+    assert isinstance(sent, CacheablePrompt)
+    assert sent == "static instructions\n\ndynamic part"
+    assert sent.static_prefix == "static instructions"
+
+
+@pytest.mark.offline
+def test_openai_cached_tokens_are_tracked():
+    from lightrag.llm.openai import _usage_token_counts
+
+    usage = SimpleNamespace(
+        prompt_tokens=1200,
+        completion_tokens=100,
+        total_tokens=1300,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+    )
+    tracker = TokenTracker()
+    tracker.add_usage(_usage_token_counts(usage))
+    tracker.add_usage(
+        _usage_token_counts(
+            SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        )
+    )
+
+    stats = tracker.get_usage()
+    assert stats["prompt_tokens"] == 1210
+    assert stats["cached_tokens"] == 1024
+    assert stats["call_count"] == 2
+
+
+@pytest.mark.offline
+def test_anthropic_system_blocks_mark_static_prefix():
+    pytest.importorskip("anthropic")
+    from lightrag.llm.anthropic import _system_blocks
+
+    blocks = _system_blocks(CacheablePrompt("static\ndynamic", 7))
+    assert blocks == [
+        {
+            "type": "text",
+            "text": "static\n",
+            "cache_control": {"type": "ephemeral"},
+        },
+        {"type": "text", "text": "dynamic"},
+    ]
+    assert _system_blocks("plain prompt") == "plain prompt"
@@ -0,0 +1,69 @@
+"""
+Tests for the retrieval-context cache (lightrag.query_cache.QueryContextCache)
+
+This test verifies:
+1. The key ignores answer-only parameters and includes retrieval parameters
+2. The query text is only part of the key when retrieval depends on it
+3. Cached contexts are returned as copies
+4. A new knowledge-graph version drops cached contexts
+"""
+
+import pytest
+
+from lightrag.base import QueryContextResult, QueryParam
+from lightrag.query_cache import QueryContextCache, query_context_cache_key
+
+
+def _key(query="q", mode="local", config=None, **params):
+    config = config if config is not None else {"kg_chunk_pick_method": "WEIGHT"}
+    return query_context_cache_key(
+        query, "alice", "meetings", QueryParam(mode=mode, **params), config
+    )
+
+
+@pytest.mark.offline
+def test_key_ignores_answer_only_parameters():
+    base = _key()
+    assert base == _key(user_prompt="Answer in French", response_type="Bullet Points")
+    assert base == _key(conversation_history=[{"role": "user", "content": "hi"}])
+    assert base != _key(top_k=5)
+    assert base != _key(max_total_tokens=1000)
+    assert base != _key(start_date="2024-01-01")
+    assert base != _key(mode="global")
+
+
+@pytest.mark.offline
+def test_query_text_is_keyed_when_retrieval_uses_it():
+    assert _key(query="a") == _key(query="b")
+    assert _key(query="a", mode="mix") != _key(query="b", mode="mix")
+    vector = {"kg_chunk_pick_method": "VECTOR"}
+    assert _key(query="a", config=vector) != _key(query="b", config=vector)
+
+
+@pytest.mark.offline
+def test_cached_context_is_copied():
+    cache = QueryContextCache(max_entries=10)
+    result = QueryContextResult(context="ctx", raw_data={"metadata": {"a": 1}})
+    cache.put("key", result, kg_version=0)
+    result.raw_data["metadata"]["a"] = 2
+
+    first = cache.get("key", kg_version=0)
+    first.raw_data["llm_response"] = {"content": "answer"}
+    second = cache.get("key", kg_version=0)
+
+    assert second.context == "ctx"
+    assert second.raw_data == {"metadata": {"a": 1}}
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.offline
+def test_new_kg_version_drops_contexts():
+    cache = QueryContextCache(max_entries=10)
+    cache.put("key", QueryContextResult(context="ctx", raw_data={}), kg_version=0)
+
+    assert cache.get("key", kg_version=1) is None
+    assert cache.stats()["entries"] == 0
+
+    # A context built before the graph changed is not stored
+    cache.put("key", QueryContextResult(context="old", raw_data={}), kg_version=0)
+    assert cache.get("key", kg_version=1) is None
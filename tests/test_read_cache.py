@@ -0,0 +1,117 @@
+"""
+Tests for the query-path read cache (lightrag.kg.read_cache)
+
+This test verifies:
+1. Repeated KV reads are served from the cache, writes invalidate them
+2. Graph node/edge/degree reads are cached and edge writes refresh both endpoints
+3. Node removal drops cached edges and degrees of its neighbours
+4. Entries expire after the TTL
+"""
+
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.read_cache import CachedGraphStorage, CachedKVStorage
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+async def _kv(tmp_path, ttl: float = 300) -> CachedKVStorage:
+    storage = CachedKVStorage(
+        JsonKVStorage(
+            namespace="text_chunks",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        ),
+        max_entries=100,
+        ttl=ttl,
+    )
+    await storage.initialize()
+    return storage
+
+
+async def _graph(tmp_path) -> CachedGraphStorage:
+    storage = CachedGraphStorage(
+        NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        ),
+        max_entries=100,
+        ttl=300,
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+async def test_kv_read_through_and_invalidation(tmp_path):
+    storage = await _kv(tmp_path)
+    await storage.upsert({"c1": {"content": "one"}})
+
+    assert (await storage.get_by_ids(["c1", "c2"]))[1] is None
+    first = await storage.get_by_id("c1")
+    first["content"] = "mutated by caller"
+    assert (await storage.get_by_id("c1"))["content"] == "one"
+    assert storage.cache_stats()["records"]["hits"] == 2
+
+    await storage.upsert({"c1": {"content": "two"}, "c2": {"content": "new"}})
+    assert [r["content"] for r in await storage.get_by_ids(["c1", "c2"])] == [
+        "two",
+        "new",
+    ]
+
+    await storage.delete(["c1"])
+    assert await storage.get_by_id("c1") is None
+    # Backend specific attributes are still reachable
+    assert storage._file_name.endswith("kv_store_text_chunks.json")
+
+
+@pytest.mark.offline
+async def test_graph_reads_and_edge_invalidation(tmp_path):
+    graph = await _graph(tmp_path)
+    for node in ("A", "B", "C"):
+        await graph.upsert_node(node, {"entity_id": node, "description": node})
+    await graph.upsert_edge("A", "B", {"weight": "1"})
+
+    assert (await graph.get_nodes_batch(["A", "X"])) == {
+        "A": {"entity_id": "A", "description": "A"}
+    }
+    assert await graph.get_edge("B", "A") == {"weight": "1"}
+    assert await graph.edge_degrees_batch([("A", "B")]) == {("A", "B"): 2}
+    await graph.get_edge("A", "B")
+    assert graph.cache_stats()["edges"]["hits"] == 1
+
+    await graph.upsert_edge("B", "C", {"weight": "2"})
+    assert await graph.node_degree("B") == 2
+    assert await graph.get_nodes_edges_batch(["C"]) == {"C": [("C", "B")]}
+
+    await graph.upsert_node("A", {"entity_id": "A", "description": "changed"})
+    assert (await graph.get_node("A"))["description"] == "changed"
+
+
+@pytest.mark.offline
+async def test_node_removal_clears_neighbour_state(tmp_path):
+    graph = await _graph(tmp_path)
+    await graph.upsert_edge("A", "B", {"weight": "1"})
+    assert await graph.node_degree("A") == 1
+    assert await graph.has_edge("A", "B")
+
+    await graph.remove_nodes(["B"])
+    assert await graph.node_degree("A") == 0
+    assert await graph.get_edge("A", "B") is None
+    assert not await graph.has_node("B")
+
+
+@pytest.mark.offline
+async def test_entries_expire_after_ttl(tmp_path):
+    storage = await _kv(tmp_path, ttl=0)
+    await storage.upsert({"c1": {"content": "one"}})
+    await storage.get_by_id("c1")
+    await storage.get_by_id("c1")
+    stats = storage.cache_stats()["records"]
+    assert stats["hits"] == 0
+    assert stats["misses"] == 2
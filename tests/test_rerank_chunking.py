@@ -40,7 +40,10 @@ class TestChunkDocumentsForRerank:
         long_doc = "a" * 2000  # 2000 characters
         documents = [long_doc, "short doc"]
 
-        with patch("lightrag.utils.TiktokenTokenizer", side_effect=ImportError):
+        with (
+            patch.dict("lightrag.rerank._rerank_tokenizers", clear=True),
+            patch("lightrag.utils.TiktokenTokenizer", side_effect=ImportError),
+        ):
             chunked_docs, doc_indices = chunk_documents_for_rerank(
                 documents,
                 max_tokens=100,  # 100 tokens = ~400 chars
@@ -79,6 +82,20 @@ class TestChunkDocumentsForRerank:
                     # At least one word should be common due to overlap
                     assert any(word in chunk2_words for word in chunk1_words[-5:])
 
+    def test_tokenizer_is_reused_across_calls(self):
+        """The tokenizer is created once per model, not on every call"""
+        tokenizer = Mock()
+        tokenizer.encode.side_effect = lambda text: list(range(len(text.split())))
+        with (
+            patch.dict("lightrag.rerank._rerank_tokenizers", clear=True),
+            patch("lightrag.utils.TiktokenTokenizer", return_value=tokenizer) as cls,
+        ):
+            for _ in range(3):
+                chunk_documents_for_rerank(["a b c"], max_tokens=10)
+
+        cls.assert_called_once_with(model_name="gpt-4o-mini")
+        assert tokenizer.encode.call_count == 3
+
     def test_empty_documents(self):
         """Test handling of empty document list"""
         documents = []
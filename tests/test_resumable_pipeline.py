@@ -0,0 +1,109 @@
+"""
+Tests for chunk-granularity checkpoints of the document pipeline
+
+This test verifies:
+1. Extraction and merge progress is stored with the doc status between windows
+2. A restarted run resumes at the first unmerged chunk without re-extracting merged ones
+3. Entities of the windows merged before the interruption stay recorded for the document
+4. In bulk-load mode a merge checkpoint is written after the buffered graph
+"""
+
+import pytest
+
+import lightrag.lightrag as lightrag_module
+from lightrag.base import DocStatus
+
+TOWNS = ["Aville", "Bville", "Cville", "Dville", "Eville", "Fville"]
+
+
+@pytest.mark.offline
+async def test_interrupted_document_resumes_at_first_unmerged_chunk(
+    make_rag, monkeypatch
+):
+    extracted = []
+    merged = []
+
+    extract_entities = lightrag_module.extract_entities
+
+    async def recording_extract(chunks, **kwargs):
+        extracted.extend(chunk["content"].split()[0] for chunk in chunks.values())
+        return await extract_entities(chunks, **kwargs)
+
+    merge_nodes_and_edges = lightrag_module.merge_nodes_and_edges
+    fail_merge = True
+
+    async def interrupted_merge(**kwargs):
+        if fail_merge and merged:
+            raise RuntimeError("worker stopped")
+        merged.append(len(kwargs["chunk_results"]))
+        await merge_nodes_and_edges(**kwargs)
+
+    monkeypatch.setattr(lightrag_module, "extract_entities", recording_extract)
+    monkeypatch.setattr(lightrag_module, "merge_nodes_and_edges", interrupted_merge)
+
+    rag = await make_rag(checkpoint_chunks=2)
+    await rag.ainsert(
+        "\n".join(f"{town} lies on the river." for town in TOWNS),
+        split_by_character="\n",
+        split_by_character_only=True,
+        ids="doc-1",
+    )
+
+    status = await rag.doc_status.get_by_id("doc-1")
+    assert status["status"] == DocStatus.FAILED
+    checkpoint = status["metadata"]["checkpoint"]
+    assert [
+        chunk["content"]
+        for chunk in await rag.text_chunks.get_by_ids(checkpoint["extracted"])
+    ] == [f"{town} lies on the river." for town in TOWNS[:4]]
+    assert checkpoint["merged"] == checkpoint["extracted"][:2]
+    assert merged == [2]
+
+    fail_merge = False
+    extracted.clear()
+    merged.clear()
+    await rag.apipeline_process_enqueue_documents("\n", True)
+
+    status = await rag.doc_status.get_by_id("doc-1")
+    assert status["status"] == DocStatus.PROCESSED
+    assert status["chunks_list"][:4] == checkpoint["extracted"]
+    assert "checkpoint" not in status["metadata"]
+    # Merged chunks are neither extracted nor merged again
+    assert merged == [2, 2]
+    assert extracted == TOWNS[2:]
+
+    entities = await rag.full_entities.get_by_id("doc-1")
+    assert set(entities["entity_names"]) == set(TOWNS)
+    for town in TOWNS:
+        assert await rag.chunk_entity_relation_graph.has_node(town)
+
+
+@pytest.mark.offline
+async def test_checkpoint_follows_buffered_graph_writes(make_rag):
+    rag = await make_rag(
+        checkpoint_chunks=2, graph_bulk_load=True, graph_bulk_buffer_size=1000
+    )
+    graph = rag._graph_write_buffer.storage
+    nodes_at_checkpoint = []
+    upsert = rag.doc_status.upsert
+
+    async def recording_upsert(data):
+        for record in data.values():
+            merged = record.get("metadata", {}).get("checkpoint", {}).get("merged")
+            if merged:
+                chunks = await rag.text_chunks.get_by_ids(merged)
+                towns = [chunk["content"].split()[0] for chunk in chunks]
+                nodes_at_checkpoint.append(
+                    [await graph.has_node(town) for town in towns]
+                )
+        return await upsert(data)
+
+    rag.doc_status.upsert = recording_upsert
+    await rag.ainsert(
+        "\n".join(f"{town} lies on the river." for town in TOWNS),
+        split_by_character="\n",
+        split_by_character_only=True,
+        ids="doc-1",
+    )
+
+    assert nodes_at_checkpoint == [[True, True], [True, True, True, True]]
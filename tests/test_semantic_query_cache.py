@@ -0,0 +1,156 @@
+"""
+Tests for the semantic query-answer cache (lightrag.query_cache)
+
+This test verifies:
+1. Similar queries in the same scope hit, dissimilar queries miss
+2. Mode, date range and custom system prompt are part of the scope
+3. Bumping the knowledge-graph version evicts cached answers, one bump at a time
+4. naive_query serves a paraphrased query without calling the LLM
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.kg.shared_storage import get_namespace_lock
+from lightrag.operate import naive_query
+from lightrag.query_cache import (
+    SemanticQueryCache,
+    bump_kg_version,
+    get_kg_version,
+    semantic_cache_scope,
+)
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+_VECTORS = {
+    "what's on this week": [1.0, 0.0, 0.1],
+    "this week's schedule": [1.0, 0.0, 0.12],
+    "who founded the company": [0.0, 1.0, 0.0],
+}
+
+
+async def _embedding_func(texts: list[str]) -> np.ndarray:
+    return np.array([_VECTORS[text] for text in texts])
+
+
+@pytest.mark.offline
+async def test_similar_queries_hit_within_scope():
+    cache = SemanticQueryCache(similarity_threshold=0.95, max_entries=10)
+    scope = semantic_cache_scope("", QueryParam(mode="naive"))
+    cache.save(
+        scope, "what's on this week", _VECTORS["what's on this week"], "A", None, 0
+    )
+
+    assert cache.lookup(scope, _VECTORS["this week's schedule"], 0)[0] == "A"
+    assert cache.lookup(scope, _VECTORS["who founded the company"], 0) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.offline
+async def test_scope_includes_mode_date_range_and_system_prompt():
+    base = semantic_cache_scope("", QueryParam(mode="mix"))
+    assert base != semantic_cache_scope("", QueryParam(mode="local"))
+    assert base != semantic_cache_scope(
+        "", QueryParam(mode="mix", start_date="2024-01-01")
+    )
+    assert base != semantic_cache_scope("other", QueryParam(mode="mix"))
+    assert base != semantic_cache_scope("", QueryParam(mode="mix"), "Answer in French.")
+
+    cache = SemanticQueryCache(similarity_threshold=0.9, max_entries=10)
+    cache.save(base, "q", [1.0, 0.0], "A", None, 0)
+    other = semantic_cache_scope("", QueryParam(mode="local"))
+    assert cache.lookup(other, [1.0, 0.0], 0) is None
+
+
+@pytest.mark.offline
+async def test_kg_version_bump_evicts_entries():
+    cache = SemanticQueryCache(similarity_threshold=0.9, max_entries=10)
+    version = await get_kg_version("ws")
+    cache.save("scope", "q", [1.0, 0.0], "A", {"status": "success"}, version)
+    assert cache.lookup("scope", [1.0, 0.0], version) is not None
+
+    new_version = await bump_kg_version("ws")
+    assert new_version == version + 1
+    assert await get_kg_version("other") == 0
+    assert cache.lookup("scope", [1.0, 0.0], new_version) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["evictions"] == 1
+
+    # The increment waits for a bump in progress in another worker
+    async with get_namespace_lock("kg_version", workspace="ws"):
+        bump = asyncio.create_task(bump_kg_version("ws"))
+        await asyncio.sleep(0.05)
+        assert not bump.done()
+    assert await bump == new_version + 1
+
+
+class _ChunksVDB:
+    embedding_func = staticmethod(_embedding_func)
+    cosine_better_than_threshold = 0.2
+
+    async def query(self, query, top_k, query_embedding=None):
+        return [
+            {
+                "id": "chunk-1",
+                "content": "Monday: planning meeting",
+                "file_path": "schedule.md",
+                "created_at": 0,
+            }
+        ]
+
+
+@pytest.mark.offline
+async def test_naive_query_reuses_answer_for_paraphrase(char_tokenizer):
+    llm_calls = []
+
+    async def llm_model_func(prompt, **kwargs):
+        llm_calls.append(prompt)
+        return "Planning meeting on Monday"
+
+    global_config = {
+        "workspace": "",
+        "tokenizer": char_tokenizer,
+        "llm_model_func": llm_model_func,
+        "semantic_query_cache": SemanticQueryCache(0.95, 10),
+        "max_total_tokens": 30000,
+    }
+
+    first = await naive_query(
+        "what's on this week",
+        _ChunksVDB(),
+        QueryParam(mode="naive", enable_rerank=False),
+        global_config,
+    )
+    second = await naive_query(
+        "this week's schedule",
+        _ChunksVDB(),
+        QueryParam(mode="naive", enable_rerank=False),
+        global_config,
+    )
+
+    assert first.content == second.content == "Planning meeting on Monday"
+    assert len(llm_calls) == 1
+    assert second.raw_data == first.raw_data
+
+    # An answer generated under another system prompt is not served
+    await naive_query(
+        "this week's schedule",
+        _ChunksVDB(),
+        QueryParam(mode="naive", enable_rerank=False),
+        global_config,
+        system_prompt="Answer in French.\n{content_data}",
+    )
+    assert len(llm_calls) == 2
+
+    await bump_kg_version("")
+    await naive_query(
+        "this week's schedule",
+        _ChunksVDB(),
+        QueryParam(mode="naive", enable_rerank=False),
+        global_config,
+    )
+    assert len(llm_calls) == 3
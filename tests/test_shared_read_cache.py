@@ -0,0 +1,158 @@
+"""
+Tests for the cross-worker read cache in shared_storage
+
+This test verifies:
+1. Namespace versions live in shared memory and are bumped by set_all_update_flags
+2. NamespaceReadCache serves hits and drops its view when the version changes
+3. JsonKVStorage serves repeated reads locally and still sees writes
+4. A drop or sanitized reload in one worker invalidates the other workers' views
+5. Single-process mode keeps the plain locked read path
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.jsonl_kv_impl import JsonlKVStorage
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    get_namespace_read_cache,
+    get_namespace_version,
+    get_update_flag,
+    initialize_share_data,
+    set_all_update_flags,
+)
+
+
+async def _mock_embedding_func(texts: list[str]) -> np.ndarray:
+    return np.random.rand(len(texts), 8)
+
+
+@pytest.fixture
+def multi_process_shared_data():
+    initialize_share_data(workers=2)
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.offline
+async def test_version_bumped_by_update_flags(multi_process_shared_data):
+    await get_update_flag("text_chunks", workspace="ws")
+    version = await get_namespace_version("text_chunks", workspace="ws")
+    other = await get_namespace_version("text_chunks", workspace="other")
+    before = version.value
+
+    await set_all_update_flags("text_chunks", workspace="ws")
+    assert version.value == before + 1
+    assert other.value == 0
+
+    # A second handle on the same namespace shares the slot
+    again = await get_namespace_version("text_chunks", workspace="ws")
+    assert again.value == version.value
+
+
+@pytest.mark.offline
+async def test_read_cache_invalidation(multi_process_shared_data):
+    await get_update_flag("full_docs", workspace="ws")
+    cache = await get_namespace_read_cache("full_docs", workspace="ws")
+    version = cache.sync()
+    cache.put("a", {"content": "1"}, version)
+    assert cache.get("a") == (True, {"content": "1"})
+
+    await set_all_update_flags("full_docs", workspace="ws")
+    # Values read under an outdated version are not cached
+    cache.put("b", {"content": "2"}, version)
+    cache.sync()
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (False, None)
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+@pytest.mark.offline
+async def test_json_kv_reads_through_cache(multi_process_shared_data, tmp_path):
+    storage = JsonKVStorage(
+        namespace="text_chunks",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=_mock_embedding_func,
+    )
+    await storage.initialize()
+    assert storage._read_cache is not None
+
+    await storage.upsert({"a": {"content": "1"}})
+    assert (await storage.get_by_id("a"))["content"] == "1"
+    assert (await storage.get_by_id("a"))["content"] == "1"
+    assert storage._read_cache.hits == 1
+
+    await storage.upsert({"a": {"content": "2"}})
+    results = await storage.get_by_ids(["a", "missing"])
+    assert results[0]["content"] == "2"
+    assert results[0]["_id"] == "a"
+    assert results[1] is None
+
+
+async def _two_workers(storage_cls, tmp_path):
+    """Two storage instances sharing a namespace, like two worker processes"""
+    workers = []
+    for _ in range(2):
+        storage = storage_cls(
+            namespace="text_chunks",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=_mock_embedding_func,
+        )
+        await storage.initialize()
+        workers.append(storage)
+    return workers
+
+
+@pytest.mark.offline
+async def test_drop_invalidates_other_workers(multi_process_shared_data, tmp_path):
+    writer, reader = await _two_workers(JsonlKVStorage, tmp_path)
+    await writer.upsert({"a": {"content": "1"}})
+    await writer.index_done_callback()
+    assert (await reader.get_by_id("a"))["content"] == "1"
+    assert (await reader.get_by_id("a"))["content"] == "1"
+    assert reader._read_cache.hits == 1
+
+    await writer.drop()
+    assert await reader.get_by_id("a") is None
+    assert await reader.get_by_ids(["a"]) == [None]
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("storage_cls", [JsonKVStorage, JsonlKVStorage])
+async def test_sanitized_reload_invalidates_other_workers(
+    multi_process_shared_data, tmp_path, storage_cls
+):
+    writer, reader = await _two_workers(storage_cls, tmp_path)
+    await writer.upsert({"a": {"content": "broken \ud800 text"}})
+    assert "\ud800" in (await reader.get_by_id("a"))["content"]
+
+    # The JSONL storage sanitizes when it folds the journal into the snapshot
+    if storage_cls is JsonlKVStorage:
+        await writer.compact()
+    else:
+        await writer.index_done_callback()
+    assert "\ud800" not in (await writer.get_by_id("a"))["content"]
+    assert "\ud800" not in (await reader.get_by_id("a"))["content"]
+
+
+@pytest.mark.offline
+async def test_single_process_has_no_read_cache(tmp_path):
+    initialize_share_data()
+    try:
+        assert await get_namespace_version("text_chunks") is None
+        storage = JsonKVStorage(
+            namespace="text_chunks",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=_mock_embedding_func,
+        )
+        await storage.initialize()
+        assert storage._read_cache is None
+        await storage.upsert({"a": {"content": "1"}})
+        assert (await storage.get_by_id("a"))["content"] == "1"
+    finally:
+        finalize_share_data()
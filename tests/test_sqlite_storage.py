@@ -0,0 +1,221 @@
+"""
+Tests for the embedded SQLite storage backends
+
+This test verifies:
+1. SqliteKVStorage upsert/get/filter/delete keep create_time across updates
+2. SqliteDocStatusStorage status counts and SQL-side pagination
+3. SqliteVectorDBStorage cosine query, row recycling and relation deletion
+4. SqliteGraphStorage undirected edges, degrees and BFS subgraph
+5. Workspaces are isolated on disk
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg.sqlite_impl import (
+    SqliteDocStatusStorage,
+    SqliteGraphStorage,
+    SqliteKVStorage,
+    SqliteVectorDBStorage,
+)
+from lightrag.utils import EmbeddingFunc
+
+_VOCAB = ["apple", "banana", "cherry", "delta"]
+
+
+async def _keyword_embedding(texts: list[str], **kwargs) -> np.ndarray:
+    """One dimension per vocabulary word, so similarity is predictable"""
+    return np.array(
+        [[float(word in text) for word in _VOCAB] for text in texts],
+        dtype=np.float32,
+    )
+
+
+def _config(tmp_path) -> dict:
+    return {
+        "working_dir": str(tmp_path),
+        "embedding_batch_num": 2,
+        "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.5},
+        "max_graph_nodes": 1000,
+    }
+
+
+@pytest.mark.offline
+async def test_kv_storage(tmp_path):
+    storage = SqliteKVStorage(
+        namespace="text_chunks",
+        workspace="",
+        global_config=_config(tmp_path),
+        embedding_func=None,
+    )
+    await storage.initialize()
+    try:
+        assert await storage.is_empty()
+        await storage.upsert({"a": {"content": "1"}, "b": {"content": "2"}})
+        first = await storage.get_by_id("a")
+        assert first["content"] == "1"
+        assert first["llm_cache_list"] == []
+
+        await storage.upsert({"a": {"content": "3"}})
+        updated = await storage.get_by_id("a")
+        assert updated["content"] == "3"
+        assert updated["create_time"] == first["create_time"]
+
+        assert [r and r["_id"] for r in await storage.get_by_ids(["b", "x", "a"])] == [
+            "b",
+            None,
+            "a",
+        ]
+        assert await storage.filter_keys({"a", "x"}) == {"x"}
+
+        await storage.delete(["a"])
+        assert await storage.get_by_id("a") is None
+    finally:
+        await storage.finalize()
+
+
+@pytest.mark.offline
+async def test_doc_status_pagination(tmp_path):
+    storage = SqliteDocStatusStorage(
+        namespace="doc_status",
+        workspace="",
+        global_config=_config(tmp_path),
+        embedding_func=None,
+    )
+    await storage.initialize()
+    try:
+        docs = {}
+        for i in range(25):
+            docs[f"doc-{i:02d}"] = {
+                "status": DocStatus.PROCESSED if i % 5 else DocStatus.FAILED,
+                "content_summary": "",
+                "content_length": i,
+                "file_path": f"file_{i:02d}.txt",
+                "created_at": f"2025-01-01T00:00:{i:02d}",
+                "updated_at": f"2025-01-01T00:00:{i:02d}",
+            }
+        await storage.upsert(docs)
+
+        counts = await storage.get_all_status_counts()
+        assert counts["processed"] == 20
+        assert counts["failed"] == 5
+        assert counts["all"] == 25
+
+        page, total = await storage.get_docs_paginated(
+            status_filter=DocStatus.PROCESSED, page=2, page_size=10
+        )
+        assert total == 20
+        assert len(page) == 10
+        assert page[0][0] == "doc-12"  # updated_at desc, page 2
+
+        assert (await storage.get_doc_by_file_path("file_07.txt"))[
+            "content_length"
+        ] == 7
+        assert len(await storage.get_docs_by_status(DocStatus.FAILED)) == 5
+    finally:
+        await storage.finalize()
+
+
+@pytest.mark.offline
+async def test_vector_storage(tmp_path):
+    embedding_func = EmbeddingFunc(embedding_dim=4, func=_keyword_embedding)
+    storage = SqliteVectorDBStorage(
+        namespace="relationships",
+        workspace="",
+        global_config=_config(tmp_path),
+        embedding_func=embedding_func,
+        meta_fields={"src_id", "tgt_id", "content"},
+    )
+    await storage.initialize()
+    try:
+        await storage.upsert(
+            {
+                "r1": {"content": "apple", "src_id": "A", "tgt_id": "B"},
+                "r2": {"content": "banana", "src_id": "B", "tgt_id": "C"},
+                "r3": {"content": "apple cherry", "src_id": "C", "tgt_id": "D"},
+            }
+        )
+        results = await storage.query("apple", top_k=5)
+        assert [r["id"] for r in results] == ["r1", "r3"]
+        assert results[0]["distance"] == pytest.approx(1.0)
+
+        await storage.delete_entity_relation("B")
+        assert await storage.get_by_ids(["r1", "r2", "r3"]) == [
+            None,
+            None,
+            await storage.get_by_id("r3"),
+        ]
+
+        # Freed rows are reused by new records
+        await storage.upsert({"r4": {"content": "delta", "src_id": "X", "tgt_id": "Y"}})
+        assert [r["id"] for r in await storage.query("delta", top_k=5)] == ["r4"]
+        vectors = await storage.get_vectors_by_ids(["r4"])
+        assert np.allclose(vectors["r4"], [0, 0, 0, 1])
+    finally:
+        await storage.finalize()
+
+
+@pytest.mark.offline
+async def test_graph_storage(tmp_path):
+    storage = SqliteGraphStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config=_config(tmp_path),
+        embedding_func=None,
+    )
+    await storage.initialize()
+    try:
+        for node in ["A", "B", "C", "D"]:
+            await storage.upsert_node(node, {"entity_id": node, "entity_type": "T"})
+        await storage.upsert_edge("A", "B", {"weight": "1"})
+        await storage.upsert_edge("C", "B", {"weight": "2"})
+        await storage.upsert_edge("C", "D", {"weight": "3"})
+
+        assert await storage.get_edge("B", "A") == {"weight": "1"}
+        assert await storage.node_degree("B") == 2
+        assert await storage.edge_degree("A", "B") == 3
+        assert sorted(await storage.get_node_edges("B")) == [("B", "A"), ("B", "C")]
+
+        await storage.upsert_node("A", {"description": "merged"})
+        assert await storage.get_node("A") == {
+            "entity_id": "A",
+            "entity_type": "T",
+            "description": "merged",
+        }
+
+        kg = await storage.get_knowledge_graph("A", max_depth=1)
+        assert {n.id for n in kg.nodes} == {"A", "B"}
+        assert len(kg.edges) == 1
+
+        assert (await storage.get_popular_labels(1)) in (["B"], ["C"])
+        assert await storage.search_labels("a") == ["A"]
+
+        await storage.remove_nodes(["B"])
+        assert await storage.get_node_edges("A") == []
+    finally:
+        await storage.finalize()
+
+
+@pytest.mark.offline
+async def test_workspace_isolation(tmp_path):
+    storages = [
+        SqliteKVStorage(
+            namespace="full_docs",
+            workspace=workspace,
+            global_config=_config(tmp_path),
+            embedding_func=None,
+        )
+        for workspace in ("space1", "space2")
+    ]
+    for storage in storages:
+        await storage.initialize()
+    try:
+        await storages[0].upsert({"doc": {"content": "one"}})
+        await storages[1].upsert({"doc": {"content": "two"}})
+        assert (await storages[0].get_by_id("doc"))["content"] == "one"
+        assert (await storages[1].get_by_id("doc"))["content"] == "two"
+        assert (tmp_path / "space1" / "kv_store_full_docs.sqlite").exists()
+    finally:
+        for storage in storages:
+            await storage.finalize()
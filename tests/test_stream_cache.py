@@ -0,0 +1,126 @@
+"""
+Tests for caching streamed query responses (lightrag.utils.tee_stream)
+
+This test verifies:
+1. tee_stream forwards every chunk and reports the full response at the end
+2. Streams that are abandoned or fail are not reported
+3. naive_query caches a streamed answer and replays a cache hit as a stream
+"""
+
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.operate import naive_query
+from lightrag.utils import replay_stream, tee_stream
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+async def _chunks(*parts, error: Exception | None = None):
+    for part in parts:
+        yield part
+    if error:
+        raise error
+
+
+@pytest.mark.offline
+async def test_tee_stream_forwards_and_accumulates():
+    completed = []
+
+    async def on_complete(content):
+        completed.append(content)
+
+    received = [
+        chunk async for chunk in tee_stream(_chunks("a", "b", "c"), on_complete)
+    ]
+    assert received == ["a", "b", "c"]
+    assert completed == ["abc"]
+
+    assert [chunk async for chunk in replay_stream("line 1\nline 2")] == [
+        "line 1\n",
+        "line 2",
+    ]
+
+
+@pytest.mark.offline
+async def test_incomplete_streams_are_not_reported():
+    completed = []
+
+    async def on_complete(content):
+        completed.append(content)
+
+    stream = tee_stream(_chunks("a", "b"), on_complete)
+    assert await stream.__anext__() == "a"
+    await stream.aclose()
+
+    with pytest.raises(RuntimeError):
+        async for _ in tee_stream(
+            _chunks("a", error=RuntimeError("broken")), on_complete
+        ):
+            pass
+
+    assert completed == []
+
+
+class _ChunksVDB:
+    cosine_better_than_threshold = 0.2
+
+    def __init__(self, embedding_func):
+        self.embedding_func = embedding_func
+
+    async def query(self, query, top_k, query_embedding=None):
+        return [
+            {
+                "id": "chunk-1",
+                "content": "Monday: planning meeting",
+                "file_path": "schedule.md",
+                "created_at": 0,
+            }
+        ]
+
+
+@pytest.mark.offline
+async def test_naive_query_caches_streamed_answer(
+    tmp_path, char_tokenizer, embedding_func
+):
+    llm_calls = []
+
+    async def llm_model_func(prompt, stream=False, **kwargs):
+        llm_calls.append(prompt)
+        return _chunks("Planning ", "meeting\n", "on Monday")
+
+    global_config = {
+        "working_dir": str(tmp_path),
+        "workspace": "",
+        "tokenizer": char_tokenizer,
+        "llm_model_func": llm_model_func,
+        "enable_llm_cache": True,
+        "max_total_tokens": 30000,
+    }
+    hashing_kv = JsonKVStorage(
+        namespace="llm_response_cache",
+        workspace="",
+        global_config=global_config,
+        embedding_func=None,
+    )
+    await hashing_kv.initialize()
+    param = QueryParam(mode="naive", stream=True, enable_rerank=False)
+
+    first = await naive_query(
+        "what's on", _ChunksVDB(embedding_func), param, global_config, hashing_kv
+    )
+    assert first.is_streaming
+    assert "".join([c async for c in first.response_iterator]) == (
+        "Planning meeting\non Monday"
+    )
+
+    second = await naive_query(
+        "what's on", _ChunksVDB(embedding_func), param, global_config, hashing_kv
+    )
+    assert second.is_streaming
+    assert [c async for c in second.response_iterator] == [
+        "Planning meeting\n",
+        "on Monday",
+    ]
+    assert len(llm_calls) == 1
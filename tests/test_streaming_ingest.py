@@ -0,0 +1,75 @@
+"""
+Tests for streaming ingestion of very large documents (LightRAG.ainsert_stream)
+
+This test verifies:
+1. The streaming chunker yields the chunks of chunking_by_token_size
+2. Entity extraction starts before the whole stream has been read
+3. Entities of every window are recorded for the document
+4. An interrupted streamed document fails instead of being reprocessed empty
+"""
+
+import re
+
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.operate import chunking_by_token_size, chunking_by_token_size_stream
+
+LINES = [f"Line {i} mentions Town{i % 7}ville and other things." for i in range(60)]
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("split_by_character", [None, "."])
+def test_stream_chunks_match_full_chunking(char_tokenizer, split_by_character):
+    expected = chunking_by_token_size(
+        char_tokenizer, "\n".join(LINES), split_by_character, False, 30, 200
+    )
+    streamed = list(
+        chunking_by_token_size_stream(
+            char_tokenizer, iter(LINES), split_by_character, False, 30, 200
+        )
+    )
+    assert streamed == expected
+
+
+@pytest.mark.offline
+async def test_extraction_overlaps_reading(make_rag, char_tokenizer):
+    events = []
+
+    async def llm_func(prompt, system_prompt=None, history_messages=None, **kwargs):
+        if not system_prompt:
+            return "A summary."
+        events.append("extract")
+        towns = sorted(set(re.findall(r"\bTown\dville\b", prompt)))
+        lines = [f"entity<|#|>{t}<|#|>location<|#|>{t} is a town." for t in towns]
+        return "\n".join(lines + ["<|COMPLETE|>"])
+
+    def segments():
+        for start in range(0, len(LINES), 10):
+            events.append("read")
+            yield "\n".join(LINES[start : start + 10])
+
+    rag = await make_rag(
+        llm_model_func=llm_func,
+        chunk_token_size=200,
+        chunk_overlap_token_size=0,
+        stream_window_chunks=4,
+    )
+    await rag.ainsert_stream(segments(), file_path="huge.log", doc_id="doc-huge")
+
+    assert events.index("extract") < len(events) - 1 - events[::-1].index("read")
+
+    status = await rag.doc_status.get_by_id("doc-huge")
+    assert status["status"] == DocStatus.PROCESSED
+    stored = await rag.text_chunks.get_by_ids(status["chunks_list"])
+    assert all(chunk["full_doc_id"] == "doc-huge" for chunk in stored)
+    assert status["chunks_count"] == len(
+        chunking_by_token_size(char_tokenizer, "\n".join(LINES), None, False, 0, 200)
+    )
+    entities = await rag.full_entities.get_by_id("doc-huge")
+    assert set(entities["entity_names"]) == {f"Town{i}ville" for i in range(7)}
+
+    with pytest.raises(Exception, match="cannot be resumed"):
+        await rag._chunk_document("doc-huge", "huge.log", None, False)
+    with pytest.raises(ValueError, match="already exists"):
+        await rag.ainsert_stream(iter(LINES), doc_id="doc-huge")
@@ -0,0 +1,122 @@
+"""
+Tests for token counts stored with entities, relations and chunks
+
+This test verifies:
+1. Truncation sums stored counts and only encodes records without a valid stamp
+2. Entities, relations and chunks get their counts when they are merged or chunked
+3. A count goes stale when the tokenizer version or the description changes
+"""
+
+import json
+
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.operate import _entity_context_json, _relation_context_json
+from lightrag.utils import (
+    Tokenizer,
+    compute_token_count_fields,
+    process_chunks_unified,
+    stored_token_count,
+    truncate_list_by_token_size,
+)
+
+
+def _record(tokenizer: Tokenizer, description: str) -> dict:
+    return {
+        "description": description,
+        **compute_token_count_fields(tokenizer, f"[{description}]", description),
+    }
+
+
+@pytest.mark.offline
+def test_truncation_uses_stored_counts(char_tokenizer):
+    tokenizer = char_tokenizer
+    records = [_record(tokenizer, "x" * 10) for _ in range(5)]
+    records[2] = _record(Tokenizer("other", tokenizer.tokenizer), "y" * 10)
+    tokenizer.tokenizer.encoded.clear()
+
+    kept = truncate_list_by_token_size(
+        records,
+        key=lambda r: f"[{r['description']}]",
+        max_token_size=40,
+        tokenizer=tokenizer,
+        count=lambda r: stored_token_count(r, tokenizer, r["description"]),
+    )
+
+    # 12 tokens per record; only the one stamped by another tokenizer is encoded
+    assert len(kept) == 3
+    assert tokenizer.tokenizer.encoded == ["[" + "y" * 10 + "]"]
+
+
+@pytest.mark.offline
+async def test_chunk_truncation_with_stored_counts(char_tokenizer):
+    tokenizer = char_tokenizer
+    chunks = []
+    for i in range(4):
+        content = f'Chunk {i} says\n"hello"' * 5
+        chunks.append(
+            {
+                "content": content,
+                "file_path": "a.txt",
+                "chunk_id": f"chunk-{i}",
+                **compute_token_count_fields(
+                    tokenizer, json.dumps(content, ensure_ascii=False), content
+                ),
+            }
+        )
+    live_size = len(
+        json.dumps({k: chunks[0][k] for k in ("content", "file_path", "chunk_id")})
+    )
+
+    kept = await process_chunks_unified(
+        query="",
+        unique_chunks=chunks,
+        query_param=QueryParam(),
+        global_config={"tokenizer": tokenizer},
+        chunk_token_limit=live_size * 3 + 10,
+    )
+
+    assert [chunk["chunk_id"] for chunk in kept] == ["chunk-0", "chunk-1", "chunk-2"]
+    assert all(
+        chunk["content"] not in encoded
+        for chunk in chunks
+        for encoded in tokenizer.tokenizer.encoded
+    )
+
+
+async def _llm_func(prompt, system_prompt=None, history_messages=None, **kwargs):
+    if not system_prompt:
+        return "A summary."
+    return (
+        "entity<|#|>Hubville<|#|>location<|#|>Hubville is a market town.\n"
+        "entity<|#|>Portville<|#|>location<|#|>Portville is a harbour.\n"
+        "relation<|#|>Hubville<|#|>Portville<|#|>trade<|#|>Hubville trades with Portville.\n"
+        "<|COMPLETE|>"
+    )
+
+
+@pytest.mark.offline
+async def test_counts_are_stored_at_merge_and_chunking(make_rag, char_tokenizer):
+    tokenizer = char_tokenizer
+    rag = await make_rag(llm_model_func=_llm_func)
+    await rag.ainsert("Hubville trades with Portville.", ids=["doc-1"])
+
+    node = await rag.chunk_entity_relation_graph.get_node("Hubville")
+    expected = _entity_context_json("Hubville", "location", node["description"])
+    assert stored_token_count(node, tokenizer, node["description"]) == len(expected)
+
+    edge = await rag.chunk_entity_relation_graph.get_edge("Hubville", "Portville")
+    expected = _relation_context_json("Hubville", "Portville", edge["description"])
+    assert stored_token_count(edge, tokenizer, edge["description"]) == len(expected)
+
+    status = await rag.doc_status.get_by_id("doc-1")
+    chunk = (await rag.text_chunks.get_by_ids(status["chunks_list"]))[0]
+    assert stored_token_count(chunk, tokenizer, chunk["content"]) == len(
+        json.dumps(chunk["content"])
+    )
+
+    # Edited descriptions and other tokenizers fall back to live counting
+    assert stored_token_count(node, tokenizer, node["description"] + "!") is None
+    other = Tokenizer("other", tokenizer.tokenizer)
+    assert stored_token_count(node, other, node["description"]) is None